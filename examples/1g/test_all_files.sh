@@ -1,56 +1,49 @@
 #!/bin/bash
 # Test tous les fichiers IQ disponibles
+# Les fichiers sont décodés en parallèle par cospas-batch-decode (un
+# processus par cœur, longs fichiers découpés en segments); chaque trame
+# attendue doit apparaître, valide, dans le résultat fusionné.
 
 EXPECTED1="8E3301E2402B002BBA863609670908"
 EXPECTED2="8E3301E240298056CF99F61503780B"
 
+FILE1="/home/fab2/Developpement/COSPAS-SARSAT/balise_406MHz/sarsat-main/beacon_signal_406mhz_long_msg_144bit.iq"
+FILE2="/home/fab2/Developpement/COSPAS-SARSAT/balise_406MHz/sarsat-main/beacon_signal_406mhz_long_msg_144bit_2.iq"
+
+RESULT=$(mktemp --suffix=.csv)
+trap 'rm -f "$RESULT"' EXIT
+
 echo "======================================================================"
-echo "TEST DE RÉPÉTABILITÉ - TOUS LES FICHIERS IQ"
+echo "TEST - TOUS LES FICHIERS IQ (décodage parallèle)"
 echo "======================================================================"
 echo ""
 
-# Fichier 1 - petit (326 KB)
-echo "=== FICHIER 1: beacon_signal_406mhz_long_msg_144bit.iq ==="
-FILE1="/home/fab2/Developpement/COSPAS-SARSAT/balise_406MHz/sarsat-main/beacon_signal_406mhz_long_msg_144bit.iq"
-success1=0
-for i in {1..10}; do
-    result=$(python3 decode_iq_40khz.py "$FILE1" 2>&1 | grep "Données (hex)" -A1 | tail -1 | xargs)
-    if [ "$result" = "$EXPECTED1" ]; then
-        echo "  Test $i: ✅"
-        ((success1++))
-    else
-        echo "  Test $i: ❌ $result"
-    fi
-done
-echo "  Résultat: $success1/10 réussis"
+cospas-batch-decode "$FILE1" "$FILE2" -s 40000 --valid-only -o "$RESULT" "$@"
 echo ""
 
-# Fichier 2 - gros (160 MB)
-echo "=== FICHIER 2: beacon_signal_406mhz_long_msg_144bit_2.iq ==="
-FILE2="/home/fab2/Developpement/COSPAS-SARSAT/balise_406MHz/sarsat-main/beacon_signal_406mhz_long_msg_144bit_2.iq"
-success2=0
-for i in {1..5}; do
-    result=$(python3 decode_iq_40khz.py "$FILE2" 2>&1 | grep "Données (hex)" -A1 | tail -1 | xargs)
-    if [ "$result" = "$EXPECTED2" ]; then
-        echo "  Test $i: ✅"
-        ((success2++))
-    else
-        echo "  Test $i: ❌ $result"
+check() {
+    local name=$1 expected=$2
+    local count
+    count=$(grep -c "^$(basename "$name"),.*$expected" "$RESULT")
+    if [ "$count" -gt 0 ]; then
+        echo "  $(basename "$name"): ✅ $expected ($count trame(s))"
+        return 0
     fi
-done
-echo "  Résultat: $success2/5 réussis"
+    echo "  $(basename "$name"): ❌ $expected absent"
+    return 1
+}
+
+failures=0
+check "$FILE1" "$EXPECTED1" || ((failures++))
+check "$FILE2" "$EXPECTED2" || ((failures++))
 echo ""
 
 echo "======================================================================"
 echo "RÉSUMÉ GLOBAL"
 echo "======================================================================"
-total_tests=$((10 + 5))
-total_success=$((success1 + success2))
-echo "Total: $total_success/$total_tests tests réussis"
-
-if [ $total_success -eq $total_tests ]; then
-    echo "🎉 TOUS LES TESTS RÉUSSIS - 100% DE DÉTERMINISME!"
+if [ $failures -eq 0 ]; then
+    echo "🎉 TOUS LES TESTS RÉUSSIS"
 else
-    percent=$(( (total_success * 100) / total_tests ))
-    echo "⚠️  Taux de réussite: ${percent}%"
+    echo "⚠️  $failures fichier(s) en échec"
+    exit 1
 fi
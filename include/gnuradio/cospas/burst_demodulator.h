@@ -0,0 +1,58 @@
+/* -*- c++ -*- */
+/*
+ * Démodulation hors flowgraph (archives IQ, traitement par lots)
+ */
+
+#ifndef INCLUDED_COSPAS_BURST_DEMODULATOR_H
+#define INCLUDED_COSPAS_BURST_DEMODULATOR_H
+
+#include <gnuradio/cospas/api.h>
+#include <gnuradio/gr_complex.h>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Résultat de la démodulation d'un burst 1G
+ */
+struct COSPAS_API burst_demod_result {
+    bool frame_found = false;      // Trame complète (144 bits) démodulée
+    bool crc_ok = false;           // CRC1 (et CRC2 hors orbitographie) valides
+    bool rescued = false;          // Trame issue d'une hypothèse alternative
+    std::vector<uint8_t> bits;     // Bits de la trame (bit sync inclus)
+    std::vector<float> soft;       // Décisions souples du filtre adapté
+    float freq_offset = 0.0f;      // Offset de fréquence corrigé (Hz)
+    float samples_per_bit = 0.0f;  // Période bit mesurée (cadence de travail)
+    std::string hex;               // Trame en hexadécimal
+};
+
+/*!
+ * \brief Démoduler une liste de bursts sans GNU Radio
+ *
+ * Même chaîne que le bloc cospas_sarsat_demodulator (décimation,
+ * filtre adapté, hypothèses alternatives), sans affichage. Les bursts
+ * sont répartis sur num_threads workers; les buffers ne sont pas copiés.
+ *
+ * \param bursts Pointeurs vers les échantillons de chaque burst
+ * \param lengths Nombre d'échantillons de chaque burst
+ * \param sample_rate Fréquence d'échantillonnage des bursts (Hz)
+ * \param working_samples_per_bit Cadence de travail (0 = cadence d'entrée)
+ * \param use_hypotheses Essayer les hypothèses alternatives si la trame nominale échoue
+ * \param num_threads Nombre de workers (0 = nombre de coeurs)
+ * \return Un résultat par burst, dans l'ordre des bursts
+ */
+COSPAS_API std::vector<burst_demod_result>
+demodulate_bursts(const std::vector<const gr_complex*>& bursts,
+                  const std::vector<int>& lengths,
+                  float sample_rate,
+                  int working_samples_per_bit = 16,
+                  bool use_hypotheses = true,
+                  int num_threads = 0);
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BURST_DEMODULATOR_H */
@@ -0,0 +1,107 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BURST_RECORDER_H
+#define INCLUDED_COSPAS_BURST_RECORDER_H
+
+#include <gnuradio/cospas/api.h>
+#include <gnuradio/sync_block.h>
+#include <string>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Enregistreur SigMF des bursts détectés, avec pré/post-roll
+ * \ingroup cospas
+ *
+ * Branché sur le même flux IQ que le cospas_burst_detector (mêmes
+ * indices d'échantillons), il conserve les dernières secondes dans un
+ * buffer circulaire. Pour chaque burst annoncé sur le port "bursts"
+ * (clé "start" et "size" du détecteur), l'intervalle
+ * [start - pre_roll, start + size + post_roll] est copié dès que le
+ * post-roll est reçu puis confié a un thread d'écriture.
+ *
+ * Le port "frames" reçoit les trames des démodulateurs 1G et 2G (clé
+ * burst_start): l'état du décodage (decoded, crc_error/bch_error ou
+ * no_frame après decode_timeout_ms) est ajouté aux métadonnées.
+ *
+ * Chaque burst donne une paire burst_AAAAMMJJ_HHMMSS_mmm_N.sigmf-data
+ * (cf32_le) / .sigmf-meta: sample rate, fréquence, date UTC du premier
+ * échantillon, annotation du burst (SNR estimé sur le pré-roll, état du
+ * décodage, hex, génération, offset de fréquence).
+ *
+ * Les écritures sont faites hors des threads DSP, dans une file bornée a
+ * max_queue_mb: si le disque ne suit pas, les bursts suivants sont
+ * abandonnés (get_bursts_dropped) plutôt que de bloquer le flux.
+ */
+class COSPAS_API burst_recorder : virtual public gr::sync_block
+{
+public:
+    typedef std::shared_ptr<burst_recorder> sptr;
+
+    /*!
+     * \brief Créer un enregistreur de bursts
+     *
+     * \param sample_rate Taux d'échantillonnage (Hz)
+     * \param output_dir Répertoire des fichiers SigMF (créé si absent)
+     * \param pre_roll_ms Durée enregistrée avant le début du burst (ms)
+     * \param post_roll_ms Durée enregistrée après la fin du burst (ms)
+     * \param center_freq Fréquence centrale (Hz, 0 = inconnue)
+     * \param failed_only N'écrire que les bursts non décodés ou en erreur
+     * \param max_queue_mb Taille maximale des bursts en attente d'écriture (Mo)
+     * \param decode_timeout_ms Attente de la trame d'un burst avant no_frame (ms)
+     * \param debug_mode Active les messages de debug
+     */
+    static sptr make(float sample_rate,
+                     const std::string& output_dir,
+                     int pre_roll_ms = 200,
+                     int post_roll_ms = 200,
+                     double center_freq = 0.0,
+                     bool failed_only = false,
+                     int max_queue_mb = 64,
+                     int decode_timeout_ms = 3000,
+                     bool debug_mode = false);
+
+    /*!
+     * \brief Obtenir le nombre de bursts écrits sur disque
+     */
+    virtual int get_bursts_recorded() const = 0;
+
+    /*!
+     * \brief Obtenir le nombre de bursts abandonnés (file pleine, erreur d'écriture)
+     */
+    virtual int get_bursts_dropped() const = 0;
+
+    /*!
+     * \brief Changer la fréquence centrale (nouveau cycle de scan)
+     */
+    virtual void set_center_freq(double center_freq) = 0;
+
+    /*!
+     * \brief Date UTC (secondes Unix) du premier échantillon du flux
+     *
+     * Par défaut, l'horloge système au premier appel de work(); a fixer
+     * pour un rejeu plus rapide que le temps réel.
+     */
+    virtual void set_start_time(double unix_seconds) = 0;
+
+    /*!
+     * \brief Réinitialiser les statistiques
+     */
+    virtual void reset_statistics() = 0;
+
+    /*!
+     * \brief Activer/désactiver le mode debug
+     */
+    virtual void set_debug_mode(bool enable) = 0;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BURST_RECORDER_H */
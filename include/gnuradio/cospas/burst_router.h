@@ -22,8 +22,22 @@ namespace cospas {
  * - Port 1: Bursts 2G (SGB - Second Generation Beacon)
  *
  * Détection basée sur:
- * - Taille du burst (< 25000 samples → 1G, >= 25000 → 2G)
- * - Présence de porteuse 160ms (1G uniquement)
+ * - Signature des 100-160 premières ms: porteuse non modulée (1G, cohérente)
+ *   ou préambule PRN T.018 (2G, corrélation FFT), calculée pendant la
+ *   réception du burst
+ * - Si la signature est ambiguë (burst très bruité), taille du burst
+ *   (< 25000 samples → 1G, >= 25000 → 2G) et porteuse 160ms
+ *
+ * Dès la décision anticipée, le burst est transmis pendant sa réception:
+ * - sorties stream: tag burst_start (indice absolu du debut du burst),
+ *   burst_end sur le dernier échantillon (taille, ou PMT_F si le
+ *   détecteur abandonne le burst);
+ * - messages "fragments_1g" / "fragments_2g": dict (burst = numéro du
+ *   burst, start, offset = position du fragment dans le burst, samples
+ *   c32vector, last, discarded), un premier fragment avec tout le debut
+ *   du burst puis un fragment toutes les 20 ms.
+ * Les messages "bursts_1g" / "bursts_2g" transmettent les bursts complets
+ * reçus sur l'entrée message "bursts".
  *
  * \ingroup cospas
  */
@@ -50,6 +64,16 @@ public:
      */
     virtual int get_bursts_2g() const = 0;
 
+    /*!
+     * \brief Obtenir le nombre de bursts en file (en accumulation ou en sortie)
+     */
+    virtual int get_queue_depth() const = 0;
+
+    /*!
+     * \brief Obtenir la profondeur de file maximale observée
+     */
+    virtual int get_max_queue_depth() const = 0;
+
     /*!
      * \brief Réinitialiser les statistiques
      */
@@ -28,7 +28,12 @@ namespace cospas {
  * - Compatible 1G (BPSK) et 2G (QPSK/DSSS)
  *
  * Entrée: flux IQ continu (gr_complex)
- * Sortie: bursts isolés (gr_complex)
+ * Sortie: bursts isolés (gr_complex), produits pendant leur réception.
+ * Tag burst_start (indice absolu du debut du burst) sur le premier
+ * échantillon, burst_end sur le dernier: PMT_T si le burst est valide,
+ * PMT_F s'il est abandonné (plus court que min_burst_duration_ms)
+ * Sortie message "bursts": dict (samples c32vector, size, timestamp,
+ * start = indice absolu du premier échantillon du burst dans le flux)
  */
 class COSPAS_API cospas_burst_detector : virtual public gr::block
 {
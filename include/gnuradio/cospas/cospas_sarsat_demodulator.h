@@ -8,6 +8,7 @@
 
 #include <gnuradio/cospas/api.h>
 #include <gnuradio/sync_block.h>
+#include <vector>
 
 namespace gr {
 namespace cospas {
@@ -20,6 +21,11 @@ namespace cospas {
  * - Porteuse 160ms
  * - 15 bits de synchronisation 
  * - Modulation biphase-L ±1.1 rad
+ *
+ * Sorties message:
+ * - "frames": dict (bits u8vector, soft f32vector, hex, freq_offset,
+ *   crc_ok, rescued, burst_start si le burst vient du détecteur)
+ * - "decode_complete": PMT_T après chaque trame
  */
 class COSPAS_API cospas_sarsat_demodulator : virtual public gr::sync_block
 {
@@ -53,6 +59,84 @@ public:
      */
     virtual void set_debug_mode(bool enable) = 0;
 
+    /*!
+     * \brief Choisir le démodulateur de bits
+     *
+     * true (défaut): filtre adapté biphase-L sur la période bit complète
+     * avec suivi early-late. false: échantillonnage de phase en deux points.
+     */
+    virtual void set_matched_filter(bool enable) = 0;
+
+    /*!
+     * \brief Définir les hypothèses essayées quand la démodulation nominale échoue
+     *
+     * Si le burst échoue (bit sync ou CRC), chaque combinaison des trois
+     * listes est démodulée en parallèle; la première trame au CRC valide
+     * est publiée. Liste vide = valeur nominale seule.
+     *
+     * \param phase_variance_thresholds Seuils de détection porteuse (rad, plage 0.15-0.7)
+     * \param freq_offsets Décalages ajoutés a l'offset de fréquence estimé (Hz)
+     * \param timing_offsets Décalages du debut de trame (échantillons)
+     */
+    virtual void set_hypotheses(const std::vector<float>& phase_variance_thresholds,
+                                const std::vector<float>& freq_offsets,
+                                const std::vector<float>& timing_offsets) = 0;
+
+    /*!
+     * \brief Nombre de threads pour les hypothèses (1 = séquentiel)
+     */
+    virtual void set_hypothesis_threads(int num_threads) = 0;
+
+    /*!
+     * \brief Obtenir le nombre de trames sauvées par une hypothèse alternative
+     */
+    virtual int get_hypothesis_rescues() const = 0;
+
+    /*!
+     * \brief Nombre de workers démodulant les bursts en parallèle
+     *
+     * Chaque worker a son propre état; les trames sont publiées dans
+     * l'ordre d'arrivée des bursts. 0 = traitement synchrone sur le
+     * thread des messages.
+     */
+    virtual void set_num_workers(int num_workers) = 0;
+
+    /*!
+     * \brief Cadence de travail de la démodulation des bursts
+     *
+     * Les bursts (a n'importe quelle cadence) sont décimés par un filtre
+     * polyphase a 400 * samples_per_bit Hz (défaut: 16, soit 6400 Hz).
+     * 0 = démoduler a la cadence d'entrée.
+     */
+    virtual void set_working_samples_per_bit(int samples_per_bit) = 0;
+
+    /*!
+     * \brief Obtenir le nombre de bursts reçus et pas encore publiés
+     */
+    virtual int get_queue_depth() const = 0;
+
+    /*!
+     * \brief Obtenir la profondeur de file maximale observée
+     */
+    virtual int get_max_queue_depth() const = 0;
+
+    /*!
+     * \brief Obtenir la latence moyenne arrivée -> publication (ms)
+     */
+    virtual double get_mean_latency_ms() const = 0;
+
+    /*!
+     * \brief Obtenir la latence maximale arrivée -> publication (ms)
+     */
+    virtual double get_max_latency_ms() const = 0;
+
+    /*!
+     * \brief Obtenir un percentile de la latence arrivée -> publication (ms)
+     * \param percentile Percentile dans [0, 100] (ex: 50, 95, 99), calculé
+     *        sur les 4096 derniers bursts
+     */
+    virtual double get_latency_percentile_ms(double percentile) const = 0;
+
     /*!
      * \brief Réinitialiser les statistiques
      */
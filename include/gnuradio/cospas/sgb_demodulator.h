@@ -0,0 +1,98 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_SGB_DEMODULATOR_H
+#define INCLUDED_COSPAS_SGB_DEMODULATOR_H
+
+#include <gnuradio/cospas/api.h>
+#include <gnuradio/sync_block.h>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Démodulateur 2G (SGB) OQPSK DSSS C/S T.018
+ * \ingroup cospas
+ *
+ * Reçoit les bursts 2G du router et démodule les 250 bits de message.
+ * Entrées message:
+ * - "fragments": bursts en cours de réception (sortie "fragments_2g" du
+ *   router). L'acquisition part dès les ~205 premières ms et chaque paire
+ *   de bits est désétalée dès son arrivée: a la fin du burst, seules les
+ *   dernières paires, la correction BCH et le décodage restent a faire;
+ * - "bursts": bursts complets (même format que le démodulateur 1G).
+ *
+ * Traitement:
+ * - acquisition sur le préambule PRN (corrélation FFT), offset de porteuse
+ *   par FFT du préambule désétalé
+ * - désétalement I/Q (256 chips/bit, Q décalé d'un demi-chip) par filtre
+ *   adapté RRC et tables PRN précalculées
+ * - PLL porteuse et boucle early-late sur le débit chip
+ * - correction BCH(250,202) (jusqu'à 6 erreurs) puis décodage des champs
+ *   du message (TAC, numéro de série, pays, position, identification,
+ *   champ tournant)
+ *
+ * Sorties message:
+ * - "frames": dict (bits u8vector corrigés, soft f32vector, hex, freq_offset,
+ *   preamble_errors, bch_ok, bch_errors, puis les champs décodés: tac,
+ *   serial, country_code, hex_id, lat/lon, mmsi, rotating_id, ...;
+ *   burst_start si le burst vient du détecteur)
+ * - "decode_complete": PMT_T après chaque trame
+ */
+class COSPAS_API sgb_demodulator : virtual public gr::sync_block
+{
+public:
+    typedef std::shared_ptr<sgb_demodulator> sptr;
+
+    /*!
+     * \brief Créer un démodulateur 2G
+     * \param sample_rate Fréquence d'échantillonnage des bursts en Hz (défaut: 40000)
+     * \param debug_mode Active les messages de debug
+     */
+    static sptr make(float sample_rate = 40000.0f, bool debug_mode = false);
+
+    /*!
+     * \brief Obtenir le nombre de trames démodulées
+     */
+    virtual int get_frames_decoded() const = 0;
+
+    /*!
+     * \brief Obtenir le nombre de bursts sans trame (préambule absent ou burst incomplet)
+     */
+    virtual int get_sync_failures() const = 0;
+
+    /*!
+     * \brief Obtenir la latence moyenne réception du burst -> trame publiée (ms)
+     */
+    virtual double get_mean_latency_ms() const = 0;
+
+    /*!
+     * \brief Obtenir la latence maximale réception du burst -> trame publiée (ms)
+     */
+    virtual double get_max_latency_ms() const = 0;
+
+    /*!
+     * \brief Obtenir un percentile de la latence (ms)
+     * \param percentile Percentile dans [0, 100], calculé sur les 4096 derniers bursts
+     */
+    virtual double get_latency_percentile_ms(double percentile) const = 0;
+
+    /*!
+     * \brief Réinitialiser les statistiques
+     */
+    virtual void reset_statistics() = 0;
+
+    /*!
+     * \brief Activer/désactiver le mode debug
+     */
+    virtual void set_debug_mode(bool enable) = 0;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_SGB_DEMODULATOR_H */
@@ -0,0 +1,521 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Microbenchmarks des noyaux de la chaîne de réception
+ *
+ * Chaque noyau est mesuré seul sur des entrées fixes (bursts 1G et 2G
+ * synthétiques, graine fixe) et rapporté en ns/échantillon ou ns/trame:
+ * une optimisation d'un étage se mesure sans le reste du flowgraph.
+ * Chaque noyau est d'abord exécuté une fois et vérifié (trame trouvée,
+ * CRC valides...): un chiffre sur un chemin cassé est signalé "ECHEC".
+ *
+ * Usage: cospas_bench_kernels [--min-time S] [--repetitions N]
+ *                             [--json FICHIER] [filtre...]
+ *
+ * Les filtres sélectionnent les noyaux dont le nom contient l'un d'eux.
+ * Résultat retenu: médiane des répétitions.
+ */
+
+#include "biphase_matched_filter.h"
+#include "bpsk_demod_core.h"
+#include "burst_classifier.h"
+#include "lag_autocorrelation.h"
+#include "polyphase_resampler.h"
+#include "prn_2g_detector.h"
+#include "sgb_demod_core.h"
+#include "t018_prn.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <complex>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fcntl.h>
+#include <functional>
+#include <random>
+#include <string>
+#include <unistd.h>
+#include <vector>
+
+extern "C" {
+#include "dec406.h"
+}
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+constexpr int WORKING_SAMPLES_PER_BIT = 16;  // Cadence de travail du bloc 1G (6400 Hz)
+
+// Trames de référence (message seul, sans bit sync / frame sync pour la 1G)
+const char* const HEX_1G = "8E3301E2402B002BBA863609670908";
+const char* const HEX_2G = "0C0E7456390956CCD02799A2468ACF135787FFF00C02832000037707609BC0F";
+const char* const SYNC_1G = "111111111111111011010000";  // 15 bits a '1' + frame sync (test)
+constexpr int HEX_PAD_BITS_2G = 2;                         // 63 chiffres = 2 bits a zéro + 250
+
+// Le compilateur ne doit pas éliminer les appels mesurés
+volatile double g_sink = 0.0;
+
+std::vector<uint8_t> hex_to_bits(const char* hex)
+{
+    std::vector<uint8_t> bits;
+    for (const char* c = hex; *c; c++) {
+        int value = std::stoi(std::string(1, *c), nullptr, 16);
+        for (int j = 3; j >= 0; j--) {
+            bits.push_back((value >> j) & 1);
+        }
+    }
+    return bits;
+}
+
+void add_noise(std::vector<gr_complex>& x, float sigma, unsigned seed)
+{
+    std::mt19937 rng(seed);
+    std::normal_distribution<float> gauss(0.0f, sigma);
+    for (auto& s : x) {
+        s += gr_complex(gauss(rng), gauss(rng));
+    }
+}
+
+// Burst 1G: 160 ms de porteuse puis 144 bits biphase-L a ±1.1 rad
+std::vector<uint8_t> frame_bits_1g()
+{
+    std::vector<uint8_t> bits;
+    for (const char* c = SYNC_1G; *c; c++) {
+        bits.push_back(*c == '1');
+    }
+    const std::vector<uint8_t> message = hex_to_bits(HEX_1G);
+    bits.insert(bits.end(), message.begin(), message.end());
+    return bits;
+}
+
+std::vector<gr_complex> synthesize_1g(float sample_rate, float offset_hz)
+{
+    const std::vector<uint8_t> bits = frame_bits_1g();
+    const double samples_per_bit = sample_rate / 400.0;
+    const int carrier = static_cast<int>(0.160 * sample_rate);
+    const int total = carrier + static_cast<int>(bits.size() * samples_per_bit) +
+                      static_cast<int>(0.010 * sample_rate);
+
+    std::vector<gr_complex> x(total, gr_complex(0.0f, 0.0f));
+    for (int n = 0; n < total; n++) {
+        const double t = n - carrier;
+        double phase = 0.0;
+        if (t >= 0.0) {
+            const int k = static_cast<int>(t / samples_per_bit);
+            if (k >= static_cast<int>(bits.size())) {
+                break;
+            }
+            const bool first_half = (t - k * samples_per_bit) < samples_per_bit / 2.0;
+            phase = (first_half == (bits[k] == 1)) ? 1.1 : -1.1;
+        }
+        phase += 0.7 + 2.0 * M_PI * offset_hz * n / sample_rate;
+        x[n] = std::polar(0.5f, static_cast<float>(phase));
+    }
+    add_noise(x, 0.01f, 1);
+    return x;
+}
+
+// Burst 2G: OQPSK DSSS (Q en retard d'un demi-chip), chips RRC α=0.8
+std::vector<gr_complex> synthesize_2g(float sample_rate, float offset_hz)
+{
+    const std::vector<uint8_t> hex_bits = hex_to_bits(HEX_2G);
+    std::vector<uint8_t> bits(t018_prn::PREAMBLE_BITS, 0);
+    bits.insert(bits.end(),
+                hex_bits.begin() + HEX_PAD_BITS_2G,
+                hex_bits.begin() + HEX_PAD_BITS_2G + t018_prn::MESSAGE_BITS);
+
+    // Bits impairs (1, 3, ...) → I, pairs → Q; bit 1 inverse le PRN
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const int num_chips = t018_prn::CHIPS_PER_CHANNEL;
+    std::vector<float> chips_i(num_chips), chips_q(num_chips);
+    for (int c = 0; c < num_chips; c++) {
+        const int pair = c / t018_prn::CHIPS_PER_BIT;
+        chips_i[c] = prn_i[c] * (bits[2 * pair] ? -1.0f : 1.0f);
+        chips_q[c] = prn_q[c] * (bits[2 * pair + 1] ? -1.0f : 1.0f);
+    }
+
+    constexpr int SPAN = 4;  // Impulsion tronquée a ±4 chips
+    const double samples_per_chip = sample_rate / t018_prn::CHIP_RATE;
+    const int lead = 500;
+    const int total = lead + static_cast<int>((num_chips + SPAN) * samples_per_chip) + 500;
+    std::vector<gr_complex> x(total, gr_complex(0.0f, 0.0f));
+    for (int n = lead; n < total; n++) {
+        const double t = (n - lead) / samples_per_chip;  // En chips
+        double re = 0.0, im = 0.0;
+        for (int c = std::max(0, static_cast<int>(t) - SPAN);
+             c <= std::min(num_chips - 1, static_cast<int>(t) + SPAN);
+             c++) {
+            re += chips_i[c] * t018_prn::rrc_pulse(t - c);
+            im += chips_q[c] * t018_prn::rrc_pulse(t - c - 0.5);
+        }
+        const double phase = 2.0 * M_PI * offset_hz * n / sample_rate;
+        x[n] = gr_complex(static_cast<float>(re), static_cast<float>(im)) *
+               std::polar(0.5f, static_cast<float>(phase));
+    }
+    add_noise(x, 0.05f, 2);
+    return x;
+}
+
+std::vector<uint8_t> message_bits_2g()
+{
+    const std::vector<uint8_t> hex_bits = hex_to_bits(HEX_2G);
+    return std::vector<uint8_t>(hex_bits.begin() + HEX_PAD_BITS_2G,
+                                hex_bits.begin() + HEX_PAD_BITS_2G + t018_prn::MESSAGE_BITS);
+}
+
+// decode_1g() / decode_2g() affichent: stdout vers /dev/null pendant la mesure
+class stdout_silencer
+{
+public:
+    stdout_silencer()
+    {
+        fflush(stdout);
+        d_saved = dup(STDOUT_FILENO);
+        int null_fd = open("/dev/null", O_WRONLY);
+        if (null_fd >= 0) {
+            dup2(null_fd, STDOUT_FILENO);
+            close(null_fd);
+        }
+    }
+    ~stdout_silencer()
+    {
+        fflush(stdout);
+        if (d_saved >= 0) {
+            dup2(d_saved, STDOUT_FILENO);
+            close(d_saved);
+        }
+    }
+
+private:
+    int d_saved;
+};
+
+struct kernel {
+    std::string name;
+    const char* unit;               // "sample" ou "frame"
+    double units_per_call;          // Échantillons (ou trames) traités par appel
+    std::function<bool()> check;    // Exécution de vérification
+    std::function<void()> run;      // Corps mesuré
+    bool silence = false;           // Le noyau écrit sur stdout
+};
+
+struct kernel_result {
+    std::string name;
+    const char* unit;
+    double ns_per_unit;
+    double us_per_call;
+    long calls;
+    bool ok;
+};
+
+// Médiane sur repetitions mesures d'au moins min_time secondes chacune
+kernel_result measure(const kernel& k, double min_time, int repetitions)
+{
+    using clock = std::chrono::steady_clock;
+
+    kernel_result result{ k.name, k.unit, 0.0, 0.0, 0, false };
+    {
+        std::unique_ptr<stdout_silencer> silencer;
+        if (k.silence) {
+            silencer.reset(new stdout_silencer());
+        }
+        result.ok = k.check();
+
+        std::vector<double> ns_per_call;
+        for (int r = 0; r < repetitions; r++) {
+            long calls = 0;
+            const auto start = clock::now();
+            double elapsed = 0.0;
+            do {
+                k.run();
+                calls++;
+                elapsed = std::chrono::duration<double>(clock::now() - start).count();
+            } while (elapsed < min_time);
+            ns_per_call.push_back(elapsed * 1e9 / calls);
+            result.calls += calls;
+        }
+        std::sort(ns_per_call.begin(), ns_per_call.end());
+        const size_t mid = ns_per_call.size() / 2;
+        const double median = (ns_per_call.size() % 2)
+                                  ? ns_per_call[mid]
+                                  : 0.5 * (ns_per_call[mid - 1] + ns_per_call[mid]);
+        result.ns_per_unit = median / k.units_per_call;
+        result.us_per_call = median / 1e3;
+    }
+    return result;
+}
+
+bool write_json(const std::string& path, const std::vector<kernel_result>& results)
+{
+    FILE* f = fopen(path.c_str(), "w");
+    if (!f) {
+        return false;
+    }
+    fprintf(f, "{\n  \"kernels\": {\n");
+    for (size_t i = 0; i < results.size(); i++) {
+        const kernel_result& r = results[i];
+        fprintf(f,
+                "    \"%s\": {\"unit\": \"ns/%s\", \"value\": %.3f, \"us_per_call\": %.3f, "
+                "\"calls\": %ld, \"ok\": %s}%s\n",
+                r.name.c_str(),
+                r.unit,
+                r.ns_per_unit,
+                r.us_per_call,
+                r.calls,
+                r.ok ? "true" : "false",
+                (i + 1 < results.size()) ? "," : "");
+    }
+    fprintf(f, "  }\n}\n");
+    fclose(f);
+    return true;
+}
+
+void usage(const char* argv0)
+{
+    fprintf(stderr,
+            "Usage: %s [--min-time S] [--repetitions N] [--json FICHIER] [filtre...]\n",
+            argv0);
+}
+
+} // namespace
+
+int main(int argc, char** argv)
+{
+    double min_time = 0.2;
+    int repetitions = 5;
+    std::string json_path;
+    std::vector<std::string> filters;
+
+    for (int i = 1; i < argc; i++) {
+        const std::string arg = argv[i];
+        if (arg == "--min-time" && i + 1 < argc) {
+            min_time = std::atof(argv[++i]);
+        } else if (arg == "--repetitions" && i + 1 < argc) {
+            repetitions = std::max(1, std::atoi(argv[++i]));
+        } else if (arg == "--json" && i + 1 < argc) {
+            json_path = argv[++i];
+        } else if (arg == "-h" || arg == "--help") {
+            usage(argv[0]);
+            return 0;
+        } else if (!arg.empty() && arg[0] == '-') {
+            usage(argv[0]);
+            return 2;
+        } else {
+            filters.push_back(arg);
+        }
+    }
+
+    // Entrées fixes, calculées une fois
+    const std::vector<gr_complex> burst_1g = synthesize_1g(SAMPLE_RATE, 120.0f);
+    const std::vector<gr_complex> burst_2g = synthesize_2g(SAMPLE_RATE, 250.0f);
+    const int len_1g = static_cast<int>(burst_1g.size());
+    const int len_2g = static_cast<int>(burst_2g.size());
+    const std::vector<uint8_t> bits_1g = frame_bits_1g();
+    const std::vector<uint8_t> bits_2g = message_bits_2g();
+
+    // Burst 1G a la cadence de travail, sans offset (filtre adapté seul)
+    const float working_rate = 400.0f * WORKING_SAMPLES_PER_BIT;
+    const std::vector<gr_complex> burst_1g_working = synthesize_1g(working_rate, 0.0f);
+    const float carrier_start_working = 0.160f * working_rate;  // Fin de la porteuse
+
+    // Amplitudes pour l'autocorrélation du burst detector
+    std::vector<float> amplitudes(len_1g);
+    for (int i = 0; i < len_1g; i++) {
+        amplitudes[i] = std::abs(burst_1g[i]);
+    }
+    const int samples_per_bit = static_cast<int>(SAMPLE_RATE / 400.0f);
+
+    // État des noyaux (réutilisé d'un appel a l'autre, comme dans les blocs)
+    std::vector<float> ring(2 * samples_per_bit, 0.0f);
+    burst_classifier classifier(SAMPLE_RATE);
+    polyphase_resampler resampler(4, 25);  // 40 kHz → 6.4 kHz
+    std::vector<gr_complex> resampled;
+    bpsk_demod_core stream_core(SAMPLE_RATE, false);
+    bpsk_demod_core burst_core(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    bpsk_demod_frame frame_1g;
+    std::vector<uint8_t> stream_out(2048);
+    biphase_matched_filter matched_filter(WORKING_SAMPLES_PER_BIT);
+    mf_bit_decisions decisions;
+    prn_2g_detector prn_detector(SAMPLE_RATE);
+    sgb_demod_core sgb_core(SAMPLE_RATE, false);
+    sgb_demod_frame frame_2g;
+    std::vector<uint8_t> codeword(bits_2g);
+    BeaconInfo2G info_2g;
+
+    // Mot de code 2G avec 3 erreurs (sur 6 corrigibles)
+    std::vector<uint8_t> corrupted(bits_2g);
+    for (int pos : { 10, 120, 240 }) {
+        corrupted[pos] ^= 1;
+    }
+
+    const int classifier_window = classifier.window_size();
+    const int prn_window = std::min(prn_detector.window_size(), len_2g);
+
+    std::vector<kernel> kernels;
+
+    kernels.push_back(
+        { "burst_detector.autocorrelation", "sample", static_cast<double>(len_1g),
+          [&] { return lag_autocorrelation(ring.data(), 0, samples_per_bit) >= 0.0f; },
+          [&] {
+              // Même boucle que cospas_burst_detector_impl::process_sample
+              const int size = 2 * samples_per_bit;
+              int index = 0;
+              float acc = 0.0f;
+              for (int i = 0; i < len_1g; i++) {
+                  ring[index] = amplitudes[i];
+                  index = (index + 1) % size;
+                  acc += lag_autocorrelation(ring.data(), index, samples_per_bit);
+              }
+              g_sink = acc;
+          } });
+
+    kernels.push_back(
+        { "burst_classifier.update", "sample", static_cast<double>(classifier_window),
+          [&] {
+              classifier.reset();
+              classifier.update(burst_1g.data(), std::min(len_1g, classifier_window));
+              return classifier.decided() &&
+                     classifier.decision() == burst_classifier::TYPE_1G;
+          },
+          [&] {
+              classifier.reset();
+              classifier.update(burst_1g.data(), std::min(len_1g, classifier_window));
+              g_sink = classifier.coherence();
+          } });
+
+    kernels.push_back(
+        { "polyphase_resampler.resample", "sample", static_cast<double>(len_1g),
+          [&] {
+              resampler.resample(burst_1g.data(), len_1g, resampled);
+              return !resampled.empty();
+          },
+          [&] {
+              resampler.resample(burst_1g.data(), len_1g, resampled);
+              g_sink = resampled.back().real();
+          } });
+
+    auto run_stream_core = [&] {
+        stream_core.reset_demodulator();
+        stream_core.append(burst_1g.data(), len_1g);
+        return stream_core.process_accumulated_buffer(stream_out.data(),
+                                                      static_cast<int>(stream_out.size()));
+    };
+    kernels.push_back(
+        { "bpsk_demod_core.process_accumulated_buffer", "sample", static_cast<double>(len_1g),
+          [&] {
+              run_stream_core();
+              return stream_core.frame_ready() && stream_core.frame().crc_ok;
+          },
+          [&] { g_sink = run_stream_core(); } });
+
+    kernels.push_back(
+        { "bpsk_demod_core.demodulate_burst", "sample", static_cast<double>(len_1g),
+          [&] {
+              return burst_core.demodulate_burst(burst_1g.data(), len_1g, frame_1g) &&
+                     frame_1g.crc_ok;
+          },
+          [&] { g_sink = burst_core.demodulate_burst(burst_1g.data(), len_1g, frame_1g); } });
+
+    auto run_matched_filter = [&] {
+        return matched_filter.demodulate(burst_1g_working.data(),
+                                         static_cast<int>(burst_1g_working.size()),
+                                         0.7f,
+                                         carrier_start_working,
+                                         bpsk_demod_core::TOTAL_BITS,
+                                         15,
+                                         decisions);
+    };
+    kernels.push_back({ "biphase_matched_filter.demodulate", "frame", 1.0,
+                        [&] { return run_matched_filter() && decisions.hard == bits_1g; },
+                        [&] { g_sink = run_matched_filter(); } });
+
+    kernels.push_back(
+        { "check_crc_1g", "frame", 1.0,
+          [&] { return check_crc_1g(bits_1g.data(), static_cast<int>(bits_1g.size())) == 1; },
+          [&] { g_sink = check_crc_1g(bits_1g.data(), static_cast<int>(bits_1g.size())); } });
+
+    kernels.push_back({ "decode_1g", "frame", 1.0,
+                        [&] {
+                            decode_1g(bits_1g.data(), static_cast<int>(bits_1g.size()));
+                            return true;
+                        },
+                        [&] { decode_1g(bits_1g.data(), static_cast<int>(bits_1g.size())); },
+                        true });
+
+    kernels.push_back(
+        { "prn_2g_detector.detect", "sample", static_cast<double>(prn_window),
+          [&] { return prn_detector.detect(burst_2g.data(), prn_window); },
+          [&] { g_sink = prn_detector.detect(burst_2g.data(), prn_window); } });
+
+    kernels.push_back(
+        { "sgb_demod_core.demodulate_burst", "sample", static_cast<double>(len_2g),
+          [&] {
+              return sgb_core.demodulate_burst(burst_2g.data(), len_2g, frame_2g) &&
+                     frame_2g.bits == bits_2g;
+          },
+          [&] { g_sink = sgb_core.demodulate_burst(burst_2g.data(), len_2g, frame_2g); } });
+
+    kernels.push_back({ "bch_2g_correct", "frame", 1.0,
+                        [&] {
+                            codeword = corrupted;
+                            return bch_2g_correct(codeword.data()) == 3 && codeword == bits_2g;
+                        },
+                        [&] {
+                            std::copy(corrupted.begin(), corrupted.end(), codeword.begin());
+                            g_sink = bch_2g_correct(codeword.data());
+                        } });
+
+    kernels.push_back({ "parse_2g", "frame", 1.0,
+                        [&] { return parse_2g(bits_2g.data(), &info_2g) == 0; },
+                        [&] { g_sink = parse_2g(bits_2g.data(), &info_2g); } });
+
+    kernels.push_back({ "decode_2g", "frame", 1.0,
+                        [&] {
+                            decode_2g(bits_2g.data());
+                            return true;
+                        },
+                        [&] { decode_2g(bits_2g.data()); },
+                        true });
+
+    std::vector<kernel_result> results;
+    printf("%-44s %14s %12s %10s\n", "noyau", "ns/unite", "us/appel", "appels");
+    for (const kernel& k : kernels) {
+        if (!filters.empty() &&
+            std::none_of(filters.begin(), filters.end(), [&k](const std::string& f) {
+                return k.name.find(f) != std::string::npos;
+            })) {
+            continue;
+        }
+        const kernel_result r = measure(k, min_time, repetitions);
+        printf("%-44s %9.2f ns/%-6s %10.2f %10ld%s\n",
+               r.name.c_str(),
+               r.ns_per_unit,
+               r.unit,
+               r.us_per_call,
+               r.calls,
+               r.ok ? "" : "  ECHEC");
+        fflush(stdout);
+        results.push_back(r);
+    }
+
+    if (!json_path.empty()) {
+        if (!write_json(json_path, results)) {
+            fprintf(stderr, "Impossible d'ecrire %s\n", json_path.c_str());
+            return 1;
+        }
+        printf("Resultats: %s\n", json_path.c_str());
+    }
+
+    const bool all_ok = std::all_of(
+        results.begin(), results.end(), [](const kernel_result& r) { return r.ok; });
+    return all_ok ? 0 : 1;
+}
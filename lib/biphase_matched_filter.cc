@@ -0,0 +1,135 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "biphase_matched_filter.h"
+#include <algorithm>
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+biphase_matched_filter::biphase_matched_filter(float samples_per_bit)
+    : d_samples_per_bit(samples_per_bit)
+{
+}
+
+// Somme cumulée interpolée linéairement: intégrale de 0 a pos (pos fractionnaire)
+double biphase_matched_filter::cumulative(float pos) const
+{
+    const int n = static_cast<int>(d_projection.size());
+    if (pos <= 0.0f) {
+        return 0.0;
+    }
+    if (pos >= static_cast<float>(n)) {
+        return d_integral[n];
+    }
+    int i = static_cast<int>(pos);
+    double frac = pos - static_cast<float>(i);
+    return d_integral[i] + frac * d_projection[i];
+}
+
+// Corrélation d'un bit avec le gabarit biphase-L: (1ere moitié) - (2eme moitié)
+// Bit '1' (+1.1 -> -1.1 rad) donne une valeur positive
+float biphase_matched_filter::bit_metric(float start, float period) const
+{
+    double a = cumulative(start);
+    double b = cumulative(start + 0.5f * period);
+    double c = cumulative(start + period);
+    return static_cast<float>((b - a) - (c - b));
+}
+
+bool biphase_matched_filter::demodulate(const gr_complex* samples,
+                                        int num_samples,
+                                        float carrier_phase,
+                                        float coarse_start,
+                                        int num_bits,
+                                        int sync_bits,
+                                        mf_bit_decisions& result)
+{
+    const float T = d_samples_per_bit;
+    const float d = EARLY_LATE_SPACING * T;
+
+    // Fenêtre de recherche: -ACQUISITION_BACKSPAN .. +ACQUISITION_SPAN bits (un saut
+    // de phase dû au bruit déclenche la détection trop tot; a faible cadence le
+    // filtre de décimation adoucit le premier saut et la détection peut arriver
+    // sur la frontière de bit suivante), bornée par la place nécessaire a la
+    // trame + la marge early-late
+    float search_begin = coarse_start - ACQUISITION_BACKSPAN * T;
+    float search_end = std::min(coarse_start + ACQUISITION_SPAN * T,
+                                static_cast<float>(num_samples) - num_bits * T - d);
+    if (num_samples <= 0 || search_end < search_begin) {
+        return false;
+    }
+
+    // ÉTAPE 1: Projection sur l'axe de modulation (une seule passe)
+    // Apres dérotation de la porteuse, la phase ±1.1 rad se retrouve sur Im()
+    const gr_complex derot = std::polar(1.0f, -carrier_phase);
+    d_projection.resize(num_samples);
+    d_integral.resize(num_samples + 1);
+    d_integral[0] = 0.0;
+    double amplitude_sum = 0.0;
+    for (int i = 0; i < num_samples; i++) {
+        gr_complex y = samples[i] * derot;
+        d_projection[i] = y.imag();
+        d_integral[i + 1] = d_integral[i] + y.imag();
+        amplitude_sum += std::abs(y);
+    }
+
+    // Normalisation des décisions souples: réponse idéale d'un bit = sin(1.1)·A·T
+    float mean_amplitude = static_cast<float>(amplitude_sum / num_samples);
+    float norm = std::sin(1.1f) * mean_amplitude * T;
+    if (norm <= 0.0f) {
+        return false;
+    }
+
+    // ÉTAPE 2: Acquisition du timing sur les bits de sync (tous a '1')
+    // Une erreur d'un demi-bit inverse les corrélations et un décalage d'un bit
+    // fait entrer la porteuse ou les '0' du frame sync: on maximise la somme signée
+    float best_start = coarse_start;
+    float best_score = -1e30f;
+    // Pas fractionnaire a faible cadence (au moins ACQUISITION_RESOLUTION positions par bit)
+    int nsync = std::max(1, std::min(sync_bits, num_bits));
+    const float step = std::min(1.0f, T / ACQUISITION_RESOLUTION);
+    for (float t = search_begin; t <= search_end; t += step) {
+        float score = 0.0f;
+        for (int k = 0; k < nsync; k++) {
+            score += bit_metric(t + k * T, T);
+        }
+        if (score > best_score) {
+            best_score = score;
+            best_start = t;
+        }
+    }
+
+    // ÉTAPE 3: Intégrer-et-vider sur tous les bits avec suivi early-late
+    result.hard.resize(num_bits);
+    result.soft.resize(num_bits);
+    result.first_bit_start = best_start;
+
+    float t = best_start;
+    float period = T;
+    for (int k = 0; k < num_bits; k++) {
+        float s = bit_metric(t, period);
+        float early = std::abs(bit_metric(t - d, period));
+        float late = std::abs(bit_metric(t + d, period));
+        float err = (late - early) / (late + early + 1e-12f);
+
+        result.soft[k] = s / norm;
+        result.hard[k] = (s > 0.0f) ? 1 : 0;
+
+        // Boucle du 2nd ordre: la phase suit l'erreur, la période la dérive
+        period += PERIOD_GAIN * err * d;
+        period = std::min(std::max(period, 0.98f * T), 1.02f * T);
+        t += period + TIMING_GAIN * err * d;
+    }
+    result.samples_per_bit = period;
+
+    return true;
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,86 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BIPHASE_MATCHED_FILTER_H
+#define INCLUDED_COSPAS_BIPHASE_MATCHED_FILTER_H
+
+#include <gnuradio/gr_complex.h>
+#include <cstdint>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Décisions bit du filtre adapté biphase-L
+ */
+struct mf_bit_decisions {
+    std::vector<uint8_t> hard;  // Décisions dures (0/1)
+    std::vector<float> soft;    // Corrélation normalisée, > 0 → '1', < 0 → '0'
+    float first_bit_start;      // Position (fractionnaire) du debut du bit 1
+    float samples_per_bit;      // Période bit affinée par la boucle early-late
+};
+
+/*!
+ * \brief Démodulateur intégrer-et-vider (filtre adapté) biphase-L
+ *
+ * Corrèle chaque période bit complète avec le gabarit biphase-L
+ * (+1 sur la premiere moitié, -1 sur la seconde pour un '1') au lieu
+ * d'échantillonner la phase en deux points. Les intégrales sont obtenues
+ * par différence d'une somme cumulée: le coût par bit est constant quelle
+ * que soit la durée d'un bit, et les 144 bits sont évalués d'un seul bloc.
+ *
+ * Le timing est acquis sur les bits de synchronisation (tous a '1') puis
+ * suivi bit a bit par une porte early-late.
+ */
+class biphase_matched_filter
+{
+public:
+    explicit biphase_matched_filter(float samples_per_bit);
+
+    /*!
+     * \brief Démoduler num_bits bits
+     *
+     * \param samples Échantillons corrigés en fréquence
+     * \param num_samples Nombre d'échantillons disponibles
+     * \param carrier_phase Phase de la porteuse non modulée (rad)
+     * \param coarse_start Estimation grossière du debut du bit 1 (échantillons)
+     * \param num_bits Nombre de bits a démoduler
+     * \param sync_bits Nombre de bits de synchronisation ('1') pour l'acquisition
+     * \param result Décisions dures et souples
+     * \return false si le buffer est trop court
+     */
+    bool demodulate(const gr_complex* samples,
+                    int num_samples,
+                    float carrier_phase,
+                    float coarse_start,
+                    int num_bits,
+                    int sync_bits,
+                    mf_bit_decisions& result);
+
+private:
+    float d_samples_per_bit;
+
+    // Buffers réutilisés d'un burst a l'autre (pas d'allocation en régime établi)
+    std::vector<float> d_projection;  // Im(y·e^{-jφ}) : ±sin(1.1) pendant les bits
+    std::vector<double> d_integral;   // Somme cumulée de d_projection
+
+    static constexpr float ACQUISITION_SPAN = 4.0f;      // Recherche du debut jusqu'a +4 bits
+    static constexpr float ACQUISITION_BACKSPAN = 1.5f;  // ... et jusqu'a -1.5 bit
+    static constexpr float ACQUISITION_RESOLUTION = 32.0f; // Positions testées par bit (minimum)
+    static constexpr float EARLY_LATE_SPACING = 0.125f;  // Écart early/late (fraction de bit)
+    static constexpr float TIMING_GAIN = 0.15f;          // Gain proportionnel (phase)
+    static constexpr float PERIOD_GAIN = 0.01f;          // Gain intégral (période)
+
+    double cumulative(float pos) const;
+    float bit_metric(float start, float period) const;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BIPHASE_MATCHED_FILTER_H */
@@ -0,0 +1,1089 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "bpsk_demod_core.h"
+#include <cmath>
+#include <iostream>
+#include <iomanip>
+#include <algorithm>
+#include <numeric>
+
+// Décodeur COSPAS-SARSAT (vérification CRC)
+extern "C" {
+#include "dec406.h"
+}
+
+namespace gr {
+namespace cospas {
+
+bpsk_demod_core::bpsk_demod_core(float sample_rate, bool debug_mode, int working_samples_per_bit)
+    : d_input_rate(sample_rate),
+      d_sample_rate(working_samples_per_bit > 0 ? working_samples_per_bit * BIT_RATE : sample_rate),
+      d_samples_per_bit(working_samples_per_bit > 0 ? working_samples_per_bit
+                                                    : static_cast<int>(sample_rate / BIT_RATE)),
+      d_carrier_samples(static_cast<int>(CARRIER_DURATION * sample_rate)),
+      d_carrier_samples_min(static_cast<int>(0.025f * d_sample_rate)),  // 25ms = 1000 samples a 40 kHz
+      // Fenêtres définies en durée (valeurs historiques a 40 kHz entre parenthèses)
+      d_history_short(std::max(8, static_cast<int>(0.005f * d_sample_rate + 0.5f))),   // 5 ms (200)
+      d_history_long(std::max(32, static_cast<int>(0.125f * d_sample_rate + 0.5f))),   // 125 ms (5000)
+      d_estimate_min(std::max(16, static_cast<int>(0.050f * d_sample_rate + 0.5f))),   // 50 ms (2000)
+      d_phase_avg_len(std::max(4, static_cast<int>(0.00125f * d_sample_rate + 0.5f))), // 1.25 ms (50)
+      d_jump_lag(std::max(4, d_samples_per_bit / 10)),                                 // 1/10 bit (10)
+      d_mu_default(-0.2f * d_samples_per_bit),                                         // (-20)
+      d_mu_limit(0.25f * d_samples_per_bit),                                           // (25)
+      d_state(STATE_CARRIER_SEARCH),
+      d_carrier_count(0),
+      d_carrier_start_idx(0),
+      d_sample_count(0),
+      d_bits_demodulated(0),
+      d_total_bit_count(0),
+      d_preamble_ones(0),
+      d_error_count(0),
+      d_sync_sample_count(0),
+      d_measured_samples_per_bit(static_cast<float>(d_samples_per_bit)),
+      d_last_phase(0.0f),
+      d_phase_avg(0.0f),
+      d_consecutive_carrier(0),
+      d_timing_error(0.0f),
+      d_mu(0.0f),
+      d_omega(static_cast<float>(d_samples_per_bit)),
+      d_pll_integral(0.0f),
+      d_pll_phase(0.0f),
+      d_freq_offset(0.0f),
+      d_phase_correction(0.0f),
+      d_freq_lock(false),
+      d_freq_correction_frozen(false),
+      d_carrier_phase_ref(0.0f),
+      d_use_matched_filter(true),
+      d_matched_filter(static_cast<float>(d_samples_per_bit)),
+      d_cancel(nullptr),
+      d_frame_ready(false),
+      d_debug_mode(debug_mode),
+      d_phase_lpf_state(0.0f)
+{
+    // La récupération de timing accepte des demi-bits jusqu'a 0.7 x spb:
+    // durée de bit mesurée jusqu'a 1.4 x spb (limitée par measured_bit_length())
+    d_bit_buffer.resize(static_cast<int>(std::ceil(1.5f * d_samples_per_bit)) + 1,
+                        std::complex<float>(0, 0));
+    d_phase_history.reserve(d_history_long + 1);
+
+    // Décimation polyphase vers la cadence de travail (rapport rationnel L/M)
+    if (working_samples_per_bit > 0) {
+        long in_rate = std::lround(d_input_rate);
+        long out_rate = std::lround(d_sample_rate);
+        long g = std::gcd(in_rate, out_rate);
+        if (in_rate != out_rate && g > 0) {
+            d_resampler = std::make_unique<polyphase_resampler>(static_cast<int>(out_rate / g),
+                                                                static_cast<int>(in_rate / g));
+        }
+    }
+    d_transition_positions.reserve(30);  // 15 bits = jusqu'à 30 transitions (mi-bit + fin-bit)
+    d_frame.bits.reserve(TOTAL_BITS);
+}
+
+void bpsk_demod_core::append(const gr_complex* samples, int num_samples)
+{
+    d_sample_accumulator.insert(d_sample_accumulator.end(), samples, samples + num_samples);
+}
+
+bool bpsk_demod_core::demodulate_burst(const gr_complex* samples,
+                                       int num_samples,
+                                       bpsk_demod_frame& frame,
+                                       const std::atomic<bool>* cancel)
+{
+    // Réinitialiser le demodulateur pour un nouveau burst
+    reset_demodulator();
+    d_cancel = cancel;
+
+    // AJOUT: Garantir qu'on a assez d'echantillons pour le dernier bit
+    int padding_samples = 2 * d_samples_per_bit; // 200 samples de marge
+
+    // Décimer vers la cadence de travail si nécessaire
+    if (d_resampler) {
+        d_resampler->resample(samples, num_samples, d_work_buffer);
+        samples = d_work_buffer.data();
+        num_samples = static_cast<int>(d_work_buffer.size());
+    }
+
+    // Vider l'accumulateur et copier les echantillons
+    d_sample_accumulator.clear();
+    d_sample_accumulator.insert(d_sample_accumulator.end(), samples, samples + num_samples);
+
+    // Ajouter du padding si nécessaire
+    d_sample_accumulator.insert(d_sample_accumulator.end(), padding_samples, gr_complex(0, 0));
+
+    // Traiter le buffer accumule
+    uint8_t output_buffer[2048];
+    int bytes_produced = process_accumulated_buffer(output_buffer, sizeof(output_buffer));
+    d_cancel = nullptr;
+
+    if (d_debug_mode) {
+        std::cout << "[DEMOD] Burst traite: " << bytes_produced << " bytes decodes, "
+                  << "echantillons d'origine: " << num_samples
+                  << ", apres padding: " << (num_samples + padding_samples) << std::endl;
+    }
+
+    if (!d_frame_ready) {
+        return false;
+    }
+    frame = d_frame;
+    return true;
+}
+
+// Traitement du buffer accumule avec la machine a états
+int bpsk_demod_core::process_accumulated_buffer(uint8_t* out, int max_bytes)
+{
+    int bytes_produced = 0;
+    int samples_processed = 0;
+
+    // AGC: Normalisation automatique basée sur le niveau du signal
+    // Utiliser le 95ème percentile au lieu du max pour robustesse a la saturation
+    std::vector<float> amplitudes;
+    amplitudes.reserve(d_sample_accumulator.size());
+    int saturated_count = 0;
+
+    for (const auto& s : d_sample_accumulator) {
+        float amp = std::abs(s);
+        if (amp > 1.0f) saturated_count++;
+        amplitudes.push_back(amp);
+    }
+
+    std::sort(amplitudes.begin(), amplitudes.end());
+    size_t p95_idx = static_cast<size_t>(amplitudes.size() * 0.95f);
+    float signal_p95 = (p95_idx < amplitudes.size()) ? amplitudes[p95_idx] : amplitudes.back();
+
+    // AGC DÉSACTIVÉ en mode autonome - chaque burst a son propre niveau
+    // Le Router envoie les bursts avec leurs amplitudes originales
+    // L'AGC global sur tout le buffer mélange les niveaux de différents bursts
+    float agc_gain = 1.0f;  // Pas de correction
+
+    /*
+    // AGC conditionnel : uniquement si signal hors de la plage optimale [0.06, 0.40]
+    const float MIN_OPTIMAL = 0.06f;  // En dessous : trop faible
+    const float MAX_OPTIMAL = 0.40f;  // Au dessus : trop fort
+    const float TARGET_LEVEL = 0.20f; // Niveau cible
+
+    if (signal_p95 < MIN_OPTIMAL && signal_p95 > 0.01f) {
+        // Signal trop faible : amplifier
+        agc_gain = TARGET_LEVEL / signal_p95;
+    } else if (signal_p95 > MAX_OPTIMAL) {
+        // Signal trop fort : atténuer
+        agc_gain = TARGET_LEVEL / signal_p95;
+    }
+
+    // Appliquer AGC uniquement si nécessaire
+    if (agc_gain != 1.0f) {
+        for (auto& s : d_sample_accumulator) {
+            s *= agc_gain;
+        }
+    }
+    */
+
+    // Calculer seuil adaptatif de variance de phase basé sur le niveau du signal
+    // Signal fort (p95 >= 0.1) : seuil strict 0.15 rad (peu de bruit)
+    // Signal faible (p95 <= 0.02) : seuil relaxé 0.7 rad (beaucoup de bruit)
+    // Interpolation linéaire entre les deux pour s'adapter automatiquement
+    float phase_variance_threshold;
+    if (d_hypothesis.phase_variance_threshold >= 0.0f) {
+        phase_variance_threshold = d_hypothesis.phase_variance_threshold;  // Imposé par l'hypothèse
+    } else if (signal_p95 >= 0.1f) {
+        phase_variance_threshold = 0.15f;  // Signal fort (local)
+    } else if (signal_p95 <= 0.02f) {
+        phase_variance_threshold = 0.7f;   // Signal très faible (distant)
+    } else {
+        // Interpolation linéaire entre 0.02 et 0.1
+        float ratio = (signal_p95 - 0.02f) / (0.1f - 0.02f);
+        phase_variance_threshold = 0.7f - ratio * (0.7f - 0.15f);
+    }
+
+    if (d_debug_mode) {
+        // Compter combien d'echantillons sont > 0.05 apres AGC
+        int strong_samples = 0;
+        for (const auto& s : d_sample_accumulator) {
+            if (std::abs(s) > 0.05f) strong_samples++;
+        }
+        std::cout << "[DEBUG] process_accumulated_buffer(): " << d_sample_accumulator.size()
+                  << " echantillons, " << strong_samples << " > 0.05"
+                  << " | AGC: p95=" << signal_p95 << ", gain=" << agc_gain
+                  << ", saturated=" << saturated_count
+                  << ", phase_var_threshold=" << phase_variance_threshold << " rad" << std::endl;
+    }
+
+    d_frame_ready = false;
+
+    // Traiter les echantillons accumules avec la machine a états
+    while (samples_processed < d_sample_accumulator.size() && bytes_produced < max_bytes && 
+       d_total_bit_count < TOTAL_BITS) {
+        // Abandon si une autre hypothèse a deja décodé le burst
+        if (d_cancel && (samples_processed & 1023) == 0 &&
+            d_cancel->load(std::memory_order_relaxed)) {
+            break;
+        }
+
+        gr_complex sample = d_sample_accumulator[samples_processed++];
+
+        // Appliquer la correction de frequence si active
+        sample = apply_freq_correction(sample);
+
+        float phase = compute_phase(sample);
+
+        switch (d_state) {
+            case STATE_CARRIER_SEARCH:
+                // Debug amplitude et phase apres correction
+                if (d_debug_mode && samples_processed == 5000) {
+                    std::cout << "[DEBUG] Sample #5000: |sample|=" << std::abs(sample);
+                }
+                // Accumuler la phase de TOUS les échantillons (comme dec406_V7)
+                // Ne pas filtrer par amplitude, le signal faible doit être traité
+                {
+                    // Accumuler la phase
+                    d_phase_history.push_back(phase);
+                    size_t max_history = d_freq_lock ? d_history_short : d_history_long;
+                    if (d_phase_history.size() > max_history) {
+                        d_phase_history.erase(d_phase_history.begin());
+                    }
+
+                    // ÉTAPE 1: Détecter la porteuse AVANT d'estimer la frequence
+                    // Porteuse = différences de phase constantes (frequence constante)
+                    // BPSK = différences de phase variables (sauts ±1.1 rad)
+                    if (!d_freq_lock && d_phase_history.size() >= d_history_short) {
+                        // Calculer la variance des différences de phase
+                        float diff_sum = 0, diff_sq_sum = 0;
+                        int count = d_history_short - 1;  // 200 echantillons = 199 différences
+                        for (int i = d_phase_history.size() - d_history_short; i < (int)d_phase_history.size() - 1; i++) {
+                            float diff = d_phase_history[i+1] - d_phase_history[i];
+                            // Normaliser entre -π et +π
+                            if (diff > M_PI) diff -= 2.0f * M_PI;
+                            else if (diff < -M_PI) diff += 2.0f * M_PI;
+                            diff_sum += diff;
+                            diff_sq_sum += diff * diff;
+                        }
+                        float diff_mean = diff_sum / count;
+                        float diff_var = diff_sq_sum / count - diff_mean * diff_mean;
+                        if (diff_var < 0) diff_var = 0;
+                        float diff_std = std::sqrt(diff_var);
+
+                        // Seuil adaptatif calculé selon le niveau du signal
+                        // Signal fort : seuil strict (0.15 rad)
+                        // Signal faible : seuil relaxé (0.7 rad)
+                        if (diff_std > phase_variance_threshold) {
+                            d_phase_history.clear();
+                            if (d_debug_mode && samples_processed % 10000 == 0) {
+                                std::cout << "[DEBUG] Phase diff variance too high (" << diff_std
+                                          << " rad) - not carrier, resetting" << std::endl;
+                            }
+                        }
+                    }
+
+                    // ÉTAPE 2: Une fois 5000 echantillons de porteuse accumules, estimer la frequence
+                    if (!d_freq_lock && d_phase_history.size() >= d_history_long) {
+                        if (d_debug_mode) {
+                            std::cout << "[DEBUG] 5000 carrier samples accumulated, estimating freq" << std::endl;
+                        }
+                        estimate_freq_offset();
+                    }
+
+                    // APRES estimation, tester la porteuse
+                    // IMPORTANT: Ne pas tester la porteuse AVANT d'avoir freq_lock
+                    // Sinon la phase tourne et on ne détecte jamais de carrier stable
+                    if (d_freq_lock && detect_carrier(phase)) {
+                        d_carrier_count++;
+                        d_consecutive_carrier++;
+
+                        // Utiliser un seuil plus bas avec correction de frequence (convergence progressive)
+                        int carrier_threshold = d_freq_lock ? d_carrier_samples_min : d_carrier_samples;
+
+                        if (d_debug_mode && d_consecutive_carrier % 1000 == 0) {
+                            std::cout << "[DEBUG] Carrier detected: freq_lock=" << d_freq_lock
+                                      << ", consecutive=" << d_consecutive_carrier
+                                      <<", threshold=" << (d_freq_lock ? d_carrier_samples_min : d_carrier_samples)
+                                      <<", << detect_carrier_result=" << detect_carrier(phase) << std::endl;
+                        }
+
+                        if (d_consecutive_carrier >= carrier_threshold) {
+                            // Porteuse detectee : mémoriser la position de debut et chercher le saut de phase
+                            d_state = STATE_CARRIER_TRACKING;
+                            d_carrier_start_idx = samples_processed - d_consecutive_carrier;
+
+                            // Calculer la phase moyenne sur les 50 DERNIERS echantillons
+                            d_phase_avg = 0.0f;
+                            int count = std::min(d_phase_avg_len, (int)d_phase_history.size());
+                            for (int i = d_phase_history.size() - count; i < d_phase_history.size(); i++) {
+                                d_phase_avg += d_phase_history[i];
+                            }
+                            d_phase_avg /= count;
+
+                            if (d_debug_mode) {
+                                std::cout << "[COSPAS] Porteuse detectee apres " << d_consecutive_carrier
+                                          << " echantillons - phase moyenne: "
+                                          << d_phase_avg << " rad" << std::endl;
+                                std::cout << "[COSPAS] Position de debut: " << d_carrier_start_idx << std::endl;
+                            }
+                        }
+                    } else {
+                        if (d_debug_mode && d_consecutive_carrier > 3000) {
+                            // Calculer la phase moyenne récente pour debug
+                            float phase_sum = 0;
+                            int count = std::min(d_phase_avg_len, (int)d_phase_history.size());
+                            for (int i = d_phase_history.size() - count; i < d_phase_history.size(); i++) {
+                                phase_sum += d_phase_history[i];
+                            }
+                            float phase_mean = phase_sum / count;
+                            float diff = compute_phase_diff(phase_mean, phase);
+                            float abs_diff = std::abs(diff);
+
+                            std::cout << "[DEBUG] Carrier lost at sample " << samples_processed
+                                      << ", consecutive was " << d_consecutive_carrier
+                                      << ", phase=" << phase << " rad, phase_mean=" << phase_mean
+                                      << " rad, diff=" << abs_diff << " rad (threshold=0.5)" << std::endl;
+                        }
+                        d_consecutive_carrier = 0;
+                        // NE PAS vider l'historique une fois qu'on a verrouillé
+                    }
+                }
+                break;
+
+            case STATE_CARRIER_TRACKING:
+                {
+                    // Continuer à accumuler la phase pour tracking (TOUS les échantillons)
+                    d_phase_history.push_back(phase);
+                    if (d_phase_history.size() > d_history_short) {
+                        d_phase_history.erase(d_phase_history.begin());
+                    }
+
+                    // Correction adaptative DÉSACTIVÉE
+                    // L'estimation sur 5000 echantillons (125ms) de porteuse est suffisante
+                    // Les corrections adaptatives introduisent des erreurs car elles modifient
+                    // l'offset basé sur des données bruitées pendant le tracking
+                    /*
+                    int correction_period = d_freq_correction_frozen ? 500 : 984;
+                    if (d_freq_lock && samples_processed % correction_period == 0 && d_phase_history.size() >= 200) {
+                        // Régression linéaire sur les 200 derniers echantillons
+                        float sum_x = 0.0f, sum_y = 0.0f, sum_xy = 0.0f, sum_x2 = 0.0f;
+                        int n = 200;
+                        for (int i = 0; i < n; i++) {
+                            float x = (float)i;
+                            float y = d_phase_history[i];
+                            sum_x += x;
+                            sum_y += y;
+                            sum_xy += x * y;
+                            sum_x2 += x * x;
+                        }
+
+                        // Pente = dérive en rad/échantillon
+                        float slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x);
+
+                        // Convertir en Hz : dérive_hz = (slope * sample_rate) / (2 * PI)
+                        float drift_hz = (slope * d_sample_rate) / (2.0f * M_PI);
+
+                        // Ajuster la correction de frequence
+                        d_freq_offset += drift_hz;
+
+                        if (d_debug_mode) {
+                            std::cout << "[COSPAS] Correction adaptative: drift=" << drift_hz
+                                      << " Hz, offset total=" << d_freq_offset << " Hz" << std::endl;
+                        }
+                    }
+                    */
+
+                    // Détecter un saut de phase BRUTAL (pas une dérive progressive)
+                    // Comparer avec la phase il y a 1/10 de bit (10 echantillons a 40 kHz) pour différencier saut vs dérive
+                    float phase_jump = 0.0f;
+                    if (d_phase_history.size() >= d_jump_lag) {
+                        float phase_lag_ago = d_phase_history[d_phase_history.size() - d_jump_lag];
+                        phase_jump = phase - phase_lag_ago;
+                        // Normaliser le saut entre -π et +π
+                        while (phase_jump > M_PI) phase_jump -= 2.0f * M_PI;
+                        while (phase_jump < -M_PI) phase_jump += 2.0f * M_PI;
+                    }
+
+                    if (d_debug_mode && samples_processed % 500 == 0) {
+                        int carrier_samples_so_far = samples_processed - d_carrier_start_idx;
+                        std::cout << "[DEBUG] STATE_CARRIER_TRACKING: carrier_samples=" << carrier_samples_so_far
+                                  << ", phase=" << phase
+                                  << ", phase_jump(10samp)=" << phase_jump << " rad" << std::endl;
+                    }
+
+                    // Chercher un saut de phase BRUTAL > 1.0 rad en 1/10 de bit (transition 0 -> +1.1 rad)
+                    if (d_phase_history.size() >= d_jump_lag && phase_jump > 1.0f) {
+                        // Geler la correction de frequence : fin de la porteuse, debut BPSK
+                        if (!d_freq_correction_frozen) {
+                            d_freq_correction_frozen = true;
+                            if (d_debug_mode) {
+                                std::cout << "[COSPAS] Saut de phase detecte: offset=" << d_freq_offset
+                                          << " Hz. Correction gelee: " << (-d_freq_offset) << " Hz" << std::endl;
+                            }
+                        }
+
+                        if (d_debug_mode) {
+                            std::cout << "[COSPAS] Transition vers demodulation BPSK" << std::endl;
+                        }
+
+                        // Filtre adapté: toute la trame est démodulée d'un bloc
+                        // a partir des echantillons deja accumules
+                        if (d_use_matched_filter && bytes_produced + TOTAL_BITS <= max_bytes) {
+                            int frame_bits = demodulate_matched_filter(samples_processed - 1,
+                                                                       out + bytes_produced);
+                            if (frame_bits > 0) {
+                                bytes_produced += frame_bits;
+                                complete_frame(out + bytes_produced - frame_bits, frame_bits,
+                                               d_mf_decisions.soft.data());
+
+                                // Meme politique que la machine a états: ignorer le reste
+                                reset_demodulator();
+                                d_sample_accumulator.clear();
+                                samples_processed = 0;
+                            } else {
+                                reset_demodulator();
+                            }
+                            break;
+                        }
+
+                        // Passer directement a la demodulation sans REWIND
+                        d_state = STATE_BIT_SYNC;
+                        d_sample_count = 0;
+                        d_total_bit_count = 0;
+                        d_preamble_ones = 0;
+                        d_bits_demodulated = 0;
+                        d_error_count = 0;
+                        std::fill(d_bit_buffer.begin(), d_bit_buffer.end(), std::complex<float>(0, 0));
+
+                        // Initialiser la PLL avec la phase actuelle (apres le saut BPSK)
+                        d_pll_phase = phase;
+                        d_pll_integral = 0.0f;
+                    }
+                }
+                break;
+                
+            case STATE_BIT_SYNC:
+                if (d_sample_count < d_samples_per_bit) {
+                    // Stocker l'échantillon sans correction de phase
+                    // La correction de frequence est deja appliquée en amont
+                    d_bit_buffer[d_sample_count++] = sample;
+
+                    // Detection des transitions pour récupération de timing
+                    // Manchester '1': transition phase +1.1 -> -1.1 au milieu du bit
+                    d_sync_sample_count++;
+                    if (d_sync_sample_count > 1) {
+                        // Détecter transition de phase significative (>1.5 rad)
+                        float phase_diff = compute_phase_diff(d_last_phase, phase);
+                        if (std::abs(phase_diff) > 1.5f) {
+                            d_transition_positions.push_back(d_sync_sample_count);
+                        }
+                    }
+                }
+
+                if (d_sample_count >= d_samples_per_bit) {
+                    char bit = decode_bit(d_bit_buffer.data(), d_samples_per_bit);
+                    d_total_bit_count++;
+
+                    // Produire le bit en sortie
+                    if (bit == '0' || bit == '1') {
+                        uint8_t bit_value = (bit == '1') ? 1 : 0;
+                        out[bytes_produced++] = bit_value;
+                        d_bits_demodulated++;
+
+                        if (bit == '1') {
+                            d_preamble_ones++;
+                        }
+                    }
+
+                    if (d_total_bit_count >= BIT_SYNC_BITS) {
+                        // Valider bit sync: tolerer max 2 erreurs sur 15 bits
+                        if (d_preamble_ones >= 13) {
+                            // Calculer le timing réel a partir des transitions detectees
+                            if (d_transition_positions.size() >= 4) {
+                                // Calculer intervalles entre transitions consécutives
+                                float interval_sum = 0;
+                                int interval_count = 0;
+                                for (size_t i = 1; i < d_transition_positions.size(); i++) {
+                                    int interval = d_transition_positions[i] - d_transition_positions[i-1];
+                                    // Intervalle attendu: 50 samples (demi-bit)
+                                    if (interval > 0.3f * d_samples_per_bit && interval < 0.7f * d_samples_per_bit) {
+                                        interval_sum += interval;
+                                        interval_count++;
+                                    }
+                                }
+                                if (interval_count > 0) {
+                                    float avg_half_bit = interval_sum / interval_count;
+                                    d_measured_samples_per_bit = avg_half_bit * 2.0f;
+
+                                    if (d_debug_mode) {
+                                        std::cout << "[COSPAS] Timing recovery: " << d_transition_positions.size()
+                                                  << " transitions, interval moyen=" << avg_half_bit
+                                                  << " samples, samples/bit=" << d_measured_samples_per_bit
+                                                  << " (nominal=" << d_samples_per_bit << ")" << std::endl;
+                                    }
+                                }
+                            }
+
+                            d_state = STATE_FRAME_SYNC;
+
+                            if (d_debug_mode) {
+                                std::cout << "[COSPAS] Bit sync complet (" << d_preamble_ones
+                                          << " '1' sur " << BIT_SYNC_BITS << " bits)" << std::endl;
+                            }
+                        } else {
+                            // Bit sync invalide: trop d'erreurs
+                            if (d_debug_mode) {
+                                std::cout << "[COSPAS] Bit sync FAIL (" << d_preamble_ones
+                                          << " '1' sur " << BIT_SYNC_BITS << " bits) - reset" << std::endl;
+                            }
+                            reset_demodulator();
+                        }
+                    }
+
+                    d_sample_count = 0;
+                }
+                break;
+
+            case STATE_FRAME_SYNC:
+            {
+                // Utiliser le timing mesure au lieu du timing nominal
+                int samples_per_bit_actual = measured_bit_length();
+
+                if (d_sample_count < samples_per_bit_actual) {
+                    d_bit_buffer[d_sample_count++] = sample;
+                }
+
+                if (d_sample_count >= samples_per_bit_actual) {
+                    char bit = decode_bit(d_bit_buffer.data(), samples_per_bit_actual);
+                    d_total_bit_count++;
+
+                    // Tracking adaptatif des transitions Manchester
+                    int detected_position = detect_transition_position(d_bit_buffer.data(), samples_per_bit_actual);
+                    int expected_position = samples_per_bit_actual / 2;
+                    d_timing_error = static_cast<float>(detected_position - expected_position);
+
+                    // Tracking adaptatif avec d_mu initialisé à -20
+                    // Gain modéré pour affinage continu
+                    float gain = 0.2f;  // Gain pour phase de sync
+                    d_mu += d_timing_error * gain;
+
+                    // Borner d_mu pour eviter derive excessive
+                    if (d_mu > d_mu_limit) d_mu = d_mu_limit;
+                    if (d_mu < -d_mu_limit) d_mu = -d_mu_limit;
+
+                    // Produire le bit en sortie
+                    if (bit == '0' || bit == '1') {
+                        uint8_t bit_value = (bit == '1') ? 1 : 0;
+                        out[bytes_produced++] = bit_value;
+                        d_bits_demodulated++;
+                    }
+
+                    if (d_total_bit_count >= BIT_SYNC_BITS + FRAME_SYNC_BITS) {
+                        d_state = STATE_MESSAGE;
+                        // Note: trame signalée APRES trame complète (complete_frame)
+
+                        if (d_debug_mode) {
+                            std::cout << "[DEBUG] Transition to STATE_MESSAGE at bit " << d_total_bit_count 
+                                      << " (SYNC: " << BIT_SYNC_BITS << " + FRAME: " << FRAME_SYNC_BITS << ")" 
+                                      << std::endl;
+                                      
+                            std::cout << "[DEBUG] Expected message bits: " << MESSAGE_BITS 
+                                      << " (from bit #" << (d_total_bit_count + 1) 
+                                      << " to #" << (d_total_bit_count + MESSAGE_BITS) << ")" << std::endl;
+                        }
+                    }
+
+                    d_sample_count = 0;
+                }
+            }
+                break;
+
+            case STATE_MESSAGE:
+            {
+                // Utiliser le timing mesure pour les bits de message aussi
+                int samples_per_bit_msg = measured_bit_length();
+
+                if (d_sample_count < samples_per_bit_msg) {
+                    d_bit_buffer[d_sample_count++] = sample;
+                }
+
+                if (d_sample_count >= samples_per_bit_msg) {
+                    char bit = decode_bit(d_bit_buffer.data(), samples_per_bit_msg);
+                    d_total_bit_count++;
+
+                    // Tracking adaptatif des transitions Manchester (continue sur message)
+                    int detected_position = detect_transition_position(d_bit_buffer.data(), samples_per_bit_msg);
+                    int expected_position = samples_per_bit_msg / 2;
+                    d_timing_error = static_cast<float>(detected_position - expected_position);
+
+                    // Gain leger pour phase de message (tracking fin)
+                    float gain = 0.1f;  // Reduit a 0.1 pour stabilite en phase message
+                    d_mu += d_timing_error * gain;
+
+                    // Borner d_mu pour eviter derive excessive
+                    if (d_mu > d_mu_limit) d_mu = d_mu_limit;
+                    if (d_mu < -d_mu_limit) d_mu = -d_mu_limit;
+
+                    // Debug timing tracking sur derniers bits (desactive pour production)
+                    // if (d_total_bit_count == 143 || d_total_bit_count == 144) {
+                    //     std::cout << "[DEBUG BIT " << d_total_bit_count << "] "
+                    //               << "bit='" << bit << "'"
+                    //               << ", detected_pos=" << detected_position
+                    //               << ", expected_pos=" << expected_position
+                    //               << ", timing_error=" << d_timing_error
+                    //               << ", d_mu=" << d_mu << std::endl;
+                    // }
+
+                    // Debug message bits (désactivé - trop verbeux)
+                    // if (d_debug_mode) {
+                    //     int message_bit_index = d_total_bit_count - BIT_SYNC_BITS - FRAME_SYNC_BITS;
+                    //     std::cout << "[DEBUG] Message Bit #" << message_bit_index
+                    //               <<"/" << MESSAGE_BITS
+                    //               << " (global: " << d_total_bit_count << "/" << TOTAL_BITS << ")"
+                    //               << "=" << bit << std::endl;
+                    // }
+
+                    if (bit == '0' || bit == '1') {
+                        uint8_t bit_value = (bit == '1') ? 1 : 0;
+                        out[bytes_produced++] = bit_value;
+                        d_bits_demodulated++;
+                    }
+                    
+                    d_sample_count = 0;
+                    
+                    if (d_total_bit_count >= TOTAL_BITS) {
+                        // Les bits sont dans out[bytes_produced - d_bits_demodulated ... bytes_produced - 1]
+                        complete_frame(out + bytes_produced - d_bits_demodulated, d_bits_demodulated);
+
+                        reset_demodulator();
+                        // VIDER l'accumulateur apres une trame complète
+                        // Les echantillons restants sont probablement du burst suivant
+                        // mais au milieu (BPSK), pas au debut (porteuse)
+                        // Mieux vaut les ignorer et attendre le prochain burst complet
+                        d_sample_accumulator.clear();
+                        samples_processed = 0;  // Rien a effacer, tout est vidé
+                        break;
+                    }
+                }
+            }
+                break;
+        }
+
+        d_last_phase = phase;
+    }
+
+    // Nettoyer les echantillons traites du buffer d'accumulation
+    if (d_state == STATE_CARRIER_SEARCH || (samples_processed > 0 && d_total_bit_count >= TOTAL_BITS)) {
+        d_sample_accumulator.erase(
+            d_sample_accumulator.begin(),
+            d_sample_accumulator.begin() + samples_processed
+        );
+    }
+
+    if (d_debug_mode) {
+        std::cout << "[DEBUG] process_accumulated_buffer() end: samples_processed=" << samples_processed
+                  << ", phase_history.size()=" << d_phase_history.size()
+                  << ", freq_lock=" << d_freq_lock << std::endl;
+    }
+
+    return bytes_produced;
+}
+
+// Démodulation de la trame complète par filtre adapté
+// jump_idx: index (dans l'accumulateur) de l'échantillon ou le saut BPSK a été détecté
+// Retourne le nombre de bits écrits dans out (0 si échec)
+int bpsk_demod_core::demodulate_matched_filter(int jump_idx, uint8_t* out)
+{
+    // Fenêtre: porteuse de référence (25 ms) + un bit de marge avant le saut
+    int first = std::max(0, jump_idx - d_samples_per_bit - d_carrier_samples_min);
+    int num_samples = static_cast<int>(d_sample_accumulator.size()) - first;
+    if (num_samples <= 0) {
+        return 0;
+    }
+
+    // Reconstituer les echantillons corrigés en fréquence
+    // La correction est une rampe de phase: on la reprend a partir de la valeur courante
+    // (d_phase_correction est la phase qui sera appliquée a l'échantillon jump_idx + 1)
+    double step = d_freq_lock ? 2.0 * M_PI * d_freq_offset / d_sample_rate : 0.0;
+    double phase_next = d_freq_lock ? d_phase_correction : 0.0;
+    d_mf_buffer.resize(num_samples);
+    for (int i = 0; i < num_samples; i++) {
+        int idx = first + i;
+        double correction = phase_next - step * (jump_idx + 1 - idx);
+        d_mf_buffer[i] = d_sample_accumulator[idx] *
+                         gr_complex(std::cos(correction), -std::sin(correction));
+    }
+
+    // Phase de la porteuse: moyenne vectorielle (robuste au repliement ±π)
+    int carrier_end = std::min(num_samples, std::max(1, jump_idx - first - d_samples_per_bit));
+    gr_complex carrier_sum(0.0f, 0.0f);
+    for (int i = 0; i < carrier_end; i++) {
+        carrier_sum += d_mf_buffer[i];
+    }
+    float carrier_phase = std::arg(carrier_sum);
+
+    float coarse_start = static_cast<float>(jump_idx - first) + d_hypothesis.timing_offset;
+    if (!d_matched_filter.demodulate(d_mf_buffer.data(), num_samples, carrier_phase,
+                                     coarse_start, TOTAL_BITS, BIT_SYNC_BITS,
+                                     d_mf_decisions)) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS] Filtre adapte: burst trop court ("
+                      << num_samples << " echantillons)" << std::endl;
+        }
+        return 0;
+    }
+
+    // Valider bit sync: tolerer max 2 erreurs sur 15 bits (meme critère que la machine a états)
+    int preamble_ones = 0;
+    for (int k = 0; k < BIT_SYNC_BITS; k++) {
+        preamble_ones += d_mf_decisions.hard[k];
+    }
+    if (preamble_ones < 13) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS] Bit sync FAIL (" << preamble_ones
+                      << " '1' sur " << BIT_SYNC_BITS << " bits) - reset" << std::endl;
+        }
+        return 0;
+    }
+
+    std::copy(d_mf_decisions.hard.begin(), d_mf_decisions.hard.end(), out);
+    d_total_bit_count = TOTAL_BITS;
+    d_bits_demodulated = TOTAL_BITS;
+    d_preamble_ones = preamble_ones;
+    d_measured_samples_per_bit = d_mf_decisions.samples_per_bit;
+
+    if (d_debug_mode) {
+        float min_soft = 1e9f;
+        for (float v : d_mf_decisions.soft) {
+            min_soft = std::min(min_soft, std::abs(v));
+        }
+        std::cout << "[COSPAS] Filtre adapte: " << TOTAL_BITS << " bits, debut="
+                  << (first + d_mf_decisions.first_bit_start)
+                  << ", samples/bit=" << d_mf_decisions.samples_per_bit
+                  << ", phase porteuse=" << carrier_phase
+                  << " rad, confiance min=" << min_soft << std::endl;
+    }
+
+    return TOTAL_BITS;
+}
+
+// Trame complète: mémoriser les bits et l'état de la démodulation, vérifier les CRC
+void bpsk_demod_core::complete_frame(const uint8_t* bits, int num_bits, const float* soft)
+{
+    d_frame.bits.assign(bits, bits + num_bits);
+    if (soft) {
+        d_frame.soft.assign(soft, soft + num_bits);
+    } else {
+        d_frame.soft.clear();
+    }
+    d_frame.freq_offset = d_freq_offset;
+    d_frame.samples_per_bit = d_measured_samples_per_bit;
+    d_frame.crc_ok = check_crc_1g(bits, num_bits) != 0;
+    d_frame_ready = true;
+}
+
+// Durée de bit mesurée arrondie, bornée a la taille du tampon de bit
+int bpsk_demod_core::measured_bit_length() const
+{
+    int length = static_cast<int>(d_measured_samples_per_bit + 0.5f);
+    return std::max(1, std::min(length, static_cast<int>(d_bit_buffer.size())));
+}
+
+// Calcul de phase (inchangé mais garanti stable)
+float bpsk_demod_core::compute_phase(std::complex<float> sample)
+{
+    return std::arg(sample);
+}
+
+float bpsk_demod_core::normalize_phase(float phase)
+{
+    phase = std::fmod(phase, 2.0f * M_PI);
+    if (phase > M_PI) return phase - 2.0f * M_PI;
+    if (phase < -M_PI) return phase + 2.0f * M_PI;
+    return phase;
+}
+
+float bpsk_demod_core::compute_phase_diff(float phase1, float phase2)
+{
+    float diff = phase2 - phase1;
+    return normalize_phase(diff);
+}
+
+bool bpsk_demod_core::detect_carrier(float phase)
+{
+    // Si la correction est active, la phase peut dériver - utiliser une condition différente
+    if (d_freq_lock) {
+        // Après correction de frequence, la phase devrait être relativement stable
+        // mais peut avoir une légère dérive résiduelle
+        // Utiliser une fenêtre de moyenne plus grande et une tolérance adaptative
+        
+        //if (d_phase_history.size() < 50) {
+            return true;  // Pas assez d'historique, accepter
+        }
+
+      /*  // Calculer la dérive moyenne récente
+        float recent_drift = 0.0f;
+        int window_size = std::min(100, (int)d_phase_history.size());
+        for (int i = d_phase_history.size() - window_size; i < (int)d_phase_history.size() - 1; i++) {
+            float diff = d_phase_history[i+1] - d_phase_history[i];
+            // Normaliser entre -π et +π
+            if (diff > M_PI) diff -= 2.0f * M_PI;
+            else if (diff < -M_PI) diff += 2.0f * M_PI;
+            recent_drift += diff;
+        }
+        recent_drift /= (window_size - 1);
+        
+        // Calculer la variance autour de cette dérive
+        float variance = 0.0f;
+        for (int i = d_phase_history.size() - window_size; i < (int)d_phase_history.size(); i++) {
+            float expected = d_phase_history[d_phase_history.size() - window_size] + 
+                           recent_drift * (i - (d_phase_history.size() - window_size));
+            float diff = d_phase_history[i] - expected;
+            // Normaliser
+            if (diff > M_PI) diff -= 2.0f * M_PI;
+            else if (diff < -M_PI) diff += 2.0f * M_PI;
+            variance += diff * diff;
+        }
+        variance /= window_size;
+        float stddev = std::sqrt(variance);
+        
+        // Porteuse = faible variance autour d'une dérive linéaire
+        // BPSK = forte variance (sauts de phase)
+        return stddev < 0.5f;  // Seuil augmenté pour la dérive résiduelle
+        
+    } else {*/
+        // Mode sans correction : phase proche de 0
+        float normalized = normalize_phase(phase);
+        float threshold = CARRIER_THRESHOLD;
+        return std::abs(normalized) < threshold;
+//    }
+}
+
+// Timing error DÉSACTIVÉ (retourne toujours 0)
+// Correction de frequence automatique
+gr_complex bpsk_demod_core::apply_freq_correction(gr_complex sample)
+{
+    if (!d_freq_lock) {
+        return sample;  // Pas encore de correction
+    }
+
+    // Appliquer la correction: sample * e^(-j*phase_correction)
+    // phase_correction augmente de 2*pi*freq_offset/sample_rate a chaque échantillon
+    float correction_i = std::cos(-d_phase_correction);
+    float correction_q = std::sin(-d_phase_correction);
+    gr_complex correction(correction_i, correction_q);
+
+    // Avancer la phase de correction
+    d_phase_correction += 2.0f * M_PI * d_freq_offset / d_sample_rate;
+
+    // Normaliser la phase entre -π et +π
+    while (d_phase_correction > M_PI) {
+        d_phase_correction -= 2.0f * M_PI;
+    }
+    while (d_phase_correction < -M_PI) {
+        d_phase_correction += 2.0f * M_PI;
+    }
+
+    return sample * correction;
+}
+
+void bpsk_demod_core::estimate_freq_offset()
+{
+    // Estimer l'offset de frequence a partir de l'historique de phase
+    // Utiliser au minimum 2000 echantillons (50ms) pour une estimation précise
+    if (d_phase_history.size() < d_estimate_min) {
+        return;  // Pas assez d'echantillons
+    }
+
+    // Calculer la dérivée moyenne de la phase (= frequence)
+    float phase_diff_sum = 0.0f;
+    for (size_t i = 1; i < d_phase_history.size(); i++) {
+        float diff = d_phase_history[i] - d_phase_history[i-1];
+        // Unwrap: gérer les sauts -π/+π
+        if (diff > M_PI) {
+            diff -= 2.0f * M_PI;
+        } else if (diff < -M_PI) {
+            diff += 2.0f * M_PI;
+        }
+        phase_diff_sum += diff;
+    }
+
+    float phase_diff_avg = phase_diff_sum / (d_phase_history.size() - 1);
+
+    // VÉRIFIER QUE C'EST BIEN UNE PORTEUSE (phase linéaire, pas escalier BPSK)
+    // Calculer l'erreur résiduelle : écart entre phase réelle et droite ajustée
+    float phase_unwrapped = d_phase_history[0];
+    float residual_sq_sum = 0.0f;
+    for (size_t i = 1; i < d_phase_history.size(); i++) {
+        float diff = d_phase_history[i] - d_phase_history[i-1];
+        if (diff > M_PI) diff -= 2.0f * M_PI;
+        else if (diff < -M_PI) diff += 2.0f * M_PI;
+        phase_unwrapped += diff;
+
+        // Phase attendue si linéaire : phase_history[0] + i * slope
+        float expected = d_phase_history[0] + i * phase_diff_avg;
+        float residual = phase_unwrapped - expected;
+        residual_sq_sum += residual * residual;
+    }
+    float residual_std = std::sqrt(residual_sq_sum / (d_phase_history.size() - 1));
+
+    if (d_debug_mode) {
+        std::cout << "[DEBUG] estimate_freq_offset(): slope=" << phase_diff_avg
+                  << " rad/sample, residual_std=" << residual_std << " rad" << std::endl;
+    }
+
+    // Si résidu trop grand, ce n'est pas une porteuse (c'est du BPSK avec marches)
+    // Porteuse : résidu < 0.3 rad (juste du bruit)
+    // BPSK : résidu > 1 rad (les marches ±2.2 rad créent des écarts)
+    // Une hypothèse a seuil de variance relaxé tolère le même bruit de phase ici
+    float residual_threshold = std::max(0.3f, d_hypothesis.phase_variance_threshold);
+    if (residual_std > residual_threshold) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS] Residu trop grand (" << residual_std
+                      << " rad) - pas une porteuse linéaire, probablement BPSK" << std::endl;
+        }
+        // Vider l'historique et recommencer
+        d_phase_history.clear();
+        return;
+    }
+
+    // Convertir en Hz (plus le décalage de l'hypothèse courante)
+    d_freq_offset = phase_diff_avg / (2.0f * M_PI) * d_sample_rate + d_hypothesis.freq_offset_hz;
+
+    if (d_debug_mode) {
+        std::cout << "[DEBUG] estimate_freq_offset(): offset=" << d_freq_offset
+                  << " Hz, |offset|=" << std::abs(d_freq_offset) << std::endl;
+    }
+
+    // Verrouiller si l'offset est significatif (> 10 Hz)
+    if (std::abs(d_freq_offset) > 10.0f) {
+        d_freq_lock = true;
+        d_phase_correction = 0.0f;
+        d_carrier_phase_ref = 0.0f;  // Sera calculé apres quelques echantillons corrigés
+
+        if (d_debug_mode) {
+            std::cout << "[COSPAS] Offset de frequence detecte: "
+                      << d_freq_offset << " Hz - correction activée" << std::endl;
+            std::cout << "[COSPAS] Phase de reference sera calculee apres correction" << std::endl;
+        }
+    } else if (d_debug_mode) {
+        std::cout << "[DEBUG] Offset trop faible (" << d_freq_offset
+                  << " Hz) - pas de verrouillage" << std::endl;
+    }
+}
+
+// Detecte la position exacte de la transition Manchester dans un bit
+// Retourne la position du saut de phase (devrait etre proche de num_samples/2)
+int bpsk_demod_core::detect_transition_position(const std::complex<float>* samples, int num_samples)
+{
+    float max_phase_diff = 0.0f;
+    int best_position = num_samples / 2;  // Position par defaut au centre
+
+    // Chercher autour du centre prevu (+/- 40% = large fenetre pour gros decalages)
+    // Evite de detecter les bords du bit (debut ou fin) qui ne sont pas la transition Manchester
+    int center = num_samples / 2;
+    int window = num_samples * 2 / 5;  // +/- 40%
+    int search_start = center - window;
+    int search_end = center + window;
+
+    if (search_start < 2) search_start = 2;
+    if (search_end > num_samples - 2) search_end = num_samples - 2;
+
+    // Chercher le saut de phase le plus abrupt (gradient maximum)
+    for (int i = search_start; i < search_end; i++) {
+        float phase_before = std::arg(samples[i - 1]);
+        float phase_after = std::arg(samples[i + 1]);
+        float phase_diff = std::abs(compute_phase_diff(phase_before, phase_after));
+
+        if (phase_diff > max_phase_diff) {
+            max_phase_diff = phase_diff;
+            best_position = i;
+        }
+    }
+
+    return best_position;
+}
+
+// Décodage de bit - échantillonnage au centre de chaque demi-bit avec tracking adaptatif
+char bpsk_demod_core::decode_bit(const std::complex<float>* samples, int num_samples)
+{
+    int half_samples = num_samples / 2;
+    int quarter_samples = half_samples / 2;
+
+    // Appliquer l'offset de timing adaptatif (d_mu)
+    int timing_offset = static_cast<int>(d_mu);
+    int center_first = quarter_samples + timing_offset;
+    int center_second = half_samples + quarter_samples + timing_offset;
+
+    // Bornes de securite
+    if (center_first < 0) center_first = 0;
+    if (center_first >= num_samples) center_first = num_samples - 1;
+    if (center_second < 0) center_second = 0;
+    if (center_second >= num_samples) center_second = num_samples - 1;
+
+    float phase_first = std::arg(samples[center_first]);
+    float phase_second = std::arg(samples[center_second]);
+    float phase_diff = compute_phase_diff(phase_first, phase_second);
+
+    // Bit '1': +1.1 -> -1.1 (transition descendante < 0)
+    // Bit '0': -1.1 -> +1.1 (transition montante > 0)
+    if (phase_diff < -0.5f) {
+        return '1';
+    } else if (phase_diff > 0.5f) {
+        return '0';
+    } else {
+        // Transition ambiguë - choisir basé sur le signe (meilleure estimation)
+        return (phase_diff < 0) ? '1' : '0';
+    }
+}
+
+// RÉINITIALISATION COMPLETE et GARANTIE
+void bpsk_demod_core::reset_demodulator()
+{
+    d_state = STATE_CARRIER_SEARCH;
+    d_carrier_count = 0;
+    d_carrier_start_idx = 0;
+    d_sample_count = 0;
+    d_bits_demodulated = 0;
+    d_total_bit_count = 0;
+    d_preamble_ones = 0;
+    d_consecutive_carrier = 0;
+    d_error_count = 0;
+    d_freq_correction_frozen = false;
+
+    // Réinitialiser récupération de timing
+    d_transition_positions.clear();
+    d_sync_sample_count = 0;
+    d_measured_samples_per_bit = static_cast<float>(d_samples_per_bit);
+
+    std::fill(d_bit_buffer.begin(), d_bit_buffer.end(), std::complex<float>(0, 0));
+    // NOTE: Ne PAS clear d_sample_accumulator ici car il est géré par process_accumulated_buffer()
+
+    // IMPORTANT: Vider l'historique de phase pour éviter "Carrier lost" sur les bursts suivants
+    // La comparaison de phase utilise d_phase_history, si on garde les vieilles phases du burst précédent
+    // le nouveau burst sera rejeté car sa phase absolue est différente
+    d_phase_history.clear();
+
+    // IMPORTANT: Réinitialiser le verrouillage de frequence pour recalculer l'offset sur chaque burst
+    // L'offset peut varier entre bursts (dérive oscillateur RTL-SDR/PlutoSDR)
+    d_freq_lock = false;
+    d_freq_offset = 0.0f;
+
+    // Réinitialiser la PLL
+    d_pll_phase = 0.0f;
+    d_pll_integral = 0.0f;
+
+    d_last_phase = 0.0f;
+    d_phase_avg = 0.0f;
+    d_phase_lpf_state = 0.0f;
+    d_timing_error = 0.0f;
+    d_mu = d_mu_default + d_hypothesis.timing_offset;  // Bonne valeur par defaut pour la plupart des balises
+    d_omega = static_cast<float>(d_samples_per_bit);
+    d_pll_integral = 0.0f;
+    d_transition_positions.clear();
+}
+
+bool bpsk_demod_core::is_synchronized() const
+{
+    return (d_state == STATE_MESSAGE || d_state == STATE_FRAME_SYNC || d_state == STATE_BIT_SYNC);
+}
+
+} // namespace cospas
+} // namespace gr
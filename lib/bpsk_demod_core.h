@@ -0,0 +1,221 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BPSK_DEMOD_CORE_H
+#define INCLUDED_COSPAS_BPSK_DEMOD_CORE_H
+
+#include "biphase_matched_filter.h"
+#include "polyphase_resampler.h"
+#include <gnuradio/gr_complex.h>
+#include <atomic>
+#include <complex>
+#include <cstdint>
+#include <deque>
+#include <memory>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Hypothèse de démodulation (paramètres d'acquisition d'un essai)
+ */
+struct bpsk_demod_hypothesis {
+    float phase_variance_threshold = -1.0f;  // Seuil détection porteuse (rad), < 0 = adaptatif selon p95
+    float freq_offset_hz = 0.0f;             // Décalage ajouté a l'offset estimé (Hz)
+    float timing_offset = 0.0f;              // Décalage du debut de trame (échantillons de travail)
+};
+
+/*!
+ * \brief Trame démodulée par le coeur
+ */
+struct bpsk_demod_frame {
+    std::vector<uint8_t> bits;  // 144 bits (bit sync + frame sync + message)
+    std::vector<float> soft;    // Décisions souples (vide avec la machine a états)
+    float freq_offset = 0.0f;   // Offset de fréquence appliqué (Hz)
+    float samples_per_bit = 0.0f;  // A la cadence de travail
+    bool crc_ok = false;
+};
+
+/*!
+ * \brief Coeur de démodulation BPSK 1G, indépendant de GNU Radio
+ *
+ * Contient tout l'état d'un burst (machine a états, correction de
+ * fréquence, filtre adapté). Chaque instance est utilisée par un seul
+ * thread a la fois: plusieurs coeurs peuvent démoduler le même burst
+ * en parallèle avec des hypothèses différentes.
+ *
+ * Avec working_samples_per_bit > 0, chaque burst est d'abord décimé
+ * (polyphase, rapport rationnel) a 400 * working_samples_per_bit Hz:
+ * toutes les fenêtres sont exprimées en durée et suivent la cadence.
+ */
+class bpsk_demod_core
+{
+public:
+    bpsk_demod_core(float sample_rate, bool debug_mode, int working_samples_per_bit = 0);
+
+    void set_debug_mode(bool enable) { d_debug_mode = enable; }
+    void set_matched_filter(bool enable) { d_use_matched_filter = enable; }
+    void set_hypothesis(const bpsk_demod_hypothesis& hypothesis) { d_hypothesis = hypothesis; }
+
+    /*!
+     * \brief Démoduler un burst complet
+     *
+     * \param samples Échantillons du burst (non modifiés, partageables entre coeurs)
+     * \param num_samples Nombre d'échantillons
+     * \param frame Trame démodulée
+     * \param cancel Abandon demandé par un autre thread (optionnel)
+     * \return true si une trame complète a été démodulée
+     */
+    bool demodulate_burst(const gr_complex* samples,
+                          int num_samples,
+                          bpsk_demod_frame& frame,
+                          const std::atomic<bool>* cancel = nullptr);
+
+    // Mode flux: accumulation puis traitement par la machine a états
+    void append(const gr_complex* samples, int num_samples);
+    size_t accumulated() const { return d_sample_accumulator.size(); }
+    int process_accumulated_buffer(uint8_t* out, int max_bytes);
+
+    // Trame complétée par le dernier appel a process_accumulated_buffer()
+    bool frame_ready() const { return d_frame_ready; }
+    const bpsk_demod_frame& frame() const { return d_frame; }
+
+    void reset_demodulator();
+    bool is_synchronized() const;
+    int samples_per_bit() const { return d_samples_per_bit; }
+    float working_rate() const { return d_sample_rate; }
+
+    static constexpr int TOTAL_BITS = 144;         // Total: 15 + 9 + 120
+
+private:
+    // Paramètres fixes
+    float d_input_rate;            // Cadence des bursts reçus
+    float d_sample_rate;           // Cadence de travail (apres décimation)
+    static constexpr float BIT_RATE = 400.0f;
+    int d_samples_per_bit;
+    static constexpr float CARRIER_DURATION = 0.160f;
+    int d_carrier_samples;
+    int d_carrier_samples_min;  // Minimum requis avec correction active
+
+    // Fenêtres (échantillons a la cadence de travail)
+    int d_history_short;        // Historique de phase: variance et tracking
+    int d_history_long;         // Historique de phase: estimation de fréquence
+    int d_estimate_min;         // Minimum pour estimer l'offset
+    int d_phase_avg_len;        // Moyenne de phase de la porteuse
+    int d_jump_lag;             // Écart pour la détection du saut BPSK
+    float d_mu_default;         // Offset de timing initial
+    float d_mu_limit;           // Borne de l'offset de timing
+
+    // Décimation vers la cadence de travail (nullptr = pas de décimation)
+    std::unique_ptr<polyphase_resampler> d_resampler;
+    std::vector<gr_complex> d_work_buffer;
+
+    // Structure COSPAS-SARSAT (démodulateur)
+    static constexpr int BIT_SYNC_BITS = 15;       // Bits 1-15: bit sync (15 bits a '1')
+    static constexpr int FRAME_SYNC_BITS = 9;      // Bits 16-24: frame sync pattern (9 bits)
+    static constexpr int MESSAGE_BITS = 120;       // Bits 25-144: message (120 bits)
+
+    // Seuils
+    static constexpr float MOD_PHASE = 1.1f;
+    static constexpr float PHASE_THRESHOLD = 1.0f;
+    static constexpr float CARRIER_THRESHOLD = 0.3f;
+    static constexpr float JUMP_THRESHOLD = 0.7f;
+    static constexpr int MAX_CONSECUTIVE_ERRORS = 8;
+
+    // États
+    enum DemodulatorState {
+        STATE_CARRIER_SEARCH,
+        STATE_CARRIER_TRACKING,
+        STATE_BIT_SYNC,
+        STATE_FRAME_SYNC,
+        STATE_MESSAGE
+    };
+
+    // Variables d'état
+    DemodulatorState d_state;
+    int d_carrier_count;
+    int d_carrier_start_idx;
+    int d_sample_count;
+    int d_bits_demodulated;    // Bits démodulés (données uniquement)
+    int d_total_bit_count;     // Tous les bits (préambule + sync + données)
+    int d_preamble_ones;
+    int d_error_count;
+
+    // Récupération de timing sur bits de sync
+    std::vector<int> d_transition_positions;  // Positions des transitions detectees
+    int d_sync_sample_count;                  // Compteur d'échantillons pendant sync
+    float d_measured_samples_per_bit;         // Samples/bit mesuré réellement
+
+    // Buffers
+    std::vector<std::complex<float>> d_bit_buffer;
+    std::vector<float> d_phase_history;
+
+    // Buffer d'accumulation pour déterminisme
+    std::deque<gr_complex> d_sample_accumulator;
+
+    // Traitement phase
+    float d_last_phase;
+    float d_phase_avg;
+    int d_consecutive_carrier;
+
+    // Timing (DÉSACTIVÉ pour signal synthétique)
+    float d_timing_error;
+    float d_mu;
+    float d_omega;
+    float d_pll_integral;
+    float d_pll_phase;              // Phase estimée par la PLL
+
+    // Correction de fréquence automatique
+    float d_freq_offset;           // Offset de fréquence estimé (Hz)
+    float d_phase_correction;      // Phase accumulee pour la correction
+    bool d_freq_lock;              // Indique si l'offset est verrouillé
+    bool d_freq_correction_frozen; // Gel de la correction après détection du saut BPSK
+    float d_carrier_phase_ref;     // Phase de référence fixe pour détection porteuse
+
+    // Démodulation par filtre adapté (intégrer-et-vider sur chaque bit)
+    bool d_use_matched_filter;
+    biphase_matched_filter d_matched_filter;
+    mf_bit_decisions d_mf_decisions;
+    std::vector<gr_complex> d_mf_buffer;  // Échantillons corrigés en fréquence
+
+    // Hypothèse courante et abandon coopératif
+    bpsk_demod_hypothesis d_hypothesis;
+    const std::atomic<bool>* d_cancel;
+
+    // Dernière trame complète
+    bpsk_demod_frame d_frame;
+    bool d_frame_ready;
+
+    bool d_debug_mode;
+
+    // Filtre phase
+    float d_phase_lpf_state;
+
+    // Méthodes privées
+    float normalize_phase(float phase);
+    float compute_phase_diff(float phase1, float phase2);
+    float compute_phase(std::complex<float> sample);
+    int detect_transition_position(const std::complex<float>* samples, int num_samples);
+    char decode_bit(const std::complex<float>* samples, int num_samples);
+    bool detect_carrier(float phase);
+    int measured_bit_length() const;
+
+    // Correction de fréquence
+    gr_complex apply_freq_correction(gr_complex sample);
+    void estimate_freq_offset();
+
+    // Filtre adapté: démodule la trame complète a partir du saut de phase BPSK
+    int demodulate_matched_filter(int jump_idx, uint8_t* out);
+    // Trame complète: copie des bits et vérification CRC (sans affichage)
+    void complete_frame(const uint8_t* bits, int num_bits, const float* soft = nullptr);
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BPSK_DEMOD_CORE_H */
@@ -0,0 +1,166 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "burst_classifier.h"
+#include <algorithm>
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+burst_classifier::burst_classifier(float sample_rate)
+    : d_prn(sample_rate), d_prn_window(d_prn.window_size())
+{
+    d_window_size = std::max(static_cast<int>(sample_rate * 0.160f), d_prn.window_size());
+    d_early_window_size = static_cast<int>(sample_rate * 0.100f);
+    reset();
+}
+
+void burst_classifier::reset()
+{
+    d_count = 0;
+    d_last = gr_complex(0.0f, 0.0f);
+    d_sum = 0.0;
+    d_sum_sq = 0.0;
+    d_delay.fill(gr_complex(0.0f, 0.0f));
+    d_power = 0.0;
+    d_lag_corr_re = 0.0;
+    d_lag_corr_im = 0.0;
+    d_prn_checked = false;
+    d_prn_found = false;
+    d_decided = false;
+    d_decision = TYPE_1G;
+}
+
+void burst_classifier::update(const gr_complex* samples, int num_samples)
+{
+    int n = std::min(num_samples, d_window_size - d_count);
+    if (n <= 0) {
+        return;
+    }
+
+    // Fenêtre PRN: copie des premiers échantillons, corrélation quand elle est pleine
+    const int prn_size = static_cast<int>(d_prn_window.size());
+    if (d_count < prn_size) {
+        int to_copy = std::min(n, prn_size - d_count);
+        std::copy(samples, samples + to_copy, d_prn_window.begin() + d_count);
+        if (d_count + to_copy == prn_size) {
+            d_prn_found = d_prn.detect(d_prn_window.data(), prn_size);
+            d_prn_checked = true;
+        }
+    }
+
+    for (int i = 0; i < n; i++) {
+        const gr_complex x = samples[i];
+        const int index = d_count + i;
+
+        // Δφ = arg(x[n]·conj(x[n-1])) : déjà dans [-π, π], un seul atan2 par échantillon
+        if (index > 0) {
+            float diff = std::abs(std::arg(x * std::conj(d_last)));
+            d_sum += diff;
+            d_sum_sq += static_cast<double>(diff) * diff;
+        }
+        d_last = x;
+
+        // Autocorrélation au retard L (ligne a retard circulaire)
+        gr_complex& delayed = d_delay[index % COHERENCE_LAG];
+        if (index >= COHERENCE_LAG) {
+            gr_complex r = x * std::conj(delayed);
+            d_lag_corr_re += r.real();
+            d_lag_corr_im += r.imag();
+        }
+        delayed = x;
+        d_power += std::norm(x);
+    }
+    d_count += n;
+
+    if (!d_decided) {
+        try_decide();
+    }
+}
+
+void burst_classifier::try_decide()
+{
+    if (d_count < d_early_window_size) {
+        return;
+    }
+
+    // Préambule PRN: 2G confirmé, quelle que soit la taille du burst
+    if (d_prn_found) {
+        d_decided = true;
+        d_decision = TYPE_2G;
+        return;
+    }
+
+    float c = coherence();
+    if (c >= COHERENCE_1G_EARLY || (window_complete() && c >= COHERENCE_1G)) {
+        d_decided = true;
+        d_decision = TYPE_1G;
+    }
+    // Sinon: attendre la fin de la fenêtre, puis la taille du burst
+}
+
+float burst_classifier::coherence() const
+{
+    int num_lags = d_count - COHERENCE_LAG;
+    if (num_lags <= 0 || d_power <= 0.0) {
+        return 0.0f;
+    }
+    // R(0) normalisé au même nombre de termes que R(L)
+    double power = d_power * num_lags / d_count;
+    return static_cast<float>(std::hypot(d_lag_corr_re, d_lag_corr_im) / power);
+}
+
+float burst_classifier::phase_stddev() const
+{
+    int num_diffs = d_count - 1;
+    if (num_diffs <= 0) {
+        return 0.0f;
+    }
+    double mean = d_sum / num_diffs;
+    double variance = std::max(0.0, d_sum_sq / num_diffs - mean * mean);
+    return static_cast<float>(std::sqrt(variance));
+}
+
+bool burst_classifier::has_carrier() const
+{
+    return window_complete() && phase_stddev() < CARRIER_THRESHOLD;
+}
+
+burst_classifier::burst_type burst_classifier::classify(size_t burst_size)
+{
+    // Signature du debut du burst (porteuse 1G / spectre étalé 2G)
+    if (d_decided) {
+        return d_decision;
+    }
+
+    // Burst partiel: fenêtre PRN incomplète, detect() complète par des zéros
+    if (!d_prn_checked && d_count > 0) {
+        d_prn_found = d_prn.detect(d_prn_window.data(), d_count);
+        d_prn_checked = true;
+        if (d_prn_found) {
+            d_decided = true;
+            d_decision = TYPE_2G;
+            return d_decision;
+        }
+    }
+
+    // Méthode 1 : Taille du burst (le plus robuste)
+    if (burst_size < static_cast<size_t>(THRESHOLD_SIZE)) {
+        return TYPE_1G;
+    }
+
+    // Méthode 2 : Porteuse 160ms (confirmation pour les bursts 1G longs)
+    if (has_carrier() && burst_size < static_cast<size_t>(THRESHOLD_SIZE) * 2) {
+        return TYPE_1G;
+    }
+
+    return TYPE_2G;
+}
+
+} // namespace cospas
+} // namespace gr
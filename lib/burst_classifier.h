@@ -0,0 +1,125 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BURST_CLASSIFIER_H
+#define INCLUDED_COSPAS_BURST_CLASSIFIER_H
+
+#include "prn_2g_detector.h"
+#include <gnuradio/gr_complex.h>
+#include <array>
+#include <cstddef>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Classification 1G/2G d'un burst, calculée au fil de l'eau
+ *
+ * Les statistiques sont accumulées sur les 160 premières ms du burst au
+ * fur et a mesure que les échantillons arrivent, sans buffer intermédiaire:
+ * - écart-type de |Δφ| entre échantillons successifs (porteuse stable)
+ * - cohérence |R(L)|/R(0) a L = 8 échantillons: la porteuse non modulée
+ *   1G reste corrélée quel que soit son offset de fréquence (≈ S/(S+N)),
+ *   l'étalement DSSS OQPSK 2G (38.4 kchips/s) décorrèle en moins d'un
+ *   chip (≈ 0). Le bruit seul ne fait que diluer la cohérence 1G.
+ * - corrélation avec le préambule PRN T.018 sur les ~100 premières ms
+ *   (prn_2g_detector): seule une balise 2G produit un pic.
+ *
+ * 2G est confirmé par le préambule PRN, 1G par la cohérence, dès 100 ms
+ * si la signature est franche, sinon a 160 ms. Un burst partiel plus court
+ * que la fenêtre PRN est corrélé par classify() sur ce qui a été reçu. Si
+ * la signature reste ambiguë (burst très bruité), classify() retombe sur
+ * la taille du burst.
+ */
+class burst_classifier
+{
+public:
+    enum burst_type {
+        TYPE_1G,  // First Generation (FGB)
+        TYPE_2G   // Second Generation (SGB)
+    };
+
+    explicit burst_classifier(float sample_rate);
+
+    //! Préparer un nouveau burst
+    void reset();
+
+    //! Ajouter des échantillons (seuls les 160 premières ms sont analysées)
+    void update(const gr_complex* samples, int num_samples);
+
+    //! Décision anticipée disponible (100-160 ms après le debut du burst)
+    bool decided() const { return d_decided; }
+
+    //! Type décidé (valide si decided())
+    burst_type decision() const { return d_decision; }
+
+    //! Cohérence |R(L)|/R(0) sur les échantillons analysés
+    float coherence() const;
+
+    //! Préambule PRN 2G recherché / trouvé, rapport pic/moyenne
+    bool prn_checked() const { return d_prn_checked; }
+    bool prn_found() const { return d_prn_found; }
+    float prn_peak_ratio() const { return d_prn.peak_ratio(); }
+
+    //! Porteuse analysée sur toute la fenêtre
+    bool window_complete() const { return d_count >= d_window_size; }
+
+    //! Écart-type des variations de phase sur la fenêtre (rad)
+    float phase_stddev() const;
+
+    //! Porteuse non modulée détectée (fenêtre complète et stddev < seuil)
+    bool has_carrier() const;
+
+    /*!
+     * \brief Décision finale: anticipée si disponible, sinon taille du burst et porteuse
+     *
+     * Burst plus court que la fenêtre PRN (burst partiel): le préambule est
+     * d'abord recherché sur les échantillons reçus, complétés par des zéros.
+     */
+    burst_type classify(size_t burst_size);
+
+    int window_size() const { return d_window_size; }
+    int early_window_size() const { return d_early_window_size; }
+
+    // 1G : ~14k-20k samples (360ms @ 40kHz), 2G : ~38k-40k samples (960ms @ 40kHz)
+    static constexpr int THRESHOLD_SIZE = 25000;
+    // Porteuse non modulée: stddev < 0.3 radians
+    static constexpr float CARRIER_THRESHOLD = 0.3f;
+
+    static constexpr int COHERENCE_LAG = 8;           // 0.2 ms @ 40kHz, >> 1 chip
+    static constexpr float COHERENCE_1G_EARLY = 0.4f; // 1G franc dès 100 ms (SNR > -2 dB)
+    static constexpr float COHERENCE_1G = 0.1f;       // 1G a 160 ms (SNR > -9.5 dB)
+
+private:
+    int d_window_size;        // 160 ms d'échantillons (au moins la fenêtre PRN)
+    int d_early_window_size;  // 100 ms d'échantillons
+    int d_count;              // Échantillons analysés dans la fenêtre
+    gr_complex d_last;        // Dernier échantillon (continuité entre appels)
+    double d_sum;             // Σ|Δφ|
+    double d_sum_sq;          // Σ|Δφ|²
+
+    std::array<gr_complex, COHERENCE_LAG> d_delay;  // L derniers échantillons
+    double d_power;           // R(0) = Σ|x|²
+    double d_lag_corr_re;     // R(L) = Σ x[n]·conj(x[n-L])
+    double d_lag_corr_im;
+
+    prn_2g_detector d_prn;
+    std::vector<gr_complex> d_prn_window;  // Premiers échantillons du burst (alloué une fois)
+    bool d_prn_checked;
+    bool d_prn_found;
+
+    bool d_decided;
+    burst_type d_decision;
+
+    void try_decide();
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BURST_CLASSIFIER_H */
@@ -0,0 +1,209 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "burst_demod_worker.h"
+#include <atomic>
+#include <condition_variable>
+#include <iostream>
+#include <mutex>
+
+namespace gr {
+namespace cospas {
+
+burst_demod_worker::burst_demod_worker(float sample_rate,
+                                       bool debug_mode,
+                                       int working_samples_per_bit)
+    : d_sample_rate(sample_rate),
+      d_working_samples_per_bit(working_samples_per_bit),
+      d_debug_mode(debug_mode),
+      d_use_matched_filter(true),
+      d_core(sample_rate, debug_mode, working_samples_per_bit)
+{
+}
+
+std::vector<bpsk_demod_hypothesis>
+burst_demod_worker::make_hypothesis_grid(const std::vector<float>& phase_variance_thresholds,
+                                         const std::vector<float>& freq_offsets,
+                                         const std::vector<float>& timing_offsets)
+{
+    const std::vector<float> nominal_threshold = { -1.0f };
+    const std::vector<float> nominal_offset = { 0.0f };
+    const auto& thresholds =
+        phase_variance_thresholds.empty() ? nominal_threshold : phase_variance_thresholds;
+    const auto& freqs = freq_offsets.empty() ? nominal_offset : freq_offsets;
+    const auto& timings = timing_offsets.empty() ? nominal_offset : timing_offsets;
+
+    std::vector<bpsk_demod_hypothesis> grid;
+    for (float threshold : thresholds) {
+        for (float freq : freqs) {
+            for (float timing : timings) {
+                if (threshold < 0.0f && freq == 0.0f && timing == 0.0f) {
+                    continue;
+                }
+                bpsk_demod_hypothesis h;
+                h.phase_variance_threshold = threshold;
+                h.freq_offset_hz = freq;
+                h.timing_offset = timing;
+                grid.push_back(h);
+            }
+        }
+    }
+    return grid;
+}
+
+void burst_demod_worker::set_hypotheses(const std::vector<bpsk_demod_hypothesis>& hypotheses)
+{
+    d_hypotheses = hypotheses;
+    d_hypothesis_cores.clear();
+    for (const auto& h : d_hypotheses) {
+        auto core = std::make_unique<bpsk_demod_core>(
+            d_sample_rate, d_debug_mode, d_working_samples_per_bit);
+        core->set_matched_filter(d_use_matched_filter);
+        core->set_hypothesis(h);
+        d_hypothesis_cores.push_back(std::move(core));
+    }
+    d_hypothesis_frames.assign(d_hypotheses.size(), bpsk_demod_frame());
+}
+
+void burst_demod_worker::set_debug_mode(bool enable)
+{
+    d_debug_mode = enable;
+    d_core.set_debug_mode(enable);
+    for (auto& core : d_hypothesis_cores) {
+        core->set_debug_mode(enable);
+    }
+}
+
+void burst_demod_worker::set_matched_filter(bool enable)
+{
+    d_use_matched_filter = enable;
+    d_core.set_matched_filter(enable);
+    for (auto& core : d_hypothesis_cores) {
+        core->set_matched_filter(enable);
+    }
+}
+
+bool burst_demod_worker::process(const gr_complex* samples,
+                                 int num_samples,
+                                 thread_pool* hypothesis_pool,
+                                 burst_demod_result& result)
+{
+    // Hypothèse nominale d'abord: suffit pour les bursts normaux
+    const bpsk_demod_frame* frame = nullptr;
+    if (d_core.demodulate_burst(samples, num_samples, d_frame)) {
+        frame = &d_frame;
+    }
+
+    // Bit sync FAIL ou CRC faux: essayer les hypothèses alternatives
+    // Sinon la trame nominale est conservée (CRC signalé par dec406)
+    result.rescued = false;
+    if ((!frame || !frame->crc_ok) && !d_hypotheses.empty()) {
+        const bpsk_demod_frame* rescued =
+            demodulate_hypotheses(samples, num_samples, hypothesis_pool);
+        if (rescued) {
+            frame = rescued;
+            result.rescued = true;
+        }
+    }
+
+    result.frame_found = (frame != nullptr);
+    if (!frame) {
+        result.crc_ok = false;
+        result.bits.clear();
+        result.soft.clear();
+        result.hex.clear();
+        return false;
+    }
+
+    result.crc_ok = frame->crc_ok;
+    result.bits = frame->bits;
+    result.soft = frame->soft;
+    result.freq_offset = frame->freq_offset;
+    result.samples_per_bit = frame->samples_per_bit;
+
+    // Convertir bits en hex (4 bits = 1 digit hex)
+    static const char digits[] = "0123456789ABCDEF";
+    const int num_bits = static_cast<int>(frame->bits.size());
+    result.hex.clear();
+    for (int i = 0; i < num_bits; i += 4) {
+        int hex_val = 0;
+        for (int j = 0; j < 4 && (i + j) < num_bits; j++) {
+            if (frame->bits[i + j] == 1) {
+                hex_val |= (1 << (3 - j));
+            }
+        }
+        result.hex.push_back(digits[hex_val]);
+    }
+    return true;
+}
+
+// Chaque hypothèse démodule le même buffer (lecture seule) avec son propre coeur
+// La première trame au CRC valide gagne, les autres hypothèses sont abandonnées
+const bpsk_demod_frame* burst_demod_worker::demodulate_hypotheses(const gr_complex* samples,
+                                                                  int num_samples,
+                                                                  thread_pool* hypothesis_pool)
+{
+    const int count = static_cast<int>(d_hypotheses.size());
+
+    if (!hypothesis_pool) {
+        for (int i = 0; i < count; i++) {
+            if (d_hypothesis_cores[i]->demodulate_burst(
+                    samples, num_samples, d_hypothesis_frames[i]) &&
+                d_hypothesis_frames[i].crc_ok) {
+                return &d_hypothesis_frames[i];
+            }
+        }
+        return nullptr;
+    }
+
+    std::atomic<bool> cancel(false);
+    std::atomic<int> winner(-1);
+    std::mutex done_mutex;
+    std::condition_variable done_cond;
+    int remaining = count;
+
+    for (int i = 0; i < count; i++) {
+        hypothesis_pool->submit([&, i]() {
+            if (!cancel.load(std::memory_order_relaxed)) {
+                bpsk_demod_frame& result = d_hypothesis_frames[i];
+                if (d_hypothesis_cores[i]->demodulate_burst(
+                        samples, num_samples, result, &cancel) &&
+                    result.crc_ok) {
+                    int expected = -1;
+                    if (winner.compare_exchange_strong(expected, i)) {
+                        cancel.store(true);
+                    }
+                }
+            }
+            // Notifier sous verrou: les variables locales disparaissent des que remaining == 0
+            std::lock_guard<std::mutex> done_lock(done_mutex);
+            if (--remaining == 0) {
+                done_cond.notify_one();
+            }
+        });
+    }
+
+    std::unique_lock<std::mutex> done_lock(done_mutex);
+    done_cond.wait(done_lock, [&]() { return remaining == 0; });
+
+    int best = winner.load();
+    if (best < 0) {
+        return nullptr;
+    }
+
+    if (d_debug_mode) {
+        const bpsk_demod_hypothesis& h = d_hypotheses[best];
+        std::cout << "[COSPAS] Trame sauvee par l'hypothese #" << best
+                  << ": seuil variance=" << h.phase_variance_threshold
+                  << " rad, offset freq=" << h.freq_offset_hz
+                  << " Hz, offset timing=" << h.timing_offset << std::endl;
+    }
+    return &d_hypothesis_frames[best];
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,76 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BURST_DEMOD_WORKER_H
+#define INCLUDED_COSPAS_BURST_DEMOD_WORKER_H
+
+#include <gnuradio/cospas/burst_demodulator.h>
+#include "bpsk_demod_core.h"
+#include "thread_pool.h"
+#include <memory>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief État complet pour démoduler un burst a la fois
+ *
+ * Coeur nominal + un coeur par hypothèse alternative. L'hypothèse
+ * nominale est essayée d'abord; si elle échoue (bit sync ou CRC), les
+ * hypothèses démodulent le même buffer, en parallèle sur le pool fourni,
+ * et la première trame au CRC valide gagne.
+ */
+class burst_demod_worker
+{
+public:
+    burst_demod_worker(float sample_rate, bool debug_mode, int working_samples_per_bit);
+
+    void set_hypotheses(const std::vector<bpsk_demod_hypothesis>& hypotheses);
+    void set_debug_mode(bool enable);
+    void set_matched_filter(bool enable);
+
+    const bpsk_demod_core& core() const { return d_core; }
+
+    /*!
+     * \brief Démoduler un burst
+     * \param hypothesis_pool Pool pour les hypothèses (nullptr = séquentiel)
+     * \return true si une trame a été trouvée
+     */
+    bool process(const gr_complex* samples,
+                 int num_samples,
+                 thread_pool* hypothesis_pool,
+                 burst_demod_result& result);
+
+    // Grille = produit cartésien des trois listes, liste vide = valeur nominale,
+    // hypothèse nominale exclue (deja essayée en premier)
+    static std::vector<bpsk_demod_hypothesis>
+    make_hypothesis_grid(const std::vector<float>& phase_variance_thresholds,
+                         const std::vector<float>& freq_offsets,
+                         const std::vector<float>& timing_offsets);
+
+private:
+    float d_sample_rate;
+    int d_working_samples_per_bit;
+    bool d_debug_mode;
+    bool d_use_matched_filter;
+
+    bpsk_demod_core d_core;
+    bpsk_demod_frame d_frame;
+    std::vector<bpsk_demod_hypothesis> d_hypotheses;
+    std::vector<std::unique_ptr<bpsk_demod_core>> d_hypothesis_cores;
+    std::vector<bpsk_demod_frame> d_hypothesis_frames;
+
+    const bpsk_demod_frame* demodulate_hypotheses(const gr_complex* samples,
+                                                  int num_samples,
+                                                  thread_pool* hypothesis_pool);
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BURST_DEMOD_WORKER_H */
@@ -0,0 +1,76 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/cospas/burst_demodulator.h>
+#include "burst_demod_worker.h"
+#include <algorithm>
+#include <atomic>
+#include <memory>
+#include <stdexcept>
+#include <thread>
+
+namespace gr {
+namespace cospas {
+
+std::vector<burst_demod_result> demodulate_bursts(const std::vector<const gr_complex*>& bursts,
+                                                  const std::vector<int>& lengths,
+                                                  float sample_rate,
+                                                  int working_samples_per_bit,
+                                                  bool use_hypotheses,
+                                                  int num_threads)
+{
+    if (bursts.size() != lengths.size()) {
+        throw std::invalid_argument("demodulate_bursts: bursts et lengths de tailles differentes");
+    }
+    if (sample_rate <= 0.0f) {
+        throw std::invalid_argument("demodulate_bursts: sample_rate doit etre > 0");
+    }
+
+    const int count = static_cast<int>(bursts.size());
+    std::vector<burst_demod_result> results(count);
+    if (count == 0) {
+        return results;
+    }
+
+    if (num_threads <= 0) {
+        num_threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    num_threads = std::min(num_threads, count);
+
+    // Même grille par défaut que le bloc (seuil de variance de phase)
+    std::vector<bpsk_demod_hypothesis> hypotheses;
+    if (use_hypotheses) {
+        hypotheses = burst_demod_worker::make_hypothesis_grid({ 0.15f, 0.3f, 0.5f, 0.7f }, {}, {});
+    }
+
+    // Un worker par thread, bursts distribués dynamiquement (durées inégales)
+    // Les hypothèses d'un burst restent séquentielles: le parallélisme est entre bursts
+    std::atomic<int> next(0);
+    auto run = [&]() {
+        burst_demod_worker worker(sample_rate, false, std::max(0, working_samples_per_bit));
+        worker.set_hypotheses(hypotheses);
+        for (int i = next++; i < count; i = next++) {
+            if (bursts[i] && lengths[i] > 0) {
+                worker.process(bursts[i], lengths[i], nullptr, results[i]);
+            }
+        }
+    };
+
+    std::vector<std::thread> threads;
+    for (int t = 1; t < num_threads; t++) {
+        threads.emplace_back(run);
+    }
+    run();
+    for (auto& t : threads) {
+        t.join();
+    }
+
+    return results;
+}
+
+} // namespace cospas
+} // namespace gr
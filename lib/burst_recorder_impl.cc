@@ -0,0 +1,316 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "burst_recorder_impl.h"
+#include <gnuradio/io_signature.h>
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <filesystem>
+#include <iostream>
+#include <stdexcept>
+
+namespace gr {
+namespace cospas {
+
+burst_recorder::sptr burst_recorder::make(float sample_rate,
+                                          const std::string& output_dir,
+                                          int pre_roll_ms,
+                                          int post_roll_ms,
+                                          double center_freq,
+                                          bool failed_only,
+                                          int max_queue_mb,
+                                          int decode_timeout_ms,
+                                          bool debug_mode)
+{
+    return gnuradio::make_block_sptr<burst_recorder_impl>(sample_rate,
+                                                          output_dir,
+                                                          pre_roll_ms,
+                                                          post_roll_ms,
+                                                          center_freq,
+                                                          failed_only,
+                                                          max_queue_mb,
+                                                          decode_timeout_ms,
+                                                          debug_mode);
+}
+
+burst_recorder_impl::burst_recorder_impl(float sample_rate,
+                                         const std::string& output_dir,
+                                         int pre_roll_ms,
+                                         int post_roll_ms,
+                                         double center_freq,
+                                         bool failed_only,
+                                         int max_queue_mb,
+                                         int decode_timeout_ms,
+                                         bool debug_mode)
+    : gr::sync_block("burst_recorder",
+                     gr::io_signature::make(1, 1, sizeof(gr_complex)),
+                     gr::io_signature::make(0, 0, 0)),
+      d_sample_rate(sample_rate),
+      d_pre_roll(static_cast<int>(sample_rate * std::max(0, pre_roll_ms) / 1000.0f)),
+      d_post_roll(static_cast<int>(sample_rate * std::max(0, post_roll_ms) / 1000.0f)),
+      d_center_freq(center_freq),
+      d_start_time(0.0),
+      d_start_time_set(false),
+      d_start_time_fixed(false),
+      d_debug_mode(debug_mode),
+      d_ring_end(0),
+      d_lost(0)
+{
+    std::error_code ec;
+    std::filesystem::create_directories(output_dir, ec);
+    if (ec) {
+        throw std::runtime_error("burst_recorder: impossible de créer " + output_dir + ": " +
+                                 ec.message());
+    }
+
+    d_ring.resize(d_pre_roll + d_post_roll +
+                  static_cast<size_t>((MAX_BURST_S + MESSAGE_SLACK_S) * sample_rate));
+
+    d_writer = std::make_unique<sigmf_burst_writer>(
+        output_dir,
+        static_cast<size_t>(std::max(1, max_queue_mb)) << 20,
+        std::max(0, decode_timeout_ms) / 1000.0,
+        failed_only,
+        debug_mode);
+
+    // Bursts du détecteur (start, size) et trames des démodulateurs (burst_start)
+    message_port_register_in(pmt::mp("bursts"));
+    set_msg_handler(pmt::mp("bursts"), [this](pmt::pmt_t msg) { this->handle_burst_message(msg); });
+    message_port_register_in(pmt::mp("frames"));
+    set_msg_handler(pmt::mp("frames"), [this](pmt::pmt_t msg) { this->handle_frame_message(msg); });
+
+    if (d_debug_mode) {
+        std::cout << "[BURST_RECORDER] Initialized:" << std::endl;
+        std::cout << "  Output dir: " << output_dir << std::endl;
+        std::cout << "  Pre/post roll: " << d_pre_roll << " / " << d_post_roll << " samples"
+                  << std::endl;
+        std::cout << "  Ring buffer: " << d_ring.size() << " samples" << std::endl;
+        std::cout << "  Queue: " << max_queue_mb << " Mo, decode timeout " << decode_timeout_ms
+                  << " ms" << (failed_only ? ", echecs seulement" : "") << std::endl;
+    }
+}
+
+burst_recorder_impl::~burst_recorder_impl()
+{
+    d_writer.reset();  // Ecrit les bursts restants puis joint le thread
+}
+
+// Arret du flowgraph: bursts en cours copiés avec le post-roll disponible
+bool burst_recorder_impl::stop()
+{
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        capture_ready(true);
+        if (!d_start_time_fixed) {
+            d_start_time_set = false;  // Recalé sur l'horloge au redémarrage
+        }
+    }
+    d_writer->flush();
+    return true;
+}
+
+uint64_t burst_recorder_impl::ring_begin() const
+{
+    return d_ring_end > d_ring.size() ? d_ring_end - d_ring.size() : 0;
+}
+
+void burst_recorder_impl::handle_burst_message(pmt::pmt_t msg)
+{
+    if (!pmt::is_dict(msg)) {
+        return;
+    }
+    pmt::pmt_t start = pmt::dict_ref(msg, pmt::mp("start"), pmt::PMT_NIL);
+    pmt::pmt_t size = pmt::dict_ref(msg, pmt::mp("size"), pmt::PMT_NIL);
+    if (!pmt::is_integer(start) && !pmt::is_uint64(start)) {
+        if (d_debug_mode) {
+            std::cout << "[BURST_RECORDER] Message sans cle 'start' ignore" << std::endl;
+        }
+        return;
+    }
+
+    pending_burst burst;
+    burst.start = pmt::is_uint64(start) ? pmt::to_uint64(start)
+                                        : static_cast<uint64_t>(pmt::to_long(start));
+    burst.size = pmt::is_integer(size) ? static_cast<uint64_t>(pmt::to_long(size)) : 0;
+    burst.size = std::min<uint64_t>(burst.size, MAX_BURST_S * d_sample_rate);
+
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_pending.push_back(burst);
+    capture_ready(false);
+}
+
+void burst_recorder_impl::handle_frame_message(pmt::pmt_t msg)
+{
+    if (!pmt::is_dict(msg)) {
+        return;
+    }
+    pmt::pmt_t start = pmt::dict_ref(msg, pmt::mp("burst_start"), pmt::PMT_NIL);
+    if (!pmt::is_integer(start) && !pmt::is_uint64(start)) {
+        return;
+    }
+
+    // 2G: bch_ok, 1G: crc_ok
+    burst_status status;
+    pmt::pmt_t bch_ok = pmt::dict_ref(msg, pmt::mp("bch_ok"), pmt::PMT_NIL);
+    pmt::pmt_t crc_ok = pmt::dict_ref(msg, pmt::mp("crc_ok"), pmt::PMT_NIL);
+    status.generation = pmt::is_bool(bch_ok) ? 2 : 1;
+    status.valid = pmt::is_bool(bch_ok)   ? pmt::to_bool(bch_ok)
+                   : pmt::is_bool(crc_ok) ? pmt::to_bool(crc_ok)
+                                          : false;
+    pmt::pmt_t hex = pmt::dict_ref(msg, pmt::mp("hex"), pmt::PMT_NIL);
+    if (pmt::is_symbol(hex)) {
+        status.hex = pmt::symbol_to_string(hex);
+    }
+    pmt::pmt_t freq_offset = pmt::dict_ref(msg, pmt::mp("freq_offset"), pmt::PMT_NIL);
+    if (pmt::is_number(freq_offset)) {
+        status.freq_offset = pmt::to_double(freq_offset);
+    }
+
+    d_writer->set_status(pmt::is_uint64(start) ? pmt::to_uint64(start)
+                                               : static_cast<uint64_t>(pmt::to_long(start)),
+                         status);
+}
+
+void burst_recorder_impl::capture_ready(bool final)
+{
+    for (auto it = d_pending.begin(); it != d_pending.end();) {
+        if (final || it->start + it->size + d_post_roll <= d_ring_end) {
+            capture(*it);
+            it = d_pending.erase(it);
+        } else {
+            ++it;
+        }
+    }
+}
+
+void burst_recorder_impl::capture(const pending_burst& burst)
+{
+    const uint64_t available = ring_begin();
+    if (burst.start < available || burst.start >= d_ring_end) {
+        // Message arrivé trop tard (ou flux arrêté avant le burst)
+        d_lost++;
+        if (d_debug_mode) {
+            std::cout << "[BURST_RECORDER] Burst @" << burst.start
+                      << " hors du buffer circulaire, perdu" << std::endl;
+        }
+        return;
+    }
+
+    burst_capture c;
+    c.burst_start = burst.start;
+    c.burst_size = burst.size;
+    c.first_sample = burst.start > static_cast<uint64_t>(d_pre_roll) ? burst.start - d_pre_roll : 0;
+    if (c.first_sample < available) {
+        c.first_sample = available;
+        c.truncated = true;
+    }
+    uint64_t last = burst.start + burst.size + d_post_roll;
+    if (last > d_ring_end) {
+        last = d_ring_end;
+        c.truncated = true;
+    }
+
+    // Copie hors du buffer circulaire (au plus deux morceaux)
+    const size_t ring_size = d_ring.size();
+    const size_t count = static_cast<size_t>(last - c.first_sample);
+    c.samples.resize(count);
+    size_t pos = static_cast<size_t>(c.first_sample % ring_size);
+    size_t first_part = std::min(count, ring_size - pos);
+    std::memcpy(c.samples.data(), &d_ring[pos], first_part * sizeof(gr_complex));
+    if (count > first_part) {
+        std::memcpy(c.samples.data() + first_part, d_ring.data(),
+                    (count - first_part) * sizeof(gr_complex));
+    }
+
+    c.sample_rate = d_sample_rate;
+    c.center_freq = d_center_freq;
+    c.start_time = d_start_time + static_cast<double>(c.first_sample) / d_sample_rate;
+
+    if (!d_writer->submit(std::move(c))) {
+        std::cerr << "[BURST_RECORDER] File d'ecriture pleine, burst @" << burst.start
+                  << " abandonne" << std::endl;
+    }
+}
+
+int burst_recorder_impl::work(int noutput_items,
+                              gr_vector_const_void_star& input_items,
+                              gr_vector_void_star& output_items)
+{
+    const gr_complex* in = static_cast<const gr_complex*>(input_items[0]);
+
+    std::lock_guard<std::mutex> lock(d_mutex);
+
+    if (!d_start_time_set) {
+        const double now = std::chrono::duration<double>(
+                               std::chrono::system_clock::now().time_since_epoch())
+                               .count();
+        d_start_time = now - static_cast<double>(d_ring_end) / d_sample_rate;
+        d_start_time_set = true;
+    }
+
+    // Seuls les ring_size derniers échantillons sont utiles
+    const size_t ring_size = d_ring.size();
+    size_t n = static_cast<size_t>(noutput_items);
+    size_t skip = n > ring_size ? n - ring_size : 0;
+    uint64_t position = d_ring_end + skip;
+    for (size_t i = skip; i < n;) {
+        size_t pos = static_cast<size_t>(position % ring_size);
+        size_t chunk = std::min(n - i, ring_size - pos);
+        std::memcpy(&d_ring[pos], in + i, chunk * sizeof(gr_complex));
+        i += chunk;
+        position += chunk;
+    }
+    d_ring_end += n;
+
+    if (!d_pending.empty()) {
+        capture_ready(false);
+    }
+    return noutput_items;
+}
+
+int burst_recorder_impl::get_bursts_recorded() const
+{
+    return d_writer->recorded();
+}
+
+int burst_recorder_impl::get_bursts_dropped() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_lost + d_writer->dropped();
+}
+
+void burst_recorder_impl::set_center_freq(double center_freq)
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_center_freq = center_freq;
+}
+
+void burst_recorder_impl::set_start_time(double unix_seconds)
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_start_time = unix_seconds;
+    d_start_time_set = true;
+    d_start_time_fixed = true;
+}
+
+void burst_recorder_impl::reset_statistics()
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_lost = 0;
+    d_writer->reset_statistics();
+}
+
+void burst_recorder_impl::set_debug_mode(bool enable)
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_debug_mode = enable;
+    d_writer->set_debug_mode(enable);
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,89 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_BURST_RECORDER_IMPL_H
+#define INCLUDED_COSPAS_BURST_RECORDER_IMPL_H
+
+#include <gnuradio/cospas/burst_recorder.h>
+#include "sigmf_burst_writer.h"
+#include <pmt/pmt.h>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+class burst_recorder_impl : public burst_recorder
+{
+private:
+    float d_sample_rate;
+    int d_pre_roll;          // Echantillons avant le burst
+    int d_post_roll;         // Echantillons après le burst
+    double d_center_freq;
+    double d_start_time;     // Date UTC (s Unix) de l'échantillon 0
+    bool d_start_time_set;
+    bool d_start_time_fixed; // set_start_time(): pas de recalage sur l'horloge système
+    bool d_debug_mode;
+
+    // Buffer circulaire: pré-roll + burst le plus long + post-roll + retard des messages
+    static constexpr float MAX_BURST_S = 1.5f;
+    static constexpr float MESSAGE_SLACK_S = 1.0f;
+    std::vector<gr_complex> d_ring;
+    uint64_t d_ring_end;     // Indice absolu qui suit le dernier échantillon reçu
+
+    // Bursts annoncés par le détecteur, en attente de leur post-roll
+    struct pending_burst {
+        uint64_t start;
+        uint64_t size;
+    };
+    std::deque<pending_burst> d_pending;
+    int d_lost;              // Début du burst déja sorti du buffer circulaire
+
+    std::unique_ptr<sigmf_burst_writer> d_writer;
+
+    mutable std::mutex d_mutex;
+
+    void handle_burst_message(pmt::pmt_t msg);
+    void handle_frame_message(pmt::pmt_t msg);
+
+    // Copier les bursts dont le post-roll est reçu (final: sans attendre)
+    void capture_ready(bool final);
+    void capture(const pending_burst& burst);
+    uint64_t ring_begin() const;
+
+public:
+    burst_recorder_impl(float sample_rate,
+                        const std::string& output_dir,
+                        int pre_roll_ms,
+                        int post_roll_ms,
+                        double center_freq,
+                        bool failed_only,
+                        int max_queue_mb,
+                        int decode_timeout_ms,
+                        bool debug_mode);
+    ~burst_recorder_impl() override;
+
+    bool stop() override;
+
+    int work(int noutput_items,
+             gr_vector_const_void_star& input_items,
+             gr_vector_void_star& output_items) override;
+
+    int get_bursts_recorded() const override;
+    int get_bursts_dropped() const override;
+    void set_center_freq(double center_freq) override;
+    void set_start_time(double unix_seconds) override;
+    void reset_statistics() override;
+    void set_debug_mode(bool enable) override;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_BURST_RECORDER_IMPL_H */
@@ -30,15 +30,21 @@ burst_router_impl::burst_router_impl(float sample_rate, bool debug_mode)
       d_sample_rate(sample_rate),
       d_debug_mode(debug_mode),
       d_in_burst(false),
-      d_burst_ready_for_output(false),
-      d_burst_output_offset(0),
+      d_next_id(0),
+      d_fragment_size(static_cast<size_t>(0.020f * sample_rate)),
+      d_classifier(sample_rate),
+      d_msg_classifier(sample_rate),
       d_bursts_1g(0),
-      d_bursts_2g(0)
+      d_bursts_2g(0),
+      d_queue_depth(0),
+      d_max_queue_depth(0)
 {
     // Message ports (asynchrones - prioritaires)
     message_port_register_in(pmt::mp("bursts"));
     message_port_register_out(pmt::mp("bursts_1g"));
     message_port_register_out(pmt::mp("bursts_2g"));
+    message_port_register_out(pmt::mp("fragments_1g"));
+    message_port_register_out(pmt::mp("fragments_2g"));
 
     // Connecter le handler avec boost::bind
     set_msg_handler(pmt::mp("bursts"),
@@ -54,12 +60,15 @@ burst_router_impl::burst_router_impl(float sample_rate, bool debug_mode)
     if (d_debug_mode) {
         std::cout << "[ROUTER] Initialise:" << std::endl;
         std::cout << "  Sample rate: " << d_sample_rate << " Hz" << std::endl;
-        std::cout << "  Mode: sortie progressive multi-appels" << std::endl;
+        std::cout << "  Mode: sortie progressive multi-appels, file de "
+                  << MAX_QUEUED_BURSTS << " bursts" << std::endl;
         std::cout << "  Stream Port 0: Bursts 1G (FGB - BPSK)" << std::endl;
         std::cout << "  Stream Port 1: Bursts 2G (SGB - OQPSK DSSS)" << std::endl;
         std::cout << "  Message Port 'bursts': entree" << std::endl;
         std::cout << "  Message Port 'bursts_1g': sortie 1G" << std::endl;
         std::cout << "  Message Port 'bursts_2g': sortie 2G" << std::endl;
+        std::cout << "  Message Ports 'fragments_1g'/'fragments_2g': bursts en cours de reception"
+                  << std::endl;
     }
 }
 
@@ -83,11 +92,15 @@ burst_router_impl::handle_burst_message(pmt::pmt_t msg)
         return;
     }
 
-    std::vector<gr_complex> samples = pmt::c32vector_elements(samples_pmt);
-    BurstType type = detect_burst_type(samples);
+    // Lecture directe du vecteur PMT (pas de copie)
+    size_t num_samples = 0;
+    const gr_complex* samples = pmt::c32vector_elements(samples_pmt, num_samples);
+    d_msg_classifier.reset();
+    d_msg_classifier.update(samples, static_cast<int>(num_samples));
+    BurstType type = detect_burst_type(d_msg_classifier, num_samples);
 
     // Publier sur les ports de sortie (pour monitoring externe)
-    if (type == TYPE_1G) {
+    if (type == burst_classifier::TYPE_1G) {
         message_port_pub(pmt::mp("bursts_1g"), msg);
     } else {
         message_port_pub(pmt::mp("bursts_2g"), msg);
@@ -95,101 +108,163 @@ burst_router_impl::handle_burst_message(pmt::pmt_t msg)
 }
 
 burst_router_impl::BurstType
-burst_router_impl::detect_burst_type(const std::vector<gr_complex>& samples)
+burst_router_impl::detect_burst_type(burst_classifier& classifier, size_t size) const
 {
-    int size = samples.size();
+    BurstType type = classifier.classify(size);
 
-    // Méthode 1 : Taille du burst (le plus robuste)
-    // 1G : ~14k-20k samples (360ms @ 40kHz)
-    // 2G : ~38k-40k samples (960ms @ 40kHz)
-    const int THRESHOLD_SIZE = 25000;
-
-    if (size < THRESHOLD_SIZE) {
-        if (d_debug_mode) {
+    if (d_debug_mode) {
+        if (classifier.decided()) {
+            std::cout << "[ROUTER] Detection " << (type == burst_classifier::TYPE_1G ? "1G" : "2G")
+                      << " par signature: coherence=" << classifier.coherence()
+                      << " (1G >= " << burst_classifier::COHERENCE_1G
+                      << "), pic PRN=" << classifier.prn_peak_ratio()
+                      << " (2G >= " << prn_2g_detector::PEAK_RATIO_THRESHOLD << ")" << std::endl;
+        } else if (size < static_cast<size_t>(burst_classifier::THRESHOLD_SIZE)) {
             std::cout << "[ROUTER] Detection 1G par taille: " << size
-                      << " samples < " << THRESHOLD_SIZE << std::endl;
-        }
-        return TYPE_1G;
-    }
-
-    // Méthode 2 : Vérification de porteuse (optionnel, confirmation)
-    // 1G a une porteuse non modulée de 160ms = 6400 samples @ 40kHz
-    int carrier_window = static_cast<int>(d_sample_rate * 0.160f);
-
-    if (size >= carrier_window) {
-        bool has_carrier = detect_unmodulated_carrier(samples, carrier_window);
-
-        if (has_carrier && size < THRESHOLD_SIZE * 2) {
-            if (d_debug_mode) {
+                      << " samples < " << burst_classifier::THRESHOLD_SIZE << std::endl;
+        } else {
+            std::cout << "[ROUTER] Analyse porteuse: stddev=" << classifier.phase_stddev()
+                      << " (seuil=" << burst_classifier::CARRIER_THRESHOLD << ") -> "
+                      << (classifier.has_carrier() ? "OUI" : "NON") << std::endl;
+            if (type == burst_classifier::TYPE_1G) {
                 std::cout << "[ROUTER] Detection 1G par porteuse: presente" << std::endl;
+            } else {
+                std::cout << "[ROUTER] Detection 2G: taille=" << size << " samples >= "
+                          << burst_classifier::THRESHOLD_SIZE << std::endl;
             }
-            return TYPE_1G;
         }
     }
-
-    if (d_debug_mode) {
-        std::cout << "[ROUTER] Detection 2G: taille=" << size
-                  << " samples >= " << THRESHOLD_SIZE << std::endl;
-    }
-    return TYPE_2G;
+    return type;
 }
 
-bool
-burst_router_impl::detect_unmodulated_carrier(const std::vector<gr_complex>& samples,
-                                               int window_size)
+// Nouveau burst en fin de file (buffer recyclé)
+void burst_router_impl::open_burst(uint64_t start)
 {
-    if (samples.size() < static_cast<size_t>(window_size)) {
-        return false;
+    routed_burst burst;
+    if (!d_spare_buffers.empty()) {
+        burst.samples.swap(d_spare_buffers.back());
+        d_spare_buffers.pop_back();
     }
+    burst.samples.clear();
+    burst.id = d_next_id++;
+    burst.start = start;
+    burst.type = burst_classifier::TYPE_1G;
+    burst.decided = false;
+    burst.complete = false;
+    burst.discarded = false;
+    burst.output_offset = 0;
+    burst.fragment_offset = 0;
+    d_queue.push_back(std::move(burst));
+
+    d_classifier.reset();
+    d_in_burst = true;
 
-    // Analyser les variations de phase sur la fenêtre
-    // Une porteuse non modulée a une phase stable (faibles variations)
-    std::vector<float> phases;
-    phases.reserve(window_size);
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_queue_depth = static_cast<int>(d_queue.size());
+    d_max_queue_depth = std::max(d_max_queue_depth, d_queue_depth);
+}
 
-    for (int i = 0; i < window_size; i++) {
-        float phase = std::arg(samples[i]);
-        phases.push_back(phase);
+void burst_router_impl::append_samples(const gr_complex* samples, int num_samples)
+{
+    if (!d_in_burst || num_samples <= 0) {
+        return;  // Hors burst: échantillons ignorés
     }
 
-    // Calculer les variations de phase
-    std::vector<float> phase_diffs;
-    for (size_t i = 1; i < phases.size(); i++) {
-        float diff = phases[i] - phases[i-1];
+    routed_burst& burst = d_queue.back();
+    burst.samples.insert(burst.samples.end(), samples, samples + num_samples);
 
-        // Normaliser entre -π et +π
-        while (diff > M_PI) diff -= 2.0f * M_PI;
-        while (diff < -M_PI) diff += 2.0f * M_PI;
+    // Analyse au fil de l'eau (limitée aux 160 premières ms)
+    d_classifier.update(samples, num_samples);
 
-        phase_diffs.push_back(std::abs(diff));
+    // Décision anticipée: le debut du burst part vers le démodulateur sans
+    // attendre la fin de la réception
+    if (!burst.decided && d_classifier.decided()) {
+        burst.type = detect_burst_type(d_classifier, burst.samples.size());
+        burst.decided = true;
     }
-
-    // Calculer l'écart-type des variations de phase
-    float mean = 0.0f;
-    for (float diff : phase_diffs) {
-        mean += diff;
+    if (burst.decided && burst.samples.size() - burst.fragment_offset >= d_fragment_size) {
+        publish_fragment(burst);
     }
-    mean /= phase_diffs.size();
+}
 
-    float variance = 0.0f;
-    for (float diff : phase_diffs) {
-        float delta = diff - mean;
-        variance += delta * delta;
+void burst_router_impl::close_burst(bool valid)
+{
+    routed_burst& burst = d_queue.back();
+    burst.complete = true;
+    d_in_burst = false;
+
+    if (!valid) {
+        // Burst abandonné par le détecteur: le démodulateur oublie les
+        // fragments reçus, la sortie stream déjà commencée se termine
+        burst.discarded = true;
+        if (burst.fragment_offset > 0) {
+            publish_fragment(burst);
+        }
+        if (d_debug_mode) {
+            std::cout << "[ROUTER] Burst abandonne: " << burst.samples.size() << " samples"
+                      << std::endl;
+        }
+        if (burst.output_offset == 0) {
+            d_spare_buffers.push_back(std::move(burst.samples));
+            d_queue.pop_back();
+            std::lock_guard<std::mutex> lock(d_mutex);
+            d_queue_depth = static_cast<int>(d_queue.size());
+        }
+        return;
     }
-    variance /= phase_diffs.size();
-    float stddev = std::sqrt(variance);
 
-    // Seuil : porteuse non modulée a stddev < 0.3 radians
-    const float CARRIER_THRESHOLD = 0.3f;
-    bool is_carrier = (stddev < CARRIER_THRESHOLD);
+    // Pas de décision anticipée: taille du burst complet
+    if (!burst.decided) {
+        burst.type = detect_burst_type(d_classifier, burst.samples.size());
+        burst.decided = true;
+    }
+    publish_fragment(burst);
+
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        if (burst.type == burst_classifier::TYPE_1G) {
+            d_bursts_1g++;
+        } else {
+            d_bursts_2g++;
+        }
+    }
 
     if (d_debug_mode) {
-        std::cout << "[ROUTER] Analyse porteuse: stddev=" << stddev
-                  << " (seuil=" << CARRIER_THRESHOLD << ") -> "
-                  << (is_carrier ? "OUI" : "NON") << std::endl;
+        std::cout << "[ROUTER] Burst complet: " << burst.samples.size() << " samples ("
+                  << d_queue.size() << " en file)" << std::endl;
     }
+}
 
-    return is_carrier;
+// Échantillons reçus depuis le fragment précédent; le dernier fragment
+// (last) suit burst_end, éventuellement vide
+void burst_router_impl::publish_fragment(routed_burst& burst)
+{
+    const size_t count = burst.samples.size() - burst.fragment_offset;
+    pmt::pmt_t msg = pmt::make_dict();
+    msg = pmt::dict_add(msg, pmt::mp("burst"), pmt::from_uint64(burst.id));
+    msg = pmt::dict_add(msg, pmt::mp("start"), pmt::from_uint64(burst.start));
+    msg = pmt::dict_add(msg, pmt::mp("offset"), pmt::from_uint64(burst.fragment_offset));
+    msg = pmt::dict_add(msg,
+                        pmt::mp("samples"),
+                        pmt::init_c32vector(count, burst.samples.data() + burst.fragment_offset));
+    msg = pmt::dict_add(msg, pmt::mp("last"), pmt::from_bool(burst.complete));
+    msg = pmt::dict_add(msg, pmt::mp("discarded"), pmt::from_bool(burst.discarded));
+
+    if (burst.type == burst_classifier::TYPE_1G) {
+        message_port_pub(pmt::mp("fragments_1g"), msg);
+    } else {
+        message_port_pub(pmt::mp("fragments_2g"), msg);
+    }
+    burst.fragment_offset = burst.samples.size();
+}
+
+void burst_router_impl::recycle_front()
+{
+    d_spare_buffers.push_back(std::move(d_queue.front().samples));
+    d_queue.pop_front();
+
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_queue_depth = static_cast<int>(d_queue.size());
 }
 
 int burst_router_impl::general_work(int noutput_items,
@@ -198,166 +273,116 @@ int burst_router_impl::general_work(int noutput_items,
                                      gr_vector_void_star& output_items)
 {
     const gr_complex* in = static_cast<const gr_complex*>(input_items[0]);
-    gr_complex* out0 = static_cast<gr_complex*>(output_items[0]);  // 1G
-    gr_complex* out1 = static_cast<gr_complex*>(output_items[1]);  // 2G
-
-    int ninput = ninput_items[0];
-    int produced0 = 0;
-    int produced1 = 0;
-
-    // BLOQUER l'entree si un burst est en cours de sortie
-    // Sinon le burst suivant arrive avant que le courant soit fini!
-    if (d_burst_ready_for_output) {
-        // Ne pas consommer d'entree tant que le burst n'est pas completement sorti
-        ninput = 0;
-    }
+    gr_complex* out[2] = { static_cast<gr_complex*>(output_items[0]),    // 1G
+                           static_cast<gr_complex*>(output_items[1]) };  // 2G
 
-    // Lire les tags AVANT d'accumuler pour détecter les debuts/fins de burst
-    std::vector<tag_t> tags;
-    if (ninput > 0) {
-        get_tags_in_range(tags, 0, nitems_read(0), nitems_read(0) + ninput);
-    }
+    const int ninput = ninput_items[0];
+    const uint64_t first_item = nitems_read(0);
 
-    bool was_in_burst = d_in_burst;
-    bool burst_start_found = false;
-    bool burst_end_found = false;
+    // ÉTAPE 1: Accumuler l'entrée, découpée aux tags burst_start/burst_end
+    // L'entrée n'est jamais bloquée par la sortie, seulement par une file pleine
+    std::vector<tag_t> tags;
+    get_tags_in_range(tags, 0, first_item, first_item + ninput);
 
+    int consumed = ninput;
+    int pos = 0;
     for (const auto& tag : tags) {
-        if (pmt::eq(tag.key, pmt::intern("burst_start"))) {
-            // IMPORTANT: Ne réinitialiser QUE si c'est un NOUVEAU burst
-            // Le detector envoie burst_start sur chaque fragment du même burst!
-            if (!was_in_burst && !d_in_burst) {
-                burst_start_found = true;
-                d_in_burst = true;
-                d_burst_ready_for_output = false;  // Pas encore pret
-                d_current_burst.clear();
-                d_burst_output_offset = 0;
+        const int offset = static_cast<int>(tag.offset - first_item);
 
-                if (d_debug_mode) {
-                    long size = pmt::to_long(tag.value);
-                    std::cout << "[ROUTER] NOUVEAU burst detecte (taille=" << size << ")" << std::endl;
-                }
-            } else {
+        if (pmt::eq(tag.key, pmt::intern("burst_start"))) {
+            // Le detector peut répéter burst_start dans un même burst: ignoré
+            if (d_in_burst) {
                 if (d_debug_mode) {
                     std::cout << "[ROUTER] Tag burst_start ignore (deja dans un burst)" << std::endl;
                 }
+                continue;
+            }
+            if (d_queue.size() >= MAX_QUEUED_BURSTS) {
+                // File pleine: reprendre a ce burst au prochain appel
+                consumed = offset;
+                break;
+            }
+            // Indice absolu du debut (détecteur), sinon position dans le flux
+            const uint64_t start =
+                pmt::is_uint64(tag.value) ? pmt::to_uint64(tag.value) : tag.offset;
+            open_burst(start);
+            pos = offset;
+            if (d_debug_mode) {
+                std::cout << "[ROUTER] NOUVEAU burst detecte (debut=" << start << ")" << std::endl;
             }
         }
         else if (pmt::eq(tag.key, pmt::intern("burst_end"))) {
-            burst_end_found = true;
-            // Ne pas mettre d_in_burst = false ici, on doit d'abord accumuler!
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Tag burst_end detecte" << std::endl;
+            if (!d_in_burst) {
+                continue;
             }
+            // Le tag burst_end est sur le dernier échantillon du burst
+            append_samples(in + pos, offset + 1 - pos);
+            pos = offset + 1;
+            close_burst(!pmt::eq(tag.value, pmt::PMT_F));
         }
     }
-
-    // ACCUMULER les samples SI on est dans un burst (inclut le premier fragment!)
-    if (d_in_burst && ninput > 0) {
-        for (int i = 0; i < ninput; i++) {
-            d_current_burst.push_back(in[i]);
-        }
-        if (d_debug_mode && burst_start_found) {
-            std::cout << "[ROUTER] Premier fragment accumule: " << ninput << " samples" << std::endl;
-        }
+    if (consumed == ninput) {
+        append_samples(in + pos, ninput - pos);
     }
 
-    // MAINTENANT gérer burst_end (apres accumulation)
-    if (burst_end_found) {
-        d_burst_ready_for_output = true;  // Maintenant pret a sortir!
-        d_in_burst = false;  // Fin accumulation -> accepter prochain burst!
-        if (d_debug_mode) {
-            std::cout << "[ROUTER] Burst complet: " << d_current_burst.size()
-                      << " samples, pret pour sortie" << std::endl;
-        }
-    }
-
-    // Sortie progressive du burst (peut prendre plusieurs appels work())
-    // IMPORTANT: N'autoriser la sortie QU'APRÈS burst_end (burst complet)
-    if (d_burst_ready_for_output && d_burst_output_offset < d_current_burst.size()) {
-        BurstType type = detect_burst_type(d_current_burst);
-
-        // INCRÉMENTER LES STATS AU PREMIER APPEL (offset=0)
-        // Sinon si flowgraph termine avant sortie complète, stats = 0!
-        if (d_burst_output_offset == 0) {
-            std::lock_guard<std::mutex> lock(d_mutex);
-            if (type == TYPE_1G) {
-                d_bursts_1g++;
-            } else {
-                d_bursts_2g++;
-            }
-
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Debut sortie burst type "
-                          << (type == TYPE_1G ? "1G" : "2G")
-                          << " (" << d_current_burst.size() << " samples)" << std::endl;
-            }
+    // ÉTAPE 2: Vider la file vers les sorties, dans l'ordre des bursts
+    // Un burst sort dès que son type est connu, pendant sa réception; son
+    // dernier échantillon est retenu jusqu'a burst_end pour porter le tag
+    int produced[2] = { 0, 0 };
+    while (!d_queue.empty()) {
+        routed_burst& burst = d_queue.front();
+        if (!burst.decided) {
+            break;
         }
 
-        int remaining = d_current_burst.size() - d_burst_output_offset;
-        int to_copy = std::min(remaining, noutput_items);
-        int port = (type == TYPE_1G) ? 0 : 1;
+        const int port = (burst.type == burst_classifier::TYPE_1G) ? 0 : 1;
+        const size_t ready = burst.complete ? burst.samples.size() : burst.samples.size() - 1;
+        const size_t available = ready - burst.output_offset;
+        const int space = noutput_items - produced[port];
 
-        if (type == TYPE_1G) {
-            // Copier depuis d_burst_output_offset
-            std::memcpy(out0, d_current_burst.data() + d_burst_output_offset,
-                       to_copy * sizeof(gr_complex));
-            produced0 = to_copy;
+        if (available > 0 && space > 0) {
+            const uint64_t write_pos = nitems_written(port) + produced[port];
 
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Sortie 1G: [" << d_burst_output_offset
-                          << ", " << (d_burst_output_offset + to_copy) << ") / "
-                          << d_current_burst.size() << " samples" << std::endl;
+            // Premier fragment: tag burst_start
+            if (burst.output_offset == 0) {
+                add_item_tag(port, write_pos, pmt::intern("burst_start"),
+                             pmt::from_uint64(burst.start));
+                if (d_debug_mode) {
+                    std::cout << "[ROUTER] Debut sortie burst type " << (port == 0 ? "1G" : "2G")
+                              << " a offset " << write_pos << " (debut=" << burst.start << ")"
+                              << std::endl;
+                }
             }
-        }
-        else {  // TYPE_2G
-            std::memcpy(out1, d_current_burst.data() + d_burst_output_offset,
-                       to_copy * sizeof(gr_complex));
-            produced1 = to_copy;
 
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Sortie 2G: [" << d_burst_output_offset
-                          << ", " << (d_burst_output_offset + to_copy) << ") / "
-                          << d_current_burst.size() << " samples" << std::endl;
-            }
+            const int to_copy = static_cast<int>(std::min(available, static_cast<size_t>(space)));
+            std::memcpy(out[port] + produced[port],
+                        burst.samples.data() + burst.output_offset,
+                        to_copy * sizeof(gr_complex));
+            produced[port] += to_copy;
+            burst.output_offset += to_copy;
         }
 
-        // Ajouter tag burst_start au PREMIER fragment seulement
-        if (d_burst_output_offset == 0) {
-            add_item_tag(port, nitems_written(port),
-                        pmt::intern("burst_start"),
-                        pmt::from_long(d_current_burst.size()));
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Tag burst_start ajoute a offset "
-                          << nitems_written(port) << " (taille=" << d_current_burst.size() << ")" << std::endl;
-            }
+        if (!burst.complete || burst.output_offset < burst.samples.size()) {
+            break;  // Attendre la suite du burst ou de la place en sortie
         }
 
-        d_burst_output_offset += to_copy;
-
-        // Si tout le burst est sorti, ajouter burst_end et nettoyer
-        if (d_burst_output_offset >= d_current_burst.size()) {
-            // Ajouter tag burst_end a la fin du burst
-            add_item_tag(port, nitems_written(port) + to_copy - 1,
-                        pmt::intern("burst_end"),
-                        pmt::from_long(d_current_burst.size()));
-            if (d_debug_mode) {
-                std::cout << "[ROUTER] Tag burst_end ajoute a offset "
-                          << (nitems_written(port) + to_copy - 1) << std::endl;
-                std::cout << "[ROUTER] Burst completement sorti -> reset" << std::endl;
-            }
-
-            d_current_burst.clear();
-            d_burst_output_offset = 0;
-            d_burst_ready_for_output = false;
-            d_in_burst = false;
+        // Burst entièrement sorti: tag burst_end sur son dernier échantillon
+        add_item_tag(port, nitems_written(port) + produced[port] - 1,
+                     pmt::intern("burst_end"),
+                     burst.discarded ? pmt::PMT_F : pmt::from_long(burst.samples.size()));
+        if (d_debug_mode) {
+            std::cout << "[ROUTER] Burst completement sorti ("
+                      << burst.samples.size() << " samples)" << std::endl;
         }
+        recycle_front();
     }
 
-    consume_each(ninput);
+    consume_each(consumed);
 
-    // Retourner le max des deux sorties pour GNU Radio
-    return std::max(produced0, produced1);
+    // Chaque sortie ne produit que ses propres échantillons
+    produce(0, produced[0]);
+    produce(1, produced[1]);
+    return WORK_CALLED_PRODUCE;
 }
 
 int burst_router_impl::get_bursts_1g() const
@@ -372,11 +397,24 @@ int burst_router_impl::get_bursts_2g() const
     return d_bursts_2g;
 }
 
+int burst_router_impl::get_queue_depth() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_queue_depth;
+}
+
+int burst_router_impl::get_max_queue_depth() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_max_queue_depth;
+}
+
 void burst_router_impl::reset_statistics()
 {
     std::lock_guard<std::mutex> lock(d_mutex);
     d_bursts_1g = 0;
     d_bursts_2g = 0;
+    d_max_queue_depth = d_queue_depth;
 }
 
 void burst_router_impl::set_debug_mode(bool enable)
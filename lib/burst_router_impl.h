@@ -9,6 +9,8 @@
 #define INCLUDED_COSPAS_BURST_ROUTER_IMPL_H
 
 #include <gnuradio/cospas/burst_router.h>
+#include "burst_classifier.h"
+#include <deque>
 #include <vector>
 #include <mutex>
 
@@ -22,27 +24,50 @@ private:
     float d_sample_rate;
     bool d_debug_mode;
 
-    // État du burst en cours
-    std::vector<gr_complex> d_current_burst;
-    bool d_in_burst;
-    bool d_burst_ready_for_output;  // true après burst_end
-    int d_burst_output_offset;  // Position de sortie dans le burst actuel
+    typedef burst_classifier::burst_type BurstType;
+
+    // Burst en file: accumulé en entrée, sorti dès que son type est connu,
+    // dans l'ordre d'arrivée
+    struct routed_burst {
+        std::vector<gr_complex> samples;
+        uint64_t id;             // Numéro du burst (messages fragments)
+        uint64_t start;          // Indice absolu du debut (tag burst_start)
+        BurstType type;
+        bool decided;            // Type connu: sortie et fragments possibles
+        bool complete;           // burst_end reçu
+        bool discarded;          // Abandonné par le détecteur
+        size_t output_offset;    // Position de sortie stream dans le burst
+        size_t fragment_offset;  // Échantillons déjà publiés en fragments
+    };
+
+    // File bornée: l'entrée n'est bloquée que si elle est pleine
+    static constexpr size_t MAX_QUEUED_BURSTS = 8;
+    std::deque<routed_burst> d_queue;
+    bool d_in_burst;  // Le dernier burst de la file est en cours d'accumulation
+    std::vector<std::vector<gr_complex>> d_spare_buffers;  // Buffers recyclés
+    uint64_t d_next_id;
+    size_t d_fragment_size;  // Fragment publié au plus tard tous les 20 ms
+
+    // Classification calculée une seule fois par burst
+    burst_classifier d_classifier;      // Stream: alimenté pendant l'accumulation
+    burst_classifier d_msg_classifier;  // Messages: thread du handler
 
     // Statistiques
     int d_bursts_1g;
     int d_bursts_2g;
+    int d_queue_depth;
+    int d_max_queue_depth;
 
     // Thread-safety
     mutable std::mutex d_mutex;
 
     // Méthodes privées
-    enum BurstType {
-        TYPE_1G,  // First Generation (FGB)
-        TYPE_2G   // Second Generation (SGB)
-    };
-
-    BurstType detect_burst_type(const std::vector<gr_complex>& samples);
-    bool detect_unmodulated_carrier(const std::vector<gr_complex>& samples, int window_size);
+    BurstType detect_burst_type(burst_classifier& classifier, size_t size) const;
+    void open_burst(uint64_t start);
+    void append_samples(const gr_complex* samples, int num_samples);
+    void close_burst(bool valid);
+    void publish_fragment(routed_burst& burst);
+    void recycle_front();
 
     // Message handler
     void handle_burst_message(pmt::pmt_t msg);
@@ -60,6 +85,8 @@ public:
     // Méthodes publiques
     int get_bursts_1g() const override;
     int get_bursts_2g() const override;
+    int get_queue_depth() const override;
+    int get_max_queue_depth() const override;
     void reset_statistics() override;
     void set_debug_mode(bool enable) override;
 };
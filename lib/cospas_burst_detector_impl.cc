@@ -6,12 +6,12 @@
  */
 
 #include "cospas_burst_detector_impl.h"
+#include "lag_autocorrelation.h"
 #include <gnuradio/io_signature.h>
 #include <pmt/pmt.h>
 #include <iostream>
 #include <cmath>
 #include <algorithm>
-#include <cstring>
 
 namespace gr {
 namespace cospas {
@@ -45,8 +45,9 @@ cospas_burst_detector_impl::cospas_burst_detector_impl(float sample_rate,
       d_samples_per_bit(static_cast<int>(sample_rate / 400.0f)),
       d_buffer_index(0),
       d_state(IDLE),
+      d_sample_count(0),
+      d_burst_start(0),
       d_silence_count(0),
-      d_output_offset(0),
       d_bursts_detected(0)
 {
     d_buffer_size = static_cast<int>((sample_rate * buffer_duration_ms) / 1000.0f);
@@ -79,25 +80,13 @@ cospas_burst_detector_impl::~cospas_burst_detector_impl()
 
 float cospas_burst_detector_impl::compute_autocorrelation()
 {
-    float mean = 0.0f;
-    for (int i = 0; i < 2 * d_samples_per_bit; i++) {
-        mean += d_correlation_buffer[i];
-    }
-    mean /= (2 * d_samples_per_bit);
-
-    float correlation = 0.0f;
-    for (int i = 0; i < d_samples_per_bit; i++) {
-        int idx1 = (d_buffer_index + i) % (2 * d_samples_per_bit);
-        int idx2 = (d_buffer_index + i + d_samples_per_bit) % (2 * d_samples_per_bit);
-        correlation += (d_correlation_buffer[idx1] - mean) * (d_correlation_buffer[idx2] - mean);
-    }
-
-    return std::abs(correlation);
+    return lag_autocorrelation(d_correlation_buffer.data(), d_buffer_index, d_samples_per_bit);
 }
 
 void cospas_burst_detector_impl::process_sample(const gr_complex& sample)
 {
     float amplitude = std::abs(sample);
+    const uint64_t sample_index = d_sample_count++;
 
     d_correlation_buffer[d_buffer_index] = amplitude;
     d_buffer_index = (d_buffer_index + 1) % (2 * d_samples_per_bit);
@@ -134,6 +123,7 @@ void cospas_burst_detector_impl::process_sample(const gr_complex& sample)
         case IDLE:
             if (correlation > d_adaptive_threshold) {
                 d_state = IN_BURST;
+                d_burst_start = sample_index;
                 d_burst_samples.clear();
                 d_burst_samples.push_back(sample);
                 d_silence_count = 0;
@@ -201,7 +191,7 @@ void cospas_burst_detector_impl::process_sample(const gr_complex& sample)
             break;
 
         case BURST_COMPLETE:
-            // Attendre que le burst soit extrait (ne rien faire)
+            // Message publié par general_work avant l'échantillon suivant
             break;
     }
 }
@@ -211,12 +201,24 @@ bool cospas_burst_detector_impl::is_burst_ready()
     return d_state == BURST_COMPLETE;
 }
 
-void cospas_burst_detector_impl::extract_burst(std::vector<gr_complex>& burst_data)
+// Burst complet: envoi via message port (asynchrone)
+void cospas_burst_detector_impl::publish_burst(uint64_t timestamp)
 {
-    // Copier les echantillons du burst
-    burst_data = d_burst_samples;
+    pmt::pmt_t burst_msg = pmt::make_dict();
+    pmt::pmt_t samples_vec = pmt::init_c32vector(d_burst_samples.size(), d_burst_samples.data());
+    burst_msg = pmt::dict_add(burst_msg, pmt::mp("samples"), samples_vec);
+    burst_msg = pmt::dict_add(burst_msg, pmt::mp("size"), pmt::from_long(d_burst_samples.size()));
+    burst_msg = pmt::dict_add(burst_msg, pmt::mp("timestamp"), pmt::from_uint64(timestamp));
+    burst_msg = pmt::dict_add(burst_msg, pmt::mp("start"), pmt::from_uint64(d_burst_start));
+
+    message_port_pub(pmt::mp("bursts"), burst_msg);
+
+    if (d_debug_mode) {
+        std::cout << "[BURST_DETECTOR] Message envoye: " << d_burst_samples.size()
+                  << " samples via port 'bursts'" << std::endl;
+    }
 
-    // Réinitialiser l'état apres extraction
+    // Réinitialiser l'état apres envoi
     reset_burst_state();
 }
 
@@ -241,90 +243,34 @@ int cospas_burst_detector_impl::general_work(int noutput_items,
     int produced = 0;
     int consumed = 0;
 
-    // Priorité 1: Si on a un burst en cours de sortie, continuer a le produire
-    if (d_output_offset < d_output_burst.size()) {
-        size_t remaining = d_output_burst.size() - d_output_offset;
-        size_t to_copy = std::min(remaining, static_cast<size_t>(noutput_items));
-
-        // Copier la portion du burst
-        std::memcpy(out, &d_output_burst[d_output_offset], to_copy * sizeof(gr_complex));
-        d_output_offset += to_copy;
-        produced = static_cast<int>(to_copy);
-
-        // Si le burst est completement sorti, le libérer
-        if (d_output_offset >= d_output_burst.size()) {
-            if (d_debug_mode) {
-                std::cout << "[BURST_DETECTOR] Burst fully output ("
-                          << d_output_burst.size() << " samples)" << std::endl;
-            }
-
-            // Tag de fin de burst (à la dernière position)
-            add_item_tag(0, nitems_written(0) + produced - 1,
-                         pmt::intern("burst_end"),
-                         pmt::PMT_T);
-
-            d_output_burst.clear();
-            d_output_offset = 0;
-        }
-
-        // Ne pas consommer d'entree pendant qu'on sort un burst
-        consume_each(0);
-        return produced;
-    }
-
-    // Priorité 2: Traiter les echantillons entrants
-    for (int i = 0; i < ninput; i++) {
-        process_sample(in[i]);
-    }
-    consumed = ninput;
-
-    // Priorité 3: Si un burst est pret, le préparer pour la sortie
-    if (is_burst_ready()) {
-        extract_burst(d_output_burst);
-        d_output_offset = 0;
-
-        // Envoyer le burst via message port (asynchrone)
-        pmt::pmt_t burst_msg = pmt::make_dict();
-        pmt::pmt_t samples_vec = pmt::init_c32vector(d_output_burst.size(), d_output_burst.data());
-        burst_msg = pmt::dict_add(burst_msg, pmt::mp("samples"), samples_vec);
-        burst_msg = pmt::dict_add(burst_msg, pmt::mp("size"), pmt::from_long(d_output_burst.size()));
-        burst_msg = pmt::dict_add(burst_msg, pmt::mp("timestamp"), pmt::from_uint64(nitems_read(0)));
-
-        message_port_pub(pmt::mp("bursts"), burst_msg);
-
-        if (d_debug_mode) {
-            std::cout << "[BURST_DETECTOR] Message envoye: " << d_output_burst.size()
-                      << " samples via port 'bursts'" << std::endl;
-        }
-
-        // Tag de debut de burst (pour compatibilité stream)
-        add_item_tag(0, nitems_written(0),
-                     pmt::intern("burst_start"),
-                     pmt::from_long(d_output_burst.size()));
-
-        // Produire autant que possible immédiatement
-        size_t to_copy = std::min(d_output_burst.size(), static_cast<size_t>(noutput_items));
-        std::memcpy(out, &d_output_burst[0], to_copy * sizeof(gr_complex));
-        d_output_offset = to_copy;
-        produced = static_cast<int>(to_copy);
-
-        if (d_debug_mode) {
-            if (to_copy < d_output_burst.size()) {
-                std::cout << "[BURST_DETECTOR] Burst partial output: "
-                          << to_copy << " / " << d_output_burst.size() << " samples" << std::endl;
-            } else {
-                std::cout << "[BURST_DETECTOR] Burst fully output ("
-                          << d_output_burst.size() << " samples)" << std::endl;
-
+    // Le burst sort sur le stream au fil de sa réception: le router peut le
+    // classer et le transmettre aux démodulateurs avant sa fin.
+    // burst_start (indice absolu du debut) sur le premier échantillon,
+    // burst_end sur le dernier: PMT_T si valide, PMT_F si trop court (abandonné)
+    // Une place de sortie par échantillon traité: arrêt quand la sortie est pleine
+    while (consumed < ninput && produced < noutput_items) {
+        const BurstState previous = d_state;
+        process_sample(in[consumed]);
+        consumed++;
+
+        if (previous == IDLE && d_state == IN_BURST) {
+            add_item_tag(0, nitems_written(0) + produced,
+                         pmt::intern("burst_start"),
+                         pmt::from_uint64(d_burst_start));
+            out[produced++] = in[consumed - 1];
+        } else if (previous == IN_BURST) {
+            out[produced++] = in[consumed - 1];
+            if (d_state != IN_BURST) {
                 // Tag de fin de burst (à la dernière position)
                 add_item_tag(0, nitems_written(0) + produced - 1,
                              pmt::intern("burst_end"),
-                             pmt::PMT_T);
-
-                d_output_burst.clear();
-                d_output_offset = 0;
+                             is_burst_ready() ? pmt::PMT_T : pmt::PMT_F);
             }
         }
+
+        if (is_burst_ready()) {
+            publish_burst(nitems_read(0) + consumed);
+        }
     }
 
     // Consommer les echantillons d'entree
@@ -48,17 +48,15 @@ private:
     enum BurstState {
         IDLE,           // Pas de burst en cours
         IN_BURST,       // Burst en cours de capture
-        BURST_COMPLETE  // Burst capturé, prêt a sortir
+        BURST_COMPLETE  // Burst capturé, message a publier
     };
 
     BurstState d_state;
     std::vector<gr_complex> d_burst_samples;  // Échantillons du burst en cours de détection
+    uint64_t d_sample_count;                   // Échantillons analysés depuis le démarrage
+    uint64_t d_burst_start;                    // Indice absolu du premier échantillon du burst
     int d_silence_count;                       // Compteur d'échantillons sous le seuil
 
-    // Sortie du burst en cours (peut être produit sur plusieurs appels)
-    std::vector<gr_complex> d_output_burst;   // Burst prêt a sortir
-    size_t d_output_offset;                    // Position dans d_output_burst
-
     // Statistiques
     int d_bursts_detected;
 
@@ -68,7 +66,7 @@ private:
     // Méthodes privées
     void process_sample(const gr_complex& sample);
     bool is_burst_ready();
-    void extract_burst(std::vector<gr_complex>& burst_data);
+    void publish_burst(uint64_t timestamp);
     void reset_burst_state();
 
 public:
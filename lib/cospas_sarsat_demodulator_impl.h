@@ -7,10 +7,18 @@
 #define INCLUDED_COSPAS_COSPAS_SARSAT_DECODER_IMPL_H
 
 #include <gnuradio/cospas/cospas_sarsat_demodulator.h>
-#include <vector>
+#include "bpsk_demod_core.h"
+#include "burst_demod_worker.h"
+#include "latency_stats.h"
+#include "thread_pool.h"
+#include <chrono>
 #include <complex>
+#include <condition_variable>
 #include <deque>
+#include <map>
+#include <memory>
 #include <mutex>
+#include <vector>
 
 namespace gr {
 namespace cospas {
@@ -20,113 +28,77 @@ class cospas_sarsat_demodulator_impl : public cospas_sarsat_demodulator
 private:
     // Paramètres fixes
     float d_sample_rate;
-    static constexpr float BIT_RATE = 400.0f;
-    int d_samples_per_bit;
-    static constexpr float CARRIER_DURATION = 0.160f;
-    int d_carrier_samples;
-    int d_carrier_samples_min;  // Minimum requis avec correction active
-    
-    // Structure COSPAS-SARSAT (démodulateur)
-    static constexpr int BIT_SYNC_BITS = 15;       // Bits 1-15: bit sync (15 bits a '1')
-    static constexpr int FRAME_SYNC_BITS = 9;      // Bits 16-24: frame sync pattern (9 bits)
-    static constexpr int MESSAGE_BITS = 120;       // Bits 25-144: message (120 bits)
-    static constexpr int TOTAL_BITS = 144;         // Total: 15 + 9 + 120
-
-    // Seuils
-    static constexpr float MOD_PHASE = 1.1f;
-    static constexpr float PHASE_THRESHOLD = 1.0f;
-    static constexpr float CARRIER_THRESHOLD = 0.3f;
-    static constexpr float JUMP_THRESHOLD = 0.7f;
-    static constexpr int MAX_CONSECUTIVE_ERRORS = 8;
-    
+    static constexpr int TOTAL_BITS = bpsk_demod_core::TOTAL_BITS;
+
     void handle_burst_message(pmt::pmt_t msg);  // Handler pour les messages
-    void process_burst(const gr_complex* samples, int num_samples);  // Traitement d'un burst
-
-    // États
-    enum DemodulatorState {
-        STATE_CARRIER_SEARCH,
-        STATE_CARRIER_TRACKING,
-        STATE_BIT_SYNC,
-        STATE_FRAME_SYNC,
-        STATE_MESSAGE
-    };
 
-    // Variables d'état
-    DemodulatorState d_state;
-    int d_carrier_count;
-    int d_carrier_start_idx;
-    int d_sample_count;
-    int d_bits_demodulated;    // Bits démodulés (données uniquement)
-    int d_total_bit_count;     // Tous les bits (préambule + sync + données)
-    int d_preamble_ones;
-    int d_error_count;
-
-    // Récupération de timing sur bits de sync
-    std::vector<int> d_transition_positions;  // Positions des transitions detectees
-    int d_sync_sample_count;                  // Compteur d'échantillons pendant sync
-    float d_measured_samples_per_bit;         // Samples/bit mesuré réellement
-
-    // Gestion des bursts (via tags burst_start)
-    long d_expected_burst_size;  // Taille attendue du burst (depuis tag burst_start)
-    bool d_waiting_for_burst;    // True = ignorer les samples jusqu'au prochain burst_start
-
-    // Buffers
-    std::vector<std::complex<float>> d_bit_buffer;
-    std::vector<float> d_phase_history;
+    // Machine a états et filtre adapté (mode flux, work())
+    bpsk_demod_core d_core;
 
     // Buffer d'accumulation pour déterminisme
-    std::deque<gr_complex> d_sample_accumulator;
     static constexpr int MIN_SAMPLES_FOR_FRAME = 20000;  // Proche de burst réel (20778) mais permet accumulation
 
-    // Traitement phase
-    float d_last_phase;
-    float d_phase_avg;
-    int d_consecutive_carrier;
-
-    // Timing (DÉSACTIVÉ pour signal synthétique)
-    float d_timing_error;
-    float d_mu;
-    float d_omega;
-    float d_gain_omega;
-    float d_gain_mu;
-    float d_pll_integral;
-    float d_pll_phase;              // Phase estimée par la PLL
-    static constexpr float PLL_ALPHA = 0.1f;   // Gain proportionnel PLL
-    static constexpr float PLL_BETA = 0.01f;   // Gain intégral PLL
-
-    // Correction de fréquence automatique
-    float d_freq_offset;           // Offset de fréquence estimé (Hz)
-    float d_phase_correction;      // Phase accumulee pour la correction
-    bool d_freq_lock;              // Indique si l'offset est verrouillé
-    bool d_freq_correction_frozen; // Gel de la correction après détection du saut BPSK
-    float d_carrier_phase_ref;     // Phase de référence fixe pour détection porteuse
+    // Résultat d'un burst, en attente de publication dans l'ordre d'arrivée
+    struct burst_result {
+        burst_demod_result demod;
+        std::chrono::steady_clock::time_point arrival;
+        pmt::pmt_t burst_start;  // Clé "start" du message du détecteur (PMT_NIL si absente)
+    };
+
+    // Cadence de travail des bursts: 0 = cadence d'entrée (pas de décimation)
+    int d_working_samples_per_bit;
+
+    // Pool de workers: 0 = traitement synchrone sur le thread des messages
+    int d_num_workers;
+    std::vector<std::unique_ptr<burst_demod_worker>> d_workers;  // Un état complet par worker
+    std::vector<burst_demod_worker*> d_idle_workers;
+    std::unique_ptr<thread_pool> d_burst_pool;
+    std::condition_variable d_idle_cond;  // Worker libéré ou burst publié
+
+    // Publication dans l'ordre d'arrivée, hors de d_mutex: un seul thread a la
+    // fois vide d_publish_queue (les autres y déposent leurs résultats)
+    uint64_t d_next_sequence;
+    uint64_t d_next_publish;
+    std::map<uint64_t, burst_result> d_completed;
+    std::deque<std::pair<uint64_t, burst_result>> d_publish_queue;
+    bool d_publishing;
+
+    // Hypothèses supplémentaires, essayées en parallèle si l'hypothèse nominale échoue
+    std::vector<bpsk_demod_hypothesis> d_hypotheses;
+    std::unique_ptr<thread_pool> d_hypothesis_pool;
+    int d_hypothesis_threads;
+    int d_hypothesis_rescues;  // Trames sauvées par une hypothèse alternative
+
+    // Démodulation par filtre adapté (intégrer-et-vider sur chaque bit)
+    bool d_use_matched_filter;
 
     // Statistiques
     int d_bursts_detected;
+    int d_queue_depth;       // Bursts reçus et pas encore publiés
+    int d_max_queue_depth;
+    latency_stats d_latency;  // Latence arrivée -> publication
     bool d_debug_mode;
 
     // Thread-safety
     mutable std::mutex d_mutex;
 
-    // Filtre phase
-    float d_phase_lpf_state;
-    static constexpr float LPF_ALPHA = 0.3f;
+    void submit_burst(pmt::pmt_t msg, const gr_complex* samples, int num_samples);
+    // Les fonctions suivantes sont appelées avec d_mutex verrouillé
+    // (complete_burst le relâche pendant la publication)
+    void complete_burst(uint64_t sequence,
+                        burst_result&& result,
+                        std::unique_lock<std::mutex>& lock);
+    void wait_idle(std::unique_lock<std::mutex>& lock);
+    void rebuild_workers();
 
-    // Méthodes privées
-    float normalize_phase(float phase);
-    float compute_phase_diff(float phase1, float phase2);
-    float compute_phase(std::complex<float> sample);
-    int detect_transition_position(const std::complex<float>* samples, int num_samples);
-    char decode_bit(const std::complex<float>* samples, int num_samples);
-    bool detect_carrier(float phase);
-    void reset_demodulator();
+    // Trame complète: comptage puis print_frame
+    void publish_frame(const uint8_t* bits, int num_bits);
 
-    // Correction de fréquence
-    gr_complex apply_freq_correction(gr_complex sample);
-    void estimate_freq_offset();
+    // Affichage HEX, décodage dec406 et signal decode_complete (sans d_mutex)
+    void print_frame(const uint8_t* bits, int num_bits);
 
-    // NOUVEAU: Traitement du buffer accumule
-    int process_accumulated_buffer(uint8_t* out, int max_bytes);
+    // Dict publié sur le port "frames"
+    static pmt::pmt_t frame_to_dict(const burst_demod_result& demod, pmt::pmt_t burst_start);
 
 public:
     cospas_sarsat_demodulator_impl(float sample_rate, bool debug_mode);
@@ -135,11 +107,25 @@ public:
     int work(int noutput_items,
              gr_vector_const_void_star &input_items,
              gr_vector_void_star &output_items) override;
+    bool stop() override;
     
     bool is_synchronized() const override;
     int get_frames_decoded() const override;
     int get_sync_failures() const override;
     void set_debug_mode(bool enable) override;
+    void set_matched_filter(bool enable) override;
+    void set_hypotheses(const std::vector<float>& phase_variance_thresholds,
+                        const std::vector<float>& freq_offsets,
+                        const std::vector<float>& timing_offsets) override;
+    void set_hypothesis_threads(int num_threads) override;
+    int get_hypothesis_rescues() const override;
+    void set_num_workers(int num_workers) override;
+    void set_working_samples_per_bit(int samples_per_bit) override;
+    int get_queue_depth() const override;
+    int get_max_queue_depth() const override;
+    double get_mean_latency_ms() const override;
+    double get_max_latency_ms() const override;
+    double get_latency_percentile_ms(double percentile) const override;
     void reset_statistics() override;
 };
 
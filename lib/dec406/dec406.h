@@ -23,8 +23,73 @@
 #define FRAME_1G_LONG 144
 #define FRAME_2G_LENGTH 250
 
+#define BCH_2G_INFO_BITS 202
+#define BCH_2G_PARITY_BITS 48
+#define BCH_2G_MAX_ERRORS 6
+
+// Aircraft/vessel ID type (T.018 bits 91-93)
+#define VESSEL_ID_NONE 0
+#define VESSEL_ID_MMSI 1
+#define VESSEL_ID_CALLSIGN 2
+#define VESSEL_ID_REGISTRATION 3
+#define VESSEL_ID_AVIATION_ADDRESS 4
+#define VESSEL_ID_OPERATOR 5
+
+// Rotating field identifier (T.018 bits 155-158)
+#define ROTATING_G008 0
+#define ROTATING_INFLIGHT_EMERGENCY 1
+#define ROTATING_RLS 2
+#define ROTATING_NATIONAL_USE 3
+#define ROTATING_CANCELLATION 15
+
+// 2G message fields (T.018 Appendix B), filled by parse_2g()
+typedef struct {
+    // Main field (bits 1-154)
+    uint16_t tac;               // Type approval certificate number (bits 1-16)
+    uint16_t serial;            // Serial number (bits 17-30)
+    uint16_t country_code;      // MID (bits 31-40)
+    uint8_t homing_flag;        // bit 41
+    uint8_t rls_flag;           // bit 42
+    uint8_t test_flag;          // bit 43
+    uint8_t has_position;       // bits 44-90 not at their default value
+    double lat;
+    double lon;
+    uint8_t vessel_id_type;     // bits 91-93 (VESSEL_ID_*)
+    uint64_t vessel_id_raw;     // bits 94-137
+    uint32_t mmsi;              // VESSEL_ID_MMSI
+    uint32_t ais_id;            // VESSEL_ID_MMSI: EPIRB-AIS system identity
+    uint32_t aircraft_address;  // VESSEL_ID_AVIATION_ADDRESS
+    uint16_t operator_serial;   // VESSEL_ID_OPERATOR
+    char vessel_id[8];          // Call sign, registration or operator designator
+    uint8_t beacon_type;        // bits 138-140
+    uint16_t spare;             // bits 141-154
+    // Rotating field (bits 155-202)
+    uint8_t rotating_id;        // ROTATING_*
+    uint64_t rotating_raw;      // bits 159-202
+    int hours_since_activation; // G.008 (-1 if absent)
+    int minutes_since_location; // G.008 (-1 if absent)
+    uint8_t has_altitude;       // G.008 / inflight emergency
+    int altitude_m;
+    uint8_t hdop;               // G.008
+    uint8_t vdop;
+    uint8_t activation_type;    // G.008
+    uint8_t battery;            // G.008 / inflight emergency
+    uint8_t gnss_status;        // G.008 / inflight emergency
+    uint32_t location_time_s;   // Inflight emergency: seconds since 00:00 UTC
+    uint8_t triggering_event;   // Inflight emergency
+    uint8_t deactivation;       // Cancellation
+    char hex_id[24];            // 23 Hex ID
+} BeaconInfo2G;
+
 void decode_1g(const uint8_t *bits, int length);
+int check_crc_1g(const uint8_t *bits, int length);  // 1 si CRC valides, sans affichage
 void decode_2g(const uint8_t *bits);
+void decode_2g_corrected(const uint8_t *bits, int corrected);  // Bits already BCH corrected (corrected = bch_2g_correct result)
+
+// BCH(250,202), bits one per byte, bit 1 first
+void bch_2g_encode(const uint8_t *info, uint8_t *parity);  // 202 bits -> 48 parity bits
+int bch_2g_correct(uint8_t *bits);  // 250 bits in place: errors corrected (0-6), -1 if uncorrectable
+int parse_2g(const uint8_t *bits, BeaconInfo2G *info);  // Sans affichage, 0 si OK
 void decode_beacon(const uint8_t *bits, int length);
 
 #endif
@@ -181,6 +181,24 @@ static uint32_t get_bits(const char *s, int start, int len) {
     return val;
 }
 
+// CRC1 on every frame, CRC2 on long frames except orbitography
+// (user protocol 0b000 carries no position data, CRC2 doesn't apply)
+static void check_frame_crc(const char *frame, int frame_length,
+                            int *crc1_failed, int *crc2_failed, int *is_orbitography) {
+    *crc1_failed = test_crc1(frame);
+    *crc2_failed = 0;
+    *is_orbitography = 0;
+
+    if (frame_length == LONG_FRAME_BITS) {
+        int user_protocol_code = get_bits(frame, 36, 3);
+        *is_orbitography = (user_protocol_code == 0b000);
+
+        if (!*is_orbitography) {
+            *crc2_failed = test_crc2(frame);
+        }
+    }
+}
+
 static int validate_coordinates(double lat, double lon) {
     return (lat >= -90.0 && lat <= 90.0 && lon >= -180.0 && lon <= 180.0);
 }
@@ -860,21 +878,8 @@ static void decode_1g_frame(const char *frame, int frame_length, BeaconInfo1G *i
     info->crc_error = 0;
 
     // CRC verification
-    int crc1_failed = test_crc1(frame);
-    int crc2_failed = 0;
-    int is_orbitography = 0;
-
-    if (frame_length == LONG_FRAME_BITS) {
-        // Check if it's orbitography (protocol 0b000 for user location)
-        // Orbitography beacons don't have position data, so CRC2 doesn't apply
-        int user_protocol_code = get_bits(frame, 36, 3);
-        is_orbitography = (user_protocol_code == 0b000);
-
-        if (!is_orbitography) {
-            // Only test CRC2 if NOT orbitography
-            crc2_failed = test_crc2(frame);
-        }
-    }
+    int crc1_failed, crc2_failed, is_orbitography;
+    check_frame_crc(frame, frame_length, &crc1_failed, &crc2_failed, &is_orbitography);
 
     // Display CRC status
     if (crc1_failed || crc2_failed) {
@@ -1078,8 +1083,24 @@ switch (info->protocol) {
              protocol_str, info->country_code, info->serial);
 }
 // ===================================================
-// Interface function
+// Interface functions
 // ===================================================
+int check_crc_1g(const uint8_t *bits, int length) {
+    if (!bits || (length != SHORT_FRAME_BITS && length != LONG_FRAME_BITS)) {
+        return 0;
+    }
+
+    char frame_str[LONG_FRAME_BITS + 1];
+    for (int i = 0; i < length; i++) {
+        frame_str[i] = (bits[i] & 1) ? '1' : '0';
+    }
+    frame_str[length] = '\0';
+
+    int crc1_failed, crc2_failed, is_orbitography;
+    check_frame_crc(frame_str, length, &crc1_failed, &crc2_failed, &is_orbitography);
+    return !crc1_failed && !crc2_failed;
+}
+
 void decode_1g(const uint8_t *bits, int length) {
     if (length != SHORT_FRAME_BITS && length != LONG_FRAME_BITS) {
         fprintf(stderr, "ERROR: Invalid frame length: %d bits (expected %d or %d)\n", 
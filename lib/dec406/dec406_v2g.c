@@ -0,0 +1,518 @@
+/**********************************
+
+## Licence
+
+ Licence Creative Commons CC BY-NC-SA
+
+## Auteurs et contributions
+
+- **Code original dec406_v7** : F4EHY (2020)
+- **Refactoring et support 2G** : Développement collaboratif (2025)
+- **Conformité T.018** : Implémentation complète BCH + MID database
+
+***********************************/
+
+
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+#include <math.h>
+#include <pthread.h>
+#include "dec406.h"
+#include "display_utils.h"
+#include "country_codes.h"
+
+// ===================================================
+// Constants
+// ===================================================
+// BCH(255,207) over GF(2^8), primitive polynomial x^8+x^4+x^3+x^2+1,
+// shortened to (250,202). Generator = LCM of the minimal polynomials of
+// alpha^1..alpha^12 (T.018 Appendix B):
+// g(x) = x^48 + ... = 1110001111110101110000101110111110011110010010111
+#define GF_PRIMITIVE 0x11D
+#define GF_ORDER 255
+#define BCH_GENERATOR 0x1C7EB85DF3C97ULL
+#define BCH_PARITY_MASK ((1ULL << BCH_2G_PARITY_BITS) - 1)
+#define BCH_SYNDROMES (2 * BCH_2G_MAX_ERRORS)
+
+// ===================================================
+// Tables (built once)
+// ===================================================
+static uint8_t gf_exp[2 * GF_ORDER];
+static uint8_t gf_log[256];
+static uint64_t bch_remainder_table[256];  // (byte * x^48) mod g(x)
+static pthread_once_t bch_tables_once = PTHREAD_ONCE_INIT;
+
+static void build_bch_tables(void) {
+    int x = 1;
+    for (int i = 0; i < GF_ORDER; i++) {
+        gf_exp[i] = (uint8_t)x;
+        gf_exp[i + GF_ORDER] = (uint8_t)x;
+        gf_log[x] = (uint8_t)i;
+        x <<= 1;
+        if (x & 0x100) x ^= GF_PRIMITIVE;
+    }
+    gf_log[0] = 0;  // Never used: zero has no logarithm
+
+    for (int byte = 0; byte < 256; byte++) {
+        uint64_t r = (uint64_t)byte << (BCH_2G_PARITY_BITS - 8);
+        for (int k = 0; k < 8; k++) {
+            int feedback = (int)((r >> (BCH_2G_PARITY_BITS - 1)) & 1);
+            r = (r << 1) & BCH_PARITY_MASK;
+            if (feedback) r ^= BCH_GENERATOR & BCH_PARITY_MASK;
+        }
+        bch_remainder_table[byte] = r;
+    }
+}
+
+static inline uint8_t gf_mul(uint8_t a, uint8_t b) {
+    if (a == 0 || b == 0) return 0;
+    return gf_exp[gf_log[a] + gf_log[b]];
+}
+
+static inline uint8_t gf_div(uint8_t a, uint8_t b) {
+    if (a == 0) return 0;
+    return gf_exp[gf_log[a] + GF_ORDER - gf_log[b]];
+}
+
+// ===================================================
+// BCH(250,202)
+// ===================================================
+// m(x) * x^48 mod g(x) over the 202 information bits, MSB (bit 1) first:
+// 2 leading bits one at a time, then 25 bytes through the table
+static uint64_t bch_info_remainder(const uint8_t *info) {
+    uint64_t r = 0;
+    const int lead = BCH_2G_INFO_BITS % 8;
+    int i;
+
+    for (i = 0; i < lead; i++) {
+        int feedback = (int)((r >> (BCH_2G_PARITY_BITS - 1)) & 1) ^ (info[i] & 1);
+        r = (r << 1) & BCH_PARITY_MASK;
+        if (feedback) r ^= BCH_GENERATOR & BCH_PARITY_MASK;
+    }
+    for (; i < BCH_2G_INFO_BITS; i += 8) {
+        int byte = 0;
+        for (int k = 0; k < 8; k++) {
+            byte = (byte << 1) | (info[i + k] & 1);
+        }
+        int index = (int)((r >> (BCH_2G_PARITY_BITS - 8)) & 0xFF) ^ byte;
+        r = ((r << 8) & BCH_PARITY_MASK) ^ bch_remainder_table[index];
+    }
+    return r;
+}
+
+void bch_2g_encode(const uint8_t *info, uint8_t *parity) {
+    pthread_once(&bch_tables_once, build_bch_tables);
+
+    uint64_t r = bch_info_remainder(info);
+    for (int i = 0; i < BCH_2G_PARITY_BITS; i++) {
+        parity[i] = (uint8_t)((r >> (BCH_2G_PARITY_BITS - 1 - i)) & 1);
+    }
+}
+
+int bch_2g_correct(uint8_t *bits) {
+    pthread_once(&bch_tables_once, build_bch_tables);
+
+    // Remainder of the received word: recomputed parity XOR received parity
+    uint64_t r = bch_info_remainder(bits);
+    for (int i = 0; i < BCH_2G_PARITY_BITS; i++) {
+        r ^= (uint64_t)(bits[BCH_2G_INFO_BITS + i] & 1) << (BCH_2G_PARITY_BITS - 1 - i);
+    }
+    if (r == 0) {
+        return 0;
+    }
+
+    // Syndromes S_j = r(alpha^j), j = 1..12 (roots of g(x))
+    uint8_t s[BCH_SYNDROMES + 1];
+    for (int j = 1; j <= BCH_SYNDROMES; j++) {
+        uint8_t sum = 0;
+        for (int k = 0; k < BCH_2G_PARITY_BITS; k++) {
+            if ((r >> k) & 1) sum ^= gf_exp[(j * k) % GF_ORDER];
+        }
+        s[j] = sum;
+    }
+
+    // Berlekamp-Massey: error locator Lambda(x)
+    uint8_t lambda[BCH_SYNDROMES + 1] = { 1 };
+    uint8_t prev[BCH_SYNDROMES + 1] = { 1 };
+    uint8_t temp[BCH_SYNDROMES + 1];
+    int degree = 0;
+    int shift = 1;
+    uint8_t prev_discrepancy = 1;
+
+    for (int n = 0; n < BCH_SYNDROMES; n++) {
+        uint8_t d = s[n + 1];
+        for (int i = 1; i <= degree; i++) {
+            d ^= gf_mul(lambda[i], s[n + 1 - i]);
+        }
+        if (d == 0) {
+            shift++;
+            continue;
+        }
+        uint8_t scale = gf_div(d, prev_discrepancy);
+        memcpy(temp, lambda, sizeof(lambda));
+        for (int i = 0; i + shift <= BCH_SYNDROMES; i++) {
+            lambda[i + shift] ^= gf_mul(scale, prev[i]);
+        }
+        if (2 * degree <= n) {
+            degree = n + 1 - degree;
+            memcpy(prev, temp, sizeof(prev));
+            prev_discrepancy = d;
+            shift = 1;
+        } else {
+            shift++;
+        }
+    }
+    if (degree > BCH_2G_MAX_ERRORS) {
+        return -1;
+    }
+
+    // Chien search over the 250 positions of the shortened code:
+    // bit i (0-based) is the coefficient of x^(249-i). Term i of
+    // Lambda(alpha^-p) is kept as a logarithm and stepped by -i per position
+    int log_terms[BCH_2G_MAX_ERRORS + 1];
+    for (int i = 1; i <= degree; i++) {
+        log_terms[i] = lambda[i] ? gf_log[lambda[i]] : -1;
+    }
+    int positions[BCH_2G_MAX_ERRORS];
+    int found = 0;
+    for (int p = 0; p < FRAME_2G_LENGTH; p++) {
+        uint8_t sum = lambda[0];
+        for (int i = 1; i <= degree; i++) {
+            if (log_terms[i] < 0) continue;
+            sum ^= gf_exp[log_terms[i]];
+            log_terms[i] -= i;
+            if (log_terms[i] < 0) log_terms[i] += GF_ORDER;
+        }
+        if (sum == 0) {
+            if (found == degree) return -1;
+            positions[found++] = FRAME_2G_LENGTH - 1 - p;
+        }
+    }
+    if (found != degree) {
+        return -1;  // Roots outside the shortened code: uncorrectable
+    }
+
+    for (int i = 0; i < found; i++) {
+        bits[positions[i]] ^= 1;
+    }
+    return found;
+}
+
+// ===================================================
+// Utility functions
+// ===================================================
+// Bits numbered as in T.018 (bit 1 = first message bit)
+static uint64_t field(const uint8_t *bits, int first, int len) {
+    uint64_t val = 0;
+    for (int i = 0; i < len; i++) {
+        val = (val << 1) | (bits[first - 1 + i] & 1);
+    }
+    return val;
+}
+
+// Modified Baudot (T.018 Table 3.2, same code as 1G)
+static char baudot_char(int x) {
+    switch(x) {
+        case 56: return 'A'; case 51: return 'B'; case 46: return 'C'; case 50: return 'D';
+        case 48: return 'E'; case 54: return 'F'; case 43: return 'G'; case 37: return 'H';
+        case 44: return 'I'; case 58: return 'J'; case 62: return 'K'; case 41: return 'L';
+        case 39: return 'M'; case 38: return 'N'; case 35: return 'O'; case 45: return 'P';
+        case 61: return 'Q'; case 42: return 'R'; case 52: return 'S'; case 33: return 'T';
+        case 60: return 'U'; case 47: return 'V'; case 57: return 'W'; case 55: return 'X';
+        case 53: return 'Y'; case 49: return 'Z'; case 36: return ' '; case 24: return '-';
+        case 23: return '/'; case 13: return '0'; case 29: return '1'; case 25: return '2';
+        case 16: return '3'; case 10: return '4'; case 1: return '5'; case 21: return '6';
+        case 28: return '7'; case 12: return '8'; case 3: return '9';
+        default: return '_';
+    }
+}
+
+// count characters of 6 bits (or 5 bits: letters only, leading '1' implied)
+static void baudot_string(const uint8_t *bits, int first, int count, int width, char *out) {
+    for (int j = 0; j < count; j++) {
+        int code = (int)field(bits, first + j * width, width);
+        if (width == 5) code |= 0x20;
+        out[j] = baudot_char(code);
+    }
+    out[count] = '\0';
+}
+
+// ===================================================
+// Message parser (T.018 Appendix B, no output)
+// ===================================================
+static void parse_location(const uint8_t *bits, BeaconInfo2G *info) {
+    // Bits 44-90: N/S, 7-bit degrees, 15-bit fraction, E/W, 8-bit degrees, 15-bit fraction
+    int lat_deg = (int)field(bits, 45, 7);
+    int lon_deg = (int)field(bits, 68, 8);
+
+    // Default (no fix): 127 degrees latitude, 255 degrees longitude
+    if (lat_deg > 90 || lon_deg > 180) {
+        info->has_position = 0;
+        return;
+    }
+    info->lat = lat_deg + field(bits, 52, 15) / 32768.0;
+    info->lon = lon_deg + field(bits, 76, 15) / 32768.0;
+    if (field(bits, 44, 1)) info->lat = -info->lat;
+    if (field(bits, 67, 1)) info->lon = -info->lon;
+    info->has_position = 1;
+}
+
+static void parse_vessel_id(const uint8_t *bits, BeaconInfo2G *info) {
+    info->vessel_id_type = (uint8_t)field(bits, 91, 3);
+    info->vessel_id_raw = field(bits, 94, 44);
+
+    switch (info->vessel_id_type) {
+        case VESSEL_ID_MMSI:
+            info->mmsi = (uint32_t)field(bits, 94, 30);
+            info->ais_id = (uint32_t)field(bits, 124, 14);
+            break;
+        case VESSEL_ID_CALLSIGN:
+        case VESSEL_ID_REGISTRATION:
+            baudot_string(bits, 94, 7, 6, info->vessel_id);
+            break;
+        case VESSEL_ID_AVIATION_ADDRESS:
+            info->aircraft_address = (uint32_t)field(bits, 94, 24);
+            baudot_string(bits, 118, 3, 5, info->vessel_id);
+            break;
+        case VESSEL_ID_OPERATOR:
+            baudot_string(bits, 94, 3, 5, info->vessel_id);
+            info->operator_serial = (uint16_t)field(bits, 109, 12);
+            break;
+        default:
+            break;
+    }
+}
+
+static void parse_rotating_field(const uint8_t *bits, BeaconInfo2G *info) {
+    info->rotating_id = (uint8_t)field(bits, 155, 4);
+    info->rotating_raw = field(bits, 159, 44);
+
+    switch (info->rotating_id) {
+        case ROTATING_G008: {
+            info->hours_since_activation = (int)field(bits, 159, 6);
+            info->minutes_since_location = (int)field(bits, 165, 11);
+            int altitude = (int)field(bits, 176, 10);
+            info->has_altitude = (altitude != 0x3FF);
+            info->altitude_m = altitude * 16 - 400;
+            info->hdop = (uint8_t)field(bits, 186, 4);
+            info->vdop = (uint8_t)field(bits, 190, 4);
+            info->activation_type = (uint8_t)field(bits, 194, 2);
+            info->battery = (uint8_t)field(bits, 196, 3);
+            info->gnss_status = (uint8_t)field(bits, 199, 2);
+            break;
+        }
+        case ROTATING_INFLIGHT_EMERGENCY: {
+            info->location_time_s = (uint32_t)field(bits, 159, 17);
+            int altitude = (int)field(bits, 176, 10);
+            info->has_altitude = (altitude != 0x3FF);
+            info->altitude_m = altitude * 16 - 400;
+            info->triggering_event = (uint8_t)field(bits, 186, 4);
+            info->gnss_status = (uint8_t)field(bits, 190, 2);
+            info->battery = (uint8_t)field(bits, 192, 2);
+            break;
+        }
+        case ROTATING_CANCELLATION:
+            info->deactivation = (uint8_t)field(bits, 201, 2);
+            break;
+        default:
+            break;  // RLS, national use, spare: raw bits only
+    }
+}
+
+// 23 Hex ID (T.018 Appendix B2): '1', country, '101', TAC, serial,
+// test flag, vessel ID type, vessel ID (92 bits)
+static void build_hex_id(const BeaconInfo2G *info, char *out) {
+    static const char digits[] = "0123456789ABCDEF";
+    uint8_t id[92];
+    int n = 0;
+
+    id[n++] = 1;
+    for (int i = 9; i >= 0; i--) id[n++] = (info->country_code >> i) & 1;
+    id[n++] = 1; id[n++] = 0; id[n++] = 1;
+    for (int i = 15; i >= 0; i--) id[n++] = (info->tac >> i) & 1;
+    for (int i = 13; i >= 0; i--) id[n++] = (info->serial >> i) & 1;
+    id[n++] = info->test_flag;
+    for (int i = 2; i >= 0; i--) id[n++] = (info->vessel_id_type >> i) & 1;
+    for (int i = 43; i >= 0; i--) id[n++] = (info->vessel_id_raw >> i) & 1;
+
+    for (int i = 0; i < 23; i++) {
+        out[i] = digits[(id[4 * i] << 3) | (id[4 * i + 1] << 2) | (id[4 * i + 2] << 1) | id[4 * i + 3]];
+    }
+    out[23] = '\0';
+}
+
+int parse_2g(const uint8_t *bits, BeaconInfo2G *info) {
+    if (!bits || !info) {
+        return -1;
+    }
+    memset(info, 0, sizeof(*info));
+    info->hours_since_activation = -1;
+    info->minutes_since_location = -1;
+
+    // Main field (bits 1-154)
+    info->tac = (uint16_t)field(bits, 1, 16);
+    info->serial = (uint16_t)field(bits, 17, 14);
+    info->country_code = (uint16_t)field(bits, 31, 10);
+    info->homing_flag = (uint8_t)field(bits, 41, 1);
+    info->rls_flag = (uint8_t)field(bits, 42, 1);
+    info->test_flag = (uint8_t)field(bits, 43, 1);
+    parse_location(bits, info);
+    parse_vessel_id(bits, info);
+    info->beacon_type = (uint8_t)field(bits, 138, 3);
+    info->spare = (uint16_t)field(bits, 141, 14);
+
+    // Rotating field (bits 155-202)
+    parse_rotating_field(bits, info);
+
+    build_hex_id(info, info->hex_id);
+    return 0;
+}
+
+// ===================================================
+// Display
+// ===================================================
+static const char *beacon_type_name(int type) {
+    switch (type) {
+        case 0: return "ELT (not ELT-DT)";
+        case 1: return "EPIRB";
+        case 2: return "PLB";
+        case 3: return "ELT-DT";
+        case 7: return "System beacon";
+        default: return "Spare";
+    }
+}
+
+static const char *rotating_field_name(int id) {
+    switch (id) {
+        case ROTATING_G008: return "C/S G.008 Objective Requirements";
+        case ROTATING_INFLIGHT_EMERGENCY: return "Inflight Emergency";
+        case ROTATING_RLS: return "RLS";
+        case ROTATING_NATIONAL_USE: return "National Use";
+        case ROTATING_CANCELLATION: return "Cancellation Message";
+        default: return "Spare";
+    }
+}
+
+static void display_vessel_id(const BeaconInfo2G *info) {
+    switch (info->vessel_id_type) {
+        case VESSEL_ID_NONE:
+            printf("\nIdentification: none");
+            break;
+        case VESSEL_ID_MMSI:
+            printf("\nIdentification: MMSI %09u", info->mmsi);
+            printf("\nEPIRB-AIS ID: %u", info->ais_id);
+            break;
+        case VESSEL_ID_CALLSIGN:
+            printf("\nIdentification: Radio call sign %s", info->vessel_id);
+            break;
+        case VESSEL_ID_REGISTRATION:
+            printf("\nIdentification: Aircraft registration %s", info->vessel_id);
+            break;
+        case VESSEL_ID_AVIATION_ADDRESS:
+            printf("\nIdentification: Aircraft 24-bit address %06X (operator %s)",
+                   info->aircraft_address, info->vessel_id);
+            break;
+        case VESSEL_ID_OPERATOR:
+            printf("\nIdentification: Aircraft operator %s, serial %u",
+                   info->vessel_id, info->operator_serial);
+            break;
+        default:
+            printf("\nIdentification: type %d", info->vessel_id_type);
+    }
+}
+
+static void display_rotating_field(const BeaconInfo2G *info) {
+    printf("\nRotating field: #%d (%s)", info->rotating_id, rotating_field_name(info->rotating_id));
+
+    switch (info->rotating_id) {
+        case ROTATING_G008:
+            printf("\nTime since activation: %d h", info->hours_since_activation);
+            printf("\nTime since last location: %d min", info->minutes_since_location);
+            if (info->has_altitude) printf("\nAltitude: %d m", info->altitude_m);
+            printf("\nHDOP/VDOP: %d/%d", info->hdop, info->vdop);
+            printf("\nActivation: %s",
+                   info->activation_type == 0 ? "Manual" :
+                   info->activation_type == 1 ? "Automatic (beacon)" :
+                   info->activation_type == 2 ? "Automatic (external)" : "Spare");
+            printf("\nGNSS status: %s",
+                   info->gnss_status == 0 ? "No fix" :
+                   info->gnss_status == 1 ? "2D" :
+                   info->gnss_status == 2 ? "3D" : "Spare");
+            break;
+        case ROTATING_INFLIGHT_EMERGENCY:
+            printf("\nTime of last location: %02u:%02u:%02u UTC",
+                   info->location_time_s / 3600, (info->location_time_s / 60) % 60,
+                   info->location_time_s % 60);
+            if (info->has_altitude) printf("\nAltitude: %d m", info->altitude_m);
+            printf("\nTriggering event: %d", info->triggering_event);
+            break;
+        case ROTATING_CANCELLATION:
+            printf("\nDeactivation: %s",
+                   info->deactivation == 2 ? "Manual" :
+                   info->deactivation == 1 ? "Automatic (external)" : "Spare");
+            break;
+        default:
+            printf("\nData: %011llX", (unsigned long long)info->rotating_raw);
+    }
+}
+
+// ===================================================
+// Interface functions
+// ===================================================
+void decode_2g(const uint8_t *bits) {
+    if (!bits) {
+        fprintf(stderr, "ERROR: NULL bits array\n");
+        return;
+    }
+
+    uint8_t frame[FRAME_2G_LENGTH];
+    for (int i = 0; i < FRAME_2G_LENGTH; i++) {
+        frame[i] = bits[i] & 1;
+    }
+    decode_2g_corrected(frame, bch_2g_correct(frame));
+}
+
+// Display only: bits already went through bch_2g_correct(), which returned corrected
+void decode_2g_corrected(const uint8_t *bits, int corrected) {
+    if (!bits) {
+        fprintf(stderr, "ERROR: NULL bits array\n");
+        return;
+    }
+
+    BeaconInfo2G info;
+    parse_2g(bits, &info);
+
+    if (corrected < 0) {
+        printf("\nBCH ERROR - Data may be corrupted");
+    }
+
+    printf("\n=== 406 MHz BEACON DECODE (2G SGB) ===");
+    if (corrected >= 0) {
+        printf("\nBCH: OK (%d bit%s corrected)", corrected, corrected == 1 ? "" : "s");
+    }
+    printf("\nBeacon type: %d (%s)", info.beacon_type, beacon_type_name(info.beacon_type));
+    printf("\nCountry: %u (%s)", info.country_code, get_country_name(info.country_code));
+    printf("\nTAC: %u", info.tac);
+    printf("\nSerial: %u", info.serial);
+    printf("\n23 Hex ID: %s", info.hex_id);
+    printf("\nTest protocol: %s", info.test_flag ? "Yes" : "No");
+    printf("\n121.5 MHz Homing: %s", info.homing_flag ? "Yes" : "No");
+    printf("\nRLS function: %s", info.rls_flag ? "Yes" : "No");
+    display_vessel_id(&info);
+
+    if (info.has_position) {
+        printf("\nPosition: %.5f %c, %.5f %c",
+               fabs(info.lat), (info.lat >= 0) ? 'N' : 'S',
+               fabs(info.lon), (info.lon >= 0) ? 'E' : 'W');
+        printf("\nOpenStreetMap: https://www.openstreetmap.org/?mlat=%.6f&mlon=%.6f#map=10/%.6f/%.6f",
+               info.lat, info.lon, info.lat, info.lon);
+    } else {
+        printf("\nPosition not available");
+    }
+
+    display_rotating_field(&info);
+
+    printf("\n");
+    log_to_terminal("2G decoding completed");
+}
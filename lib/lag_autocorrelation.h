@@ -0,0 +1,46 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_LAG_AUTOCORRELATION_H
+#define INCLUDED_COSPAS_LAG_AUTOCORRELATION_H
+
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief |Σ (a[i] - m)·(a[i+lag] - m)| sur un buffer circulaire de 2·lag amplitudes
+ *
+ * Noyau du cospas_burst_detector (appelé a chaque échantillon), m étant
+ * la moyenne du buffer et start l'indice du plus ancien élément. Sorti
+ * du bloc pour être mesuré seul (cospas_bench_kernels).
+ */
+inline float lag_autocorrelation(const float* ring, int start, int lag)
+{
+    const int size = 2 * lag;
+
+    float mean = 0.0f;
+    for (int i = 0; i < size; i++) {
+        mean += ring[i];
+    }
+    mean /= size;
+
+    float correlation = 0.0f;
+    for (int i = 0; i < lag; i++) {
+        int idx1 = (start + i) % size;
+        int idx2 = (start + i + lag) % size;
+        correlation += (ring[idx1] - mean) * (ring[idx2] - mean);
+    }
+
+    return std::abs(correlation);
+}
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_LAG_AUTOCORRELATION_H */
@@ -0,0 +1,62 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "latency_stats.h"
+#include <algorithm>
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+latency_stats::latency_stats() { reset(); }
+
+void latency_stats::add(double latency_ms)
+{
+    if (d_history.size() < HISTORY) {
+        d_history.push_back(latency_ms);
+    } else {
+        d_history[d_next] = latency_ms;
+        d_next = (d_next + 1) % HISTORY;
+    }
+    d_count++;
+    d_sum_ms += latency_ms;
+    d_max_ms = std::max(d_max_ms, latency_ms);
+}
+
+void latency_stats::reset()
+{
+    d_history.clear();
+    d_history.reserve(HISTORY);
+    d_next = 0;
+    d_count = 0;
+    d_sum_ms = 0.0;
+    d_max_ms = 0.0;
+}
+
+double latency_stats::mean_ms() const
+{
+    return (d_count > 0) ? d_sum_ms / d_count : 0.0;
+}
+
+double latency_stats::percentile_ms(double percentile) const
+{
+    if (d_history.empty()) {
+        return 0.0;
+    }
+
+    std::vector<double> sorted(d_history);
+    std::sort(sorted.begin(), sorted.end());
+
+    const double rank =
+        std::min(std::max(percentile, 0.0), 100.0) / 100.0 * (sorted.size() - 1);
+    const size_t lower = static_cast<size_t>(std::floor(rank));
+    const size_t upper = std::min(lower + 1, sorted.size() - 1);
+    return sorted[lower] + (rank - lower) * (sorted[upper] - sorted[lower]);
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,52 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_LATENCY_STATS_H
+#define INCLUDED_COSPAS_LATENCY_STATS_H
+
+#include <cstddef>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Statistiques de latence par burst (moyenne, max, percentiles)
+ *
+ * Moyenne et max portent sur tous les bursts depuis le dernier reset();
+ * les percentiles sur les HISTORY derniers (tampon circulaire, mémoire
+ * bornée). Pas de verrou: appelé sous le mutex du bloc propriétaire.
+ */
+class latency_stats
+{
+public:
+    static constexpr size_t HISTORY = 4096;
+
+    latency_stats();
+
+    void add(double latency_ms);
+    void reset();
+
+    long count() const { return d_count; }
+    double mean_ms() const;
+    double max_ms() const { return d_max_ms; }
+
+    // percentile dans [0, 100], interpolation linéaire entre rangs
+    double percentile_ms(double percentile) const;
+
+private:
+    std::vector<double> d_history;
+    size_t d_next;
+    long d_count;
+    double d_sum_ms;
+    double d_max_ms;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_LATENCY_STATS_H */
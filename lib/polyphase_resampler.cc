@@ -0,0 +1,85 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "polyphase_resampler.h"
+#include <algorithm>
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+polyphase_resampler::polyphase_resampler(int interpolation, int decimation)
+    : d_interpolation(std::max(1, interpolation)), d_decimation(std::max(1, decimation))
+{
+    const double ratio = static_cast<double>(d_decimation) / d_interpolation;
+
+    // Coupure a 80% du Nyquist le plus bas (cycles par échantillon d'entrée)
+    const double cutoff = 0.4 * std::min(1.0, 1.0 / ratio);
+
+    // 4 échantillons de sortie de chaque coté (au moins 4 d'entrée)
+    d_half_taps = std::max(4, static_cast<int>(std::ceil(4.0 * std::max(1.0, ratio))));
+
+    // Sous-filtre φ: coefficient i appliqué a x[j0 - d_half_taps + 1 + i]
+    // ou t = (d_half_taps - 1 - i) + φ/L est la distance a l'instant de sortie
+    d_phases.assign(d_interpolation, std::vector<float>(2 * d_half_taps));
+    for (int phase = 0; phase < d_interpolation; phase++) {
+        double sum = 0.0;
+        for (int i = 0; i < 2 * d_half_taps; i++) {
+            double t = (d_half_taps - 1 - i) + static_cast<double>(phase) / d_interpolation;
+            double x = 2.0 * cutoff * t;
+            double sinc = (std::abs(x) < 1e-12) ? 1.0 : std::sin(M_PI * x) / (M_PI * x);
+            // Fenêtre de Blackman sur [-d_half_taps, +d_half_taps]
+            double w_pos = (t + d_half_taps) / (2.0 * d_half_taps);
+            double window = 0.42 - 0.5 * std::cos(2.0 * M_PI * w_pos) +
+                            0.08 * std::cos(4.0 * M_PI * w_pos);
+            double tap = sinc * std::max(0.0, window);
+            d_phases[phase][i] = static_cast<float>(tap);
+            sum += tap;
+        }
+        // Gain unitaire en continu pour chaque phase
+        for (auto& tap : d_phases[phase]) {
+            tap = static_cast<float>(tap / sum);
+        }
+    }
+}
+
+void polyphase_resampler::resample(const gr_complex* in,
+                                   int num_samples,
+                                   std::vector<gr_complex>& out) const
+{
+    if (num_samples <= 0) {
+        out.clear();
+        return;
+    }
+
+    const long L = d_interpolation;
+    const long M = d_decimation;
+    const int num_out = static_cast<int>((static_cast<long>(num_samples - 1) * L) / M) + 1;
+    const int taps = 2 * d_half_taps;
+    out.resize(num_out);
+
+    for (int k = 0; k < num_out; k++) {
+        long p = k * M;
+        long base = p / L - d_half_taps + 1;
+        const std::vector<float>& h = d_phases[p % L];
+
+        // Bornes du burst: les coefficients hors burst multiplient des zéros
+        int i_begin = static_cast<int>(std::max(0L, -base));
+        int i_end = static_cast<int>(std::min<long>(taps, num_samples - base));
+
+        float acc_re = 0.0f, acc_im = 0.0f;
+        for (int i = i_begin; i < i_end; i++) {
+            const gr_complex& x = in[base + i];
+            acc_re += h[i] * x.real();
+            acc_im += h[i] * x.imag();
+        }
+        out[k] = gr_complex(acc_re, acc_im);
+    }
+}
+
+} // namespace cospas
+} // namespace gr
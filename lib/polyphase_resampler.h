@@ -0,0 +1,52 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_POLYPHASE_RESAMPLER_H
+#define INCLUDED_COSPAS_POLYPHASE_RESAMPLER_H
+
+#include <gnuradio/gr_complex.h>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Rééchantillonneur rationnel L/M polyphase pour un burst complet
+ *
+ * Filtre passe-bas (sinc fenêtré Blackman, coupure a 80% du Nyquist de
+ * sortie) décomposé en L sous-filtres: chaque échantillon de sortie ne
+ * coûte qu'un sous-filtre, les zéros d'interpolation ne sont jamais
+ * calculés. Le filtre est centré: la sortie k correspond a l'instant
+ * k·M/L de l'entrée (pas de retard de groupe a compenser).
+ */
+class polyphase_resampler
+{
+public:
+    polyphase_resampler(int interpolation, int decimation);
+
+    /*!
+     * \brief Rééchantillonner un burst (hors burst = zéros)
+     * \param in Échantillons d'entrée
+     * \param num_samples Nombre d'échantillons d'entrée
+     * \param out Échantillons de sortie (redimensionné, réutilisable)
+     */
+    void resample(const gr_complex* in, int num_samples, std::vector<gr_complex>& out) const;
+
+    int interpolation() const { return d_interpolation; }
+    int decimation() const { return d_decimation; }
+
+private:
+    int d_interpolation;  // L
+    int d_decimation;     // M
+    int d_half_taps;      // Demi-longueur du filtre (échantillons d'entrée)
+    std::vector<std::vector<float>> d_phases;  // L sous-filtres de 2·d_half_taps coefficients
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_POLYPHASE_RESAMPLER_H */
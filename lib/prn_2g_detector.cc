@@ -0,0 +1,190 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "prn_2g_detector.h"
+#include "t018_prn.h"
+#include <algorithm>
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+namespace {
+
+// Produit différentiel x[n]·conj(x[n-D])
+inline gr_complex differential(const gr_complex& x, const gr_complex& prev)
+{
+    return gr_complex(x.real() * prev.real() + x.imag() * prev.imag(),
+                      x.imag() * prev.real() - x.real() * prev.imag());
+}
+
+// Canal I ou Q filtré RRC a l'instant t (chips), ±RRC_SPAN chips
+double shaped_channel(const std::vector<int8_t>& chips, double t)
+{
+    const int RRC_SPAN = 6;
+    const int center = static_cast<int>(std::floor(t));
+    double value = 0.0;
+    for (int k = center - RRC_SPAN; k <= center + RRC_SPAN; k++) {
+        value += t018_prn::rrc_pulse(t - k) * chips[std::max(0, k)];
+    }
+    return value;
+}
+
+// Fenêtre de confirmation au fil de l'eau (~100 ms)
+int streaming_window(float sample_rate)
+{
+    return radix2_fft::next_pow2(static_cast<int>(std::ceil(sample_rate * 0.100f)));
+}
+
+} // namespace
+
+prn_2g_detector::prn_2g_detector(float sample_rate)
+    : prn_2g_detector(sample_rate,
+                      streaming_window(sample_rate),
+                      streaming_window(sample_rate) / 4,
+                      streaming_window(sample_rate) / 2,
+                      1)
+{
+}
+
+// Fenêtre: retards 0..2·max_offset sans repliement pour une référence de
+// preamble - max_offset échantillons
+prn_2g_detector::prn_2g_detector(float sample_rate, int max_offset, int num_delays)
+    : prn_2g_detector(sample_rate,
+                      radix2_fft::next_pow2(preamble_samples(sample_rate) + max_offset),
+                      max_offset,
+                      preamble_samples(sample_rate) - max_offset,
+                      num_delays)
+{
+}
+
+prn_2g_detector::prn_2g_detector(float sample_rate,
+                                 int fft_size,
+                                 int reference_start,
+                                 int reference_length,
+                                 int num_delays)
+    : d_fft(fft_size),
+      d_reference_length(reference_length),
+      d_reference_start(reference_start),
+      d_reference_conj(std::max(1, num_delays), std::vector<gr_complex>(fft_size)),
+      d_work(fft_size),
+      d_magnitude(fft_size - reference_length + 1),
+      d_peak_ratio(0.0f),
+      d_preamble_offset(0)
+{
+    // Forme d'onde du préambule a la cadence d'échantillonnage: chips
+    // filtrés RRC, Q retardé d'un demi-chip (OQPSK, I en avance)
+    // Calculée une seule fois: le coût de construction est sans importance
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const double chips_per_sample = t018_prn::CHIP_RATE / sample_rate;
+
+    auto preamble_sample = [&](int n) {
+        double t = n * chips_per_sample;
+        return gr_complex(static_cast<float>(shaped_channel(prn_i, t)),
+                          static_cast<float>(shaped_channel(prn_q, t - 0.5)));
+    };
+
+    for (size_t d = 0; d < d_reference_conj.size(); d++) {
+        const int delay = static_cast<int>(d) + 1;
+        std::vector<gr_complex>& reference = d_reference_conj[d];
+        for (int k = 0; k < d_reference_length; k++) {
+            reference[k] = differential(preamble_sample(d_reference_start + k),
+                                        preamble_sample(d_reference_start + k - delay));
+        }
+        d_fft.forward(reference.data());
+        for (auto& r : reference) {
+            r = std::conj(r);
+        }
+    }
+}
+
+int prn_2g_detector::preamble_samples(float sample_rate)
+{
+    const int chips = t018_prn::PREAMBLE_BITS / 2 * t018_prn::CHIPS_PER_BIT;
+    return static_cast<int>(chips * sample_rate / t018_prn::CHIP_RATE);
+}
+
+bool prn_2g_detector::detect(const gr_complex* samples, int num_samples)
+{
+    const int size = d_fft.size();
+    const int count = std::min(num_samples, size);
+    const int num_lags = static_cast<int>(d_magnitude.size());
+
+    std::fill(d_magnitude.begin(), d_magnitude.end(), 0.0f);
+    for (size_t d = 0; d < d_reference_conj.size(); d++) {
+        const int delay = static_cast<int>(d) + 1;
+        std::fill(d_work.begin(), d_work.begin() + std::min(delay, size), gr_complex(0.0f, 0.0f));
+        for (int n = delay; n < count; n++) {
+            d_work[n] = differential(samples[n], samples[n - delay]);
+        }
+        std::fill(d_work.begin() + std::max(delay, count), d_work.end(), gr_complex(0.0f, 0.0f));
+
+        // Corrélation circulaire = IFFT(Z · conj(R)); retards 0..size-L sans repliement
+        d_fft.forward(d_work.data());
+        const std::vector<gr_complex>& reference = d_reference_conj[d];
+        for (int k = 0; k < size; k++) {
+            d_work[k] *= reference[k];
+        }
+        d_fft.inverse(d_work.data());
+
+        for (int lag = 0; lag < num_lags; lag++) {
+            d_magnitude[lag] += std::abs(d_work[lag]);
+        }
+    }
+
+    float peak = 0.0f;
+    int peak_lag = 0;
+    double sum = 0.0;
+    for (int lag = 0; lag < num_lags; lag++) {
+        sum += d_magnitude[lag];
+        if (d_magnitude[lag] > peak) {
+            peak = d_magnitude[lag];
+            peak_lag = lag;
+        }
+    }
+
+    const double mean = sum / num_lags;
+    d_peak_ratio = (mean > 0.0) ? static_cast<float>(peak / mean) : 0.0f;
+    d_preamble_offset = peak_lag - d_reference_start;
+    return d_peak_ratio >= PEAK_RATIO_THRESHOLD;
+}
+
+void prn_2g_detector::strongest_offsets(int count, std::vector<int>& offsets) const
+{
+    // Quelques pics seulement: recherches successives du maximum, hors
+    // voisinage des pics déjà retenus
+    offsets.clear();
+    const int num_lags = static_cast<int>(d_magnitude.size());
+    while (static_cast<int>(offsets.size()) < count) {
+        float peak = -1.0f;
+        int peak_lag = -1;
+        for (int lag = 0; lag < num_lags; lag++) {
+            if (d_magnitude[lag] <= peak) {
+                continue;
+            }
+            bool taken = false;
+            for (int offset : offsets) {
+                if (std::abs(lag - d_reference_start - offset) <= 2) {
+                    taken = true;
+                    break;
+                }
+            }
+            if (!taken) {
+                peak = d_magnitude[lag];
+                peak_lag = lag;
+            }
+        }
+        if (peak_lag < 0) {
+            break;
+        }
+        offsets.push_back(peak_lag - d_reference_start);
+    }
+}
+
+} // namespace cospas
+} // namespace gr
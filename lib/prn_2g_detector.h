@@ -0,0 +1,103 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_PRN_2G_DETECTOR_H
+#define INCLUDED_COSPAS_PRN_2G_DETECTOR_H
+
+#include "radix2_fft.h"
+#include <gnuradio/gr_complex.h>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Confirmation 2G par corrélation avec le préambule PRN T.018
+ *
+ * Le préambule 2G (50 bits a '0') est la séquence PRN I/Q nue: sa forme
+ * d'onde OQPSK (chips filtrés RRC α=0.8) est connue a l'avance. Pour rester insensible a l'offset
+ * de fréquence (inconnu, plusieurs centaines de Hz), on corrèle le produit
+ * différentiel z[n] = x[n]·conj(x[n-1]) (l'offset devient une phase
+ * constante) avec le même produit calculé sur la référence.
+ *
+ * La corrélation porte sur les window_size() premiers échantillons du
+ * burst (~100 ms) contre une portion de préambule de la moitié de cette
+ * longueur: le debut du préambule peut se trouver a ± un quart de fenêtre
+ * du debut du burst (detector en avance ou en retard, burst tronqué).
+ * Spectre de référence précalculé: une FFT directe et une inverse par burst.
+ *
+ * Pour l'acquisition du démodulateur, la référence couvre tout le préambule
+ * (166 ms) et plusieurs retards D = 1..num_delays sont corrélés:
+ * z_D[n] = x[n]·conj(x[n-D]) garde chacun l'offset de fréquence en phase
+ * constante, les modules des corrélations s'additionnent (gain non cohérent).
+ */
+class prn_2g_detector
+{
+public:
+    //! Confirmation au fil de l'eau: fenêtre de ~100 ms, retard 1
+    explicit prn_2g_detector(float sample_rate);
+
+    /*!
+     * \brief Acquisition sur le préambule complet
+     * \param max_offset Écart maximal (échantillons) entre le debut du burst
+     *        et le debut du préambule; la référence va de max_offset a la fin
+     *        du préambule
+     * \param num_delays Nombre de retards différentiels (1..)
+     */
+    prn_2g_detector(float sample_rate, int max_offset, int num_delays);
+
+    //! Nombre d'échantillons analysés depuis le debut du burst
+    int window_size() const { return d_fft.size(); }
+
+    /*!
+     * \brief Chercher le préambule PRN au debut d'un burst
+     * \param samples Premiers échantillons du burst
+     * \param num_samples Nombre d'échantillons (complété par des zéros si < window_size())
+     * \return true si le pic de corrélation dépasse PEAK_RATIO_THRESHOLD
+     */
+    bool detect(const gr_complex* samples, int num_samples);
+
+    //! Rapport pic / moyenne de |corrélation| de la dernière recherche
+    float peak_ratio() const { return d_peak_ratio; }
+
+    //! Position du debut du préambule dans le burst (échantillons, peut être < 0)
+    int preamble_offset() const { return d_preamble_offset; }
+
+    /*!
+     * \brief Positions des count plus forts pics de la dernière recherche
+     *
+     * Par ordre décroissant, espacées d'au moins 3 échantillons (un pic
+     * s'étale sur ±1 échantillon). offsets[0] == preamble_offset().
+     */
+    void strongest_offsets(int count, std::vector<int>& offsets) const;
+
+    // Bruit seul: pic ≈ 3× la moyenne sur ~2000 retards
+    static constexpr float PEAK_RATIO_THRESHOLD = 6.0f;
+
+private:
+    radix2_fft d_fft;
+    int d_reference_length;                     // Échantillons de préambule corrélés
+    int d_reference_start;                      // Début de la référence dans le préambule
+    std::vector<std::vector<gr_complex>> d_reference_conj;  // conj(FFT(référence)), par retard
+    std::vector<gr_complex> d_work;             // Buffer FFT réutilisé
+    std::vector<float> d_magnitude;             // Σ |corrélation| par retard de burst
+    float d_peak_ratio;
+    int d_preamble_offset;
+
+    static int preamble_samples(float sample_rate);
+
+    prn_2g_detector(float sample_rate,
+                    int fft_size,
+                    int reference_start,
+                    int reference_length,
+                    int num_delays);
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_PRN_2G_DETECTOR_H */
@@ -0,0 +1,101 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * BCH(250,202) 2G: trame de référence (tools/2g/test_frame_2g.txt, validée
+ * par le décodeur officiel), correction jusqu'a 6 erreurs, rejet au-delà
+ */
+
+#include "qa_signals.h"
+#include <boost/test/unit_test.hpp>
+#include <random>
+
+extern "C" {
+#include "dec406.h"
+}
+
+using namespace gr::cospas;
+
+namespace {
+
+// Positions distinctes tirées dans la trame de 250 bits
+std::vector<int> error_positions(std::mt19937& rng, int count)
+{
+    std::vector<int> positions;
+    while (static_cast<int>(positions.size()) < count) {
+        const int p = static_cast<int>(rng() % FRAME_2G_LENGTH);
+        if (std::find(positions.begin(), positions.end(), p) == positions.end()) {
+            positions.push_back(p);
+        }
+    }
+    return positions;
+}
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_reference_frame)
+{
+    // qa::HEX_2G est la trame de tools/2g/test_frame_2g.txt
+    std::vector<uint8_t> bits = qa::message_bits_2g();
+    BOOST_REQUIRE_EQUAL(static_cast<int>(bits.size()), FRAME_2G_LENGTH);
+
+    uint8_t parity[BCH_2G_PARITY_BITS];
+    bch_2g_encode(bits.data(), parity);
+    BOOST_CHECK(std::equal(parity, parity + BCH_2G_PARITY_BITS, bits.begin() + BCH_2G_INFO_BITS));
+    BOOST_CHECK_EQUAL(bch_2g_correct(bits.data()), 0);
+
+    // Champs décodés listés dans le fichier
+    BeaconInfo2G info;
+    BOOST_REQUIRE_EQUAL(parse_2g(bits.data(), &info), 0);
+    BOOST_CHECK_EQUAL(info.tac, 12345);
+    BOOST_CHECK_EQUAL(info.serial, 13398);
+    BOOST_CHECK_EQUAL(info.country_code, 228);
+    BOOST_CHECK(info.has_position);
+    BOOST_CHECK_CLOSE(info.lat, 42.85001, 1e-3);
+    BOOST_CHECK_CLOSE(info.lon, 4.95001, 1e-3);
+}
+
+BOOST_AUTO_TEST_CASE(t_corrects_up_to_six_errors)
+{
+    std::mt19937 rng(406);
+    std::vector<uint8_t> codeword(FRAME_2G_LENGTH);
+    for (int trial = 0; trial < 50; trial++) {
+        // Mot de code aléatoire: 202 bits d'information + parité
+        for (int i = 0; i < BCH_2G_INFO_BITS; i++) {
+            codeword[i] = rng() & 1;
+        }
+        bch_2g_encode(codeword.data(), codeword.data() + BCH_2G_INFO_BITS);
+
+        for (int errors = 1; errors <= BCH_2G_MAX_ERRORS; errors++) {
+            std::vector<uint8_t> received(codeword);
+            for (int p : error_positions(rng, errors)) {
+                received[p] ^= 1;
+            }
+            BOOST_CHECK_EQUAL(bch_2g_correct(received.data()), errors);
+            BOOST_CHECK(received == codeword);
+        }
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_seven_errors_not_restored)
+{
+    // Distance minimale 13: 7 erreurs sont signalées (-1) ou mal corrigées,
+    // jamais ramenées au mot émis
+    std::mt19937 rng(2025);
+    const std::vector<uint8_t> codeword = qa::message_bits_2g();
+    int rejected = 0;
+    for (int trial = 0; trial < 50; trial++) {
+        std::vector<uint8_t> received(codeword);
+        for (int p : error_positions(rng, BCH_2G_MAX_ERRORS + 1)) {
+            received[p] ^= 1;
+        }
+        const int corrected = bch_2g_correct(received.data());
+        BOOST_CHECK(received != codeword);
+        rejected += corrected < 0;
+    }
+    BOOST_CHECK_GT(rejected, 0);
+}
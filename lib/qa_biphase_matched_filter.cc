@@ -0,0 +1,141 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Filtre adapté biphase-L: décisions sur un burst idéal, suivi d'une
+ * horloge de balise décalée, et démodulation complète par le coeur 1G
+ */
+
+#include "biphase_matched_filter.h"
+#include "bpsk_demod_core.h"
+#include "qa_signals.h"
+#include <boost/test/unit_test.hpp>
+#include <cmath>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+constexpr int WORKING_SAMPLES_PER_BIT = 16;
+constexpr float CARRIER_PHASE = 0.7f;
+
+// Bits biphase-L déjà corrigés en fréquence: porteuse puis 144 bits a ±1.1 rad
+std::vector<gr_complex> baseband_bits(const std::vector<uint8_t>& bits,
+                                      double samples_per_bit,
+                                      int carrier)
+{
+    const int total = carrier + static_cast<int>(bits.size() * samples_per_bit) + 64;
+    std::vector<gr_complex> x(total);
+    for (int n = 0; n < total; n++) {
+        const double t = n - carrier;
+        double phase = 0.0;
+        if (t >= 0.0) {
+            const int k = std::min(static_cast<int>(t / samples_per_bit),
+                                   static_cast<int>(bits.size()) - 1);
+            const bool first_half = (t - k * samples_per_bit) < samples_per_bit / 2.0;
+            phase = (first_half == (bits[k] == 1)) ? 1.1 : -1.1;
+        }
+        x[n] = std::polar(1.0f, static_cast<float>(CARRIER_PHASE + phase));
+    }
+    return x;
+}
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_ideal_frame)
+{
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    const int carrier = 10 * WORKING_SAMPLES_PER_BIT;
+    const std::vector<gr_complex> x = baseband_bits(bits, WORKING_SAMPLES_PER_BIT, carrier);
+
+    // Début grossier décalé de 3 échantillons: l'acquisition le recale
+    biphase_matched_filter mf(WORKING_SAMPLES_PER_BIT);
+    mf_bit_decisions result;
+    BOOST_REQUIRE(mf.demodulate(x.data(), static_cast<int>(x.size()), CARRIER_PHASE,
+                                carrier + 3.0f, bpsk_demod_core::TOTAL_BITS, 15, result));
+
+    BOOST_REQUIRE_EQUAL(result.hard.size(), bits.size());
+    BOOST_CHECK(result.hard == bits);
+    for (size_t k = 0; k < bits.size(); k++) {
+        BOOST_CHECK_EQUAL(result.soft[k] > 0.0f, bits[k] == 1);
+    }
+    BOOST_CHECK_SMALL(result.first_bit_start - carrier, 1.0f);
+    BOOST_CHECK_CLOSE(result.samples_per_bit, WORKING_SAMPLES_PER_BIT, 1.0f);
+}
+
+BOOST_AUTO_TEST_CASE(t_beacon_clock_offset)
+{
+    // Débit +1 %: 1.4 bit de glissement sur la trame sans suivi de période
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    const double samples_per_bit = WORKING_SAMPLES_PER_BIT / 1.01;
+    const int carrier = 10 * WORKING_SAMPLES_PER_BIT;
+    const std::vector<gr_complex> x = baseband_bits(bits, samples_per_bit, carrier);
+
+    biphase_matched_filter mf(WORKING_SAMPLES_PER_BIT);
+    mf_bit_decisions result;
+    BOOST_REQUIRE(mf.demodulate(x.data(), static_cast<int>(x.size()), CARRIER_PHASE,
+                                carrier, bpsk_demod_core::TOTAL_BITS, 15, result));
+    BOOST_CHECK(result.hard == bits);
+    BOOST_CHECK_CLOSE(result.samples_per_bit, samples_per_bit, 0.5f);
+}
+
+BOOST_AUTO_TEST_CASE(t_noisy_decisions)
+{
+    // Eb/N0 9 dB (±1.1 rad: 79 % de l'énergie dans la modulation): BER ~1e-4
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    const int carrier = 10 * WORKING_SAMPLES_PER_BIT;
+    biphase_matched_filter mf(WORKING_SAMPLES_PER_BIT);
+
+    int errors = 0;
+    for (unsigned seed = 1; seed <= 10; seed++) {
+        std::vector<gr_complex> x = baseband_bits(bits, WORKING_SAMPLES_PER_BIT, carrier);
+        qa::add_noise_ebn0(x, carrier, static_cast<int>(x.size()), WORKING_SAMPLES_PER_BIT,
+                           1.0f, 9.0f, seed);
+        mf_bit_decisions result;
+        BOOST_REQUIRE(mf.demodulate(x.data(), static_cast<int>(x.size()), CARRIER_PHASE,
+                                    carrier, bpsk_demod_core::TOTAL_BITS, 15, result));
+        for (size_t k = 0; k < bits.size(); k++) {
+            errors += result.hard[k] != bits[k];
+        }
+    }
+    BOOST_CHECK_LE(errors, 2);
+}
+
+BOOST_AUTO_TEST_CASE(t_short_buffer)
+{
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    std::vector<gr_complex> x = baseband_bits(bits, WORKING_SAMPLES_PER_BIT, 160);
+    x.resize(x.size() / 2);
+
+    biphase_matched_filter mf(WORKING_SAMPLES_PER_BIT);
+    mf_bit_decisions result;
+    BOOST_CHECK(!mf.demodulate(x.data(), static_cast<int>(x.size()), CARRIER_PHASE,
+                               160.0f, bpsk_demod_core::TOTAL_BITS, 15, result));
+}
+
+BOOST_AUTO_TEST_CASE(t_core_noisy_bursts)
+{
+    // Chaîne complète du coeur (décimation 40 kHz → 6400 Hz, offset de fréquence)
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    bpsk_demod_core core(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    core.set_matched_filter(true);
+
+    int decoded = 0;
+    for (unsigned seed = 1; seed <= 10; seed++) {
+        const std::vector<gr_complex> x =
+            qa::synthesize_1g(SAMPLE_RATE, 250.0f, 30.0f, seed);
+        bpsk_demod_frame frame;
+        if (core.demodulate_burst(x.data(), static_cast<int>(x.size()), frame) &&
+            frame.crc_ok) {
+            BOOST_CHECK(frame.bits == bits);
+            BOOST_CHECK_EQUAL(frame.soft.size(), bits.size());
+            decoded++;
+        }
+    }
+    BOOST_CHECK_EQUAL(decoded, 10);
+}
@@ -0,0 +1,78 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Machine a états du coeur 1G (filtre adapté désactivé) a 16 échantillons/bit
+ *
+ * La récupération de timing accepte des demi-bits jusqu'a 0.7 x spb: sur les
+ * bursts bruités la durée de bit mesurée dépasse la durée nominale (16.7 a
+ * 24 dB, 17 échantillons écrits par bit). Le tampon de bit n'en contenait que
+ * 16: le débordement n'est visible que sous AddressSanitizer.
+ */
+
+#include "bpsk_demod_core.h"
+#include "qa_signals.h"
+#include <boost/test/unit_test.hpp>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+constexpr int WORKING_SAMPLES_PER_BIT = 16;
+constexpr float OFFSET_HZ = 250.0f;
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_state_machine_clean_bursts)
+{
+    const std::vector<uint8_t> bits = qa::frame_bits_1g();
+    bpsk_demod_core core(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    core.set_matched_filter(false);
+
+    int decoded = 0;
+    for (unsigned seed = 1; seed <= 10; seed++) {
+        const std::vector<gr_complex> x =
+            qa::synthesize_1g(SAMPLE_RATE, OFFSET_HZ, 30.0f, seed);
+        bpsk_demod_frame frame;
+        if (core.demodulate_burst(x.data(), static_cast<int>(x.size()), frame) &&
+            frame.crc_ok) {
+            BOOST_CHECK(frame.bits == bits);
+            BOOST_CHECK(frame.soft.empty());
+            decoded++;
+        }
+    }
+    BOOST_CHECK_EQUAL(decoded, 10);
+}
+
+BOOST_AUTO_TEST_CASE(t_state_machine_measured_bit_length)
+{
+    // Seuil de porteuse relâché: la machine a états atteint la synchro bit
+    // sur des bursts bruités et des horloges de balise lentes
+    bpsk_demod_hypothesis relaxed;
+    relaxed.phase_variance_threshold = 0.5f;
+    bpsk_demod_core core(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    core.set_matched_filter(false);
+    core.set_hypothesis(relaxed);
+
+    int frames = 0;
+    for (float bit_rate_error : { 0.0f, -0.02f, -0.04f }) {
+        for (float ebn0_db : { INFINITY, 30.0f, 24.0f, 18.0f }) {
+            for (unsigned seed = 1; seed <= 5; seed++) {
+                const std::vector<gr_complex> x = qa::synthesize_1g(
+                    SAMPLE_RATE, OFFSET_HZ, ebn0_db, seed, bit_rate_error);
+                bpsk_demod_frame frame;
+                if (core.demodulate_burst(x.data(), static_cast<int>(x.size()), frame)) {
+                    BOOST_CHECK_EQUAL(static_cast<int>(frame.bits.size()), bpsk_demod_core::TOTAL_BITS);
+                    BOOST_CHECK_LE(frame.samples_per_bit, 1.5f * WORKING_SAMPLES_PER_BIT);
+                    frames++;
+                }
+            }
+        }
+    }
+    BOOST_CHECK_GT(frames, 0);
+}
@@ -0,0 +1,130 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Classification 1G/2G au fil de l'eau: décision anticipée sur les
+ * signatures de début de burst, indépendance du découpage en blocs,
+ * repli sur la taille du burst pour le bruit seul
+ */
+
+#include "burst_classifier.h"
+#include "qa_signals.h"
+#include <boost/test/unit_test.hpp>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+
+// Blocs de chunk échantillons; renvoie le nombre d'échantillons a la décision (-1 sinon)
+int stream(burst_classifier& classifier, const std::vector<gr_complex>& x, int chunk)
+{
+    classifier.reset();
+    int decided_at = -1;
+    for (int i = 0; i < static_cast<int>(x.size()); i += chunk) {
+        const int n = std::min(chunk, static_cast<int>(x.size()) - i);
+        classifier.update(x.data() + i, n);
+        if (decided_at < 0 && classifier.decided()) {
+            decided_at = i + n;
+        }
+    }
+    return decided_at;
+}
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_first_generation)
+{
+    // Eb/N0 20 dB a 40 kHz: SNR 0 dB par échantillon, cohérence ≈ 0.5
+    burst_classifier classifier(SAMPLE_RATE);
+    const std::vector<gr_complex> x = qa::synthesize_1g(SAMPLE_RATE, 250.0f, 20.0f, 1);
+    const int decided_at = stream(classifier, x, 1000);
+
+    BOOST_CHECK(classifier.decided());
+    BOOST_CHECK_LE(decided_at, classifier.early_window_size() + 1000);
+    BOOST_CHECK_EQUAL(classifier.decision(), burst_classifier::TYPE_1G);
+    BOOST_CHECK_GE(classifier.coherence(), burst_classifier::COHERENCE_1G_EARLY);
+    BOOST_CHECK(classifier.prn_checked());
+    BOOST_CHECK(!classifier.prn_found());
+    BOOST_CHECK_EQUAL(classifier.classify(x.size()), burst_classifier::TYPE_1G);
+}
+
+BOOST_AUTO_TEST_CASE(t_second_generation)
+{
+    burst_classifier classifier(SAMPLE_RATE);
+    const std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, 300.0f, 20.0f);
+    const int decided_at = stream(classifier, x, 1000);
+
+    BOOST_CHECK(classifier.decided());
+    BOOST_CHECK_LE(decided_at, classifier.window_size() + 1000);
+    BOOST_CHECK_EQUAL(classifier.decision(), burst_classifier::TYPE_2G);
+    BOOST_CHECK(classifier.prn_found());
+    BOOST_CHECK_LT(classifier.coherence(), burst_classifier::COHERENCE_1G);
+
+    // Décision de début de burst: prioritaire sur la taille
+    BOOST_CHECK_EQUAL(classifier.classify(10000), burst_classifier::TYPE_2G);
+}
+
+BOOST_AUTO_TEST_CASE(t_partial_bursts)
+{
+    // Burst coupé avant la fin de la fenêtre PRN (~75 ms reçus): pas de
+    // décision anticipée, le préambule est cherché par classify()
+    constexpr int PARTIAL = 3000;
+    burst_classifier classifier(SAMPLE_RATE);
+    BOOST_REQUIRE_LT(PARTIAL, classifier.early_window_size());
+    for (float ebn0_db : { INFINITY, 15.0f }) {
+        std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, 300.0f, ebn0_db, 5, 0);
+        x.resize(PARTIAL);
+        stream(classifier, x, 1000);
+        BOOST_CHECK(!classifier.decided());
+        BOOST_CHECK(!classifier.prn_checked());
+        BOOST_CHECK_EQUAL(classifier.classify(x.size()), burst_classifier::TYPE_2G);
+        BOOST_CHECK(classifier.prn_checked());
+        BOOST_CHECK(classifier.prn_found());
+
+        x = qa::synthesize_1g(SAMPLE_RATE, 300.0f, ebn0_db, 5);
+        x.resize(PARTIAL);
+        stream(classifier, x, 1000);
+        BOOST_CHECK_EQUAL(classifier.classify(x.size()), burst_classifier::TYPE_1G);
+        BOOST_CHECK(classifier.prn_checked());
+        BOOST_CHECK(!classifier.prn_found());
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_chunk_independence)
+{
+    // Même résultat échantillon par échantillon et en un seul bloc
+    burst_classifier one_by_one(SAMPLE_RATE);
+    burst_classifier whole(SAMPLE_RATE);
+    for (int generation = 1; generation <= 2; generation++) {
+        const std::vector<gr_complex> x =
+            generation == 1 ? qa::synthesize_1g(SAMPLE_RATE, -400.0f, 25.0f, 3)
+                            : qa::synthesize_2g(SAMPLE_RATE, -400.0f, 25.0f, 3);
+        stream(one_by_one, x, 1);
+        stream(whole, x, static_cast<int>(x.size()));
+
+        BOOST_CHECK_EQUAL(one_by_one.decision(), whole.decision());
+        BOOST_CHECK_EQUAL(one_by_one.prn_found(), whole.prn_found());
+        BOOST_CHECK_CLOSE(one_by_one.coherence(), whole.coherence(), 0.1f);
+        BOOST_CHECK_CLOSE(one_by_one.phase_stddev(), whole.phase_stddev(), 0.1f);
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_noise_falls_back_to_size)
+{
+    burst_classifier classifier(SAMPLE_RATE);
+    std::vector<gr_complex> x(40000, gr_complex(0.0f, 0.0f));
+    qa::add_noise(x, 0.1, 7);
+    stream(classifier, x, 4096);
+
+    BOOST_CHECK(classifier.window_complete());
+    BOOST_CHECK(!classifier.decided());
+    BOOST_CHECK(!classifier.has_carrier());
+    BOOST_CHECK_EQUAL(classifier.classify(15000), burst_classifier::TYPE_1G);
+    BOOST_CHECK_EQUAL(classifier.classify(40000), burst_classifier::TYPE_2G);
+}
@@ -0,0 +1,106 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Décodage multi-hypothèses: construction de la grille, burst nominal,
+ * bursts bruités sauvés par un seuil de porteuse relâché (pool et séquentiel)
+ */
+
+#include "burst_demod_worker.h"
+#include "qa_signals.h"
+#include "thread_pool.h"
+#include <boost/test/unit_test.hpp>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+constexpr int WORKING_SAMPLES_PER_BIT = 16;
+constexpr float OFFSET_HZ = 250.0f;
+
+std::string frame_hex_1g()
+{
+    return std::string("FFFED0") + qa::HEX_1G;  // Bit sync + frame sync + message
+}
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_hypothesis_grid)
+{
+    // 2 x 3 x 2 = 12, moins l'hypothèse nominale (-1, 0, 0)
+    auto grid = burst_demod_worker::make_hypothesis_grid(
+        { -1.0f, 0.5f }, { -50.0f, 0.0f, 50.0f }, { 0.0f, 2.0f });
+    BOOST_CHECK_EQUAL(grid.size(), 11u);
+    for (const auto& h : grid) {
+        BOOST_CHECK(!(h.phase_variance_threshold < 0.0f && h.freq_offset_hz == 0.0f &&
+                      h.timing_offset == 0.0f));
+    }
+
+    // Listes vides = valeur nominale
+    grid = burst_demod_worker::make_hypothesis_grid({ 0.3f, 0.5f }, {}, {});
+    BOOST_REQUIRE_EQUAL(grid.size(), 2u);
+    BOOST_CHECK_EQUAL(grid[0].phase_variance_threshold, 0.3f);
+    BOOST_CHECK_EQUAL(grid[1].freq_offset_hz, 0.0f);
+    BOOST_CHECK_EQUAL(grid[1].timing_offset, 0.0f);
+
+    BOOST_CHECK(burst_demod_worker::make_hypothesis_grid({}, {}, {}).empty());
+}
+
+BOOST_AUTO_TEST_CASE(t_nominal_burst)
+{
+    // Burst propre: l'hypothèse nominale suffit, la grille n'est pas essayée
+    burst_demod_worker worker(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    worker.set_hypotheses(burst_demod_worker::make_hypothesis_grid({ 0.3f, 0.5f }, {}, {}));
+    thread_pool pool(2);
+
+    const std::vector<gr_complex> x = qa::synthesize_1g(SAMPLE_RATE, OFFSET_HZ, 30.0f, 1);
+    burst_demod_result result;
+    BOOST_REQUIRE(worker.process(x.data(), static_cast<int>(x.size()), &pool, result));
+    BOOST_CHECK(result.frame_found);
+    BOOST_CHECK(result.crc_ok);
+    BOOST_CHECK(!result.rescued);
+    BOOST_CHECK_EQUAL(result.hex, frame_hex_1g());
+}
+
+BOOST_AUTO_TEST_CASE(t_rescued_bursts)
+{
+    // Eb/N0 24 dB: le bruit de phase dépasse le seuil adaptatif de porteuse
+    // (0.15 rad pour un signal fort), seul le seuil relâché verrouille
+    const auto grid = burst_demod_worker::make_hypothesis_grid({ 0.3f, 0.5f }, {}, {});
+    burst_demod_worker nominal(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    burst_demod_worker pooled(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    burst_demod_worker sequential(SAMPLE_RATE, false, WORKING_SAMPLES_PER_BIT);
+    pooled.set_hypotheses(grid);
+    sequential.set_hypotheses(grid);
+    thread_pool pool(2);
+
+    int nominal_ok = 0, pooled_ok = 0, sequential_ok = 0;
+    for (unsigned seed = 1; seed <= 10; seed++) {
+        const std::vector<gr_complex> x =
+            qa::synthesize_1g(SAMPLE_RATE, OFFSET_HZ, 24.0f, seed);
+        const int n = static_cast<int>(x.size());
+
+        burst_demod_result result;
+        nominal.process(x.data(), n, nullptr, result);
+        nominal_ok += result.crc_ok;
+
+        if (pooled.process(x.data(), n, &pool, result) && result.crc_ok) {
+            BOOST_CHECK(result.rescued);
+            BOOST_CHECK_EQUAL(result.hex, frame_hex_1g());
+            pooled_ok++;
+        }
+        if (sequential.process(x.data(), n, nullptr, result) && result.crc_ok) {
+            BOOST_CHECK(result.rescued);
+            BOOST_CHECK_EQUAL(result.hex, frame_hex_1g());
+            sequential_ok++;
+        }
+    }
+    BOOST_CHECK_EQUAL(nominal_ok, 0);
+    BOOST_CHECK_EQUAL(pooled_ok, 10);
+    BOOST_CHECK_EQUAL(sequential_ok, 10);
+}
@@ -0,0 +1,89 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Préambule PRN T.018: détection et position quel que soit l'offset de
+ * fréquence, rejet des bursts 1G et du bruit seul
+ */
+
+#include "prn_2g_detector.h"
+#include "qa_signals.h"
+#include <boost/test/unit_test.hpp>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_preamble_position)
+{
+    // Préambule au debut du burst ou en retard (détecteur en avance)
+    prn_2g_detector detector(SAMPLE_RATE);
+    for (float offset_hz : { -900.0f, 0.0f, 450.0f }) {
+        for (int lead : { 0, 500 }) {
+            for (float ebn0_db : { INFINITY, 15.0f }) {
+                const std::vector<gr_complex> x =
+                    qa::synthesize_2g(SAMPLE_RATE, offset_hz, ebn0_db, 2, lead);
+                BOOST_CHECK(detector.detect(x.data(), static_cast<int>(x.size())));
+                BOOST_CHECK_GE(detector.peak_ratio(), prn_2g_detector::PEAK_RATIO_THRESHOLD);
+                BOOST_CHECK_LE(std::abs(detector.preamble_offset() - lead), 1);
+            }
+        }
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_short_burst)
+{
+    // Burst plus court que la fenêtre: complété par des zéros
+    prn_2g_detector detector(SAMPLE_RATE);
+    const std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, 200.0f, INFINITY, 2, 0);
+    BOOST_CHECK(detector.detect(x.data(), detector.window_size() * 3 / 4));
+    BOOST_CHECK_LE(std::abs(detector.preamble_offset()), 1);
+}
+
+BOOST_AUTO_TEST_CASE(t_rejects_first_generation)
+{
+    prn_2g_detector detector(SAMPLE_RATE);
+    for (float ebn0_db : { INFINITY, 20.0f }) {
+        const std::vector<gr_complex> x = qa::synthesize_1g(SAMPLE_RATE, 250.0f, ebn0_db, 1);
+        BOOST_CHECK(!detector.detect(x.data(), static_cast<int>(x.size())));
+        BOOST_CHECK_LT(detector.peak_ratio(), prn_2g_detector::PEAK_RATIO_THRESHOLD);
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_rejects_noise)
+{
+    prn_2g_detector detector(SAMPLE_RATE);
+    for (unsigned seed = 1; seed <= 5; seed++) {
+        std::vector<gr_complex> x(detector.window_size(), gr_complex(0.0f, 0.0f));
+        qa::add_noise(x, 0.1, seed);
+        BOOST_CHECK(!detector.detect(x.data(), static_cast<int>(x.size())));
+    }
+}
+
+BOOST_AUTO_TEST_CASE(t_full_preamble_candidates)
+{
+    // Référence sur tout le préambule, 8 retards: pics candidats distincts
+    prn_2g_detector detector(SAMPLE_RATE, 1024, 8);
+    const std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, -600.0f, 10.0f, 4, 800);
+    // Eb/N0 10 dB: pic sous PEAK_RATIO_THRESHOLD mais bien placé
+    detector.detect(x.data(), static_cast<int>(x.size()));
+    BOOST_CHECK_LE(std::abs(detector.preamble_offset() - 800), 1);
+
+    std::vector<int> offsets;
+    detector.strongest_offsets(4, offsets);
+    BOOST_REQUIRE_EQUAL(offsets.size(), 4u);
+    BOOST_CHECK_EQUAL(offsets[0], detector.preamble_offset());
+    for (size_t i = 1; i < offsets.size(); i++) {
+        for (size_t j = 0; j < i; j++) {
+            BOOST_CHECK_GT(std::abs(offsets[i] - offsets[j]), 2);
+        }
+    }
+}
@@ -0,0 +1,119 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Démodulation 2G: burst propre, puis acquisition a faible Eb/N0 (offsets
+ * de fréquence et positions de préambule variés). La trame est utile si
+ * le BCH peut la corriger (6 erreurs au plus).
+ */
+
+#include "qa_signals.h"
+#include "sgb_demod_core.h"
+#include <boost/test/unit_test.hpp>
+
+using namespace gr::cospas;
+
+namespace {
+
+constexpr float SAMPLE_RATE = 40000.0f;
+constexpr int BCH_CAPACITY = 6;
+
+int bit_errors(const std::vector<uint8_t>& bits, const std::vector<uint8_t>& expected)
+{
+    if (bits.size() != expected.size()) {
+        return static_cast<int>(expected.size());
+    }
+    int errors = 0;
+    for (size_t i = 0; i < bits.size(); i++) {
+        errors += bits[i] != expected[i];
+    }
+    return errors;
+}
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_clean_burst)
+{
+    sgb_demod_core core(SAMPLE_RATE);
+    const std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, 350.0f, INFINITY, 2, 500);
+    sgb_demod_frame frame;
+    BOOST_REQUIRE(core.demodulate_burst(x.data(), static_cast<int>(x.size()), frame));
+    BOOST_CHECK(frame.bits == qa::message_bits_2g());
+    BOOST_CHECK_EQUAL(frame.preamble_errors, 0);
+    BOOST_CHECK_LE(std::abs(frame.preamble_offset - 500.0f), 1.0f);
+    BOOST_CHECK_LE(std::abs(frame.freq_offset - 350.0f), 5.0f);
+}
+
+BOOST_AUTO_TEST_CASE(t_acquisition_low_snr)
+{
+    // 7 dB: le pic différentiel seul (retard 1, 51 ms de préambule) ne
+    // trouvait la bonne position sur aucun des bursts
+    sgb_demod_core core(SAMPLE_RATE);
+    const std::vector<uint8_t> message = qa::message_bits_2g();
+    int decoded = 0;
+    for (unsigned seed = 1; seed <= 10; seed++) {
+        const float offset_hz = -800.0f + 160.0f * seed;
+        const int lead = 300 + 70 * seed;
+        const std::vector<gr_complex> x =
+            qa::synthesize_2g(SAMPLE_RATE, offset_hz, 7.0f, seed, lead);
+        sgb_demod_frame frame;
+        if (core.demodulate_burst(x.data(), static_cast<int>(x.size()), frame)) {
+            BOOST_CHECK_LE(std::abs(frame.preamble_offset - lead), 1.0f);
+            decoded += bit_errors(frame.bits, message) <= BCH_CAPACITY;
+        }
+    }
+    BOOST_CHECK_EQUAL(decoded, 10);
+}
+
+BOOST_AUTO_TEST_CASE(t_streaming)
+{
+    // Burst reçu par fragments de 40 ms: même trame que sur le burst
+    // complet, les paires désétalées au fil de la réception
+    sgb_demod_core core(SAMPLE_RATE);
+    sgb_demod_core stream_core(SAMPLE_RATE);
+    const int fragment = 1600;
+    for (unsigned seed = 1; seed <= 4; seed++) {
+        const int lead = 200 + 300 * seed;
+        const std::vector<gr_complex> x =
+            qa::synthesize_2g(SAMPLE_RATE, 250.0f * seed - 600.0f, 8.0f, seed, lead);
+        const int size = static_cast<int>(x.size());
+        sgb_demod_frame expected;
+        const bool expected_ok = core.demodulate_burst(x.data(), size, expected);
+
+        stream_core.begin_burst();
+        int received = 0;
+        while (received + fragment < size) {
+            received += fragment;
+            stream_core.advance(x.data(), received);
+            if (received < stream_core.acquisition_samples()) {
+                BOOST_CHECK_EQUAL(stream_core.tracked_pairs(), 0);
+            }
+        }
+        // Avant le dernier fragment: il ne reste que les dernières paires
+        BOOST_CHECK_GE(stream_core.tracked_pairs(), 140);
+
+        sgb_demod_frame frame;
+        BOOST_REQUIRE_EQUAL(stream_core.finish(x.data(), size, frame), expected_ok);
+        BOOST_CHECK_EQUAL(stream_core.tracked_pairs(), 150);
+        BOOST_CHECK(frame.bits == expected.bits);
+        BOOST_CHECK(frame.soft == expected.soft);
+        BOOST_CHECK_EQUAL(frame.preamble_errors, expected.preamble_errors);
+        BOOST_CHECK_EQUAL(frame.freq_offset, expected.freq_offset);
+        BOOST_CHECK_EQUAL(frame.chip_rate, expected.chip_rate);
+        BOOST_CHECK_EQUAL(frame.preamble_offset, expected.preamble_offset);
+        BOOST_CHECK(bit_errors(frame.bits, qa::message_bits_2g()) <= BCH_CAPACITY);
+    }
+
+    // Burst coupé par le détecteur: refusé comme par demodulate_burst
+    const std::vector<gr_complex> x = qa::synthesize_2g(SAMPLE_RATE, 0.0f);
+    const int size = static_cast<int>(x.size()) - 4000;
+    stream_core.begin_burst();
+    stream_core.advance(x.data(), size / 2);
+    sgb_demod_frame frame;
+    BOOST_CHECK(!stream_core.finish(x.data(), size, frame));
+    BOOST_CHECK(frame.bits.empty());
+}
@@ -0,0 +1,235 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Enregistrement SigMF des bursts: métadonnées (annotation, état du
+ * décodage, troncature), file bornée par max_bytes, trame reçue avant le
+ * burst et écriture des fichiers .sigmf-data / .sigmf-meta par flush()
+ */
+
+#include "sigmf_burst_writer.h"
+#include <boost/test/unit_test.hpp>
+#include <algorithm>
+#include <chrono>
+#include <filesystem>
+#include <fstream>
+#include <iterator>
+#include <random>
+
+using namespace gr::cospas;
+namespace fs = std::filesystem;
+
+namespace {
+
+constexpr double SAMPLE_RATE = 40000.0;
+constexpr double START_TIME = 1763194226.0;  // 2025-11-15T08:10:26Z
+const std::string HEX_1G = "FFFED08E3301E2402B002BBA863609670908";
+
+// Pré-roll de 400 échantillons d'amplitude 0.1 puis burst d'amplitude 1
+burst_capture make_capture(uint64_t burst_start, size_t total = 3000)
+{
+    burst_capture capture;
+    capture.first_sample = burst_start - 400;
+    capture.burst_start = burst_start;
+    capture.burst_size = 2000;
+    capture.sample_rate = SAMPLE_RATE;
+    capture.center_freq = 406.028e6;
+    capture.start_time = START_TIME;
+    capture.samples.assign(total, gr_complex(1.0f, 0.0f));
+    for (size_t i = 0; i < 400 && i < total; i++) {
+        capture.samples[i] = gr_complex(0.0f, 0.1f);
+    }
+    return capture;
+}
+
+burst_status make_status(int generation, bool valid)
+{
+    burst_status status;
+    status.generation = generation;
+    status.valid = valid;
+    status.hex = HEX_1G;
+    status.freq_offset = 312.5;
+    return status;
+}
+
+bool contains(const std::string& text, const std::string& pattern)
+{
+    return text.find(pattern) != std::string::npos;
+}
+
+std::string read_file(const fs::path& path)
+{
+    std::ifstream in(path, std::ios::binary);
+    return std::string(std::istreambuf_iterator<char>(in), std::istreambuf_iterator<char>());
+}
+
+// Répertoire de sortie temporaire, supprimé en fin de test
+struct temp_dir {
+    fs::path path;
+
+    temp_dir()
+    {
+        std::random_device rd;
+        path = fs::temp_directory_path() / ("qa_sigmf_" + std::to_string(rd()));
+        fs::create_directories(path);
+    }
+    ~temp_dir() { fs::remove_all(path); }
+
+    std::vector<fs::path> files(const std::string& extension) const
+    {
+        std::vector<fs::path> found;
+        for (const auto& entry : fs::directory_iterator(path)) {
+            if (entry.path().extension() == extension) {
+                found.push_back(entry.path());
+            }
+        }
+        std::sort(found.begin(), found.end());
+        return found;
+    }
+};
+
+} // namespace
+
+BOOST_AUTO_TEST_CASE(t_metadata_json)
+{
+    burst_capture capture = make_capture(100400);
+
+    // Sans trame: annotation du burst, SNR burst / pré-roll
+    std::string json = sigmf_burst_writer::metadata_json(capture, nullptr);
+    BOOST_CHECK(contains(json, "\"core:datatype\": \"cf32_le\""));
+    BOOST_CHECK(contains(json, "\"core:sample_rate\": 40000,"));
+    BOOST_CHECK(contains(json, "\"core:frequency\": 406028000,"));
+    BOOST_CHECK(contains(json, "\"core:datetime\": \"2025-11-15T08:10:26.000Z\""));
+    BOOST_CHECK(contains(json, "\"cospas:stream_sample\": 100000\n"));
+    BOOST_CHECK(contains(json, "\"core:sample_start\": 400,"));
+    BOOST_CHECK(contains(json, "\"core:sample_count\": 2000,"));
+    BOOST_CHECK(contains(json, "\"core:label\": \"burst\""));
+    BOOST_CHECK(contains(json, "\"cospas:decode_status\": \"no_frame\""));
+    BOOST_CHECK(contains(json, "\"cospas:snr_db\": 19.96,"));
+    BOOST_CHECK(contains(json, "\"cospas:truncated\": false"));
+    BOOST_CHECK(!contains(json, "cospas:hex"));
+
+    // État du décodage
+    burst_status status = make_status(1, true);
+    json = sigmf_burst_writer::metadata_json(capture, &status);
+    BOOST_CHECK(contains(json, "\"core:label\": \"1G\""));
+    BOOST_CHECK(contains(json, "\"cospas:decode_status\": \"decoded\""));
+    BOOST_CHECK(contains(json, "\"cospas:generation\": 1,"));
+    BOOST_CHECK(contains(json, "\"cospas:hex\": \"" + HEX_1G + "\""));
+    BOOST_CHECK(contains(json, "\"cospas:freq_offset\": 312.5,"));
+
+    status.valid = false;
+    json = sigmf_burst_writer::metadata_json(capture, &status);
+    BOOST_CHECK(contains(json, "\"cospas:decode_status\": \"crc_error\""));
+    status.generation = 2;
+    json = sigmf_burst_writer::metadata_json(capture, &status);
+    BOOST_CHECK(contains(json, "\"core:label\": \"2G\""));
+    BOOST_CHECK(contains(json, "\"cospas:decode_status\": \"bch_error\""));
+
+    // Post-roll tronqué: annotation bornée aux échantillons enregistrés
+    capture = make_capture(100400, 1500);
+    capture.truncated = true;
+    json = sigmf_burst_writer::metadata_json(capture, nullptr);
+    BOOST_CHECK(contains(json, "\"core:sample_start\": 400,"));
+    BOOST_CHECK(contains(json, "\"core:sample_count\": 1100,"));
+    BOOST_CHECK(contains(json, "\"cospas:truncated\": true"));
+
+    // Nom de base: date UTC du début du burst (400 échantillons = 10 ms)
+    BOOST_CHECK_EQUAL(sigmf_burst_writer::base_name(make_capture(100400), 7),
+                      "burst_20251115_081026_010_7");
+}
+
+BOOST_AUTO_TEST_CASE(t_submit_bounded_by_max_bytes)
+{
+    temp_dir dir;
+    const size_t burst_bytes = 3000 * sizeof(gr_complex);
+    sigmf_burst_writer writer(dir.path.string(), burst_bytes * 2, 60.0, false, false);
+
+    // Deux bursts en attente de leur trame: le troisième est refusé
+    BOOST_CHECK(writer.submit(make_capture(100400)));
+    BOOST_CHECK(writer.submit(make_capture(200400)));
+    BOOST_CHECK(!writer.submit(make_capture(300400)));
+    BOOST_CHECK_EQUAL(writer.dropped(), 1);
+
+    // Trames reçues: la file se vide et accepte de nouveau
+    writer.set_status(100400, make_status(1, true));
+    writer.set_status(200400, make_status(1, false));
+    writer.flush();
+    BOOST_CHECK_EQUAL(writer.recorded(), 2);
+    BOOST_CHECK(writer.submit(make_capture(300400)));
+    writer.set_status(300400, make_status(2, false));
+    writer.flush();
+    BOOST_CHECK_EQUAL(writer.recorded(), 3);
+    BOOST_CHECK_EQUAL(dir.files(".sigmf-meta").size(), 3u);
+
+    writer.reset_statistics();
+    BOOST_CHECK_EQUAL(writer.recorded(), 0);
+    BOOST_CHECK_EQUAL(writer.dropped(), 0);
+}
+
+BOOST_AUTO_TEST_CASE(t_status_before_submit)
+{
+    temp_dir dir;
+    sigmf_burst_writer writer(dir.path.string(), 1 << 20, 60.0, false, false);
+
+    // Trame décodée pendant le post-roll: conservée jusqu'à la soumission,
+    // le burst est écrit sans attendre decode_timeout
+    writer.set_status(100400, make_status(1, true));
+    const auto start = std::chrono::steady_clock::now();
+    BOOST_CHECK(writer.submit(make_capture(100400)));
+    writer.flush();
+    BOOST_CHECK(std::chrono::steady_clock::now() - start < std::chrono::seconds(5));
+    BOOST_CHECK_EQUAL(writer.recorded(), 1);
+
+    const auto meta = dir.files(".sigmf-meta");
+    BOOST_REQUIRE_EQUAL(meta.size(), 1u);
+    const std::string json = read_file(meta[0]);
+    BOOST_CHECK(contains(json, "\"cospas:decode_status\": \"decoded\""));
+    BOOST_CHECK(contains(json, "\"cospas:hex\": \"" + HEX_1G + "\""));
+}
+
+BOOST_AUTO_TEST_CASE(t_flush_writes_data_and_meta)
+{
+    temp_dir dir;
+    {
+        // Sans trame: écrit après decode_timeout
+        sigmf_burst_writer writer(dir.path.string(), 1 << 20, 0.05, false, false);
+        burst_capture capture = make_capture(100400);
+        capture.samples[1234] = gr_complex(-0.5f, 0.25f);
+        const std::vector<gr_complex> samples = capture.samples;
+        BOOST_CHECK(writer.submit(std::move(capture)));
+        writer.flush();
+        BOOST_CHECK_EQUAL(writer.recorded(), 1);
+
+        const auto data = dir.files(".sigmf-data");
+        const auto meta = dir.files(".sigmf-meta");
+        BOOST_REQUIRE_EQUAL(data.size(), 1u);
+        BOOST_REQUIRE_EQUAL(meta.size(), 1u);
+        BOOST_CHECK_EQUAL(data[0].filename(), "burst_20251115_081026_010_0.sigmf-data");
+        BOOST_CHECK_EQUAL(meta[0].stem(), data[0].stem());
+
+        // cf32_le: échantillons bruts
+        const std::string bytes = read_file(data[0]);
+        BOOST_REQUIRE_EQUAL(bytes.size(), samples.size() * sizeof(gr_complex));
+        BOOST_CHECK(std::equal(samples.begin(), samples.end(),
+                               reinterpret_cast<const gr_complex*>(bytes.data())));
+        BOOST_CHECK(contains(read_file(meta[0]), "\"cospas:decode_status\": \"no_frame\""));
+    }
+
+    // failed_only: un burst décodé n'est pas écrit
+    temp_dir failed_dir;
+    sigmf_burst_writer writer(failed_dir.path.string(), 1 << 20, 60.0, true, false);
+    writer.submit(make_capture(100400));
+    writer.submit(make_capture(200400));
+    writer.set_status(100400, make_status(2, true));
+    writer.set_status(200400, make_status(2, false));
+    writer.flush();
+    BOOST_CHECK_EQUAL(writer.recorded(), 1);
+    const auto meta = failed_dir.files(".sigmf-meta");
+    BOOST_REQUIRE_EQUAL(meta.size(), 1u);
+    BOOST_CHECK(contains(read_file(meta[0]), "\"cospas:decode_status\": \"bch_error\""));
+}
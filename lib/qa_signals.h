@@ -0,0 +1,201 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+/*
+ * Signaux de test des QA C++ (bursts 1G et 2G synthétiques)
+ *
+ * Le bruit est tiré avec mt19937 (séquence normalisée) et Box-Muller:
+ * std::normal_distribution diffère d'une bibliothèque standard a l'autre,
+ * les tests doivent donner les mêmes bursts partout.
+ */
+
+#ifndef INCLUDED_COSPAS_QA_SIGNALS_H
+#define INCLUDED_COSPAS_QA_SIGNALS_H
+
+#include "t018_prn.h"
+#include <gnuradio/gr_complex.h>
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <random>
+#include <string>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+namespace qa {
+
+// Trames de référence (message seul, sans bit sync / frame sync pour la 1G)
+const char* const HEX_1G = "8E3301E2402B002BBA863609670908";
+const char* const HEX_2G = "0C0E7456390956CCD02799A2468ACF135787FFF00C02832000037707609BC0F";
+const char* const SYNC_1G = "111111111111111011010000";  // 15 bits a '1' + frame sync (test)
+constexpr int HEX_PAD_BITS_2G = 2;                         // 63 chiffres = 2 bits a zéro + 250
+
+constexpr float CARRIER_S_1G = 0.160f;
+constexpr float BIT_RATE_1G = 400.0f;
+constexpr float BIT_RATE_2G = 300.0f;  // 2 canaux de 150 bit/s
+
+inline std::vector<uint8_t> hex_to_bits(const char* hex)
+{
+    std::vector<uint8_t> bits;
+    for (const char* c = hex; *c; c++) {
+        int value = std::stoi(std::string(1, *c), nullptr, 16);
+        for (int j = 3; j >= 0; j--) {
+            bits.push_back((value >> j) & 1);
+        }
+    }
+    return bits;
+}
+
+// Bits d'une trame 1G: bit sync + frame sync + message (144 bits)
+inline std::vector<uint8_t> frame_bits_1g()
+{
+    std::vector<uint8_t> bits;
+    for (const char* c = SYNC_1G; *c; c++) {
+        bits.push_back(*c == '1');
+    }
+    const std::vector<uint8_t> message = hex_to_bits(HEX_1G);
+    bits.insert(bits.end(), message.begin(), message.end());
+    return bits;
+}
+
+// Message 2G de 250 bits (202 bits d'information + 48 bits BCH)
+inline std::vector<uint8_t> message_bits_2g()
+{
+    const std::vector<uint8_t> hex_bits = hex_to_bits(HEX_2G);
+    return std::vector<uint8_t>(hex_bits.begin() + HEX_PAD_BITS_2G,
+                                hex_bits.begin() + HEX_PAD_BITS_2G + t018_prn::MESSAGE_BITS);
+}
+
+//! Bruit blanc complexe gaussien, écart-type sigma par composante
+inline void add_noise(std::vector<gr_complex>& x, double sigma, unsigned seed)
+{
+    std::mt19937 rng(seed);
+    auto uniform = [&rng]() { return (rng() + 0.5) / 4294967296.0; };
+    for (auto& s : x) {
+        const double r = sigma * std::sqrt(-2.0 * std::log(uniform()));
+        const double theta = 2.0 * M_PI * uniform();
+        s += gr_complex(static_cast<float>(r * std::cos(theta)),
+                        static_cast<float>(r * std::sin(theta)));
+    }
+}
+
+/*!
+ * \brief Bruit blanc complexe pour un Eb/N0 donné
+ *
+ * La puissance du signal est mesurée sur [first, last) (partie modulée),
+ * Eb = P * sample_rate / bit_rate, N0 = variance complexe par échantillon.
+ */
+inline void add_noise_ebn0(std::vector<gr_complex>& x,
+                           int first,
+                           int last,
+                           float sample_rate,
+                           float bit_rate,
+                           float ebn0_db,
+                           unsigned seed)
+{
+    double power = 0.0;
+    for (int n = first; n < last; n++) {
+        power += std::norm(x[n]);
+    }
+    power /= std::max(1, last - first);
+    const double n0 = power * sample_rate / bit_rate / std::pow(10.0, ebn0_db / 10.0);
+    add_noise(x, std::sqrt(n0 / 2.0), seed);
+}
+
+/*!
+ * \brief Burst 1G: 160 ms de porteuse puis 144 bits biphase-L a ±1.1 rad
+ *
+ * \param bit_rate_error Écart relatif du débit (horloge de balise)
+ * \param ebn0_db Eb/N0 (dB), infini = sans bruit
+ */
+inline std::vector<gr_complex> synthesize_1g(float sample_rate,
+                                             float offset_hz,
+                                             float ebn0_db = INFINITY,
+                                             unsigned seed = 1,
+                                             float bit_rate_error = 0.0f)
+{
+    const std::vector<uint8_t> bits = frame_bits_1g();
+    const double samples_per_bit = sample_rate / (BIT_RATE_1G * (1.0 + bit_rate_error));
+    const int carrier = static_cast<int>(CARRIER_S_1G * sample_rate);
+    const int end = carrier + static_cast<int>(bits.size() * samples_per_bit);
+    const int total = end + static_cast<int>(0.010 * sample_rate);
+
+    std::vector<gr_complex> x(total, gr_complex(0.0f, 0.0f));
+    for (int n = 0; n < end; n++) {
+        const double t = n - carrier;
+        double phase = 0.0;
+        if (t >= 0.0) {
+            const int k = std::min(static_cast<int>(t / samples_per_bit),
+                                   static_cast<int>(bits.size()) - 1);
+            const bool first_half = (t - k * samples_per_bit) < samples_per_bit / 2.0;
+            phase = (first_half == (bits[k] == 1)) ? 1.1 : -1.1;
+        }
+        phase += 0.7 + 2.0 * M_PI * offset_hz * n / sample_rate;
+        x[n] = std::polar(0.5f, static_cast<float>(phase));
+    }
+    if (std::isfinite(ebn0_db)) {
+        add_noise_ebn0(x, carrier, end, sample_rate, BIT_RATE_1G, ebn0_db, seed);
+    }
+    return x;
+}
+
+/*!
+ * \brief Burst 2G: OQPSK DSSS (Q en retard d'un demi-chip), chips RRC α=0.8
+ *
+ * \param lead Échantillons de silence avant le burst
+ */
+inline std::vector<gr_complex> synthesize_2g(float sample_rate,
+                                             float offset_hz,
+                                             float ebn0_db = INFINITY,
+                                             unsigned seed = 2,
+                                             int lead = 500)
+{
+    const std::vector<uint8_t> message = message_bits_2g();
+    std::vector<uint8_t> bits(t018_prn::PREAMBLE_BITS, 0);
+    bits.insert(bits.end(), message.begin(), message.end());
+
+    // Bits impairs (1, 3, ...) → I, pairs → Q; bit 1 inverse le PRN
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const int num_chips = t018_prn::CHIPS_PER_CHANNEL;
+    std::vector<float> chips_i(num_chips), chips_q(num_chips);
+    for (int c = 0; c < num_chips; c++) {
+        const int pair = c / t018_prn::CHIPS_PER_BIT;
+        chips_i[c] = prn_i[c] * (bits[2 * pair] ? -1.0f : 1.0f);
+        chips_q[c] = prn_q[c] * (bits[2 * pair + 1] ? -1.0f : 1.0f);
+    }
+
+    constexpr int SPAN = 4;  // Impulsion tronquée a ±4 chips
+    const double samples_per_chip = sample_rate / t018_prn::CHIP_RATE;
+    const int end = lead + static_cast<int>((num_chips + SPAN) * samples_per_chip);
+    const int total = end + 500;
+    std::vector<gr_complex> x(total, gr_complex(0.0f, 0.0f));
+    for (int n = lead; n < end; n++) {
+        const double t = (n - lead) / samples_per_chip;  // En chips
+        double re = 0.0, im = 0.0;
+        for (int c = std::max(0, static_cast<int>(t) - SPAN);
+             c <= std::min(num_chips - 1, static_cast<int>(t) + SPAN);
+             c++) {
+            re += chips_i[c] * t018_prn::rrc_pulse(t - c);
+            im += chips_q[c] * t018_prn::rrc_pulse(t - c - 0.5);
+        }
+        const double phase = 2.0 * M_PI * offset_hz * n / sample_rate;
+        x[n] = gr_complex(static_cast<float>(re), static_cast<float>(im)) *
+               std::polar(0.5f, static_cast<float>(phase));
+    }
+    if (std::isfinite(ebn0_db)) {
+        add_noise_ebn0(x, lead, end, sample_rate, BIT_RATE_2G, ebn0_db, seed);
+    }
+    return x;
+}
+
+} // namespace qa
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_QA_SIGNALS_H */
@@ -0,0 +1,87 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "radix2_fft.h"
+#include <cmath>
+#include <stdexcept>
+#include <utility>
+
+namespace gr {
+namespace cospas {
+
+radix2_fft::radix2_fft(int size) : d_size(size)
+{
+    if (size < 2 || (size & (size - 1)) != 0) {
+        throw std::invalid_argument("radix2_fft: size must be a power of 2");
+    }
+
+    d_twiddles.resize(size / 2);
+    for (int k = 0; k < size / 2; k++) {
+        double angle = -2.0 * M_PI * k / size;
+        d_twiddles[k] = gr_complex(std::cos(angle), std::sin(angle));
+    }
+
+    int log2n = 0;
+    while ((1 << log2n) < size) {
+        log2n++;
+    }
+    d_bit_reverse.resize(size);
+    for (int i = 0; i < size; i++) {
+        int r = 0;
+        for (int b = 0; b < log2n; b++) {
+            r |= ((i >> b) & 1) << (log2n - 1 - b);
+        }
+        d_bit_reverse[i] = r;
+    }
+}
+
+int radix2_fft::next_pow2(int n)
+{
+    int size = 1;
+    while (size < n) {
+        size <<= 1;
+    }
+    return size;
+}
+
+void radix2_fft::execute(gr_complex* data, bool inverse) const
+{
+    for (int i = 0; i < d_size; i++) {
+        int r = d_bit_reverse[i];
+        if (r > i) {
+            std::swap(data[i], data[r]);
+        }
+    }
+
+    // Papillons Cooley-Tukey (décimation temporelle)
+    for (int half = 1; half < d_size; half <<= 1) {
+        const int stride = d_size / (2 * half);
+        for (int start = 0; start < d_size; start += 2 * half) {
+            for (int k = 0; k < half; k++) {
+                const gr_complex& w = d_twiddles[k * stride];
+                const float w_im = inverse ? -w.imag() : w.imag();
+                gr_complex& a = data[start + k];
+                gr_complex& b = data[start + k + half];
+                // Produit développé (évite la gestion NaN/Inf de std::complex)
+                gr_complex t(b.real() * w.real() - b.imag() * w_im,
+                             b.real() * w_im + b.imag() * w.real());
+                b = a - t;
+                a += t;
+            }
+        }
+    }
+
+    if (inverse) {
+        const float scale = 1.0f / d_size;
+        for (int i = 0; i < d_size; i++) {
+            data[i] *= scale;
+        }
+    }
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,51 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_RADIX2_FFT_H
+#define INCLUDED_COSPAS_RADIX2_FFT_H
+
+#include <gnuradio/gr_complex.h>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief FFT complexe radix-2 en place, taille fixe
+ *
+ * Facteurs de rotation et permutation bit-reverse précalculés a la
+ * construction: execute() n'alloue rien.
+ */
+class radix2_fft
+{
+public:
+    //! \param size Taille de la transformée (puissance de 2)
+    explicit radix2_fft(int size);
+
+    int size() const { return d_size; }
+
+    //! Transformée directe en place (sans normalisation)
+    void forward(gr_complex* data) const { execute(data, false); }
+
+    //! Transformée inverse en place (normalisée par 1/size)
+    void inverse(gr_complex* data) const { execute(data, true); }
+
+    //! Plus petite puissance de 2 >= n
+    static int next_pow2(int n);
+
+private:
+    int d_size;
+    std::vector<gr_complex> d_twiddles;  // e^{-j2πk/N}, k < N/2
+    std::vector<int> d_bit_reverse;      // Permutation d'entrée
+
+    void execute(gr_complex* data, bool inverse) const;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_RADIX2_FFT_H */
@@ -0,0 +1,528 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "sgb_demod_core.h"
+#include "t018_prn.h"
+#include <algorithm>
+#include <cmath>
+#include <iostream>
+
+namespace gr {
+namespace cospas {
+
+namespace {
+
+constexpr int PAIRS_PER_FRAME = t018_prn::FRAME_BITS / 2;       // 150
+constexpr int PREAMBLE_PAIRS = t018_prn::PREAMBLE_BITS / 2;     // 25
+constexpr int TIMING_PAIRS = 8;                                 // Recherche du timing fin
+
+// Boucles de poursuite (gains par paire de bits, 6.67 ms)
+constexpr float PLL_KP = 0.25f;
+constexpr float PLL_KI = 0.02f;
+constexpr double TIMING_KP = 0.15;    // chips par unité d'erreur early-late
+constexpr double TIMING_KI = 0.002;
+
+inline float wrap_phase(float phase)
+{
+    while (phase > static_cast<float>(M_PI)) {
+        phase -= 2.0f * static_cast<float>(M_PI);
+    }
+    while (phase < -static_cast<float>(M_PI)) {
+        phase += 2.0f * static_cast<float>(M_PI);
+    }
+    return phase;
+}
+
+} // namespace
+
+sgb_demod_core::sgb_demod_core(float sample_rate, bool debug_mode)
+    : d_sample_rate(sample_rate),
+      d_samples_per_chip(sample_rate / t018_prn::CHIP_RATE),
+      d_debug_mode(debug_mode),
+      d_acquisition(sample_rate,
+                    static_cast<int>(ACQUISITION_MAX_OFFSET_S * sample_rate),
+                    ACQUISITION_DELAYS),
+      d_freq_fft(radix2_fft::next_pow2(static_cast<int>(
+          std::ceil(PREAMBLE_PAIRS * t018_prn::CHIPS_PER_BIT * sample_rate / t018_prn::CHIP_RATE)))),
+      d_fft_buffer(d_freq_fft.size()),
+      d_stage(STAGE_ACQUISITION),
+      d_baseband_size(0),
+      d_pair(0),
+      d_preamble_errors(0)
+{
+    // Préambule au plus tard en fin de fenêtre d'acquisition (±1 échantillon
+    // de timing fin), plus la demi-longueur du filtre adapté
+    d_acquisition_samples = d_acquisition.window_size() +
+                            static_cast<int>(std::ceil((TABLE_SPAN + 1) * d_samples_per_chip)) + 3;
+
+    // Table élargie a ±TABLE_SPAN: les instants early/late (±1/4 chip)
+    // restent dans la table sur toute la fenêtre du filtre adapté
+    d_pulse.resize(2 * TABLE_SPAN * PULSE_RESOLUTION + 1);
+    for (size_t i = 0; i < d_pulse.size(); i++) {
+        double t = static_cast<double>(i) / PULSE_RESOLUTION - TABLE_SPAN;
+        d_pulse[i] = (std::abs(t) < PULSE_SPAN) ? static_cast<float>(t018_prn::rrc_pulse(t)) : 0.0f;
+    }
+
+    // Préambule OQPSK aux instants d'échantillonnage (debut a l'échantillon 0)
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const int preamble_chips = PREAMBLE_PAIRS * t018_prn::CHIPS_PER_BIT;
+    d_preamble_conj.resize(std::min(d_freq_fft.size(),
+                                    static_cast<int>(preamble_chips * d_samples_per_chip)));
+    for (size_t n = 0; n < d_preamble_conj.size(); n++) {
+        const double t = n / d_samples_per_chip;
+        float ref_i = 0.0f;
+        float ref_q = 0.0f;
+        const int center = static_cast<int>(std::floor(t));
+        for (int k = std::max(0, center - PULSE_SPAN + 1);
+             k <= std::min(preamble_chips - 1, center + PULSE_SPAN);
+             k++) {
+            ref_i += pulse(t - k) * prn_i[k];
+            ref_q += pulse(t - 0.5 - k) * prn_q[k];
+        }
+        d_preamble_conj[n] = gr_complex(ref_i, -ref_q);
+    }
+}
+
+float sgb_demod_core::pulse(double t_chips) const
+{
+    if (t_chips <= -PULSE_SPAN || t_chips >= PULSE_SPAN) {
+        return 0.0f;
+    }
+    return d_pulse[static_cast<int>((t_chips + TABLE_SPAN) * PULSE_RESOLUTION + 0.5)];
+}
+
+gr_complex sgb_demod_core::bit_correlation(const gr_complex* x,
+                                           int num_samples,
+                                           const int8_t* prn,
+                                           double first_center,
+                                           double chip_step,
+                                           gr_complex* early_late) const
+{
+    const double span = PULSE_SPAN * d_samples_per_chip;
+    const double index_step = PULSE_RESOLUTION / d_samples_per_chip;
+    const int shift = static_cast<int>(EARLY_LATE * PULSE_RESOLUTION);
+
+    gr_complex prompt(0.0f, 0.0f);
+    gr_complex early(0.0f, 0.0f);
+    gr_complex late(0.0f, 0.0f);
+    for (int k = 0; k < t018_prn::CHIPS_PER_BIT; k++) {
+        // Sortie du filtre adapté a l'instant chip: indice dans la table
+        // avancé par pas constant (pas de division par échantillon)
+        const double center = first_center + k * chip_step;
+        const int first = std::max(0, static_cast<int>(std::ceil(center - span)));
+        const int last = std::min(num_samples - 1, static_cast<int>(std::floor(center + span)));
+        double index =
+            ((first - center) / d_samples_per_chip + TABLE_SPAN) * PULSE_RESOLUTION + 0.5;
+
+        float re = 0.0f, im = 0.0f;
+        if (!early_late) {
+            for (int n = first; n <= last; n++, index += index_step) {
+                const float p = d_pulse[static_cast<int>(index)];
+                re += p * x[n].real();
+                im += p * x[n].imag();
+            }
+        } else {
+            // Early (centre - 1/4 chip) et late (+ 1/4 chip) sur les mêmes échantillons
+            float re_e = 0.0f, im_e = 0.0f, re_l = 0.0f, im_l = 0.0f;
+            for (int n = first; n <= last; n++, index += index_step) {
+                const int i = static_cast<int>(index);
+                const float p = d_pulse[i];
+                const float p_e = d_pulse[i + shift];
+                const float p_l = d_pulse[i - shift];
+                re += p * x[n].real();
+                im += p * x[n].imag();
+                re_e += p_e * x[n].real();
+                im_e += p_e * x[n].imag();
+                re_l += p_l * x[n].real();
+                im_l += p_l * x[n].imag();
+            }
+            const float sign = (prn[k] > 0) ? 1.0f : -1.0f;
+            early += sign * gr_complex(re_e, im_e);
+            late += sign * gr_complex(re_l, im_l);
+        }
+        prompt += (prn[k] > 0) ? gr_complex(re, im) : gr_complex(-re, -im);
+    }
+    if (early_late) {
+        early_late[0] = early;
+        early_late[1] = late;
+    }
+    return prompt;
+}
+
+gr_complex sgb_demod_core::pair_phasor(const gr_complex* x,
+                                       int num_samples,
+                                       int pair,
+                                       double pair_start,
+                                       double chip_step) const
+{
+    const int offset = pair * t018_prn::CHIPS_PER_BIT;
+    gr_complex c_i = bit_correlation(
+        x, num_samples, t018_prn::normal_i().data() + offset, pair_start, chip_step);
+    gr_complex c_q = bit_correlation(x,
+                                     num_samples,
+                                     t018_prn::normal_q().data() + offset,
+                                     pair_start + 0.5 * chip_step,
+                                     chip_step);
+    return combine(c_i, c_q, 1.0f, 1.0f);
+}
+
+float sgb_demod_core::preamble_energy(const gr_complex* samples, int num_samples, int start)
+{
+    std::fill(d_fft_buffer.begin(), d_fft_buffer.end(), gr_complex(0.0f, 0.0f));
+    const int first = std::max(0, -start);
+    const int last = std::min(static_cast<int>(d_preamble_conj.size()), num_samples - start);
+    for (int i = first; i < last; i++) {
+        d_fft_buffer[i] = samples[start + i] * d_preamble_conj[i];
+    }
+    d_freq_fft.forward(d_fft_buffer.data());
+
+    float peak = 0.0f;
+    for (const auto& bin : d_fft_buffer) {
+        peak = std::max(peak, std::norm(bin));
+    }
+    return peak;
+}
+
+// Désétalement du préambule par sa forme d'onde connue: il ne reste que la
+// porteuse résiduelle, dont la FFT donne l'offset (résolution fs/N, affinée
+// par interpolation parabolique)
+float sgb_demod_core::estimate_frequency(const gr_complex* samples,
+                                         int num_samples,
+                                         double preamble_start)
+{
+    const int size = d_freq_fft.size();
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const double chips_per_sample = 1.0 / d_samples_per_chip;
+    const int preamble_chips = PREAMBLE_PAIRS * t018_prn::CHIPS_PER_BIT;
+    const int start = static_cast<int>(std::floor(preamble_start));
+
+    std::fill(d_fft_buffer.begin(), d_fft_buffer.end(), gr_complex(0.0f, 0.0f));
+    for (int i = 0; i < size; i++) {
+        const int n = start + i;
+        if (n < 0) {
+            continue;
+        }
+        const double t = (n - preamble_start) * chips_per_sample;
+        if (n >= num_samples || t >= preamble_chips) {
+            break;
+        }
+        // Référence OQPSK: chips I en t, chips Q en t - 0.5
+        float ref_i = 0.0f;
+        float ref_q = 0.0f;
+        const int center = static_cast<int>(std::floor(t));
+        for (int k = center - PULSE_SPAN + 1; k <= center + PULSE_SPAN; k++) {
+            if (k < 0 || k >= preamble_chips) {
+                continue;
+            }
+            ref_i += pulse(t - k) * prn_i[k];
+            ref_q += pulse(t - 0.5 - k) * prn_q[k];
+        }
+        d_fft_buffer[i] = samples[n] * gr_complex(ref_i, -ref_q);
+    }
+    d_freq_fft.forward(d_fft_buffer.data());
+
+    int peak = 0;
+    float peak_mag = 0.0f;
+    for (int k = 0; k < size; k++) {
+        float mag = std::norm(d_fft_buffer[k]);
+        if (mag > peak_mag) {
+            peak_mag = mag;
+            peak = k;
+        }
+    }
+
+    float ym = std::abs(d_fft_buffer[(peak - 1 + size) % size]);
+    float y0 = std::abs(d_fft_buffer[peak]);
+    float yp = std::abs(d_fft_buffer[(peak + 1) % size]);
+    float denom = ym - 2.0f * y0 + yp;
+    float delta = (denom != 0.0f) ? 0.5f * (ym - yp) / denom : 0.0f;
+
+    float bin = peak + delta;
+    if (bin > size / 2) {
+        bin -= size;
+    }
+    return bin * d_sample_rate / size;
+}
+
+// Timing chip fin: énergie non cohérente des premières paires du préambule,
+// recherche par dichotomie sur ±1 échantillon autour du pic PRN (pas final 1/8)
+double sgb_demod_core::refine_timing(int num_samples, double coarse_start) const
+{
+    const double pair_samples = t018_prn::CHIPS_PER_BIT * d_samples_per_chip;
+    const int first_pair = std::max(
+        0, static_cast<int>(std::ceil((PULSE_SPAN * d_samples_per_chip - coarse_start) / pair_samples)));
+    const int last_pair = std::min(PREAMBLE_PAIRS, first_pair + TIMING_PAIRS);
+
+    auto energy = [&](double start) {
+        float sum = 0.0f;
+        for (int m = first_pair; m < last_pair; m++) {
+            sum += std::abs(pair_phasor(
+                d_baseband.data(), num_samples, m, start + m * pair_samples, d_samples_per_chip));
+        }
+        return sum;
+    };
+
+    double best_start = coarse_start;
+    float best_energy = energy(coarse_start);
+    for (double delta : { -1.0, -0.5, 0.5, 1.0 }) {
+        float e = energy(coarse_start + delta);
+        if (e > best_energy) {
+            best_energy = e;
+            best_start = coarse_start + delta;
+        }
+    }
+    for (double delta = 0.25; delta >= 0.125; delta /= 2.0) {
+        const double center = best_start;
+        for (double sign : { -1.0, 1.0 }) {
+            float e = energy(center + sign * delta);
+            if (e > best_energy) {
+                best_energy = e;
+                best_start = center + sign * delta;
+            }
+        }
+    }
+    return best_start;
+}
+
+bool sgb_demod_core::demodulate_burst(const gr_complex* samples,
+                                      int num_samples,
+                                      sgb_demod_frame& frame)
+{
+    begin_burst();
+    return finish(samples, num_samples, frame);
+}
+
+void sgb_demod_core::begin_burst()
+{
+    d_stage = STAGE_ACQUISITION;
+    d_baseband_size = 0;
+    d_pair = 0;
+    d_preamble_errors = 0;
+}
+
+void sgb_demod_core::advance(const gr_complex* samples, int num_samples)
+{
+    if (d_stage == STAGE_ACQUISITION && num_samples >= d_acquisition_samples) {
+        acquire(samples, num_samples);
+    }
+    if (d_stage == STAGE_TRACKING) {
+        extend_baseband(samples, num_samples);
+        track(false);
+    }
+}
+
+bool sgb_demod_core::finish(const gr_complex* samples, int num_samples, sgb_demod_frame& frame)
+{
+    frame.bits.clear();
+    frame.soft.clear();
+    frame.preamble_errors = 0;
+    frame.freq_offset = 0.0f;
+    frame.chip_rate = 0.0f;
+    frame.preamble_offset = 0.0f;
+
+    if (d_stage == STAGE_ACQUISITION) {
+        acquire(samples, num_samples);
+    }
+    if (d_stage == STAGE_FAILED) {
+        return false;
+    }
+
+    // Fin de burst coupée par le détecteur: le dernier bit doit être présent aux 3/4
+    const double frame_end =
+        d_coarse_start +
+        (t018_prn::CHIPS_PER_CHANNEL - t018_prn::CHIPS_PER_BIT / 4) * d_samples_per_chip;
+    if (frame_end > num_samples) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS 2G] Trame incomplete: " << num_samples << " echantillons, "
+                      << static_cast<int>(frame_end) << " necessaires" << std::endl;
+        }
+        return false;
+    }
+
+    extend_baseband(samples, num_samples);
+    track(true);
+
+    frame.bits = d_bits;
+    frame.soft = d_soft;
+    frame.preamble_errors = d_preamble_errors;
+    frame.freq_offset = d_freq_offset;
+    frame.chip_rate = static_cast<float>(d_sample_rate / d_chip_step);
+    frame.preamble_offset = static_cast<float>(d_preamble_start);
+
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Preambule a " << d_preamble_start << " ech., offset freq="
+                  << d_freq_offset << " Hz, debit chip=" << frame.chip_rate
+                  << " chips/s, erreurs preambule=" << frame.preamble_errors << std::endl;
+    }
+
+    if (frame.preamble_errors > MAX_PREAMBLE_ERRORS) {
+        return false;
+    }
+    return true;
+}
+
+// Acquisition, fréquence, timing fin et phase initiale: n'utilise que les
+// acquisition_samples() premiers échantillons, résultat identique sur un
+// debut de burst et sur le burst complet
+void sgb_demod_core::acquire(const gr_complex* samples, int num_samples)
+{
+    d_stage = STAGE_FAILED;
+
+    // === ACQUISITION: préambule PRN ===
+    // Le burst est déjà classé 2G: les pics sont retenus même sous le seuil
+    // de détection, la trame est validée ensuite par les bits du préambule.
+    // Le produit différentiel perd ~3 dB a faible SNR: le bon pic n'est pas
+    // toujours le plus fort, la corrélation cohérente départage les candidats
+    if (!d_acquisition.detect(samples, num_samples) && d_debug_mode) {
+        std::cout << "[COSPAS 2G] Pic PRN faible (pic/moyenne=" << d_acquisition.peak_ratio()
+                  << ")" << std::endl;
+    }
+    d_acquisition.strongest_offsets(ACQUISITION_CANDIDATES, d_candidates);
+    int best_start = d_acquisition.preamble_offset();
+    float best_energy = -1.0f;
+    for (int candidate : d_candidates) {
+        for (int start = candidate - 1; start <= candidate + 1; start++) {
+            const float energy = preamble_energy(samples, num_samples, start);
+            if (energy > best_energy) {
+                best_energy = energy;
+                best_start = start;
+            }
+        }
+    }
+    d_coarse_start = best_start;
+
+    // === FRÉQUENCE: FFT du préambule désétalé, puis correction du burst ===
+    d_freq_offset = estimate_frequency(samples, num_samples, d_coarse_start);
+    const double step = -2.0 * M_PI * d_freq_offset / d_sample_rate;
+    d_rotation = gr_complex(static_cast<float>(std::cos(step)),
+                            static_cast<float>(std::sin(step)));
+    d_phasor = gr_complex(1.0f, 0.0f);
+    d_baseband_size = 0;
+    extend_baseband(samples, num_samples);
+    const gr_complex* x = d_baseband.data();
+
+    // === TIMING FIN ===
+    d_preamble_start = refine_timing(num_samples, d_coarse_start);
+
+    // Paires du préambule entièrement dans le burst (debut de burst tronqué)
+    const double pair_samples = t018_prn::CHIPS_PER_BIT * d_samples_per_chip;
+    const int first_pair = std::max(
+        0, static_cast<int>(std::ceil((PULSE_SPAN * d_samples_per_chip - d_preamble_start) / pair_samples)));
+    if (first_pair >= PREAMBLE_PAIRS - 2) {
+        return;
+    }
+
+    // === PHASE ET FRÉQUENCE RÉSIDUELLES INITIALES (préambule) ===
+    std::vector<gr_complex> preamble_phasors(PREAMBLE_PAIRS);
+    for (int m = first_pair; m < PREAMBLE_PAIRS; m++) {
+        preamble_phasors[m] = pair_phasor(
+            x, num_samples, m, d_preamble_start + m * pair_samples, d_samples_per_chip);
+    }
+    gr_complex diff_sum(0.0f, 0.0f);
+    for (int m = first_pair + 1; m < PREAMBLE_PAIRS; m++) {
+        diff_sum += preamble_phasors[m] * std::conj(preamble_phasors[m - 1]);
+    }
+    d_omega = std::arg(diff_sum);  // rad par paire
+    gr_complex phase_sum(0.0f, 0.0f);
+    for (int m = first_pair; m < PREAMBLE_PAIRS; m++) {
+        phase_sum += preamble_phasors[m] * std::polar(1.0f, -d_omega * (m - first_pair));
+    }
+    d_phase = std::arg(phase_sum);
+
+    // Amplitude de référence pour les décisions souples
+    d_amplitude = std::abs(phase_sum) / (2.0f * (PREAMBLE_PAIRS - first_pair));
+    if (d_amplitude <= 0.0f) {
+        return;
+    }
+
+    d_chip_step = d_samples_per_chip;
+    d_position = d_preamble_start + first_pair * pair_samples;
+    d_timing_integrator = 0.0;
+    d_pair = first_pair;
+    d_preamble_errors = 0;
+    d_bits.assign(MESSAGE_BITS, 0);
+    d_soft.assign(MESSAGE_BITS, 0.0f);
+    d_stage = STAGE_TRACKING;
+}
+
+// Correction de fréquence des échantillons reçus depuis l'appel précédent
+void sgb_demod_core::extend_baseband(const gr_complex* samples, int num_samples)
+{
+    d_baseband.resize(std::max<size_t>(d_baseband.size(), num_samples));
+    for (int n = d_baseband_size; n < num_samples; n++) {
+        d_baseband[n] = samples[n] * d_phasor;
+        d_phasor *= d_rotation;
+        if ((n & 1023) == 1023) {
+            d_phasor /= std::abs(d_phasor);
+        }
+    }
+    d_baseband_size = std::max(d_baseband_size, num_samples);
+}
+
+// === DÉSÉTALEMENT + POURSUITE (PLL porteuse, early-late chip) ===
+// Paires suivantes tant que leurs échantillons sont arrivés (toutes si final)
+void sgb_demod_core::track(bool final)
+{
+    const std::vector<int8_t>& prn_i = t018_prn::normal_i();
+    const std::vector<int8_t>& prn_q = t018_prn::normal_q();
+    const gr_complex* x = d_baseband.data();
+    const int num_samples = d_baseband_size;
+    const double span = PULSE_SPAN * d_samples_per_chip;
+
+    for (; d_pair < PAIRS_PER_FRAME; d_pair++) {
+        const int m = d_pair;
+        // Dernier échantillon du filtre adapté pour le dernier chip Q de la paire
+        if (!final && std::floor(d_position + (t018_prn::CHIPS_PER_BIT - 0.5) * d_chip_step +
+                                 span) >= num_samples) {
+            break;
+        }
+
+        const int offset = m * t018_prn::CHIPS_PER_BIT;
+        const double q_position = d_position + 0.5 * d_chip_step;
+        gr_complex el_i[2], el_q[2];
+        gr_complex c_i = bit_correlation(x, num_samples, &prn_i[offset], d_position, d_chip_step, el_i);
+        gr_complex c_q = bit_correlation(x, num_samples, &prn_q[offset], q_position, d_chip_step, el_q);
+
+        const gr_complex derotation = std::polar(1.0f, -d_phase);
+        const float u_i = (c_i * derotation).real();
+        const float u_q = (c_q * derotation).imag();
+
+        float sign_i, sign_q;
+        if (m < PREAMBLE_PAIRS) {
+            // Préambule: bits a '0' connus
+            sign_i = 1.0f;
+            sign_q = 1.0f;
+            d_preamble_errors += (u_i < 0.0f) + (u_q < 0.0f);
+        } else {
+            sign_i = (u_i < 0.0f) ? -1.0f : 1.0f;
+            sign_q = (u_q < 0.0f) ? -1.0f : 1.0f;
+            const int bit = 2 * (m - PREAMBLE_PAIRS);
+            d_bits[bit] = (u_i < 0.0f) ? 1 : 0;
+            d_bits[bit + 1] = (u_q < 0.0f) ? 1 : 0;
+            d_soft[bit] = -u_i / d_amplitude;
+            d_soft[bit + 1] = -u_q / d_amplitude;
+        }
+
+        // PLL: erreur de phase sur les deux canaux, modulation retirée
+        float phase_error = std::arg(combine(c_i, c_q, sign_i, sign_q) * derotation);
+        d_omega += PLL_KI * phase_error;
+        d_phase = wrap_phase(d_phase + d_omega + PLL_KP * phase_error);
+
+        // Early-late: énergie cohérente a ±1/4 chip
+        float early = std::abs(combine(el_i[0], el_q[0], sign_i, sign_q));
+        float late = std::abs(combine(el_i[1], el_q[1], sign_i, sign_q));
+        double timing_error = (early + late > 0.0f) ? (late - early) / (late + early) : 0.0;
+        d_timing_integrator += TIMING_KI * timing_error;
+        d_chip_step = d_samples_per_chip * (1.0 + d_timing_integrator / t018_prn::CHIPS_PER_BIT);
+        d_position += t018_prn::CHIPS_PER_BIT * d_chip_step + TIMING_KP * timing_error * d_chip_step;
+    }
+}
+
+} // namespace cospas
+} // namespace gr
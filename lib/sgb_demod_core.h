@@ -0,0 +1,178 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_SGB_DEMOD_CORE_H
+#define INCLUDED_COSPAS_SGB_DEMOD_CORE_H
+
+#include "prn_2g_detector.h"
+#include "radix2_fft.h"
+#include <gnuradio/gr_complex.h>
+#include <cstdint>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Trame 2G démodulée (préambule retiré)
+ */
+struct sgb_demod_frame {
+    std::vector<uint8_t> bits;  // 250 bits de message (202 info + 48 BCH)
+    std::vector<float> soft;    // Décisions souples normalisées, > 0 → '1', < 0 → '0'
+    int preamble_errors;        // Bits de préambule décodés a '1' (sur 50)
+    float freq_offset;          // Offset de porteuse (Hz)
+    float chip_rate;            // Débit chip mesuré en fin de trame (chips/s)
+    float preamble_offset;      // Début du préambule dans le burst (échantillons)
+};
+
+/*!
+ * \brief Démodulateur OQPSK DSSS 2G (C/S T.018) pour un burst complet
+ *
+ * Indépendant de GNU Radio. Étapes:
+ * - acquisition: candidats de position par corrélation différentielle
+ *   multi-retards sur tout le préambule (prn_2g_detector), départagés par
+ *   corrélation cohérente du préambule complet (166 ms) avec sa forme
+ *   d'onde, toutes fréquences a la fois (FFT); puis offset de porteuse
+ *   affiné sur le préambule désétalé et timing chip fin;
+ * - désétalement bit par bit: sortie du filtre adapté RRC a chaque instant
+ *   chip (I, et Q décalé d'un demi-chip) pondérée par les tables PRN
+ *   précalculées (t018_prn), sans LFSR;
+ * - poursuite: PLL porteuse du second ordre (décisions connues pendant le
+ *   préambule, puis dirigée par les décisions) et boucle early-late sur
+ *   l'instant et le débit chip (tolérance T.018 ±0.6 chips/s).
+ *
+ * Le burst peut aussi être démodulé pendant sa réception (begin_burst(),
+ * advance(), finish()): l'acquisition part dès acquisition_samples()
+ * échantillons et chaque paire de bits est désétalée dès que ses
+ * échantillons sont arrivés, avec le même résultat que demodulate_burst().
+ *
+ * Les buffers sont réutilisés d'un burst a l'autre.
+ */
+class sgb_demod_core
+{
+public:
+    explicit sgb_demod_core(float sample_rate, bool debug_mode = false);
+
+    /*!
+     * \brief Démoduler un burst 2G
+     * \return true si le préambule est trouvé et la trame complète
+     */
+    bool demodulate_burst(const gr_complex* samples, int num_samples, sgb_demod_frame& frame);
+
+    //! Nouveau burst reçu par morceaux
+    void begin_burst();
+
+    /*!
+     * \brief Avancer la démodulation sur le début du burst
+     * \param samples Échantillons reçus depuis le début du burst
+     * \param num_samples Nombre d'échantillons reçus (croissant d'un appel a l'autre)
+     */
+    void advance(const gr_complex* samples, int num_samples);
+
+    /*!
+     * \brief Terminer la démodulation sur le burst complet
+     * \return true si le préambule est trouvé et la trame complète
+     */
+    bool finish(const gr_complex* samples, int num_samples, sgb_demod_frame& frame);
+
+    //! Échantillons reçus avant l'acquisition (préambule le plus tardif compris)
+    int acquisition_samples() const { return d_acquisition_samples; }
+
+    //! Paires de bits (préambule compris) déjà désétalées du burst en cours
+    int tracked_pairs() const { return d_pair; }
+
+    void set_debug_mode(bool enable) { d_debug_mode = enable; }
+
+    static constexpr int MESSAGE_BITS = 250;
+    static constexpr int MAX_PREAMBLE_ERRORS = 5;  // Au-delà: fausse acquisition
+
+private:
+    float d_sample_rate;
+    double d_samples_per_chip;  // Nominal: 40000 / 38400
+    bool d_debug_mode;
+
+    prn_2g_detector d_acquisition;        // Préambule complet, plusieurs retards
+    std::vector<int> d_candidates;        // Positions candidates du préambule
+    std::vector<gr_complex> d_preamble_conj;  // conj(préambule) aux instants d'échantillonnage
+    radix2_fft d_freq_fft;                // Taille >= durée du préambule
+    std::vector<gr_complex> d_fft_buffer;
+    std::vector<gr_complex> d_baseband;   // Burst corrigé en fréquence
+    std::vector<float> d_pulse;           // RRC tabulée (nulle au-delà de ±PULSE_SPAN chips)
+    int d_acquisition_samples;
+
+    // Burst en cours
+    enum stage { STAGE_ACQUISITION, STAGE_TRACKING, STAGE_FAILED };
+    stage d_stage;
+    int d_baseband_size;         // Échantillons déjà corrigés en fréquence
+    gr_complex d_phasor;         // Rotation de correction au prochain échantillon
+    gr_complex d_rotation;
+    double d_coarse_start;       // Préambule a l'échantillon près (acquisition)
+    double d_preamble_start;     // Après timing fin
+    float d_freq_offset;
+    int d_pair;                  // Prochaine paire a désétaler
+    double d_position;           // Premier chip I de la paire d_pair
+    double d_chip_step;
+    double d_timing_integrator;
+    float d_phase;
+    float d_omega;
+    float d_amplitude;
+    std::vector<uint8_t> d_bits;
+    std::vector<float> d_soft;
+    int d_preamble_errors;
+
+    static constexpr int PULSE_SPAN = 4;          // Demi-longueur du filtre adapté (chips)
+    static constexpr int PULSE_RESOLUTION = 256;  // Points par chip
+    static constexpr double EARLY_LATE = 0.25;    // Écart early/late (chips)
+
+    static constexpr int TABLE_SPAN = PULSE_SPAN + 1;
+
+    static constexpr float ACQUISITION_MAX_OFFSET_S = 0.0256f;  // Écart burst / préambule
+    static constexpr int ACQUISITION_DELAYS = 8;      // Retards différentiels
+    static constexpr int ACQUISITION_CANDIDATES = 4;  // Pics validés en cohérent
+
+    float pulse(double t_chips) const;
+
+    /*!
+     * Σ PRN[k]·y(first_center + k·chip_step), k = 0..CHIPS_PER_BIT-1, y étant
+     * la sortie du filtre adapté. Si early_late != nullptr, y reçoit aussi
+     * les corrélations a ∓EARLY_LATE chip, calculées dans la même passe.
+     */
+    gr_complex bit_correlation(const gr_complex* x,
+                               int num_samples,
+                               const int8_t* prn,
+                               double first_center,
+                               double chip_step,
+                               gr_complex* early_late = nullptr) const;
+
+    // Corrélation d'une paire de bits a '0' (I, Q) ramenée sur l'axe I
+    gr_complex pair_phasor(const gr_complex* x,
+                           int num_samples,
+                           int pair,
+                           double pair_start,
+                           double chip_step) const;
+
+    // sign_I·c_I + sign_Q·(-j)·c_Q: canal Q ramené sur l'axe I, modulation retirée
+    static gr_complex combine(gr_complex c_i, gr_complex c_q, float sign_i, float sign_q)
+    {
+        return sign_i * c_i + sign_q * gr_complex(c_q.imag(), -c_q.real());
+    }
+
+    // Max sur les fréquences de |FFT(x[start + i]·conj(préambule[i]))|²
+    float preamble_energy(const gr_complex* samples, int num_samples, int start);
+
+    float estimate_frequency(const gr_complex* samples, int num_samples, double preamble_start);
+    double refine_timing(int num_samples, double coarse_start) const;
+
+    void acquire(const gr_complex* samples, int num_samples);
+    void extend_baseband(const gr_complex* samples, int num_samples);
+    void track(bool final);
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_SGB_DEMOD_CORE_H */
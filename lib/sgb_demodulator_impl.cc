@@ -0,0 +1,365 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include "sgb_demodulator_impl.h"
+#include <gnuradio/io_signature.h>
+#include <pmt/pmt.h>
+#include <chrono>
+#include <cstdio>
+#include <iostream>
+
+namespace gr {
+namespace cospas {
+
+sgb_demodulator::sptr sgb_demodulator::make(float sample_rate, bool debug_mode)
+{
+    return gnuradio::make_block_sptr<sgb_demodulator_impl>(sample_rate, debug_mode);
+}
+
+sgb_demodulator_impl::sgb_demodulator_impl(float sample_rate, bool debug_mode)
+    : gr::sync_block("sgb_demodulator",
+                     gr::io_signature::make(0, 0, 0),  // AUCUNE entree stream
+                     gr::io_signature::make(0, 0, 0)), // AUCUNE sortie stream
+      d_sample_rate(sample_rate),
+      d_debug_mode(debug_mode),
+      d_core(sample_rate, debug_mode),
+      d_stream_core(sample_rate, debug_mode),
+      d_stream_burst(0),
+      d_stream_start(pmt::PMT_NIL),
+      d_stream_active(false),
+      d_frames_decoded(0),
+      d_sync_failures(0)
+{
+    message_port_register_in(pmt::mp("bursts"));
+    set_msg_handler(pmt::mp("bursts"), [this](pmt::pmt_t msg) { this->handle_burst_message(msg); });
+    message_port_register_in(pmt::mp("fragments"));
+    set_msg_handler(pmt::mp("fragments"),
+                    [this](pmt::pmt_t msg) { this->handle_fragment_message(msg); });
+
+    message_port_register_out(pmt::mp("frames"));
+    message_port_register_out(pmt::mp("decode_complete"));
+
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Demodulateur initialise a " << d_sample_rate << " Hz"
+                  << std::endl;
+    }
+}
+
+sgb_demodulator_impl::~sgb_demodulator_impl()
+{
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Final: " << d_frames_decoded << " trames, "
+                  << d_sync_failures << " echecs" << std::endl;
+    }
+}
+
+// Pas de flux: tout le traitement se fait dans le handler de messages
+int sgb_demodulator_impl::work(int noutput_items,
+                               gr_vector_const_void_star& input_items,
+                               gr_vector_void_star& output_items)
+{
+    return noutput_items;
+}
+
+void sgb_demodulator_impl::handle_burst_message(pmt::pmt_t msg)
+{
+    // Dict du router (clé "samples") ou c32vector direct; lecture en place
+    pmt::pmt_t samples_pmt = msg;
+    pmt::pmt_t burst_start = pmt::PMT_NIL;
+    if (pmt::is_dict(msg)) {
+        samples_pmt = pmt::dict_ref(msg, pmt::mp("samples"), pmt::PMT_NIL);
+        burst_start = pmt::dict_ref(msg, pmt::mp("start"), pmt::PMT_NIL);
+    }
+    if (!pmt::is_c32vector(samples_pmt)) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS 2G] Message invalide" << std::endl;
+        }
+        return;
+    }
+
+    size_t num_samples = 0;
+    const gr_complex* samples = pmt::c32vector_elements(samples_pmt, num_samples);
+    const auto arrival = std::chrono::steady_clock::now();
+
+    std::lock_guard<std::mutex> lock(d_mutex);
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Burst recu: " << num_samples << " echantillons" << std::endl;
+    }
+
+    if (!d_core.demodulate_burst(samples, static_cast<int>(num_samples), d_frame)) {
+        d_sync_failures++;
+    } else {
+        d_frames_decoded++;
+        publish_frame(d_frame, burst_start);
+    }
+
+    d_latency.add(std::chrono::duration<double, std::milli>(
+                      std::chrono::steady_clock::now() - arrival)
+                      .count());
+}
+
+// Fragments du router: acquisition et désétalement avancent pendant la
+// réception, seules les dernières paires restent a traiter a la fin du burst
+void sgb_demodulator_impl::handle_fragment_message(pmt::pmt_t msg)
+{
+    pmt::pmt_t samples_pmt =
+        pmt::is_dict(msg) ? pmt::dict_ref(msg, pmt::mp("samples"), pmt::PMT_NIL) : pmt::PMT_NIL;
+    if (!pmt::is_c32vector(samples_pmt)) {
+        if (d_debug_mode) {
+            std::cout << "[COSPAS 2G] Fragment invalide" << std::endl;
+        }
+        return;
+    }
+
+    const uint64_t burst = pmt::to_uint64(pmt::dict_ref(msg, pmt::mp("burst"), pmt::from_uint64(0)));
+    const uint64_t offset =
+        pmt::to_uint64(pmt::dict_ref(msg, pmt::mp("offset"), pmt::from_uint64(0)));
+    const bool last = pmt::to_bool(pmt::dict_ref(msg, pmt::mp("last"), pmt::PMT_F));
+    const bool discarded = pmt::to_bool(pmt::dict_ref(msg, pmt::mp("discarded"), pmt::PMT_F));
+    size_t num_samples = 0;
+    const gr_complex* samples = pmt::c32vector_elements(samples_pmt, num_samples);
+    const auto arrival = std::chrono::steady_clock::now();
+
+    std::lock_guard<std::mutex> lock(d_mutex);
+
+    // Premier fragment: nouveau burst
+    if (offset == 0) {
+        d_stream_active = true;
+        d_stream_burst = burst;
+        d_stream_start = pmt::dict_ref(msg, pmt::mp("start"), pmt::PMT_NIL);
+        d_stream_samples.clear();
+        d_stream_core.begin_burst();
+    }
+    if (!d_stream_active) {
+        return;
+    }
+    if (burst != d_stream_burst || offset != d_stream_samples.size()) {
+        // Fragment perdu: burst abandonné, reprise au burst suivant
+        if (d_debug_mode) {
+            std::cout << "[COSPAS 2G] Fragment manquant (burst " << d_stream_burst << ", offset "
+                      << offset << " au lieu de " << d_stream_samples.size() << ")" << std::endl;
+        }
+        d_stream_active = false;
+        d_sync_failures++;
+        return;
+    }
+    if (discarded) {
+        // Burst abandonné par le détecteur (trop court)
+        d_stream_active = false;
+        return;
+    }
+
+    d_stream_samples.insert(d_stream_samples.end(), samples, samples + num_samples);
+    const int received = static_cast<int>(d_stream_samples.size());
+    if (!last) {
+        d_stream_core.advance(d_stream_samples.data(), received);
+        return;
+    }
+
+    d_stream_active = false;
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Burst recu: " << received << " echantillons, "
+                  << d_stream_core.tracked_pairs() << " paires deja desetalees" << std::endl;
+    }
+    if (!d_stream_core.finish(d_stream_samples.data(), received, d_frame)) {
+        d_sync_failures++;
+    } else {
+        d_frames_decoded++;
+        publish_frame(d_frame, d_stream_start);
+    }
+
+    // Latence depuis la fin de la réception (dernier fragment)
+    d_latency.add(std::chrono::duration<double, std::milli>(
+                      std::chrono::steady_clock::now() - arrival)
+                      .count());
+}
+
+std::string sgb_demodulator_impl::bits_to_hex(const std::vector<uint8_t>& bits)
+{
+    // Convention C/S: 2 bits a zéro devant les 250 bits → 63 chiffres
+    static const char digits[] = "0123456789ABCDEF";
+    const int num_bits = static_cast<int>(bits.size());
+    std::string hex;
+    for (int i = -HEX_PAD_BITS; i < num_bits; i += 4) {
+        int hex_val = 0;
+        for (int j = 0; j < 4 && (i + j) < num_bits; j++) {
+            if (i + j >= 0 && bits[i + j] == 1) {
+                hex_val |= (1 << (3 - j));
+            }
+        }
+        hex.push_back(digits[hex_val]);
+    }
+    return hex;
+}
+
+pmt::pmt_t sgb_demodulator_impl::message_to_dict(pmt::pmt_t dict, const BeaconInfo2G& info)
+{
+    auto add = [&dict](const char* key, pmt::pmt_t value) {
+        dict = pmt::dict_add(dict, pmt::mp(key), value);
+    };
+
+    add("tac", pmt::from_long(info.tac));
+    add("serial", pmt::from_long(info.serial));
+    add("country_code", pmt::from_long(info.country_code));
+    add("hex_id", pmt::mp(info.hex_id));
+    add("beacon_type", pmt::from_long(info.beacon_type));
+    add("test", pmt::from_bool(info.test_flag));
+    add("homing", pmt::from_bool(info.homing_flag));
+    add("rls", pmt::from_bool(info.rls_flag));
+    if (info.has_position) {
+        add("lat", pmt::from_double(info.lat));
+        add("lon", pmt::from_double(info.lon));
+    }
+    add("vessel_id_type", pmt::from_long(info.vessel_id_type));
+    switch (info.vessel_id_type) {
+    case VESSEL_ID_MMSI:
+        add("mmsi", pmt::from_long(info.mmsi));
+        add("ais_id", pmt::from_long(info.ais_id));
+        break;
+    case VESSEL_ID_AVIATION_ADDRESS:
+        add("aircraft_address", pmt::from_long(info.aircraft_address));
+        add("vessel_id", pmt::mp(info.vessel_id));
+        break;
+    case VESSEL_ID_OPERATOR:
+        add("operator_serial", pmt::from_long(info.operator_serial));
+        add("vessel_id", pmt::mp(info.vessel_id));
+        break;
+    case VESSEL_ID_CALLSIGN:
+    case VESSEL_ID_REGISTRATION:
+        add("vessel_id", pmt::mp(info.vessel_id));
+        break;
+    default:
+        break;
+    }
+
+    add("rotating_id", pmt::from_long(info.rotating_id));
+    add("rotating_raw", pmt::from_uint64(info.rotating_raw));
+    switch (info.rotating_id) {
+    case ROTATING_G008:
+        add("hours_since_activation", pmt::from_long(info.hours_since_activation));
+        add("minutes_since_location", pmt::from_long(info.minutes_since_location));
+        add("hdop", pmt::from_long(info.hdop));
+        add("vdop", pmt::from_long(info.vdop));
+        add("activation_type", pmt::from_long(info.activation_type));
+        add("battery", pmt::from_long(info.battery));
+        add("gnss_status", pmt::from_long(info.gnss_status));
+        break;
+    case ROTATING_INFLIGHT_EMERGENCY:
+        add("location_time_s", pmt::from_long(info.location_time_s));
+        add("triggering_event", pmt::from_long(info.triggering_event));
+        add("battery", pmt::from_long(info.battery));
+        add("gnss_status", pmt::from_long(info.gnss_status));
+        break;
+    case ROTATING_CANCELLATION:
+        add("deactivation", pmt::from_long(info.deactivation));
+        break;
+    default:
+        break;
+    }
+    if (info.has_altitude) {
+        add("altitude_m", pmt::from_long(info.altitude_m));
+    }
+    return dict;
+}
+
+void sgb_demodulator_impl::publish_frame(sgb_demod_frame& frame, pmt::pmt_t burst_start)
+{
+    // Correction BCH(250,202) en place: HEX et champs publiés corrigés
+    const int bch_errors = bch_2g_correct(frame.bits.data());
+
+    const std::string hex = bits_to_hex(frame.bits);
+    std::cout << "[COSPAS 2G] HEX: " << hex << std::endl;
+
+    if (d_debug_mode) {
+        std::cout << "[COSPAS 2G] Offset freq: " << frame.freq_offset
+                  << " Hz, debit chip: " << frame.chip_rate
+                  << " chips/s, erreurs preambule: " << frame.preamble_errors
+                  << ", erreurs BCH: " << bch_errors << std::endl;
+    }
+
+    BeaconInfo2G info;
+    parse_2g(frame.bits.data(), &info);
+
+    pmt::pmt_t dict = pmt::make_dict();
+    dict = pmt::dict_add(dict,
+                         pmt::mp("bits"),
+                         pmt::init_u8vector(frame.bits.size(), frame.bits.data()));
+    dict = pmt::dict_add(dict,
+                         pmt::mp("soft"),
+                         pmt::init_f32vector(frame.soft.size(), frame.soft.data()));
+    dict = pmt::dict_add(dict, pmt::mp("hex"), pmt::mp(hex));
+    dict = pmt::dict_add(dict, pmt::mp("freq_offset"), pmt::from_float(frame.freq_offset));
+    dict = pmt::dict_add(
+        dict, pmt::mp("preamble_errors"), pmt::from_long(frame.preamble_errors));
+    dict = pmt::dict_add(dict, pmt::mp("bch_ok"), pmt::from_bool(bch_errors >= 0));
+    dict = pmt::dict_add(dict, pmt::mp("bch_errors"), pmt::from_long(bch_errors));
+    if (!pmt::is_null(burst_start)) {
+        dict = pmt::dict_add(dict, pmt::mp("burst_start"), burst_start);
+    }
+    dict = message_to_dict(dict, info);
+    message_port_pub(pmt::mp("frames"), dict);
+
+    // Affichage du décodage: BCH déjà appliqué, nombre de bits corrigés connu
+    decode_2g_corrected(frame.bits.data(), bch_errors);
+
+    // Flusher stdout AVANT le signal: tout le décodage est écrit
+    fflush(stdout);
+    message_port_pub(pmt::mp("decode_complete"), pmt::PMT_T);
+}
+
+int sgb_demodulator_impl::get_frames_decoded() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_frames_decoded;
+}
+
+int sgb_demodulator_impl::get_sync_failures() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_sync_failures;
+}
+
+double sgb_demodulator_impl::get_mean_latency_ms() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_latency.mean_ms();
+}
+
+double sgb_demodulator_impl::get_max_latency_ms() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_latency.max_ms();
+}
+
+double sgb_demodulator_impl::get_latency_percentile_ms(double percentile) const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_latency.percentile_ms(percentile);
+}
+
+void sgb_demodulator_impl::reset_statistics()
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_frames_decoded = 0;
+    d_sync_failures = 0;
+    d_latency.reset();
+}
+
+void sgb_demodulator_impl::set_debug_mode(bool enable)
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_debug_mode = enable;
+    d_core.set_debug_mode(enable);
+    d_stream_core.set_debug_mode(enable);
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,85 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_SGB_DEMODULATOR_IMPL_H
+#define INCLUDED_COSPAS_SGB_DEMODULATOR_IMPL_H
+
+#include <gnuradio/cospas/sgb_demodulator.h>
+#include "latency_stats.h"
+#include "sgb_demod_core.h"
+#include <pmt/pmt.h>
+#include <mutex>
+#include <string>
+#include <vector>
+
+// Décodeur COSPAS-SARSAT (BCH et parser 2G)
+extern "C" {
+#include "dec406.h"
+}
+
+namespace gr {
+namespace cospas {
+
+class sgb_demodulator_impl : public sgb_demodulator
+{
+private:
+    float d_sample_rate;
+    bool d_debug_mode;
+
+    sgb_demod_core d_core;
+    sgb_demod_frame d_frame;  // Réutilisée d'un burst a l'autre
+
+    // Burst reçu par fragments (router, pendant la réception)
+    sgb_demod_core d_stream_core;
+    std::vector<gr_complex> d_stream_samples;  // Début du burst reçu
+    uint64_t d_stream_burst;                   // Numéro du burst en cours
+    pmt::pmt_t d_stream_start;                 // Clé "start" du premier fragment
+    bool d_stream_active;
+
+    // Statistiques
+    int d_frames_decoded;
+    int d_sync_failures;
+    latency_stats d_latency;  // Réception du burst -> trame publiée
+
+    mutable std::mutex d_mutex;
+
+    void handle_burst_message(pmt::pmt_t msg);
+    void handle_fragment_message(pmt::pmt_t msg);
+
+    // Trame complète: correction BCH, affichage HEX et décodage, port
+    // "frames" et signal decode_complete. burst_start: clé "start" du
+    // message du détecteur (PMT_NIL si absente)
+    void publish_frame(sgb_demod_frame& frame, pmt::pmt_t burst_start);
+
+    // 2 bits a zéro + 250 bits → 63 chiffres hexadécimaux
+    static constexpr int HEX_PAD_BITS = 2;
+    static std::string bits_to_hex(const std::vector<uint8_t>& bits);
+
+    // Champs du message 2G ajoutés au dict publié
+    static pmt::pmt_t message_to_dict(pmt::pmt_t dict, const BeaconInfo2G& info);
+
+public:
+    sgb_demodulator_impl(float sample_rate, bool debug_mode);
+    ~sgb_demodulator_impl() override;
+
+    int work(int noutput_items,
+             gr_vector_const_void_star& input_items,
+             gr_vector_void_star& output_items) override;
+
+    int get_frames_decoded() const override;
+    int get_sync_failures() const override;
+    double get_mean_latency_ms() const override;
+    double get_max_latency_ms() const override;
+    double get_latency_percentile_ms(double percentile) const override;
+    void reset_statistics() override;
+    void set_debug_mode(bool enable) override;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_SGB_DEMODULATOR_IMPL_H */
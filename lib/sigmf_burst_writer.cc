@@ -0,0 +1,330 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "sigmf_burst_writer.h"
+#include <algorithm>
+#include <cmath>
+#include <ctime>
+#include <fstream>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+
+namespace gr {
+namespace cospas {
+
+namespace {
+
+// Date UTC ISO 8601 a la milliseconde ("2025-11-15T08:10:26.412Z")
+std::string format_utc(double unix_seconds, bool compact)
+{
+    const long long total_ms = std::llround(unix_seconds * 1000.0);
+    const int ms = static_cast<int>(((total_ms % 1000) + 1000) % 1000);
+    std::time_t t = static_cast<std::time_t>((total_ms - ms) / 1000);
+    std::tm tm_utc;
+    gmtime_r(&t, &tm_utc);
+
+    char buf[32];
+    std::strftime(buf, sizeof(buf), compact ? "%Y%m%d_%H%M%S" : "%Y-%m-%dT%H:%M:%S", &tm_utc);
+    std::ostringstream out;
+    out << buf << (compact ? "_" : ".") << std::setw(3) << std::setfill('0') << ms
+        << (compact ? "" : "Z");
+    return out.str();
+}
+
+std::string json_string(const std::string& s)
+{
+    std::ostringstream out;
+    out << '"';
+    for (char c : s) {
+        if (c == '"' || c == '\\') {
+            out << '\\' << c;
+        } else if (static_cast<unsigned char>(c) < 0x20) {
+            out << "\\u" << std::hex << std::setw(4) << std::setfill('0') << int(c)
+                << std::dec;
+        } else {
+            out << c;
+        }
+    }
+    out << '"';
+    return out.str();
+}
+
+double mean_power(const std::vector<gr_complex>& x, size_t begin, size_t end)
+{
+    double sum = 0.0;
+    for (size_t i = begin; i < end; i++) {
+        sum += std::norm(x[i]);
+    }
+    return end > begin ? sum / static_cast<double>(end - begin) : 0.0;
+}
+
+} // namespace
+
+sigmf_burst_writer::sigmf_burst_writer(const std::string& output_dir,
+                                       size_t max_bytes,
+                                       double decode_timeout_s,
+                                       bool failed_only,
+                                       bool debug_mode)
+    : d_output_dir(output_dir),
+      d_max_bytes(max_bytes),
+      d_decode_timeout(decode_timeout_s),
+      d_failed_only(failed_only),
+      d_debug_mode(debug_mode),
+      d_pending_bytes(0),
+      d_writing(0),
+      d_sequence(0),
+      d_recorded(0),
+      d_dropped(0),
+      d_stop(false)
+{
+    d_thread = std::thread([this]() { run(); });
+}
+
+sigmf_burst_writer::~sigmf_burst_writer()
+{
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        d_stop = true;  // Bursts restants écrits sans attendre leur trame
+    }
+    d_cond.notify_all();
+    d_thread.join();
+}
+
+bool sigmf_burst_writer::submit(burst_capture&& capture)
+{
+    const size_t bytes = capture.samples.size() * sizeof(gr_complex);
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        if (d_pending_bytes + bytes > d_max_bytes) {
+            d_dropped++;
+            return false;
+        }
+
+        entry e;
+        e.has_status = false;
+        auto early = d_early_status.find(capture.burst_start);
+        if (early != d_early_status.end()) {
+            e.has_status = true;
+            e.status = early->second;
+            d_early_status.erase(early);
+        }
+        e.capture = std::move(capture);
+        e.deadline = clock::now() +
+                     std::chrono::duration_cast<clock::duration>(d_decode_timeout);
+        d_pending.push_back(std::move(e));
+        d_pending_bytes += bytes;
+    }
+    d_cond.notify_one();
+    return true;
+}
+
+void sigmf_burst_writer::set_status(uint64_t burst_start, const burst_status& status)
+{
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        for (auto& e : d_pending) {
+            if (e.capture.burst_start == burst_start) {
+                // Plusieurs trames pour un burst: garder la valide
+                if (!e.has_status || (status.valid && !e.status.valid)) {
+                    e.status = status;
+                    e.has_status = true;
+                }
+                d_cond.notify_one();
+                return;
+            }
+        }
+
+        // Burst encore en post-roll: l'état attend sa soumission
+        d_early_status[burst_start] = status;
+        while (d_early_status.size() > MAX_EARLY_STATUS) {
+            d_early_status.erase(d_early_status.begin());
+        }
+    }
+}
+
+void sigmf_burst_writer::flush()
+{
+    std::unique_lock<std::mutex> lock(d_mutex);
+    d_idle_cond.wait(lock, [this]() { return d_pending.empty() && d_writing == 0; });
+}
+
+void sigmf_burst_writer::run()
+{
+    std::unique_lock<std::mutex> lock(d_mutex);
+    for (;;) {
+        // Burst prêt: état connu, délai dépassé ou arrêt
+        const auto now = clock::now();
+        auto ready = std::find_if(d_pending.begin(), d_pending.end(), [&](const entry& e) {
+            return d_stop || e.has_status || e.deadline <= now;
+        });
+
+        if (ready != d_pending.end()) {
+            entry e = std::move(*ready);
+            d_pending.erase(ready);
+            const size_t bytes = e.capture.samples.size() * sizeof(gr_complex);
+            const bool skip = d_failed_only && e.has_status && e.status.valid;
+            const int sequence = skip ? -1 : d_sequence++;
+            const bool debug = d_debug_mode;
+            d_writing++;
+
+            lock.unlock();
+            const bool ok = skip || write(e, sequence, debug);
+            lock.lock();
+
+            d_pending_bytes -= bytes;
+            d_writing--;
+            if (!skip) {
+                ok ? d_recorded++ : d_dropped++;
+            }
+            d_idle_cond.notify_all();
+            continue;
+        }
+
+        if (d_stop) {
+            return;
+        }
+        if (d_pending.empty()) {
+            d_cond.wait(lock);
+        } else {
+            auto next = std::min_element(
+                d_pending.begin(), d_pending.end(), [](const entry& a, const entry& b) {
+                    return a.deadline < b.deadline;
+                });
+            d_cond.wait_until(lock, next->deadline);
+        }
+    }
+}
+
+bool sigmf_burst_writer::write(const entry& e, int sequence, bool debug)
+{
+    const std::string base = d_output_dir + "/" + base_name(e.capture, sequence);
+    const std::string data_path = base + ".sigmf-data";
+    const std::string meta_path = base + ".sigmf-meta";
+
+    // Données puis métadonnées: un .sigmf-meta présent désigne un burst complet
+    std::ofstream data(data_path, std::ios::binary);
+    data.write(reinterpret_cast<const char*>(e.capture.samples.data()),
+               e.capture.samples.size() * sizeof(gr_complex));
+    data.close();
+    if (!data) {
+        std::cerr << "[BURST_RECORDER] Erreur d'écriture " << data_path << std::endl;
+        return false;
+    }
+
+    std::ofstream meta(meta_path);
+    meta << metadata_json(e.capture, e.has_status ? &e.status : nullptr);
+    meta.close();
+    if (!meta) {
+        std::cerr << "[BURST_RECORDER] Erreur d'écriture " << meta_path << std::endl;
+        return false;
+    }
+
+    if (debug) {
+        std::cout << "[BURST_RECORDER] " << meta_path << " ("
+                  << e.capture.samples.size() << " echantillons)" << std::endl;
+    }
+    return true;
+}
+
+std::string sigmf_burst_writer::base_name(const burst_capture& capture, int sequence)
+{
+    const double burst_time =
+        capture.start_time +
+        static_cast<double>(capture.burst_start - capture.first_sample) / capture.sample_rate;
+    return "burst_" + format_utc(burst_time, true) + "_" + std::to_string(sequence);
+}
+
+std::string sigmf_burst_writer::metadata_json(const burst_capture& capture,
+                                              const burst_status* status)
+{
+    const size_t total = capture.samples.size();
+    const size_t offset =
+        std::min<size_t>(capture.burst_start - capture.first_sample, total);
+    const size_t count = std::min<size_t>(capture.burst_size, total - offset);
+
+    std::ostringstream out;
+    out << std::setprecision(15);
+    out << "{\n"
+        << "  \"global\": {\n"
+        << "    \"core:datatype\": \"cf32_le\",\n"
+        << "    \"core:sample_rate\": " << capture.sample_rate << ",\n"
+        << "    \"core:version\": \"1.0.0\",\n"
+        << "    \"core:recorder\": \"gr-cospas burst_recorder\",\n"
+        << "    \"core:description\": \"COSPAS-SARSAT burst\",\n"
+        << "    \"core:extensions\": [{\"name\": \"cospas\", \"version\": \"1.0.0\", "
+           "\"optional\": true}]\n"
+        << "  },\n";
+
+    out << "  \"captures\": [{\n"
+        << "    \"core:sample_start\": 0,\n";
+    if (capture.center_freq > 0.0) {
+        out << "    \"core:frequency\": " << capture.center_freq << ",\n";
+    }
+    out << "    \"core:datetime\": " << json_string(format_utc(capture.start_time, false))
+        << ",\n"
+        << "    \"cospas:stream_sample\": " << capture.first_sample << "\n"
+        << "  }],\n";
+
+    // Annotation du burst; SNR: puissance du burst / puissance du pré-roll
+    const char* label = "burst";
+    std::string decode_status = "no_frame";
+    if (status) {
+        label = status->generation == 2 ? "2G" : "1G";
+        decode_status = status->valid ? "decoded"
+                        : status->generation == 2 ? "bch_error"
+                                                  : "crc_error";
+    }
+    out << "  \"annotations\": [{\n"
+        << "    \"core:sample_start\": " << offset << ",\n"
+        << "    \"core:sample_count\": " << count << ",\n"
+        << "    \"core:label\": " << json_string(label) << ",\n"
+        << "    \"cospas:decode_status\": " << json_string(decode_status) << ",\n";
+    if (status) {
+        out << "    \"cospas:generation\": " << status->generation << ",\n"
+            << "    \"cospas:hex\": " << json_string(status->hex) << ",\n"
+            << "    \"cospas:freq_offset\": " << status->freq_offset << ",\n";
+    }
+    const double noise = mean_power(capture.samples, 0, offset);
+    const double signal = mean_power(capture.samples, offset, offset + count);
+    if (noise > 0.0 && signal > noise) {
+        out << "    \"cospas:snr_db\": " << std::setprecision(4)
+            << 10.0 * std::log10((signal - noise) / noise) << std::setprecision(15) << ",\n";
+    }
+    out << "    \"cospas:truncated\": " << (capture.truncated ? "true" : "false") << "\n"
+        << "  }]\n"
+        << "}\n";
+    return out.str();
+}
+
+int sigmf_burst_writer::recorded() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_recorded;
+}
+
+int sigmf_burst_writer::dropped() const
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    return d_dropped;
+}
+
+void sigmf_burst_writer::reset_statistics()
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_recorded = 0;
+    d_dropped = 0;
+}
+
+void sigmf_burst_writer::set_debug_mode(bool enable)
+{
+    std::lock_guard<std::mutex> lock(d_mutex);
+    d_debug_mode = enable;
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,127 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_SIGMF_BURST_WRITER_H
+#define INCLUDED_COSPAS_SIGMF_BURST_WRITER_H
+
+#include <gnuradio/gr_complex.h>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <map>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Burst copié du flux, en attente d'écriture
+ */
+struct burst_capture {
+    uint64_t first_sample = 0;  // Indice absolu du premier échantillon enregistré
+    uint64_t burst_start = 0;   // Indice absolu du début du burst (clé "start" du détecteur)
+    uint64_t burst_size = 0;    // Durée du burst en échantillons
+    std::vector<gr_complex> samples;
+    double sample_rate = 0.0;
+    double center_freq = 0.0;   // Hz, 0 = inconnue
+    double start_time = 0.0;    // Date UTC (s Unix) de first_sample
+    bool truncated = false;     // Pré/post-roll incomplet (buffer circulaire dépassé, arrêt)
+};
+
+/*!
+ * \brief Etat du décodage d'un burst (trame d'un démodulateur)
+ */
+struct burst_status {
+    int generation = 0;  // 1 ou 2
+    bool valid = false;  // CRC 1G / BCH 2G
+    std::string hex;
+    double freq_offset = 0.0;
+};
+
+/*!
+ * \brief Thread d'écriture des bursts en SigMF (.sigmf-data cf32_le + .sigmf-meta)
+ *
+ * Les bursts soumis restent en mémoire jusqu'a leur état de décodage
+ * (set_status, éventuellement reçu avant le burst) ou jusqu'a
+ * decode_timeout, puis sont écrits par le thread. La mémoire en attente
+ * est bornée a max_bytes: submit() refuse un burst plutôt que de bloquer.
+ */
+class sigmf_burst_writer
+{
+public:
+    sigmf_burst_writer(const std::string& output_dir,
+                       size_t max_bytes,
+                       double decode_timeout_s,
+                       bool failed_only,
+                       bool debug_mode);
+    ~sigmf_burst_writer();
+
+    sigmf_burst_writer(const sigmf_burst_writer&) = delete;
+    sigmf_burst_writer& operator=(const sigmf_burst_writer&) = delete;
+
+    // false si la file est pleine (burst abandonné)
+    bool submit(burst_capture&& capture);
+    void set_status(uint64_t burst_start, const burst_status& status);
+
+    // Attendre l'écriture des bursts soumis (au plus decode_timeout)
+    void flush();
+
+    int recorded() const;
+    int dropped() const;
+    void reset_statistics();
+    void set_debug_mode(bool enable);
+
+    // Métadonnées SigMF d'un burst (status nullptr: pas de trame)
+    static std::string metadata_json(const burst_capture& capture,
+                                     const burst_status* status);
+    // Nom de base burst_AAAAMMJJ_HHMMSS_mmm_N (date UTC du début du burst)
+    static std::string base_name(const burst_capture& capture, int sequence);
+
+private:
+    using clock = std::chrono::steady_clock;
+
+    struct entry {
+        burst_capture capture;
+        bool has_status;
+        burst_status status;
+        clock::time_point deadline;
+    };
+
+    static constexpr size_t MAX_EARLY_STATUS = 256;
+
+    const std::string d_output_dir;
+    const size_t d_max_bytes;
+    const std::chrono::duration<double> d_decode_timeout;
+    const bool d_failed_only;
+    bool d_debug_mode;
+
+    std::deque<entry> d_pending;
+    std::map<uint64_t, burst_status> d_early_status;  // Trame reçue avant le burst
+    size_t d_pending_bytes;
+    int d_writing;  // Bursts retirés de la file, en cours d'écriture
+    int d_sequence;
+    int d_recorded;
+    int d_dropped;
+    bool d_stop;
+
+    mutable std::mutex d_mutex;
+    std::condition_variable d_cond;       // Travail pour le thread
+    std::condition_variable d_idle_cond;  // Fin d'écriture (flush)
+    std::thread d_thread;
+
+    void run();
+    bool write(const entry& e, int sequence, bool debug);
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_SIGMF_BURST_WRITER_H */
@@ -0,0 +1,57 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "t018_prn.h"
+#include <cmath>
+
+namespace gr {
+namespace cospas {
+
+std::vector<int8_t> t018_prn::generate(uint32_t init_state, int length)
+{
+    std::vector<int8_t> chips(length > 0 ? length : 0);
+    uint32_t state = init_state & 0x7FFFFF;  // 23 bits
+
+    for (int i = 0; i < length; i++) {
+        uint32_t output = state & 1;
+        uint32_t feedback = (state ^ (state >> 18)) & 1;
+        state = (state >> 1) | (feedback << 22);
+        chips[i] = output ? -1 : +1;
+    }
+    return chips;
+}
+
+// Initialisation statique locale: thread-safe en C++11
+const std::vector<int8_t>& t018_prn::normal_i()
+{
+    static const std::vector<int8_t> table = generate(INIT_NORMAL_I, CHIPS_PER_CHANNEL);
+    return table;
+}
+
+const std::vector<int8_t>& t018_prn::normal_q()
+{
+    static const std::vector<int8_t> table = generate(INIT_NORMAL_Q, CHIPS_PER_CHANNEL);
+    return table;
+}
+
+double t018_prn::rrc_pulse(double t)
+{
+    const double alpha = RRC_ROLLOFF;
+    if (std::abs(t) < 1e-9) {
+        return 1.0 - alpha + 4.0 * alpha / M_PI;
+    }
+    if (std::abs(std::abs(t) - 1.0 / (4.0 * alpha)) < 1e-9) {
+        return (alpha / std::sqrt(2.0)) *
+               ((1.0 + 2.0 / M_PI) * std::sin(M_PI / (4.0 * alpha)) +
+                (1.0 - 2.0 / M_PI) * std::cos(M_PI / (4.0 * alpha)));
+    }
+    return (std::sin(M_PI * t * (1.0 - alpha)) + 4.0 * alpha * t * std::cos(M_PI * t * (1.0 + alpha))) /
+           (M_PI * t * (1.0 - (4.0 * alpha * t) * (4.0 * alpha * t)));
+}
+
+} // namespace cospas
+} // namespace gr
@@ -0,0 +1,58 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_T018_PRN_H
+#define INCLUDED_COSPAS_T018_PRN_H
+
+#include <cstdint>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Séquences PRN des balises 2G (C/S T.018 Table 2.2, Appendix D)
+ *
+ * LFSR Fibonacci G(x) = x²³ + x¹⁸ + 1: sortie X0, rétroaction X0 ⊕ X18
+ * injectée en X22, décalage a droite. Logique 1 → chip -1, 0 → chip +1.
+ * Même générateur que LFSR_T018 (tools/2g/generate_oqpsk_iq.py).
+ *
+ * Les tables d'une trame complète (38400 chips par canal) sont calculées
+ * une seule fois; les démodulateurs lisent les chips par indice.
+ */
+class t018_prn
+{
+public:
+    // États initiaux T.018 Table 2.2
+    static constexpr uint32_t INIT_NORMAL_I = 0x000001;
+    static constexpr uint32_t INIT_NORMAL_Q = 0x000041;  // Offset 64 chips
+    static constexpr uint32_t INIT_TEST_I = 0x69E780;
+    static constexpr uint32_t INIT_TEST_Q = 0x3CB948;
+
+    static constexpr double CHIP_RATE = 38400.0;  // chips/s par canal
+    static constexpr int CHIPS_PER_BIT = 256;     // par canal (I ou Q)
+    static constexpr int PREAMBLE_BITS = 50;      // bits a '0' (166.7 ms)
+    static constexpr int MESSAGE_BITS = 250;      // 202 info + 48 BCH
+    static constexpr int FRAME_BITS = PREAMBLE_BITS + MESSAGE_BITS;
+    static constexpr int CHIPS_PER_CHANNEL = FRAME_BITS / 2 * CHIPS_PER_BIT;  // 38400
+
+    //! Générer length chips (±1) depuis un état initial
+    static std::vector<int8_t> generate(uint32_t init_state, int length);
+
+    //! Tables d'une trame complète, mode normal (calculées au premier appel)
+    static const std::vector<int8_t>& normal_i();
+    static const std::vector<int8_t>& normal_q();
+
+    //! Impulsion de mise en forme RRC (α = 0.8, T.018 §2.3.4), t en chips
+    static double rrc_pulse(double t);
+    static constexpr double RRC_ROLLOFF = 0.8;
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_T018_PRN_H */
@@ -0,0 +1,63 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include "thread_pool.h"
+
+namespace gr {
+namespace cospas {
+
+thread_pool::thread_pool(int num_threads) : d_stop(false)
+{
+    if (num_threads < 1) {
+        num_threads = 1;
+    }
+    d_threads.reserve(num_threads);
+    for (int i = 0; i < num_threads; i++) {
+        d_threads.emplace_back([this]() { run(); });
+    }
+}
+
+thread_pool::~thread_pool()
+{
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        d_stop = true;
+    }
+    d_cond.notify_all();
+    for (auto& t : d_threads) {
+        t.join();
+    }
+}
+
+void thread_pool::submit(std::function<void()> task)
+{
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        d_tasks.push_back(std::move(task));
+    }
+    d_cond.notify_one();
+}
+
+void thread_pool::run()
+{
+    for (;;) {
+        std::function<void()> task;
+        {
+            std::unique_lock<std::mutex> lock(d_mutex);
+            d_cond.wait(lock, [this]() { return d_stop || !d_tasks.empty(); });
+            if (d_tasks.empty()) {
+                return;  // Arret demandé et file vide
+            }
+            task = std::move(d_tasks.front());
+            d_tasks.pop_front();
+        }
+        task();
+    }
+}
+
+} // namespace cospas
+} // namespace gr
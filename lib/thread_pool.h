@@ -0,0 +1,52 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2025 COSPAS-SARSAT.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_COSPAS_THREAD_POOL_H
+#define INCLUDED_COSPAS_THREAD_POOL_H
+
+#include <condition_variable>
+#include <deque>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace gr {
+namespace cospas {
+
+/*!
+ * \brief Pool de threads de taille fixe (file FIFO de taches)
+ *
+ * Les threads sont créés une seule fois; le destructeur termine les
+ * taches deja soumises puis joint les threads.
+ */
+class thread_pool
+{
+public:
+    explicit thread_pool(int num_threads);
+    ~thread_pool();
+
+    thread_pool(const thread_pool&) = delete;
+    thread_pool& operator=(const thread_pool&) = delete;
+
+    void submit(std::function<void()> task);
+    int size() const { return static_cast<int>(d_threads.size()); }
+
+private:
+    std::vector<std::thread> d_threads;
+    std::deque<std::function<void()>> d_tasks;
+    std::mutex d_mutex;
+    std::condition_variable d_cond;
+    bool d_stop;
+
+    void run();
+};
+
+} // namespace cospas
+} // namespace gr
+
+#endif /* INCLUDED_COSPAS_THREAD_POOL_H */
@@ -21,4 +21,15 @@ except ModuleNotFoundError:
 
 # import any pure python here
 from .cospas_generator import cospas_generator
+from .frame_synthesis import synthesize_frame, synthesize_frames
 from .decode_monitor import decode_monitor
+from . import channel_model
+from .iq_file import open_iq, iq_recording
+from . import iq_archive
+from .iq_archive import iq_archive_sink
+from . import iq_pyramid
+from .iq_pyramid import open_pyramid
+from . import frame_store
+from . import alert_dispatcher
+from . import replay
+from . import batch_decode
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Envoi asynchrone des alertes balise (email, webhook, fichier)
+
+submit() ne bloque jamais la boucle de décodage: chaque sortie (sink) a son
+thread et sa file bornée. Pour chaque sortie:
+- anti-doublon: une balise (hex ID) déjà signalée depuis moins de DEDUP_S
+  n'est pas renvoyée (une balise émet toutes les ~50 s)
+- limite de débit: au plus RATE_LIMIT alertes par RATE_PERIOD_S
+- nouvel essai après échec, délai doublé à chaque fois (BACKOFF_S, 2x...),
+  sans retarder les alertes suivantes; après MAX_ATTEMPTS échecs la balise
+  est oubliée, sa prochaine trame redéclenche l'alerte
+
+Une sortie est un objet avec un attribut name et une méthode send(alert)
+qui lève une exception en cas d'échec: smtp_sink, webhook_sink, file_sink.
+
+Une alerte est un dict: utc (texte), freq_mhz, generation, hex, hex_id,
+text (sortie du décodeur, trame.asc). Sa clé d'anti-doublon est hex_id,
+sinon l'ID 15 caractères déduit du hex 1G, sinon le hex.
+
+Le journal (log_file, sinon stderr) n'utilise jamais stdout: scan406_iq.py
+le redirige vers trame.asc pendant les captures.
+"""
+
+import heapq
+import itertools
+import json
+import queue
+import smtplib
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from email.message import EmailMessage
+
+from .frame_store import decode_1g_hex
+
+# Fenêtre d'anti-doublon par balise
+DEDUP_S = 900.0
+
+# Limite de débit par sortie
+RATE_LIMIT = 20
+RATE_PERIOD_S = 3600.0
+
+# Essais par alerte et délai avant le deuxième
+MAX_ATTEMPTS = 4
+BACKOFF_S = 10.0
+
+# Alertes en attente par sortie
+MAX_QUEUE = 100
+
+SUBJECT = "Alerte_Balise_406"
+
+
+def alert_key(alert):
+    """Clé d'anti-doublon: hex ID de la balise"""
+    if alert.get('hex_id'):
+        return alert['hex_id']
+    hex_str = alert.get('hex')
+    if hex_str and int(alert.get('generation') or 1) == 1:
+        hex_id = decode_1g_hex(hex_str).get('hex_id')
+        if hex_id:
+            return hex_id
+    return hex_str
+
+
+def alert_message(alert):
+    """Texte court de l'alerte (corps d'email)"""
+    lines = [f"Date et Heure (UTC) du decodage: {alert.get('utc', '')}"]
+    if alert.get('freq_mhz') is not None:
+        lines.append(f"Frequence: {alert['freq_mhz']:.6f} MHz")
+    key = alert_key(alert)
+    if key:
+        lines.append(f"Balise: {key}")
+    return '\n'.join(lines)
+
+
+class smtp_sink:
+    """Email par SMTP (STARTTLS par défaut, SSL sur le port 465), trame.asc en pièce jointe"""
+
+    name = 'email'
+
+    def __init__(self, host, port=587, sender=None, recipients=(), username=None,
+                 password=None, starttls=True, timeout=30.0, subject=SUBJECT):
+        self.host = host
+        self.port = int(port)
+        self.sender = sender or username
+        if isinstance(recipients, str):
+            recipients = [r.strip() for r in recipients.split(',') if r.strip()]
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.subject = subject
+
+    @classmethod
+    def from_address(cls, server, **kwargs):
+        """Serveur 'hôte:port' (format sendemail de config_mail.txt)"""
+        host, _, port = server.partition(':')
+        return cls(host, int(port) if port else 587, **kwargs)
+
+    def send(self, alert):
+        msg = EmailMessage()
+        msg['Subject'] = self.subject
+        msg['From'] = self.sender
+        msg['To'] = ', '.join(self.recipients)
+        msg.set_content(alert_message(alert))
+        if alert.get('text'):
+            msg.add_attachment(alert['text'], filename='trame.asc')
+
+        if self.port == 465:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        with smtp:
+            if self.starttls and self.port != 465:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            smtp.send_message(msg)
+
+
+class webhook_sink:
+    """POST JSON de l'alerte vers une URL (code HTTP >= 400: échec)"""
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=10.0, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+
+    def send(self, alert):
+        body = json.dumps(dict(alert, key=alert_key(alert)), ensure_ascii=False).encode()
+        headers = {'Content-Type': 'application/json', **self.headers}
+        request = urllib.request.Request(self.url, data=body, headers=headers, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class file_sink:
+    """Une alerte JSON par ligne, ajoutée au fichier"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(dict(alert, key=alert_key(alert)), ensure_ascii=False) + '\n')
+
+
+class _sink_worker:
+    """File, anti-doublon, limite de débit et nouveaux essais d'une sortie"""
+
+    def __init__(self, dispatcher, sink):
+        self.dispatcher = dispatcher
+        self.sink = sink
+        self.name = getattr(sink, 'name', type(sink).__name__)
+        self.stats = {'queued': 0, 'sent': 0, 'retried': 0, 'failed': 0,
+                      'duplicates': 0, 'rate_limited': 0, 'dropped': 0}
+        self._last = {}       # Clé -> instant (monotone) de la dernière alerte acceptée
+        self._recent = deque()  # Instants des alertes acceptées (limite de débit)
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._deadline = None
+        self.queue = queue.Queue(maxsize=dispatcher.max_queue)
+        self.thread = threading.Thread(target=self._run, name=f'alert_{self.name}', daemon=True)
+        self.thread.start()
+
+    def offer(self, alert, key, now):
+        with self._lock:
+            last = self._last.get(key)
+            if key is not None and last is not None and now - last < self.dispatcher.dedup_s:
+                self.stats['duplicates'] += 1
+                return 'duplicate'
+            while self._recent and now - self._recent[0] >= self.dispatcher.rate_period_s:
+                self._recent.popleft()
+            if len(self._recent) >= self.dispatcher.rate_limit:
+                self.stats['rate_limited'] += 1
+                return 'rate_limited'
+            try:
+                self.queue.put_nowait(alert)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                return 'dropped'
+            if key is not None:
+                self._last[key] = now
+            self._recent.append(now)
+            self.stats['queued'] += 1
+            return 'queued'
+
+    def _run(self):
+        retries = []  # (échéance, ordre, essai, alerte)
+        stopping = False
+        while True:
+            now = time.monotonic()
+            if retries and retries[0][0] <= now:
+                _, _, attempt, alert = heapq.heappop(retries)
+                self._attempt(alert, attempt, retries)
+                continue
+            if stopping and (not retries or now >= self._deadline):
+                for _, _, _, alert in retries:
+                    self._give_up(alert, 'arrêt du dispatcher')
+                return
+            wait = retries[0][0] - now if retries else None
+            if stopping:
+                wait = min(wait, self._deadline - now)
+            try:
+                alert = self.queue.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if alert is None:
+                stopping = True
+                continue
+            self._attempt(alert, 1, retries)
+
+    def _attempt(self, alert, attempt, retries):
+        key = alert_key(alert)
+        try:
+            self.sink.send(alert)
+        except Exception as e:
+            if attempt < self.dispatcher.max_attempts:
+                delay = self.dispatcher.backoff_s * 2 ** (attempt - 1)
+                heapq.heappush(retries, (time.monotonic() + delay, next(self._seq),
+                                         attempt + 1, alert))
+                self.stats['retried'] += 1
+                self.dispatcher.log(f"{self.name} {key}: échec ({e}), "
+                                    f"nouvel essai dans {delay:.0f} s")
+            else:
+                self._give_up(alert, e)
+            return
+        self.stats['sent'] += 1
+        self.dispatcher.log(f"{self.name} {key}: envoyée"
+                            + (f" ({attempt} essais)" if attempt > 1 else ""))
+
+    def _give_up(self, alert, reason):
+        key = alert_key(alert)
+        with self._lock:
+            self._last.pop(key, None)  # La prochaine trame de la balise redéclenche l'alerte
+        self.stats['failed'] += 1
+        self.dispatcher.log(f"{self.name} {key}: abandon ({reason})")
+
+
+class alert_dispatcher:
+    """
+    Répartit les alertes vers les sorties, chacune dans son thread
+
+    submit(alert) renvoie l'état par sortie ('queued', 'duplicate',
+    'rate_limited', 'dropped') sans attendre l'envoi; close() laisse
+    jusqu'à timeout secondes aux envois et nouveaux essais en cours.
+    """
+
+    def __init__(self, sinks, dedup_s=DEDUP_S, rate_limit=RATE_LIMIT,
+                 rate_period_s=RATE_PERIOD_S, max_attempts=MAX_ATTEMPTS,
+                 backoff_s=BACKOFF_S, max_queue=MAX_QUEUE, log_file=None):
+        self.dedup_s = dedup_s
+        self.rate_limit = rate_limit
+        self.rate_period_s = rate_period_s
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.max_queue = max_queue
+        self.log_file = log_file
+        self._log_lock = threading.Lock()
+        self._workers = [_sink_worker(self, sink) for sink in sinks]
+
+    def submit(self, alert):
+        alert = dict(alert)
+        alert.setdefault('utc', datetime.now(timezone.utc).strftime('%d %m %Y   %Hh%Mm%Ss'))
+        key = alert_key(alert)
+        now = time.monotonic()
+        return {worker.name: worker.offer(alert, key, now) for worker in self._workers}
+
+    def close(self, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker._deadline = deadline
+            try:
+                worker.queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                pass
+        for worker in self._workers:
+            worker.thread.join(max(0.0, deadline - time.monotonic()) + 1.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def get_statistics(self):
+        return {worker.name: dict(worker.stats) for worker in self._workers}
+
+    def log(self, text):
+        stamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        line = f"{stamp} [ALERTE] {text}\n"
+        with self._log_lock:
+            if self.log_file:
+                try:
+                    with open(self.log_file, 'a') as f:
+                        f.write(line)
+                    return
+                except OSError:
+                    pass
+            sys.stderr.write(line)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Décodage hors ligne d'une archive I/Q répartie sur plusieurs processus
+
+Remplace le passage fichier par fichier (examples/1g/test_all_files.sh) qui
+n'occupe qu'un cœur:
+- les enregistrements sont découpés en tâches: un fichier court = une tâche,
+  un long enregistrement = plusieurs segments coupés dans des zones
+  silencieuses et qui se recouvrent (calibration du détecteur en tête,
+  burst 2G complet en queue), pour qu'aucun burst ne soit tronqué
+- chaque tâche est rejouée dans la chaîne C++ (replay.replay_file) par un
+  processus du pool, démodulateur 1G en mode synchrone pour ne pas
+  surcharger les cœurs
+- les trames sont fusionnées puis dédoublonnées (même enregistrement,
+  même hex, instants de burst proches): les recouvrements ne produisent
+  pas de doublons
+- résultat unique en CSV, JSON, JSON lines ou SQLite (selon l'extension)
+
+Point d'entrée: cospas-batch-decode (apps/).
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from .iq_file import open_iq, find_recordings
+
+# Découpage des longs enregistrements (secondes)
+SEGMENT_S = 120.0       # Durée nominale d'un segment
+MIN_SEGMENT_S = 20.0    # Plancher quand la durée est divisée entre les workers
+LEAD_S = 0.75           # Calibration du détecteur (0.5 s) + marge, avant la coupure
+TAIL_S = 1.25           # Burst 2G (1 s) + fin de burst, après la coupure
+SEARCH_S = 2.0          # Recherche de la zone silencieuse autour de la coupure
+POWER_FRAME_S = 0.01    # Trames de puissance pour cette recherche
+QUIET_S = 0.05          # Lissage: un creux de modulation n'est pas un silence
+
+# Deux trames d'un même burst (recouvrement) sont à moins de DEDUP_S
+DEDUP_S = 0.5
+
+# Colonnes CSV/SQLite; les autres champs vont dans "fields" (JSON)
+COLUMNS = ('source', 'generation', 'sample', 'time_s', 'utc', 'hex', 'valid',
+           'freq_offset', 'hex_id', 'country_code', 'lat', 'lon')
+
+
+def _quiet_point(recording, nominal, sample_rate):
+    """Indice du début de la zone la plus silencieuse autour de nominal"""
+    frame = max(1, int(POWER_FRAME_S * sample_rate))
+    search = int(SEARCH_S * sample_rate)
+    lo = max(0, nominal - search)
+    hi = min(recording.num_samples, nominal + search)
+    n_frames = (hi - lo) // frame
+    if n_frames < 2:
+        return nominal
+    x = recording.samples(lo, lo + n_frames * frame)
+    power = (x.real.astype(np.float32) ** 2 + x.imag.astype(np.float32) ** 2)
+    power = power.reshape(n_frames, frame).mean(axis=1)
+    width = max(1, min(n_frames, int(QUIET_S / POWER_FRAME_S)))
+    smoothed = np.convolve(power, np.ones(width) / width, mode='valid')
+    return lo + (int(np.argmin(smoothed)) + width // 2) * frame
+
+
+def plan_segments(recording, sample_rate, segment_s=SEGMENT_S):
+    """
+    Segments [start, stop) d'un enregistrement, en échantillons
+
+    Les coupures nominales (tous les segment_s) sont déplacées vers le
+    minimum de puissance à ±SEARCH_S; chaque segment commence LEAD_S avant
+    sa coupure et se termine TAIL_S après la suivante.
+    """
+    total = recording.num_samples
+    length = int(segment_s * sample_rate)
+    if length <= 0 or total <= 1.5 * length:
+        return [(0, total)]
+
+    cuts = [0]
+    nominal = length
+    while total - nominal > length // 2:
+        cut = _quiet_point(recording, nominal, sample_rate)
+        if cut > cuts[-1]:
+            cuts.append(cut)
+        nominal += length
+    cuts.append(total)
+
+    lead = int(LEAD_S * sample_rate)
+    tail = int(TAIL_S * sample_rate)
+    return [(max(0, a - lead), min(total, b + tail))
+            for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+def plan_jobs(paths, jobs, sample_rate=None, fmt=None, segment_s=None):
+    """
+    Tâches (path, start, stop, durée en s) pour l'ensemble des fichiers
+
+    Sans segment_s, la durée des segments est choisie pour donner au moins
+    quatre tâches par worker (équilibrage), entre MIN_SEGMENT_S et SEGMENT_S.
+    Les tâches sont triées de la plus longue à la plus courte.
+
+    Returns:
+        (tâches, [(path, durée en s) des enregistrements], [(path, erreur)])
+    """
+    recordings = []
+    errors = []
+    for path in paths:
+        try:
+            recording = open_iq(path, sample_rate, fmt)
+        except (OSError, ValueError) as e:
+            errors.append((path, str(e)))
+            continue
+        rate = float(sample_rate or recording.sample_rate or 40000.0)
+        recordings.append((path, recording, rate))
+
+    if segment_s is None:
+        total_s = sum(rec.num_samples / rate for _, rec, rate in recordings)
+        segment_s = min(SEGMENT_S, max(MIN_SEGMENT_S, total_s / (4 * max(1, jobs))))
+
+    tasks = []
+    for path, recording, rate in recordings:
+        for start, stop in plan_segments(recording, rate, segment_s):
+            tasks.append((path, start, stop, (stop - start) / rate))
+    tasks.sort(key=lambda task: -task[3])
+    durations = [(path, rec.num_samples / rate) for path, rec, rate in recordings]
+    return tasks, durations, errors
+
+
+def _init_worker(decode_text):
+    """Initialisation d'un processus du pool: stdout C++ détourné"""
+    if not decode_text:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.close(devnull)
+
+
+def _decode_segment(task, options):
+    """Tâche exécutée dans un processus du pool: (événements, statistiques)"""
+    from . import replay
+
+    path, start, stop, _ = task
+    events = []
+    stats = replay.replay_file(path, events.append, options.get('sample_rate'),
+                               options.get('fmt'), threshold=options.get('threshold', 0.1),
+                               gain=options.get('gain', 1.0), start=start, stop=stop,
+                               include_soft=options.get('include_soft', False),
+                               debug_mode=options.get('debug_mode', False),
+                               demod_threads=0)
+    return events, stats
+
+
+def is_valid(event):
+    """CRC 1G ou BCH 2G correct"""
+    return bool(event.get('crc_ok', event.get('bch_ok', False)))
+
+
+def _quality(event):
+    return (is_valid(event), -event.get('bch_errors', 0), not event.get('rescued', False))
+
+
+def deduplicate(events, window_s=DEDUP_S):
+    """
+    Supprime les trames décodées deux fois (segments qui se recouvrent)
+
+    Deux trames sont le même burst si elles viennent du même enregistrement
+    et de la même génération, à moins de window_s d'intervalle, et ont le
+    même hex (ou l'une des deux est invalide: burst tronqué en bord de
+    segment). La meilleure est conservée (valide, moins d'erreurs BCH).
+
+    Returns:
+        Liste triée par (source, sample)
+    """
+    ordered = sorted(events, key=lambda e: (e.get('source', ''), e.get('sample', -1)))
+    kept = []
+    for event in ordered:
+        if 'sample' not in event:
+            kept.append(event)
+            continue
+        duplicate = None
+        for index in range(len(kept) - 1, -1, -1):
+            other = kept[index]
+            if other.get('source') != event.get('source') or 'sample' not in other:
+                break
+            if event['time_s'] - other['time_s'] > window_s:
+                break
+            if other['generation'] != event['generation']:
+                continue
+            if other.get('hex') == event.get('hex') or not (is_valid(other)
+                                                              and is_valid(event)):
+                duplicate = index
+                break
+        if duplicate is None:
+            kept.append(event)
+        elif _quality(event) > _quality(kept[duplicate]):
+            kept[duplicate] = event
+    return kept
+
+
+def _row(event):
+    """Ligne CSV/SQLite: colonnes fixes + autres champs en JSON"""
+    row = {column: event.get(column) for column in COLUMNS}
+    row['valid'] = int(is_valid(event))
+    extra = {k: v for k, v in event.items() if k not in COLUMNS}
+    row['fields'] = json.dumps(extra, ensure_ascii=False, sort_keys=True)
+    return row
+
+
+def write_csv(events, out):
+    writer = csv.DictWriter(out, fieldnames=COLUMNS + ('fields',), lineterminator='\n')
+    writer.writeheader()
+    for event in events:
+        writer.writerow(_row(event))
+
+
+def write_sqlite(events, path):
+    """
+    Table "frames" (COLUMNS + fields); un même burst (source, sample, hex)
+    n'est inséré qu'une fois, ce qui permet de relancer sur la même base.
+    """
+    db = sqlite3.connect(path)
+    try:
+        with db:
+            db.execute("""CREATE TABLE IF NOT EXISTS frames (
+                source TEXT, generation INTEGER, sample INTEGER, time_s REAL, utc TEXT,
+                hex TEXT, valid INTEGER, freq_offset REAL, hex_id TEXT,
+                country_code INTEGER, lat REAL, lon REAL, fields TEXT,
+                UNIQUE (source, sample, hex))""")
+            db.execute("CREATE INDEX IF NOT EXISTS frames_hex ON frames (hex)")
+            columns = COLUMNS + ('fields',)
+            db.executemany(
+                f"INSERT OR IGNORE INTO frames ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                ([_row(event)[c] for c in columns] for event in events))
+    finally:
+        db.close()
+
+
+def write_results(events, output=None, output_format=None):
+    """
+    Ecrit le résultat fusionné
+
+    output_format: 'csv', 'json', 'jsonl' ou 'sqlite'; par défaut déduit de
+    l'extension de output (.csv, .json, .jsonl, .db/.sqlite), CSV sinon.
+    output None: stdout (CSV, JSON ou JSON lines).
+    """
+    if output_format is None:
+        ext = os.path.splitext(output or '')[1].lower()
+        output_format = {'.json': 'json', '.jsonl': 'jsonl', '.db': 'sqlite',
+                         '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}.get(ext, 'csv')
+
+    if output_format == 'sqlite':
+        if not output:
+            raise ValueError("la sortie SQLite demande un fichier (-o)")
+        write_sqlite(events, output)
+        return
+
+    out = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        if output_format == 'csv':
+            write_csv(events, out)
+        elif output_format == 'json':
+            json.dump(events, out, ensure_ascii=False, indent=1)
+            out.write('\n')
+        elif output_format == 'jsonl':
+            for event in events:
+                out.write(json.dumps(event, ensure_ascii=False) + '\n')
+        else:
+            raise ValueError(f"format de sortie inconnu: {output_format}")
+    finally:
+        if output:
+            out.close()
+
+
+def batch_decode(paths, jobs=None, sample_rate=None, fmt=None, segment_s=None,
+                 threshold=0.1, gain=1.0, include_soft=False, decode_text=False,
+                 debug_mode=False, progress=None):
+    """
+    Décoder des enregistrements (fichiers ou répertoires) sur un pool de processus
+
+    Args:
+        jobs: Nombre de processus (défaut: nombre de cœurs)
+        segment_s: Durée des segments des longs enregistrements (défaut: auto)
+        progress: callable(terminées, total, tâche, stats ou exception)
+
+    Returns:
+        (trames dédoublonnées, dict de statistiques)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tasks, durations, errors = plan_jobs(find_recordings(paths), jobs, sample_rate, fmt,
+                                         segment_s)
+    options = {'sample_rate': sample_rate, 'fmt': fmt, 'threshold': threshold, 'gain': gain,
+               'include_soft': include_soft, 'debug_mode': debug_mode}
+
+    events = []
+    processed_s = 0.0
+    t0 = time.perf_counter()
+    # spawn: pas de fork d'un processus ayant déjà chargé le runtime GNU Radio
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, max(1, len(tasks))),
+                                                mp_context=context,
+                                                initializer=_init_worker,
+                                                initargs=(decode_text,)) as pool:
+        futures = {pool.submit(_decode_segment, task, options): task for task in tasks}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            task = futures[future]
+            try:
+                segment_events, stats = future.result()
+            except (OSError, ValueError, RuntimeError) as e:
+                errors.append((task[0], str(e)))
+                result = e
+            else:
+                events.extend(segment_events)
+                processed_s += stats['signal_duration_s']
+                result = stats
+            if progress:
+                progress(done, len(tasks), task, result)
+    elapsed = time.perf_counter() - t0
+
+    frames = deduplicate(events)
+    signal_s = sum(duration for _, duration in durations)
+    return frames, {
+        'recordings': len(durations),
+        'segments': len(tasks),
+        'jobs': jobs,
+        'signal_duration_s': signal_s,
+        'processed_duration_s': processed_s,
+        'wall_time_s': elapsed,
+        'x_real_time': signal_s / elapsed if elapsed > 0 else None,
+        'frames_raw': len(events),
+        'frames': len(frames),
+        'frames_valid': sum(1 for f in frames if is_valid(f)),
+        'errors': errors,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='cospas-batch-decode',
+        description="Décode une archive d'enregistrements I/Q sur tous les cœurs et écrit "
+                    "un résultat unique dédoublonné (CSV, JSON, JSON lines ou SQLite)")
+    parser.add_argument('files', nargs='+',
+                        help='Fichiers ou répertoires (.iq/.raw/.cf32/.cs16/.cu8/.wav/SigMF)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Nombre de processus (défaut: nombre de cœurs)')
+    parser.add_argument('-o', '--output',
+                        help='Fichier résultat: .csv, .json, .jsonl, .db/.sqlite (défaut: CSV '
+                             'sur stdout)')
+    parser.add_argument('--output-format', choices=('csv', 'json', 'jsonl', 'sqlite'),
+                        help='Format forcé du résultat')
+    parser.add_argument('-s', '--sample-rate', type=float,
+                        help='Sample rate en Hz (défaut: en-tête WAV/SigMF, nom gqrx, sinon 40000)')
+    parser.add_argument('-f', '--format', help='Format I/Q forcé (cf32, cs16, cu8, wav...)')
+    parser.add_argument('--segment', type=float,
+                        help='Durée des segments des longs enregistrements en s (défaut: auto)')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Seuil du détecteur de bursts (défaut: 0.1)')
+    parser.add_argument('--gain', type=float, default=1.0, help='Gain appliqué au signal')
+    parser.add_argument('--valid-only', action='store_true',
+                        help='Ne garder que les trames CRC/BCH correctes')
+    parser.add_argument('--soft', action='store_true',
+                        help='Inclure les bits et décisions souples (JSON)')
+    parser.add_argument('--decode-text', action='store_true',
+                        help='Laisser passer l\'affichage texte du décodeur (stdout)')
+    parser.add_argument('--debug', action='store_true', help='Mode debug des blocs')
+    args = parser.parse_args(argv)
+
+    def progress(done, total, task, result):
+        path, start, stop, duration = task
+        name = os.path.basename(path)
+        if isinstance(result, Exception):
+            print(f"[BATCH] {done}/{total} {name}: {result}", file=sys.stderr)
+        else:
+            print(f"[BATCH] {done}/{total} {name} [{start}:{stop}] {duration:.1f} s "
+                  f"x{result['x_real_time']:.1f}, trames 1G {result['frames_1g']}, "
+                  f"2G {result['frames_2g']}", file=sys.stderr)
+
+    frames, stats = batch_decode(args.files, args.jobs, args.sample_rate, args.format,
+                                 args.segment, args.threshold, args.gain, args.soft,
+                                 args.decode_text, args.debug, progress)
+    if not stats['recordings'] and not stats['errors']:
+        parser.error("aucun enregistrement I/Q trouvé")
+    if args.valid_only:
+        frames = [f for f in frames if is_valid(f)]
+
+    try:
+        write_results(frames, args.output, args.output_format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for path, error in stats['errors']:
+        print(f"[BATCH] {path}: {error}", file=sys.stderr)
+    print(f"[BATCH] {stats['recordings']} fichier(s), {stats['segments']} segment(s), "
+          f"{stats['jobs']} processus: {stats['signal_duration_s']:.1f} s de signal en "
+          f"{stats['wall_time_s']:.2f} s (x{stats['x_real_time'] or 0:.1f}), "
+          f"{stats['frames']} trame(s) dont {stats['frames_valid']} valide(s) "
+          f"({stats['frames_raw'] - stats['frames']} doublon(s) supprimé(s))", file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+/*
+ * Copyright 2025 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+#include <pybind11/complex.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/cospas/burst_demodulator.h>
+
+void bind_burst_demodulator(py::module& m)
+{
+    using burst_demod_result = ::gr::cospas::burst_demod_result;
+
+    py::class_<burst_demod_result>(m, "burst_demod_result", "Resultat de demodulation d'un burst 1G")
+
+        .def_readonly("frame_found", &burst_demod_result::frame_found)
+
+        .def_readonly("crc_ok", &burst_demod_result::crc_ok)
+
+        .def_readonly("rescued", &burst_demod_result::rescued)
+
+        .def_property_readonly("bits",
+                               [](const burst_demod_result& r) {
+                                   return py::array_t<uint8_t>(r.bits.size(), r.bits.data());
+                               })
+
+        .def_property_readonly("soft",
+                               [](const burst_demod_result& r) {
+                                   return py::array_t<float>(r.soft.size(), r.soft.data());
+                               })
+
+        .def_readonly("freq_offset", &burst_demod_result::freq_offset)
+
+        .def_readonly("samples_per_bit", &burst_demod_result::samples_per_bit)
+
+        .def_readonly("hex", &burst_demod_result::hex)
+
+        .def("__repr__",
+             [](const burst_demod_result& r) {
+                 return "<burst_demod_result frame_found=" +
+                        std::string(r.frame_found ? "True" : "False") +
+                        " crc_ok=" + std::string(r.crc_ok ? "True" : "False") +
+                        " hex=" + (r.hex.empty() ? std::string("''") : r.hex) + ">";
+             })
+
+        ;
+
+    // Les tableaux complex64 contigus sont lus sans copie (les autres sont convertis)
+    // Le GIL est relâché pendant toute la démodulation
+    m.def(
+        "demodulate_bursts",
+        [](const std::vector<py::array_t<gr_complex, py::array::c_style | py::array::forcecast>>&
+               bursts,
+           float sample_rate,
+           int working_samples_per_bit,
+           bool use_hypotheses,
+           int num_threads) {
+            std::vector<const gr_complex*> pointers;
+            std::vector<int> lengths;
+            pointers.reserve(bursts.size());
+            lengths.reserve(bursts.size());
+            for (const auto& burst : bursts) {
+                if (burst.ndim() != 1) {
+                    throw std::invalid_argument("demodulate_bursts: chaque burst doit etre 1-D");
+                }
+                pointers.push_back(burst.data());
+                lengths.push_back(static_cast<int>(burst.size()));
+            }
+
+            py::gil_scoped_release release;
+            return ::gr::cospas::demodulate_bursts(
+                pointers, lengths, sample_rate, working_samples_per_bit, use_hypotheses, num_threads);
+        },
+        py::arg("bursts"),
+        py::arg("sample_rate"),
+        py::arg("working_samples_per_bit") = 16,
+        py::arg("use_hypotheses") = true,
+        py::arg("num_threads") = 0,
+        "Demoduler une liste de bursts complex64 (une trame 1G par burst) sans flowgraph");
+}
@@ -0,0 +1,62 @@
+/*
+ * Copyright 2025 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/cospas/burst_recorder.h>
+
+void bind_burst_recorder(py::module& m)
+{
+    using burst_recorder = ::gr::cospas::burst_recorder;
+
+    py::class_<burst_recorder,
+               gr::sync_block,
+               gr::block,
+               gr::basic_block,
+               std::shared_ptr<burst_recorder>>(
+        m, "burst_recorder", "Enregistreur SigMF des bursts détectés, avec pré/post-roll")
+
+        .def(py::init(&burst_recorder::make),
+             py::arg("sample_rate"),
+             py::arg("output_dir"),
+             py::arg("pre_roll_ms") = 200,
+             py::arg("post_roll_ms") = 200,
+             py::arg("center_freq") = 0.0,
+             py::arg("failed_only") = false,
+             py::arg("max_queue_mb") = 64,
+             py::arg("decode_timeout_ms") = 3000,
+             py::arg("debug_mode") = false)
+
+        .def("get_bursts_recorded",
+             &burst_recorder::get_bursts_recorded)
+
+        .def("get_bursts_dropped",
+             &burst_recorder::get_bursts_dropped)
+
+        .def("set_center_freq",
+             &burst_recorder::set_center_freq,
+             py::arg("center_freq"))
+
+        .def("set_start_time",
+             &burst_recorder::set_start_time,
+             py::arg("unix_seconds"))
+
+        .def("reset_statistics",
+             &burst_recorder::reset_statistics)
+
+        .def("set_debug_mode",
+             &burst_recorder::set_debug_mode,
+             py::arg("enable"))
+
+        ;
+}
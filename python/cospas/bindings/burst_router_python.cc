@@ -35,6 +35,12 @@ void bind_burst_router(py::module& m)
         .def("get_bursts_2g",
              &burst_router::get_bursts_2g)
 
+        .def("get_queue_depth",
+             &burst_router::get_queue_depth)
+
+        .def("get_max_queue_depth",
+             &burst_router::get_max_queue_depth)
+
         .def("reset_statistics",
              &burst_router::reset_statistics)
 
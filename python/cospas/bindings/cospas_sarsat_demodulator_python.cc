@@ -67,6 +67,69 @@ void bind_cospas_sarsat_demodulator(py::module& m)
              D(cospas_sarsat_demodulator, set_debug_mode))
 
 
+        .def("set_matched_filter",
+             &cospas_sarsat_demodulator::set_matched_filter,
+             py::arg("enable"),
+             D(cospas_sarsat_demodulator, set_matched_filter))
+
+
+        .def("set_hypotheses",
+             &cospas_sarsat_demodulator::set_hypotheses,
+             py::arg("phase_variance_thresholds"),
+             py::arg("freq_offsets"),
+             py::arg("timing_offsets"),
+             D(cospas_sarsat_demodulator, set_hypotheses))
+
+
+        .def("set_hypothesis_threads",
+             &cospas_sarsat_demodulator::set_hypothesis_threads,
+             py::arg("num_threads"),
+             D(cospas_sarsat_demodulator, set_hypothesis_threads))
+
+
+        .def("get_hypothesis_rescues",
+             &cospas_sarsat_demodulator::get_hypothesis_rescues,
+             D(cospas_sarsat_demodulator, get_hypothesis_rescues))
+
+
+        .def("set_num_workers",
+             &cospas_sarsat_demodulator::set_num_workers,
+             py::arg("num_workers"),
+             D(cospas_sarsat_demodulator, set_num_workers))
+
+
+        .def("set_working_samples_per_bit",
+             &cospas_sarsat_demodulator::set_working_samples_per_bit,
+             py::arg("samples_per_bit"),
+             D(cospas_sarsat_demodulator, set_working_samples_per_bit))
+
+
+        .def("get_queue_depth",
+             &cospas_sarsat_demodulator::get_queue_depth,
+             D(cospas_sarsat_demodulator, get_queue_depth))
+
+
+        .def("get_max_queue_depth",
+             &cospas_sarsat_demodulator::get_max_queue_depth,
+             D(cospas_sarsat_demodulator, get_max_queue_depth))
+
+
+        .def("get_mean_latency_ms",
+             &cospas_sarsat_demodulator::get_mean_latency_ms,
+             D(cospas_sarsat_demodulator, get_mean_latency_ms))
+
+
+        .def("get_max_latency_ms",
+             &cospas_sarsat_demodulator::get_max_latency_ms,
+             D(cospas_sarsat_demodulator, get_max_latency_ms))
+
+
+        .def("get_latency_percentile_ms",
+             &cospas_sarsat_demodulator::get_latency_percentile_ms,
+             py::arg("percentile"),
+             D(cospas_sarsat_demodulator, get_latency_percentile_ms))
+
+
         .def("reset_statistics",
              &cospas_sarsat_demodulator::reset_statistics,
              D(cospas_sarsat_demodulator, reset_statistics))
@@ -44,5 +44,48 @@ static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_sync_failures =
 static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_debug_mode = R"doc()doc";
 
 
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_matched_filter =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_hypotheses = R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_hypothesis_threads =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_hypothesis_rescues =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_num_workers =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_set_working_samples_per_bit =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_queue_depth =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_max_queue_depth =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_mean_latency_ms =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_max_latency_ms =
+    R"doc()doc";
+
+
+static const char* __doc_gr_cospas_cospas_sarsat_demodulator_get_latency_percentile_ms =
+    R"doc()doc";
+
+
 static const char* __doc_gr_cospas_cospas_sarsat_demodulator_reset_statistics =
     R"doc()doc";
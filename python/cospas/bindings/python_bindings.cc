@@ -24,6 +24,9 @@ namespace py = pybind11;
     void bind_cospas_sarsat_demodulator(py::module& m);
     void bind_cospas_burst_detector(py::module& m);
     void bind_burst_router(py::module& m);
+    void bind_burst_demodulator(py::module& m);
+    void bind_sgb_demodulator(py::module& m);
+    void bind_burst_recorder(py::module& m);
 // ) END BINDING_FUNCTION_PROTOTYPES
 
 
@@ -55,5 +58,8 @@ PYBIND11_MODULE(cospas_python, m)
     bind_cospas_sarsat_demodulator(m);
     bind_cospas_burst_detector(m);
     bind_burst_router(m);
+    bind_burst_demodulator(m);
+    bind_sgb_demodulator(m);
+    bind_burst_recorder(m);
     // ) END BINDING_FUNCTION_CALLS
 }
\ No newline at end of file
@@ -0,0 +1,57 @@
+/*
+ * Copyright 2025 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/cospas/sgb_demodulator.h>
+
+void bind_sgb_demodulator(py::module& m)
+{
+    using sgb_demodulator = ::gr::cospas::sgb_demodulator;
+
+    py::class_<sgb_demodulator,
+               gr::sync_block,
+               gr::block,
+               gr::basic_block,
+               std::shared_ptr<sgb_demodulator>>(
+        m, "sgb_demodulator", "Demodulateur 2G OQPSK DSSS COSPAS-SARSAT (T.018)")
+
+        .def(py::init(&sgb_demodulator::make),
+             py::arg("sample_rate") = 40000.0f,
+             py::arg("debug_mode") = false)
+
+        .def("get_frames_decoded",
+             &sgb_demodulator::get_frames_decoded)
+
+        .def("get_sync_failures",
+             &sgb_demodulator::get_sync_failures)
+
+        .def("get_mean_latency_ms",
+             &sgb_demodulator::get_mean_latency_ms)
+
+        .def("get_max_latency_ms",
+             &sgb_demodulator::get_max_latency_ms)
+
+        .def("get_latency_percentile_ms",
+             &sgb_demodulator::get_latency_percentile_ms,
+             py::arg("percentile"))
+
+        .def("reset_statistics",
+             &sgb_demodulator::reset_statistics)
+
+        .def("set_debug_mode",
+             &sgb_demodulator::set_debug_mode,
+             py::arg("enable"))
+
+        ;
+}
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modèle de canal pour les tests de sensibilité COSPAS-SARSAT
+Dégrade un signal I/Q propre (cospas_generator, générateurs 2G) de façon
+reproductible: bruit, offset/dérive de porteuse, bruit de phase, erreur
+d'horloge d'échantillonnage, quantification RTL-SDR et bursts superposés.
+
+Tout est vectorisé NumPy; chaque essai Monte-Carlo tire son générateur
+aléatoire de trial_rng(seed, index), donc un balayage réparti sur plusieurs
+processus redonne exactement les mêmes signaux quel que soit le découpage.
+"""
+
+import numpy as np
+
+# Débits bits des deux générations (Eb/N0)
+BIT_RATE_1G = 400.0
+BIT_RATE_2G = 300.0
+
+# Interpolateur de l'erreur d'horloge: sinc fenêtré (Blackman) 16 coefficients,
+# table de RESAMPLE_PHASES phases fractionnaires
+RESAMPLE_TAPS = 16
+RESAMPLE_PHASES = 1024
+RESAMPLE_BLOCK = 65536
+
+_resample_table = None
+
+
+def _resample_taps():
+    """Table (RESAMPLE_PHASES + 1, RESAMPLE_TAPS) des coefficients par phase"""
+    global _resample_table
+    if _resample_table is None:
+        half = RESAMPLE_TAPS // 2
+        frac = np.arange(RESAMPLE_PHASES + 1)[:, None] / RESAMPLE_PHASES
+        d = np.arange(-half + 1, half + 1)[None, :] - frac
+        w = 0.42 + 0.5 * np.cos(np.pi * d / half) + 0.08 * np.cos(2 * np.pi * d / half)
+        _resample_table = (np.sinc(d) * w).astype(np.float32)
+    return _resample_table
+
+
+def trial_rng(seed, trial):
+    """
+    Générateur aléatoire de l'essai `trial` d'un balayage
+
+    Indépendant de l'ordre d'exécution et du processus qui traite l'essai.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(trial,)))
+
+
+def signal_power(x):
+    """Puissance moyenne d'un signal complexe"""
+    return float(np.mean(np.abs(x) ** 2))
+
+
+def add_awgn(x, ebn0_db, sample_rate, bit_rate, rng, power=None):
+    """
+    Ajoute un bruit blanc gaussien complexe à Eb/N0 donné
+
+    Eb = P / bit_rate et la variance du bruit complexe par échantillon vaut
+    N0 · sample_rate. La puissance P est celle du signal utile: la passer
+    explicitement quand x contient du silence (burst dans un enregistrement).
+
+    Args:
+        x: Signal complexe
+        ebn0_db: Eb/N0 cible (dB)
+        sample_rate: Fréquence d'échantillonnage (Hz)
+        bit_rate: Débit bits (400 en 1G, 300 en 2G)
+        rng: np.random.Generator
+        power: Puissance du signal utile (défaut: puissance moyenne de x)
+
+    Returns:
+        np.array: Signal bruité (complex64)
+    """
+    if power is None:
+        power = signal_power(x)
+    n0 = power / bit_rate / 10 ** (ebn0_db / 10)
+    sigma = np.sqrt(n0 * sample_rate / 2)
+    noise = rng.standard_normal((2, len(x)), dtype=np.float32) * np.float32(sigma)
+    out = np.asarray(x, dtype=np.complex64).copy()
+    out.real += noise[0]
+    out.imag += noise[1]
+    return out
+
+
+def apply_frequency_offset(x, sample_rate, offset_hz, drift_hz_s=0.0, phase=0.0, start=0):
+    """
+    Décale la porteuse de offset_hz avec une dérive linéaire drift_hz_s
+
+    Phase(t) = phase + 2π (f t + d t² / 2), t = (start + n) / sample_rate.
+    """
+    t = (start + np.arange(len(x))) / sample_rate
+    rotation = np.exp(1j * (phase + 2 * np.pi * (offset_hz * t + 0.5 * drift_hz_s * t * t)))
+    return (np.asarray(x) * rotation).astype(np.complex64)
+
+
+def apply_phase_noise(x, sample_rate, linewidth_hz, rng):
+    """
+    Bruit de phase d'oscillateur (processus de Wiener)
+
+    Largeur de raie Lorentzienne linewidth_hz: incrément de phase gaussien
+    de variance 2π · linewidth / sample_rate par échantillon.
+    """
+    if linewidth_hz <= 0:
+        return np.asarray(x, dtype=np.complex64)
+    steps = rng.standard_normal(len(x)) * np.sqrt(2 * np.pi * linewidth_hz / sample_rate)
+    return (np.asarray(x) * np.exp(1j * np.cumsum(steps))).astype(np.complex64)
+
+
+def apply_clock_error(x, ppm, offset=0.0):
+    """
+    Erreur d'horloge d'échantillonnage du récepteur (ppm) et décalage fractionnaire
+
+    L'échantillon n du récepteur est pris à l'instant (n · (1 + ppm·1e-6) + offset)
+    de l'émetteur; interpolation sinc fenêtrée (Blackman, 16 coefficients,
+    phase quantifiée à 1/1024 d'échantillon), traitée par blocs pour borner
+    la mémoire. Suppose un signal suréchantillonné
+    (bande utile < 0.4 · sample_rate).
+
+    Args:
+        x: Signal complexe
+        ppm: Erreur d'horloge en ppm (positif: récepteur lent, moins d'échantillons)
+        offset: Retard initial en échantillons (≥ 0, peut être fractionnaire)
+
+    Returns:
+        np.array: Signal rééchantillonné (complex64)
+    """
+    x = np.asarray(x, dtype=np.complex64)
+    if offset < 0:
+        raise ValueError("offset doit être positif (retard)")
+    if ppm == 0 and offset == 0:
+        return x.copy()
+
+    ratio = 1.0 + ppm * 1e-6
+    n_out = int(np.floor((len(x) - 1 - offset) / ratio)) + 1
+    half = RESAMPLE_TAPS // 2
+    padded = np.concatenate([np.zeros(half, np.complex64), x, np.zeros(half + 1, np.complex64)])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, RESAMPLE_TAPS)
+    table = _resample_taps()
+
+    out = np.empty(max(n_out, 0), dtype=np.complex64)
+    for start in range(0, len(out), RESAMPLE_BLOCK):
+        n = np.arange(start, min(start + RESAMPLE_BLOCK, len(out)))
+        pos = n * ratio + offset
+        base = np.floor(pos).astype(np.int64)
+        phase = np.rint((pos - base) * RESAMPLE_PHASES).astype(np.int64)
+        # Fenêtre des échantillons base-7 .. base+8 (padded décalé de half)
+        out[n[0]:n[-1] + 1] = np.einsum('ij,ij->i', windows[base + 1], table[phase])
+    return out
+
+
+def quantize_rtlsdr(x, full_scale=1.0):
+    """
+    Quantification 8 bits non signée façon RTL-SDR
+
+    I et Q sont écrêtés à ±full_scale puis codés u8 = round(127.5 + 127.5 · v);
+    le retour est déquantifié ((u8 - 127.5) / 127.5 · full_scale), comme le
+    lit le driver, pour enchaîner directement sur le détecteur.
+
+    Returns:
+        np.array: Signal quantifié (complex64)
+    """
+    u8 = to_rtlsdr_bytes(x, full_scale)
+    levels = (u8.astype(np.float32) - 127.5) * np.float32(full_scale / 127.5)
+    return levels.view(np.complex64)
+
+
+def to_rtlsdr_bytes(x, full_scale=1.0):
+    """Octets I/Q entrelacés uint8 (format rtl_sdr) d'un signal complexe"""
+    x = np.asarray(x, dtype=np.complex64)
+    iq = x.view(np.float32) / np.float32(full_scale)
+    return np.round(127.5 + 127.5 * np.clip(iq, -1.0, 1.0)).astype(np.uint8)
+
+
+def mix_bursts(bursts, length, positions, gains_db=None, offsets_hz=None,
+               sample_rate=None, rng=None):
+    """
+    Superpose les bursts de plusieurs balises dans un même enregistrement
+
+    Args:
+        bursts: Liste de signaux complexes (un par balise)
+        length: Longueur de la sortie (échantillons)
+        positions: Indice de début de chaque burst (tronqué aux bornes)
+        gains_db: Gain relatif de chaque burst (dB, défaut 0)
+        offsets_hz: Offset de porteuse propre à chaque balise (requiert sample_rate)
+        sample_rate: Fréquence d'échantillonnage (Hz)
+        rng: Générateur pour des phases initiales aléatoires (défaut: phase 0)
+
+    Returns:
+        np.array: Mélange (complex64)
+    """
+    out = np.zeros(length, dtype=np.complex64)
+    for i, (burst, pos) in enumerate(zip(bursts, positions)):
+        burst = np.asarray(burst, dtype=np.complex64)
+        gain = 10 ** ((gains_db[i] if gains_db is not None else 0.0) / 20)
+        phase = rng.uniform(0, 2 * np.pi) if rng is not None else 0.0
+        if offsets_hz is not None and offsets_hz[i]:
+            burst = apply_frequency_offset(burst, sample_rate, offsets_hz[i], phase=phase)
+        elif phase:
+            burst = burst * np.complex64(np.exp(1j * phase))
+
+        first = max(pos, 0)
+        last = min(pos + len(burst), length)
+        if last > first:
+            out[first:last] += gain * burst[first - pos:last - pos]
+    return out
+
+
+class ChannelModel:
+    """
+    Chaîne de dégradations appliquée à un signal propre
+
+    Ordre: bruit de phase, offset/dérive de porteuse, erreur d'horloge,
+    AWGN, gain puis quantification RTL-SDR (ce que verrait le récepteur).
+    Un paramètre à 0 / None désactive l'étape correspondante.
+
+    Exemple (balayage Eb/N0 reproductible, un essai par processus):
+        model = ChannelModel(sample_rate=40000, bit_rate=BIT_RATE_2G,
+                             ebn0_db=8.0, offset_hz=1200.0, drift_hz_s=-2.0)
+        x = model.apply(clean, trial_rng(seed=1, trial=k))
+    """
+
+    def __init__(self, sample_rate, bit_rate=BIT_RATE_1G, ebn0_db=None,
+                 offset_hz=0.0, drift_hz_s=0.0, random_phase=True,
+                 linewidth_hz=0.0, clock_ppm=0.0, timing_offset=0.0,
+                 gain=1.0, quantize=False, full_scale=1.0, signal_power=None):
+        """
+        Args:
+            sample_rate: Fréquence d'échantillonnage (Hz)
+            bit_rate: Débit bits pour Eb/N0 (BIT_RATE_1G ou BIT_RATE_2G)
+            ebn0_db: Eb/N0 cible en dB (None: pas de bruit)
+            offset_hz: Offset de porteuse (Hz)
+            drift_hz_s: Dérive linéaire de la porteuse (Hz/s)
+            random_phase: Phase initiale de porteuse aléatoire
+            linewidth_hz: Largeur de raie du bruit de phase (Hz)
+            clock_ppm: Erreur d'horloge d'échantillonnage (ppm)
+            timing_offset: Décalage fractionnaire initial (échantillons)
+            gain: Gain d'amplitude avant quantification
+            quantize: Quantification uint8 RTL-SDR
+            full_scale: Pleine échelle du quantificateur
+            signal_power: Puissance utile pour Eb/N0 (défaut: mesurée sur l'entrée)
+        """
+        self.sample_rate = sample_rate
+        self.bit_rate = bit_rate
+        self.ebn0_db = ebn0_db
+        self.offset_hz = offset_hz
+        self.drift_hz_s = drift_hz_s
+        self.random_phase = random_phase
+        self.linewidth_hz = linewidth_hz
+        self.clock_ppm = clock_ppm
+        self.timing_offset = timing_offset
+        self.gain = gain
+        self.quantize = quantize
+        self.full_scale = full_scale
+        self.signal_power = signal_power
+
+    def apply(self, x, rng):
+        """
+        Applique le canal à un signal propre
+
+        Args:
+            x: Signal complexe propre (burst ou enregistrement)
+            rng: np.random.Generator (voir trial_rng)
+
+        Returns:
+            np.array: Signal dégradé (complex64)
+        """
+        x = np.asarray(x, dtype=np.complex64)
+        power = self.signal_power if self.signal_power is not None else signal_power(x)
+
+        if self.linewidth_hz:
+            x = apply_phase_noise(x, self.sample_rate, self.linewidth_hz, rng)
+
+        phase = rng.uniform(0, 2 * np.pi) if self.random_phase else 0.0
+        if self.offset_hz or self.drift_hz_s or phase:
+            x = apply_frequency_offset(x, self.sample_rate, self.offset_hz,
+                                       self.drift_hz_s, phase)
+
+        if self.clock_ppm or self.timing_offset:
+            x = apply_clock_error(x, self.clock_ppm, self.timing_offset)
+
+        if self.ebn0_db is not None:
+            x = add_awgn(x, self.ebn0_db, self.sample_rate, self.bit_rate, rng, power)
+
+        if self.gain != 1.0:
+            x = (x * np.float32(self.gain)).astype(np.complex64)
+
+        if self.quantize:
+            x = quantize_rtlsdr(x, self.full_scale)
+        return x
@@ -8,6 +8,13 @@ Génère un signal I/Q en bande de base
 import numpy as np
 from gnuradio import gr
 
+from .frame_synthesis import (
+    SAMPLE_RATE, BIT_RATE, SAMPLES_PER_BIT, CARRIER_DURATION, CARRIER_SAMPLES,
+    PREAMBLE_BITS, FRAME_SYNC_NORMAL, FRAME_SYNC_TEST, MOD_PHASE,
+    synthesize_frame,
+)
+
+
 class cospas_generator(gr.sync_block):
     """
     Générateur de trames COSPAS-SARSAT en modulation biphase-L
@@ -30,20 +37,20 @@ class cospas_generator(gr.sync_block):
         )
 
         # Paramètres du système
-        self.SAMPLE_RATE = 6400.0
-        self.BIT_RATE = 400.0
-        self.SAMPLES_PER_BIT = int(self.SAMPLE_RATE / self.BIT_RATE)  # 16
-        self.CARRIER_DURATION = 0.160  # 160 ms
-        self.CARRIER_SAMPLES = int(self.CARRIER_DURATION * self.SAMPLE_RATE)  # 1024
-        self.PREAMBLE_BITS = 15
-        self.FRAME_SYNC_BITS = 9
+        self.SAMPLE_RATE = SAMPLE_RATE
+        self.BIT_RATE = BIT_RATE
+        self.SAMPLES_PER_BIT = SAMPLES_PER_BIT  # 16
+        self.CARRIER_DURATION = CARRIER_DURATION  # 160 ms
+        self.CARRIER_SAMPLES = CARRIER_SAMPLES  # 1024
+        self.PREAMBLE_BITS = PREAMBLE_BITS
+        self.FRAME_SYNC_BITS = len(FRAME_SYNC_NORMAL)
 
         # Frame sync patterns
-        self.FRAME_SYNC_NORMAL = '000101111'  # Mode normal
-        self.FRAME_SYNC_TEST = '011010000'    # Mode self-test
+        self.FRAME_SYNC_NORMAL = FRAME_SYNC_NORMAL  # Mode normal
+        self.FRAME_SYNC_TEST = FRAME_SYNC_TEST      # Mode self-test
 
         # Modulation biphase-L
-        self.MOD_PHASE = 1.1  # ±1.1 radians
+        self.MOD_PHASE = MOD_PHASE  # ±1.1 radians
 
         # Données à transmettre (par défaut: pattern de test)
         if data_bytes is None:
@@ -61,28 +68,12 @@ class cospas_generator(gr.sync_block):
 
     def generate_frame(self):
         """Génère une trame COSPAS-SARSAT complète"""
-        frame_samples = []
-
-        # 1. Porteuse non modulée (160 ms à phase 0)
-        carrier = np.exp(1j * 0.0) * np.ones(self.CARRIER_SAMPLES, dtype=np.complex64)
-        frame_samples.extend(carrier)
-
-        # 2. Préambule (15 bits à '1')
-        for _ in range(self.PREAMBLE_BITS):
-            frame_samples.extend(self.generate_bit('1'))
-
-        # 3. Frame synchronization (9 bits)
         frame_sync_pattern = self.FRAME_SYNC_TEST if self.test_mode else self.FRAME_SYNC_NORMAL
-        for bit in frame_sync_pattern:
-            frame_samples.extend(self.generate_bit(bit))
-
-        # 4. Données
-        for byte in self.data_bytes:
-            for bit_pos in range(7, -1, -1):  # MSB first
-                bit = '1' if (byte >> bit_pos) & 1 else '0'
-                frame_samples.extend(self.generate_bit(bit))
 
-        self.frame = np.array(frame_samples, dtype=np.complex64)
+        self.frame = synthesize_frame(self.data_bytes, self.test_mode,
+                                      mod_phase=self.MOD_PHASE,
+                                      samples_per_bit=self.SAMPLES_PER_BIT,
+                                      carrier_samples=self.CARRIER_SAMPLES)
         self.frame_length = len(self.frame)
 
         mode_str = "Self-Test" if self.test_mode else "Normal"
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Base de trames décodées (SQLite), alimentée en continu
+
+Chaque trame (événement de replay.frame_event: ports "frames" des
+démodulateurs 1G/2G) est ajoutée sans jamais réécrire les précédentes:
+- add() ne fait que mettre l'événement dans une file; un thread écrit par
+  lots (BATCH_SIZE trames ou FLUSH_S secondes) en une transaction
+- journal WAL: lectures concurrentes de l'écriture (autre processus compris)
+- index sur hex ID, date UTC, fréquence, protocole et position
+- bits bruts (BLOB, packbits) et champs décodés (JSON) conservés
+
+Les trames 1G n'ont que leur hex: hex ID 15 caractères, pays et protocole
+en sont extraits (bits 26-85, 27-36, 26 et 37-40 du message). Les trames 2G
+arrivent décodées par le démodulateur (hex_id, pays, position...).
+
+Une trame reçue deux fois (même source, même échantillon, même hex: rejeu
+d'un même fichier) n'est enregistrée qu'une fois.
+
+Point d'entrée: cospas-frames (apps/), requêtes en ligne de commande.
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Ecriture: trames par transaction, délai maximal avant écriture
+BATCH_SIZE = 256
+FLUSH_S = 1.0
+
+# Trames en attente au-delà desquelles add() refuse (disque bloqué)
+MAX_QUEUE = 100000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    id INTEGER PRIMARY KEY,
+    utc REAL NOT NULL,           -- s Unix du burst
+    generation INTEGER NOT NULL,
+    hex TEXT,
+    hex_id TEXT,                 -- 15 (1G) ou 23 (2G) caractères
+    valid INTEGER NOT NULL,      -- CRC (1G) ou BCH (2G) correct
+    protocol TEXT,
+    country_code INTEGER,
+    lat REAL,
+    lon REAL,
+    freq_hz REAL,                -- fréquence porteuse (réception)
+    freq_offset REAL,
+    source TEXT,                 -- fichier rejoué ou capture en direct
+    sample INTEGER,              -- indice du burst dans la source
+    num_bits INTEGER,
+    bits BLOB,                   -- np.packbits des bits démodulés
+    fields TEXT,                 -- autres champs décodés (JSON)
+    UNIQUE (source, sample, hex)
+);
+CREATE INDEX IF NOT EXISTS frames_hex_id ON frames (hex_id, utc);
+CREATE INDEX IF NOT EXISTS frames_utc ON frames (utc);
+CREATE INDEX IF NOT EXISTS frames_freq ON frames (freq_hz, utc);
+CREATE INDEX IF NOT EXISTS frames_protocol ON frames (protocol, utc);
+CREATE INDEX IF NOT EXISTS frames_position ON frames (lat, lon);
+"""
+
+COLUMNS = ('utc', 'generation', 'hex', 'hex_id', 'valid', 'protocol', 'country_code',
+           'lat', 'lon', 'freq_hz', 'freq_offset', 'source', 'sample', 'num_bits', 'bits',
+           'fields')
+
+# Champs de l'événement déjà rangés dans une colonne (ou volumineux)
+EVENT_COLUMNS = ('utc', 'generation', 'hex', 'hex_id', 'crc_ok', 'bch_ok', 'country_code',
+                 'lat', 'lon', 'freq_hz', 'freq_offset', 'source', 'sample', 'bits', 'soft')
+
+# Protocoles 1G (C/S T.001): code utilisateur (bits 37-39) ou de localisation (37-40)
+USER_PROTOCOLS = {
+    0b000: 'Orbitography', 0b001: 'ELT Aviation User', 0b010: 'EPIRB Maritime User',
+    0b011: 'Serial User', 0b100: 'National User', 0b110: 'Radio Call Sign User',
+    0b111: 'Test User',
+}
+LOCATION_PROTOCOLS = {
+    0b0010: 'Standard Location EPIRB (MMSI)', 0b0011: 'Standard Location ELT (24-bit address)',
+    0b0100: 'Standard Location ELT (serial)', 0b0101: 'Standard Location ELT (operator)',
+    0b0110: 'Standard Location EPIRB (serial)', 0b0111: 'Standard Location PLB (serial)',
+    0b1000: 'National Location ELT', 0b1001: 'ELT(DT) Location',
+    0b1010: 'National Location EPIRB', 0b1011: 'National Location PLB',
+    0b1100: 'Standard Location Ship Security', 0b1101: 'RLS Location',
+    0b1110: 'Standard Location Test', 0b1111: 'National Location Test',
+}
+
+# Type de balise 2G (C/S T.018, bits 43-45)
+BEACON_TYPES_2G = {0: 'ELT', 1: 'EPIRB', 2: 'PLB', 3: 'ELT(DT)', 7: 'System'}
+
+# Hex ID 15 des protocoles de localisation: position remplacée par sa valeur
+# par défaut (C/S T.001), pour un identifiant stable quand la balise bouge
+STANDARD_LOCATION_CODES = (0b0010, 0b0011, 0b0100, 0b0101, 0b0110, 0b0111, 0b1100, 0b1110)
+NATIONAL_LOCATION_CODES = (0b1000, 0b1010, 0b1011, 0b1111)
+STANDARD_DEFAULT_POSITION = (65, '011111111101111111111')      # Bits 65-85
+NATIONAL_DEFAULT_POSITION = (59, '011111110000001111111100000')  # Bits 59-85
+
+
+def decode_1g_hex(hex_str):
+    """
+    Hex ID, pays et protocole d'une trame 1G (hex avec ou sans FFFE2F)
+
+    Returns:
+        dict (hex_id, country_code, protocol), vide si la trame est trop courte
+    """
+    if not hex_str:
+        return {}
+    hex_str = hex_str.strip().upper()
+    if hex_str.startswith('FFFE2F') or hex_str.startswith('FFFED0'):
+        hex_str = hex_str[6:]  # Bits 25 et suivants
+    try:
+        value = int(hex_str, 16)
+    except ValueError:
+        return {}
+    num_bits = 4 * len(hex_str)
+    if num_bits < 61:
+        return {}
+
+    def bits(first, count):
+        """Bits first..first+count-1 du message (numérotation C/S, bit 25 en tête)"""
+        shift = num_bits - (first - 25) - count
+        return (value >> shift) & ((1 << count) - 1)
+
+    hex_id = bits(26, 60)
+    default = None
+    if bits(26, 1):
+        protocol = USER_PROTOCOLS.get(bits(37, 3), 'User')
+    else:
+        code = bits(37, 4)
+        protocol = LOCATION_PROTOCOLS.get(code, 'Location')
+        if code in STANDARD_LOCATION_CODES:
+            default = STANDARD_DEFAULT_POSITION
+        elif code in NATIONAL_LOCATION_CODES:
+            default = NATIONAL_DEFAULT_POSITION
+    if default:
+        first, pattern = default
+        width = 86 - first
+        hex_id = (hex_id >> width << width) | int(pattern, 2)
+    return {
+        'hex_id': f"{hex_id:015X}",
+        'country_code': bits(27, 10),
+        'protocol': protocol,
+    }
+
+
+def _parse_utc(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    stamp = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.timestamp()
+
+
+def frame_row(event, utc=None, freq_hz=None):
+    """Ligne de la table frames (tuple dans l'ordre de COLUMNS) d'un événement"""
+    generation = int(event.get('generation') or 1)
+    hex_str = event.get('hex')
+    decoded = decode_1g_hex(hex_str) if generation == 1 else {}
+    protocol = decoded.get('protocol')
+    if generation == 2:
+        beacon_type = event.get('beacon_type')
+        protocol = 'SGB ' + BEACON_TYPES_2G.get(beacon_type, str(beacon_type))
+
+    valid = event.get('bch_ok') if generation == 2 else event.get('crc_ok')
+    bits = event.get('bits')
+    packed = None
+    if bits is not None:
+        bits = np.asarray(bits, dtype=np.uint8)
+        packed = np.packbits(bits).tobytes()
+
+    fields = {k: v for k, v in event.items() if k not in EVENT_COLUMNS}
+    return (
+        _parse_utc(event.get('utc')) or utc or time.time(),
+        generation,
+        hex_str,
+        event.get('hex_id') or decoded.get('hex_id'),
+        int(bool(valid)),
+        protocol,
+        event.get('country_code', decoded.get('country_code')),
+        event.get('lat'),
+        event.get('lon'),
+        event.get('freq_hz', freq_hz),
+        event.get('freq_offset'),
+        event.get('source'),
+        event.get('sample'),
+        None if bits is None else len(bits),
+        packed,
+        json.dumps(fields, ensure_ascii=False, sort_keys=True) if fields else None,
+    )
+
+
+class frame_store:
+    """
+    Base de trames SQLite, écriture par lots dans un thread
+
+    add(event, utc, freq_hz) ne bloque pas; flush() attend l'écriture des
+    trames ajoutées; query() lit avec sa propre connexion (WAL).
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_S):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.frames_written = 0
+        self.frames_dropped = 0
+
+        db = sqlite3.connect(path)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.executescript(SCHEMA)
+        db.close()
+
+        self._read_db = sqlite3.connect(path, check_same_thread=False)
+        self._read_db.row_factory = sqlite3.Row
+        self._read_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=MAX_QUEUE)
+        self._thread = threading.Thread(target=self._run, name='frame_store_writer', daemon=True)
+        self._thread.start()
+
+    def add(self, event, utc=None, freq_hz=None):
+        """
+        Ajouter une trame (événement replay.frame_event)
+
+        utc (s Unix) et freq_hz servent quand l'événement ne les contient pas
+        (réception en direct: horloge système, fréquence d'accord).
+        """
+        try:
+            self._queue.put_nowait(frame_row(event, utc, freq_hz))
+            return True
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+
+    def flush(self):
+        """Attendre l'écriture des trames déjà ajoutées"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._read_db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _run(self):
+        db = sqlite3.connect(self.path)
+        db.execute('PRAGMA synchronous=NORMAL')  # Suffisant en WAL, fsync au checkpoint
+        insert = (f"INSERT OR IGNORE INTO frames ({', '.join(COLUMNS)}) "
+                  f"VALUES ({', '.join('?' * len(COLUMNS))})")
+        stop = False
+        while not stop:
+            # Premier élément: attente libre, puis lot complété pendant flush_interval
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stop = True
+            rows = [row for row in batch if row is not None]
+            try:
+                with db:
+                    before = db.total_changes
+                    db.executemany(insert, rows)
+                    self.frames_written += db.total_changes - before
+            except sqlite3.Error as e:
+                print(f"[FRAME_STORE] Erreur d'écriture ({len(rows)} trames): {e}",
+                      file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        db.close()
+
+    def query(self, hex_id=None, since=None, until=None, freq_range=None, protocol=None,
+              bbox=None, valid=None, generation=None, limit=None):
+        """
+        Trames (dict) par date croissante
+
+        hex_id: hex ID exact ou préfixe terminé par '*'; since/until: s Unix;
+        freq_range: (fmin, fmax) Hz; protocol: sous-chaîne; bbox: (lat_min,
+        lat_max, lon_min, lon_max); valid/generation: filtres exacts.
+        """
+        where, params = [], []
+        if hex_id:
+            if hex_id.endswith('*'):
+                # Intervalle plutôt que LIKE: utilise l'index ('G' suit 'F')
+                where.append("hex_id >= ? AND hex_id < ?")
+                prefix = hex_id[:-1].upper()
+                params += [prefix, prefix + 'G']
+            else:
+                where.append("hex_id = ?")
+                params.append(hex_id.upper())
+        if since is not None:
+            where.append("utc >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("utc < ?")
+            params.append(until)
+        if freq_range is not None:
+            where.append("freq_hz BETWEEN ? AND ?")
+            params += list(freq_range)
+        if protocol:
+            where.append("protocol LIKE ?")
+            params.append(f"%{protocol}%")
+        if bbox is not None:
+            where.append("lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?")
+            params += list(bbox)
+        if valid is not None:
+            where.append("valid = ?")
+            params.append(int(bool(valid)))
+        if generation is not None:
+            where.append("generation = ?")
+            params.append(generation)
+
+        sql = "SELECT * FROM frames"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY utc"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._read_lock:
+            rows = self._read_db.execute(sql, params).fetchall()
+        return [_frame_dict(row) for row in rows]
+
+    def beacons(self, since=None):
+        """Balises distinctes: hex_id, nombre de trames, première et dernière réception"""
+        sql = ("SELECT hex_id, generation, protocol, country_code, COUNT(*) AS frames, "
+               "SUM(valid) AS valid, MIN(utc) AS first_utc, MAX(utc) AS last_utc FROM frames "
+               "WHERE hex_id IS NOT NULL" + (" AND utc >= ?" if since is not None else "") +
+               " GROUP BY hex_id ORDER BY last_utc DESC")
+        with self._read_lock:
+            rows = self._read_db.execute(sql, [since] if since is not None else []).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _frame_dict(row):
+    frame = dict(row)
+    if frame['bits'] is not None:
+        bits = np.unpackbits(np.frombuffer(frame['bits'], dtype=np.uint8))
+        frame['bits'] = bits[:frame['num_bits']].tolist()
+    fields = frame.pop('fields')
+    if fields:
+        frame.update(json.loads(fields))
+    frame['utc_iso'] = datetime.fromtimestamp(frame['utc'], tz=timezone.utc).isoformat(
+        timespec='milliseconds')
+    return frame
+
+
+def _duration(text):
+    """'90', '30m', '24h', '7d' → secondes"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='cospas-frames',
+        description="Interroge une base de trames COSPAS-SARSAT (frame_store) "
+                    "et écrit une trame JSON par ligne")
+    parser.add_argument('database', help='Base SQLite (ex: ../data/frames.db)')
+    parser.add_argument('--hex-id', help="Hex ID (15 ou 23 caractères, préfixe avec '*')")
+    parser.add_argument('--last', help='Seulement les N dernières s/m/h/d (ex: 24h)')
+    parser.add_argument('--since', help='Début ISO 8601 (UTC)')
+    parser.add_argument('--until', help='Fin ISO 8601 (UTC)')
+    parser.add_argument('--freq', nargs=2, type=float, metavar=('FMIN', 'FMAX'),
+                        help='Fréquences en Hz')
+    parser.add_argument('--protocol', help='Protocole (sous-chaîne, ex: EPIRB)')
+    parser.add_argument('--bbox', nargs=4, type=float,
+                        metavar=('LAT_MIN', 'LAT_MAX', 'LON_MIN', 'LON_MAX'))
+    parser.add_argument('--valid-only', action='store_true', help='Seulement CRC/BCH corrects')
+    parser.add_argument('--bits', action='store_true', help='Inclure les bits démodulés')
+    parser.add_argument('--beacons', action='store_true',
+                        help='Résumé par balise au lieu des trames')
+    parser.add_argument('-n', '--limit', type=int, help='Nombre maximal de trames')
+    args = parser.parse_args(argv)
+
+    since = _parse_utc(args.since)
+    if args.last:
+        since = time.time() - _duration(args.last)
+
+    store = frame_store(args.database)
+    try:
+        t0 = time.perf_counter()
+        if args.beacons:
+            results = store.beacons(since)
+        else:
+            results = store.query(args.hex_id, since, _parse_utc(args.until), args.freq,
+                                  args.protocol, args.bbox, True if args.valid_only else None,
+                                  limit=args.limit)
+        elapsed = time.perf_counter() - t0
+        for result in results:
+            if not args.bits:
+                result.pop('bits', None)
+            print(json.dumps(result, ensure_ascii=False))
+    finally:
+        store.close()
+    print(f"[FRAMES] {len(results)} résultat(s) en {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
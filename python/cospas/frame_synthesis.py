@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Synthèse vectorisée de trames COSPAS-SARSAT 1G en biphase-L
+Signal I/Q en bande de base, NumPy seul (sans GNU Radio): utilisable par
+les scripts de test et de benchmark hors flowgraph
+"""
+
+import numpy as np
+
+# Paramètres du signal 1G
+SAMPLE_RATE = 6400.0
+BIT_RATE = 400.0
+SAMPLES_PER_BIT = int(SAMPLE_RATE / BIT_RATE)  # 16
+CARRIER_DURATION = 0.160  # 160 ms
+CARRIER_SAMPLES = int(CARRIER_DURATION * SAMPLE_RATE)  # 1024
+PREAMBLE_BITS = 15
+FRAME_SYNC_NORMAL = '000101111'  # Mode normal
+FRAME_SYNC_TEST = '011010000'    # Mode self-test
+MOD_PHASE = 1.1  # ±1.1 radians
+
+
+def _frame_header(test_mode):
+    """Préambule (15 bits à '1') + frame sync (9 bits)"""
+    sync = FRAME_SYNC_TEST if test_mode else FRAME_SYNC_NORMAL
+    return np.array([1] * PREAMBLE_BITS + [int(b) for b in sync], dtype=np.uint8)
+
+
+def _data_matrix(frames):
+    """
+    Convertit les trames en matrice d'octets (n_trames, n_octets)
+
+    Accepte bytes, chaînes hex ou tableau uint8 2D. Toutes les trames
+    doivent avoir la même longueur (trames courtes et longues à séparer).
+    """
+    if isinstance(frames, np.ndarray):
+        data = frames.astype(np.uint8, copy=False)
+        if data.ndim != 2:
+            raise ValueError("Tableau de trames attendu en 2D (n_trames, n_octets)")
+        return data
+
+    rows = [bytes.fromhex(f) if isinstance(f, str) else bytes(f) for f in frames]
+    lengths = {len(r) for r in rows}
+    if len(lengths) > 1:
+        raise ValueError(f"Trames de longueurs différentes: {sorted(lengths)} octets")
+    return np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1)
+
+
+def synthesize_frames(frames, test_mode=False, mod_phase=MOD_PHASE,
+                      samples_per_bit=SAMPLES_PER_BIT, carrier_samples=CARRIER_SAMPLES):
+    """
+    Synthétise un lot de trames 1G en biphase-L, sans boucle par bit
+
+    Chaque trame = porteuse non modulée + préambule + frame sync + données
+    (MSB first). Les bits sont dépliés en demi-bits (bit '1': +φ puis -φ,
+    bit '0': -φ puis +φ), répétés sur samples_per_bit/2 échantillons et
+    convertis par une table de 2 symboles complexes.
+
+    Args:
+        frames: Itérable de trames (bytes ou hex) ou tableau uint8 (n, n_octets)
+        test_mode: Frame sync self-test au lieu du mode normal
+        mod_phase: Déviation de phase (rad)
+        samples_per_bit: Echantillons par bit (pair)
+        carrier_samples: Echantillons de porteuse non modulée
+
+    Returns:
+        np.array: Signaux I/Q complex64 de forme (n_trames, longueur_trame)
+    """
+    data = _data_matrix(frames)
+    n_frames = data.shape[0]
+
+    header = np.broadcast_to(_frame_header(test_mode), (n_frames, PREAMBLE_BITS + len(FRAME_SYNC_NORMAL)))
+    bits = np.concatenate([header, np.unpackbits(data, axis=1)], axis=1)
+
+    # Demi-bits: index 1 = +φ, 0 = -φ
+    halves = np.stack([bits, 1 - bits], axis=2).reshape(n_frames, -1)
+    halves = np.repeat(halves, samples_per_bit // 2, axis=1)
+
+    symbols = np.exp(1j * np.array([-mod_phase, mod_phase])).astype(np.complex64)
+    out = np.empty((n_frames, carrier_samples + halves.shape[1]), dtype=np.complex64)
+    out[:, :carrier_samples] = 1.0
+    out[:, carrier_samples:] = symbols[halves]
+    return out
+
+
+def synthesize_frame(data_bytes, test_mode=False, **kwargs):
+    """
+    Synthétise une trame 1G en biphase-L (voir synthesize_frames)
+
+    Returns:
+        np.array: Signal I/Q complex64
+    """
+    return synthesize_frames([data_bytes], test_mode, **kwargs)[0]
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archive I/Q continue (24/7) en morceaux de durée fixe, indexée par date UTC
+
+En complex64 brut, 40 kHz représentent ~27 Go/jour. L'archive stocke:
+- des échantillons quantifiés cs16 (int16, taille /2) ou cs8 (int8, /4), ou cf32
+- compressés sans perte par zstd (module zstandard, optionnel), par
+  trames indépendantes de block_s secondes pour l'accès aléatoire
+- en morceaux alignés sur l'horloge UTC (chunk_s, 60 s par défaut):
+  AAAAMMJJ/iq_AAAAMMJJTHHMMSS_mmmZ_<rate>.cs16[.zst]
+- avec un index SQLite (index.db: date, indice dans le flux, format,
+  position des trames zstd) et un quota disque: les plus anciens
+  morceaux sont supprimés au-delà de quota_gb
+
+L'écriture (quantification, compression, disque) se fait dans un thread:
+work() ne fait que copier les échantillons dans une file bornée. Si le
+disque ne suit pas, les blocs sont abandonnés et le morceau courant est
+fermé: l'index reste exact, le trou est visible entre deux morceaux.
+
+Lecture: iq_archive(root).window(t0, t1) renvoie un enregistrement de la
+même interface que iq_file.iq_recording (samples(start, stop), time_of...)
+que replay.replay_file rejoue directement (cospas-replay --archive).
+"""
+
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from gnuradio import gr
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_NAME = 'index.db'
+
+# Format → type des composantes I/Q entrelacées
+SAMPLE_FORMATS = {
+    'cf32': np.dtype('<f4'),
+    'cs16': np.dtype('<i2'),
+    'cs8': np.dtype('i1'),
+}
+
+# Secondes de signal que la file d'écriture peut contenir
+QUEUE_S = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,   -- relatif à la racine de l'archive
+    start_utc REAL NOT NULL,     -- s Unix du premier échantillon
+    end_utc REAL NOT NULL,       -- s Unix qui suit le dernier échantillon
+    stream_sample INTEGER,       -- indice du premier échantillon dans le flux
+    num_samples INTEGER NOT NULL,
+    sample_rate REAL NOT NULL,
+    center_freq REAL,
+    format TEXT NOT NULL,        -- cf32, cs16, cs8
+    scale REAL NOT NULL,         -- composante = valeur stockée * scale
+    compression TEXT NOT NULL,   -- '' ou 'zstd'
+    block_samples INTEGER,       -- échantillons par trame zstd
+    block_offsets BLOB,          -- int64 LE: position de chaque trame, puis taille du fichier
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_start ON chunks (start_utc);
+"""
+
+
+def _utc_name(unix_seconds):
+    """AAAAMMJJTHHMMSS_mmmZ"""
+    ms = int(round(unix_seconds * 1000))
+    stamp = datetime.fromtimestamp(ms // 1000, tz=timezone.utc)
+    return stamp.strftime('%Y%m%dT%H%M%S') + f'_{ms % 1000:03d}Z'
+
+
+def _open_index(root):
+    db = sqlite3.connect(os.path.join(root, INDEX_NAME))
+    db.execute('PRAGMA journal_mode=WAL')  # Lecteurs concurrents de l'enregistreur
+    db.executescript(SCHEMA)
+    return db
+
+
+class archive_writer:
+    """
+    Ecriture d'un flux I/Q dans l'archive, dans un thread
+
+    push(first_sample, samples) ne bloque jamais: False si la file est
+    pleine (bloc abandonné, compté dans samples_dropped).
+    """
+
+    def __init__(self, root, sample_rate, center_freq=0.0, fmt='cs16', compression=None,
+                 chunk_s=60.0, quota_gb=None, full_scale=1.0, block_s=1.0, level=3):
+        if fmt not in SAMPLE_FORMATS:
+            raise ValueError(f"format '{fmt}' inconnu ({', '.join(SAMPLE_FORMATS)})")
+        if compression not in (None, '', 'zstd'):
+            raise ValueError(f"compression '{compression}' inconnue (zstd)")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("compression zstd: module zstandard absent (pip install zstandard)")
+
+        self.root = root
+        self.sample_rate = float(sample_rate)
+        self.center_freq = float(center_freq or 0.0)
+        self.fmt = fmt
+        self.dtype = SAMPLE_FORMATS[fmt]
+        self.compression = compression or ''
+        self.chunk_s = float(chunk_s)
+        self.quota_bytes = int(quota_gb * 1e9) if quota_gb else None
+        self.block_samples = max(1, int(block_s * self.sample_rate))
+        self.level = level
+        if self.dtype.kind == 'f':
+            self.scale = 1.0
+        else:
+            self.scale = float(full_scale) / np.iinfo(self.dtype).max
+        self.start_time = None  # s Unix de l'échantillon 0 du flux
+
+        self.chunks_written = 0
+        self.samples_written = 0
+        self.samples_dropped = 0
+        self.bytes_written = 0
+        self.chunks_evicted = 0
+
+        os.makedirs(root, exist_ok=True)
+        blocks = max(4, int(QUEUE_S * self.sample_rate / 4096))
+        self._queue = queue.Queue(maxsize=blocks)
+        self._chunk = None
+        self._thread = None
+        self.open()
+
+    # -- côté flux -------------------------------------------------------
+
+    def push(self, first_sample, samples):
+        """Bloc d'échantillons (complex64, copié par l'appelant) d'indice first_sample"""
+        try:
+            self._queue.put_nowait(('samples', first_sample, samples))
+            return True
+        except queue.Full:
+            self.samples_dropped += len(samples)
+            return False
+
+    def set_center_freq(self, center_freq):
+        """Nouvelle fréquence: le morceau courant est fermé"""
+        self._queue.put(('freq', None, float(center_freq or 0.0)))
+
+    def open(self):
+        """Démarrer le thread d'écriture (après close(): reprise dans un nouveau morceau)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='iq_archive_writer',
+                                            daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Vider la file, fermer le morceau courant et arrêter le thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(('close', None, None))
+            self._thread.join()
+
+    # -- thread d'écriture -----------------------------------------------
+
+    def _run(self):
+        db = _open_index(self.root)
+        self._db = db
+        self._enforce_quota()
+        try:
+            while True:
+                kind, first, payload = self._queue.get()
+                if kind == 'close':
+                    break
+                if kind == 'freq':
+                    self._close_chunk()
+                    self.center_freq = payload
+                    continue
+                self._append(first, payload)
+        finally:
+            self._close_chunk()
+            db.close()
+
+    def _append(self, first, samples):
+        chunk = self._chunk
+        if chunk is not None and first != chunk['next_sample']:
+            self._close_chunk()  # Trou (blocs abandonnés ou redémarrage)
+        position = 0
+        while position < len(samples):
+            if self._chunk is None:
+                self._open_chunk(first + position)
+            chunk = self._chunk
+            n = min(len(samples) - position, chunk['end_sample'] - chunk['next_sample'])
+            self._write(samples[position:position + n])
+            position += n
+            if chunk['next_sample'] >= chunk['end_sample']:
+                self._close_chunk()
+
+    def _open_chunk(self, first_sample):
+        start_utc = self.start_time + first_sample / self.sample_rate
+        # Fin du morceau sur le prochain multiple de chunk_s (horloge UTC)
+        end_utc = (math.floor(start_utc / self.chunk_s + 1e-9) + 1) * self.chunk_s
+        length = max(1, int(math.ceil((end_utc - start_utc) * self.sample_rate - 1e-6)))
+
+        name = (f"iq_{_utc_name(start_utc)}_{int(self.sample_rate)}.{self.fmt}"
+                + ('.zst' if self.compression else ''))
+        relative = os.path.join(name[3:11], name)
+        path = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._chunk = {
+            'relative': relative,
+            'path': path,
+            'file': open(path + '.part', 'wb'),
+            'start_utc': start_utc,
+            'first_sample': first_sample,
+            'next_sample': first_sample,
+            'end_sample': first_sample + length,
+            'center_freq': self.center_freq,
+            'pending': [],         # Composantes en attente d'une trame zstd complète
+            'pending_samples': 0,
+            'offsets': [],
+            'bytes': 0,
+        }
+        if self.compression:
+            self._chunk['compressor'] = zstandard.ZstdCompressor(level=self.level)
+
+    def _quantize(self, samples):
+        components = np.asarray(samples, dtype=np.complex64).view(np.float32)
+        if self.dtype.kind == 'f':
+            return components.astype(self.dtype, copy=False)
+        info = np.iinfo(self.dtype)
+        scaled = np.rint(components / self.scale)
+        return np.clip(scaled, info.min, info.max).astype(self.dtype)
+
+    def _write(self, samples):
+        chunk = self._chunk
+        data = self._quantize(samples)
+        chunk['next_sample'] += len(samples)
+        if not self.compression:
+            chunk['file'].write(data.tobytes())
+            chunk['bytes'] += data.nbytes
+            return
+
+        chunk['pending'].append(data)
+        chunk['pending_samples'] += len(samples)
+        while chunk['pending_samples'] >= self.block_samples:
+            pending = np.concatenate(chunk['pending'])
+            self._write_frame(chunk, pending[:2 * self.block_samples])
+            rest = pending[2 * self.block_samples:]
+            chunk['pending'] = [rest] if len(rest) else []
+            chunk['pending_samples'] = len(rest) // 2
+
+    def _write_frame(self, chunk, components):
+        frame = chunk['compressor'].compress(components.tobytes())
+        chunk['offsets'].append(chunk['bytes'])
+        chunk['file'].write(frame)
+        chunk['bytes'] += len(frame)
+
+    def _close_chunk(self):
+        chunk = self._chunk
+        if chunk is None:
+            return
+        self._chunk = None
+        if self.compression and chunk['pending_samples']:
+            self._write_frame(chunk, np.concatenate(chunk['pending']))
+        chunk['file'].close()
+
+        num_samples = chunk['next_sample'] - chunk['first_sample']
+        if num_samples == 0:
+            os.remove(chunk['path'] + '.part')
+            return
+        os.replace(chunk['path'] + '.part', chunk['path'])
+
+        offsets = None
+        if self.compression:
+            offsets = np.asarray(chunk['offsets'] + [chunk['bytes']], dtype='<i8').tobytes()
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO chunks (path, start_utc, end_utc, stream_sample, "
+                "num_samples, sample_rate, center_freq, format, scale, compression, "
+                "block_samples, block_offsets, bytes) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (chunk['relative'], chunk['start_utc'],
+                 chunk['start_utc'] + num_samples / self.sample_rate, chunk['first_sample'],
+                 num_samples, self.sample_rate, chunk['center_freq'], self.fmt, self.scale,
+                 self.compression, self.block_samples if self.compression else None,
+                 offsets, chunk['bytes']))
+        self.chunks_written += 1
+        self.samples_written += num_samples
+        self.bytes_written += chunk['bytes']
+        self._enforce_quota(keep=chunk['relative'])
+
+    def _enforce_quota(self, keep=None):
+        """
+        Supprimer les morceaux les plus anciens au-delà du quota
+
+        Le morceau keep (celui qui vient d'être fermé, par défaut le plus
+        récent) est toujours conservé, même s'il dépasse le quota à lui seul.
+        """
+        if not self.quota_bytes:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM chunks").fetchone()[0]
+        if total <= self.quota_bytes:
+            return
+        query = "SELECT id, path, bytes FROM chunks ORDER BY start_utc"
+        rows = self._db.execute(query).fetchall()
+        keep = keep or rows[-1][1]
+        evicted = []
+        for chunk_id, relative, size in rows:
+            if total <= self.quota_bytes:
+                break
+            if relative == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.root, relative))
+            except FileNotFoundError:
+                pass
+            evicted.append((chunk_id,))
+            total -= size
+        with self._db:
+            self._db.executemany("DELETE FROM chunks WHERE id = ?", evicted)
+        self.chunks_evicted += len(evicted)
+
+
+class iq_archive_sink(gr.sync_block):
+    """
+    Enregistrement continu du flux dans une archive (archive_writer)
+
+    La date UTC de l'échantillon 0 est prise sur l'horloge système au
+    premier appel de work(), sauf set_start_time().
+    """
+
+    def __init__(self, root, sample_rate, center_freq=0.0, fmt='cs16', compression=None,
+                 chunk_s=60.0, quota_gb=None, full_scale=1.0):
+        gr.sync_block.__init__(self, name="iq_archive_sink", in_sig=[np.complex64], out_sig=None)
+        self.writer = archive_writer(root, sample_rate, center_freq, fmt, compression, chunk_s,
+                                     quota_gb, full_scale)
+        self.start_time_fixed = False
+
+    def set_center_freq(self, center_freq):
+        self.writer.set_center_freq(center_freq)
+
+    def set_start_time(self, unix_seconds):
+        self.writer.start_time = unix_seconds
+        self.start_time_fixed = True
+
+    def get_statistics(self):
+        w = self.writer
+        return {
+            'chunks_written': w.chunks_written,
+            'samples_written': w.samples_written,
+            'samples_dropped': w.samples_dropped,
+            'bytes_written': w.bytes_written,
+            'chunks_evicted': w.chunks_evicted,
+        }
+
+    def start(self):
+        self.writer.open()
+        if not self.start_time_fixed:
+            self.writer.start_time = None  # Recalé sur l'horloge au redémarrage
+        return True
+
+    def stop(self):
+        self.writer.close()
+        return True
+
+    def work(self, input_items, output_items):
+        x = input_items[0]
+        first = self.nitems_read(0)
+        if self.writer.start_time is None:
+            self.writer.start_time = time.time() - first / self.writer.sample_rate
+        self.writer.push(first, x.copy())
+        return len(x)
+
+
+class iq_archive:
+    """
+    Lecture d'une archive par date UTC (index SQLite, sans parcourir les fichiers)
+    """
+
+    def __init__(self, root):
+        self.root = root
+        if not os.path.exists(os.path.join(root, INDEX_NAME)):
+            raise ValueError(f"{root}: pas d'archive I/Q ({INDEX_NAME} absent)")
+        self._db = sqlite3.connect(os.path.join(root, INDEX_NAME))
+        self._db.row_factory = sqlite3.Row
+        self._cache = (None, None, None)  # (chunk id, indice de trame, composantes)
+
+    def close(self):
+        self._db.close()
+
+    def chunks(self, t0=None, t1=None):
+        """Morceaux (dict) qui recouvrent [t0, t1), par date croissante"""
+        query = "SELECT * FROM chunks WHERE end_utc > ? AND start_utc < ? ORDER BY start_utc"
+        rows = self._db.execute(query, (t0 if t0 is not None else -math.inf,
+                                        t1 if t1 is not None else math.inf))
+        return [dict(row) for row in rows]
+
+    def extent(self):
+        """(première, dernière) date UTC de l'archive, None si vide"""
+        row = self._db.execute("SELECT MIN(start_utc), MAX(end_utc) FROM chunks").fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    def _components(self, chunk, first, last):
+        """Composantes stockées des échantillons [first, last) d'un morceau"""
+        dtype = SAMPLE_FORMATS[chunk['format']]
+        path = os.path.join(self.root, chunk['path'])
+        if not chunk['compression']:
+            with open(path, 'rb') as f:
+                f.seek(2 * first * dtype.itemsize)
+                return np.fromfile(f, dtype=dtype, count=2 * (last - first))
+
+        if zstandard is None:
+            raise ValueError(f"{path}: module zstandard absent (pip install zstandard)")
+        per_block = chunk['block_samples']
+        offsets = np.frombuffer(chunk['block_offsets'], dtype='<i8')
+        parts = []
+        with open(path, 'rb') as f:
+            for block in range(first // per_block, (last - 1) // per_block + 1):
+                cached_id, cached_block, data = self._cache
+                if cached_id != chunk['id'] or cached_block != block:
+                    f.seek(offsets[block])
+                    raw = f.read(offsets[block + 1] - offsets[block])
+                    data = np.frombuffer(zstandard.ZstdDecompressor().decompress(raw),
+                                         dtype=dtype)
+                    self._cache = (chunk['id'], block, data)
+                lo = max(first, block * per_block) - block * per_block
+                hi = min(last, (block + 1) * per_block) - block * per_block
+                parts.append(data[2 * lo:2 * hi])
+        return np.concatenate(parts)
+
+    def place(self, t0, t1):
+        """
+        Morceaux de [t0, t1) avec l'indice (entier) de leur premier échantillon
+        relativement à t0, calculé une fois pour des lectures par blocs exactes
+        """
+        chunks = self.chunks(t0, t1)
+        if not chunks:
+            raise ValueError("aucun morceau de l'archive dans l'intervalle demandé")
+        rate = chunks[0]['sample_rate']
+        return [(int(round((c['start_utc'] - t0) * rate)), c) for c in chunks
+                if c['sample_rate'] == rate]
+
+    def fill(self, placed, start, stop, out=None):
+        """
+        Echantillons complex64 [start, stop) d'un intervalle placé (place())
+
+        Les trous de l'archive (arrêts, blocs abandonnés) sont remplis de zéros.
+        """
+        count = max(0, stop - start)
+        if out is None:
+            out = np.zeros(count, dtype=np.complex64)
+        else:
+            out = out[:count]
+            out[:] = 0
+        for offset, chunk in placed:
+            lo = max(start, offset)
+            hi = min(stop, offset + chunk['num_samples'])
+            if hi <= lo:
+                continue
+            components = self._components(chunk, lo - offset, hi - offset)
+            view = out[lo - start:hi - start].view(np.float32)
+            view[:] = components
+            if chunk['scale'] != 1.0:
+                view *= chunk['scale']
+        return out
+
+    def read(self, t0, t1, out=None):
+        """Echantillons complex64 de [t0, t1) (s Unix), trous remplis de zéros"""
+        placed = self.place(t0, t1)
+        rate = placed[0][1]['sample_rate']
+        return self.fill(placed, 0, int(round((t1 - t0) * rate)), out)
+
+    def window(self, t0=None, t1=None):
+        """Fenêtre [t0, t1) de l'archive (toute l'archive par défaut), rejouable"""
+        extent = self.extent()
+        if extent is None:
+            raise ValueError(f"{self.root}: archive vide")
+        t0 = extent[0] if t0 is None else max(t0, extent[0])
+        t1 = extent[1] if t1 is None else min(t1, extent[1])
+        if t1 <= t0:
+            raise ValueError("intervalle hors de l'archive")
+        return archive_window(self, t0, t1)
+
+
+class archive_window:
+    """
+    Intervalle d'une archive présenté comme un iq_recording
+
+    Attributs: path, sample_rate, center_freq, start_time (datetime UTC),
+    num_samples, metadata; samples(start, stop, out) et time_of(indice).
+    """
+
+    def __init__(self, archive, t0, t1):
+        self.archive = archive
+        first = archive.chunks(t0, t1)[0]
+        self.sample_rate = first['sample_rate']
+        # Début calé sur la grille d'échantillons du premier morceau
+        self.t0 = first['start_utc'] + math.ceil(
+            (t0 - first['start_utc']) * self.sample_rate - 1e-6) / self.sample_rate
+        self.center_freq = first['center_freq'] or None
+        self.start_time = datetime.fromtimestamp(self.t0, tz=timezone.utc)
+        self.num_samples = max(0, int(round((t1 - self.t0) * self.sample_rate)))
+        self.path = os.path.join(archive.root, 'archive_' + _utc_name(self.t0))
+        self._placed = archive.place(self.t0, t1)
+        self.metadata = {'chunks': [c['path'] for _, c in self._placed]}
+
+    def __len__(self):
+        return self.num_samples
+
+    @property
+    def duration(self):
+        return self.num_samples / self.sample_rate
+
+    def samples(self, start=0, stop=None, out=None):
+        stop = self.num_samples if stop is None else min(stop, self.num_samples)
+        start = max(0, min(start, stop))
+        return self.archive.fill(self._placed, start, stop, out)
+
+    def time_of(self, sample_index):
+        return datetime.fromtimestamp(self.t0 + sample_index / self.sample_rate, tz=timezone.utc)
+
+
+def parse_utc(text):
+    """Date ISO 8601 (UTC si sans fuseau) → s Unix"""
+    stamp = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.timestamp()
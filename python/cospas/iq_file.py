@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lecture des enregistrements I/Q archivés, en mémoire projetée (mmap)
+Formats reconnus:
+- complex64 brut: .cf32, .fc32, .cfile, .iq, .raw (gqrx)
+- entiers entrelacés: .cs16/.ci16 (int16), .cs8/.ci8 (int8), .cu8 (rtl_sdr)
+- WAV stéréo I/Q (PCM 8/16 bits ou float32, y compris WAVE_FORMAT_EXTENSIBLE)
+- SigMF (.sigmf-meta + .sigmf-data): datatype, sample rate, fréquence et
+  date de début lus dans les métadonnées
+
+Le fichier n'est jamais chargé en entier: samples(start, stop) ne convertit
+en complex64 que la tranche demandée, ce qui permet de parcourir des
+enregistrements de plusieurs Go avec une mémoire bornée.
+"""
+
+import json
+import os
+import re
+import struct
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Extension → type des composantes I/Q entrelacées
+RAW_FORMATS = {
+    '.cf32': np.float32,
+    '.fc32': np.float32,
+    '.cfile': np.float32,
+    '.iq': np.float32,
+    '.raw': np.float32,
+    '.cs16': np.int16,
+    '.ci16': np.int16,
+    '.cs8': np.int8,
+    '.ci8': np.int8,
+    '.cu8': np.uint8,
+}
+
+# core:datatype SigMF → type des composantes (complexes, little endian)
+SIGMF_DATATYPES = {
+    'cf32_le': np.dtype('<f4'),
+    'ci16_le': np.dtype('<i2'),
+    'ci8': np.dtype('i1'),
+    'cu8': np.dtype('u1'),
+    'cf32_be': np.dtype('>f4'),
+    'ci16_be': np.dtype('>i2'),
+}
+
+# gqrx_AAAAMMJJ_HHMMSS_[fréquence_]samplerate[_fc].raw
+GQRX_NAME = re.compile(r'gqrx_(\d{8})_(\d{6})_(?:(\d+)_)?(\d+)(?:_fc)?\.(?:raw|iq)$')
+
+
+def _scale(dtype):
+    """(décalage, gain) ramenant les composantes entières dans [-1, 1]"""
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return 0.0, 1.0
+    if dtype.kind == 'u':
+        half = (np.iinfo(dtype).max + 1) / 2.0
+        return half - 0.5, 1.0 / (half - 0.5)
+    return 0.0, 1.0 / (np.iinfo(dtype).max + 1)
+
+
+class iq_recording:
+    """
+    Enregistrement I/Q projeté en mémoire
+
+    Attributs: path, sample_rate (Hz, None si inconnu), center_freq (Hz ou
+    None), start_time (datetime UTC ou None), num_samples, dtype (type des
+    composantes), metadata (dict, SigMF ou vide).
+    """
+
+    def __init__(self, path, components, sample_rate=None, center_freq=None,
+                 start_time=None, metadata=None):
+        self.path = path
+        self._components = components
+        self.dtype = components.dtype
+        self.num_samples = len(components) // 2
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.start_time = start_time
+        self.metadata = metadata or {}
+        self._offset, self._gain = _scale(self.dtype)
+
+    def __len__(self):
+        return self.num_samples
+
+    @property
+    def duration(self):
+        """Durée en secondes (None si le sample rate est inconnu)"""
+        return self.num_samples / self.sample_rate if self.sample_rate else None
+
+    def samples(self, start=0, stop=None, out=None):
+        """
+        Echantillons [start, stop) en complex64
+
+        Les fichiers complex64 natifs sont renvoyés sans conversion (vue sur
+        la projection mémoire, copiée seulement si out est fourni).
+        """
+        stop = self.num_samples if stop is None else min(stop, self.num_samples)
+        start = max(0, min(start, stop))
+        raw = self._components[2 * start:2 * stop]
+
+        if self.dtype == np.float32:
+            x = raw.view(np.complex64)
+            if out is None:
+                return x
+            out[:len(x)] = x
+            return out[:len(x)]
+
+        if out is None:
+            out = np.empty(stop - start, dtype=np.complex64)
+        else:
+            out = out[:stop - start]
+        pairs = raw.reshape(-1, 2)
+        out.real = pairs[:, 0]
+        out.imag = pairs[:, 1]
+        if self._offset:
+            out -= self._offset * (1 + 1j)
+        if self._gain != 1.0:
+            out *= self._gain
+        return out
+
+    def blocks(self, block_size, start=0, stop=None, overlap=0):
+        """
+        Parcours par blocs: (indice du premier échantillon, complex64)
+
+        Deux blocs successifs se recouvrent de `overlap` échantillons.
+        """
+        stop = self.num_samples if stop is None else min(stop, self.num_samples)
+        step = block_size - overlap
+        if step <= 0:
+            raise ValueError("overlap doit être inférieur à block_size")
+        position = start
+        while position < stop:
+            yield position, self.samples(position, min(position + block_size, stop))
+            if position + block_size >= stop:
+                break
+            position += step
+
+    def time_of(self, sample_index):
+        """Date UTC d'un échantillon (None si la date de début est inconnue)"""
+        if self.start_time is None or not self.sample_rate:
+            return None
+        return datetime.fromtimestamp(
+            self.start_time.timestamp() + sample_index / self.sample_rate, tz=timezone.utc)
+
+
+def _memmap(path, dtype, offset=0, length=None):
+    dtype = np.dtype(dtype)
+    size = os.path.getsize(path) - offset
+    if length is not None:
+        size = min(size, length)
+    count = (size // (2 * dtype.itemsize)) * 2  # Paires I/Q complètes
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+
+def _parse_gqrx_name(path):
+    """(start_time, center_freq, sample_rate) d'un nom de fichier gqrx"""
+    match = GQRX_NAME.search(os.path.basename(path))
+    if not match:
+        return None, None, None
+    date, time_, freq, rate = match.groups()
+    try:
+        start = datetime.strptime(date + time_, '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc)
+    except ValueError:
+        start = None
+    return start, float(freq) if freq else None, float(rate)
+
+
+def _open_wav(path):
+    """Fichier WAV stéréo (I à gauche, Q à droite)"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] not in (b'RIFF', b'RF64') or header[8:12] != b'WAVE':
+            raise ValueError(f"{path}: fichier WAV invalide")
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path}: chunk 'data' absent")
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size)
+                tag, channels, rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if tag == 0xFFFE and len(body) >= 26:  # WAVE_FORMAT_EXTENSIBLE
+                    tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+                f.seek(chunk_size & 1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                # RF64 / tailles > 4 Go: le chunk s'étend jusqu'à la fin du fichier
+                data_size = None if chunk_size == 0xFFFFFFFF else chunk_size
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"{path}: chunk 'fmt ' absent")
+    tag, channels, rate, bits = fmt
+    if channels != 2:
+        raise ValueError(f"{path}: {channels} canal(aux), I/Q stéréo attendu")
+    if tag == 3 and bits == 32:
+        dtype = np.dtype('<f4')
+    elif tag == 1 and bits == 16:
+        dtype = np.dtype('<i2')
+    elif tag == 1 and bits == 8:
+        dtype = np.dtype('u1')
+    else:
+        raise ValueError(f"{path}: format WAV non supporté (tag {tag}, {bits} bits)")
+    return _memmap(path, dtype, data_offset, data_size), float(rate)
+
+
+def _sigmf_paths(path):
+    base = path
+    for suffix in ('.sigmf-meta', '.sigmf-data'):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+            break
+    return base + '.sigmf-meta', base + '.sigmf-data'
+
+
+def _open_sigmf(path):
+    meta_path, data_path = _sigmf_paths(path)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    glob = meta.get('global', {})
+    datatype = glob.get('core:datatype', 'cf32_le')
+    if datatype not in SIGMF_DATATYPES:
+        raise ValueError(f"{meta_path}: core:datatype '{datatype}' non supporté")
+
+    captures = meta.get('captures') or [{}]
+    capture = captures[0]
+    start_time = None
+    if capture.get('core:datetime'):
+        start_time = datetime.fromisoformat(
+            capture['core:datetime'].replace('Z', '+00:00')).astimezone(timezone.utc)
+
+    # Big endian: converti à la volée par samples()
+    return iq_recording(data_path, _memmap(data_path, SIGMF_DATATYPES[datatype]),
+                        sample_rate=glob.get('core:sample_rate'),
+                        center_freq=capture.get('core:frequency'),
+                        start_time=start_time,
+                        metadata=meta)
+
+
+def is_sigmf(path):
+    return path.endswith(('.sigmf-meta', '.sigmf-data'))
+
+
+def open_iq(path, sample_rate=None, fmt=None):
+    """
+    Ouvrir un enregistrement I/Q en mémoire projetée
+
+    Args:
+        path: Fichier (.cf32, .iq, .raw, .cs16, .cu8, .wav, .sigmf-meta/-data...)
+        sample_rate: Sample rate en Hz; prioritaire sur celui du fichier
+            (en-tête WAV, métadonnées SigMF, nom de fichier gqrx)
+        fmt: Extension à utiliser à la place de celle du fichier ('cf32', 'cu8', ...)
+
+    Returns:
+        iq_recording
+    """
+    ext = ('.' + fmt.lstrip('.')) if fmt else os.path.splitext(path)[1].lower()
+
+    if is_sigmf(path) or ext in ('.sigmf-meta', '.sigmf-data'):
+        recording = _open_sigmf(path)
+    elif ext == '.wav':
+        components, rate = _open_wav(path)
+        recording = iq_recording(path, components, sample_rate=rate)
+    elif ext in RAW_FORMATS:
+        start_time, center_freq, rate = _parse_gqrx_name(path)
+        recording = iq_recording(path, _memmap(path, RAW_FORMATS[ext]), sample_rate=rate,
+                                 center_freq=center_freq, start_time=start_time)
+    else:
+        raise ValueError(f"{path}: format I/Q inconnu ({ext or 'sans extension'})")
+
+    if sample_rate:
+        recording.sample_rate = float(sample_rate)
+    return recording
+
+
+def find_recordings(paths):
+    """
+    Enregistrements I/Q désignés par une liste de fichiers et/ou de répertoires
+
+    Les répertoires sont parcourus récursivement; une capture SigMF n'est
+    listée qu'une fois (fichier .sigmf-meta).
+    """
+    extensions = set(RAW_FORMATS) | {'.wav', '.sigmf-meta'}
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in extensions:
+                    found.append(os.path.join(root, name))
+    return found
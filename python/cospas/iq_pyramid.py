@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pyramide min/max/puissance pour visualiser de longs enregistrements I/Q
+
+Le fichier (iq_file: projeté en mémoire) est parcouru une fois par blocs:
+le niveau 0 résume chaque tranche de BASE_BIN échantillons (min/max de I,
+de Q et de l'amplitude, puissance moyenne), chaque niveau suivant regroupe
+FACTOR tranches du précédent. La pyramide (~0.4 % de la taille d'un
+fichier complex64) est mise en cache à côté du fichier
+(<fichier>.pyramid.npy + .pyramid.json) et relue en mémoire projetée.
+
+view(start, stop, width) choisit le niveau le plus grossier qui garde au
+moins une tranche par pixel: au plus width*FACTOR tranches sont lues, quelle
+que soit la longueur de l'intervalle. En dessous de BASE_BIN échantillons
+par pixel, les échantillons eux-mêmes sont lus (au plus width*BASE_BIN).
+
+burst_marks() donne les limites des bursts à superposer: annotations
+SigMF (burst_recorder: début et taille du détecteur) ou événements de
+cospas-replay / cospas-batch-decode (JSON lines, JSON, CSV).
+"""
+
+import csv
+import json
+import os
+
+import numpy as np
+
+from .iq_file import open_iq
+
+PYRAMID_VERSION = 1
+
+# Echantillons par tranche du niveau 0, regroupement entre niveaux
+BASE_BIN = 256
+FACTOR = 8
+
+# Colonnes de chaque niveau
+FIELDS = ('i_min', 'i_max', 'q_min', 'q_max', 'mag_min', 'mag_max', 'power')
+
+# Tranches du niveau 0 calculées par bloc lu
+BUILD_BINS = 4096
+
+# Durée nominale des bursts quand seul leur début est connu (événements)
+BURST_S = {1: 0.52, 2: 1.0}
+
+
+def _summarize(x, edges):
+    """Résumé des tranches d'échantillons [edges[k], edges[k+1]) (la dernière va jusqu'au bout)"""
+    out = np.empty((len(edges), len(FIELDS)), dtype=np.float32)
+    mag = np.abs(x)
+    out[:, 0] = np.minimum.reduceat(x.real, edges)
+    out[:, 1] = np.maximum.reduceat(x.real, edges)
+    out[:, 2] = np.minimum.reduceat(x.imag, edges)
+    out[:, 3] = np.maximum.reduceat(x.imag, edges)
+    out[:, 4] = np.minimum.reduceat(mag, edges)
+    out[:, 5] = np.maximum.reduceat(mag, edges)
+    out[:, 6] = np.add.reduceat(mag * mag, edges) / np.diff(np.append(edges, len(x)))
+    return out
+
+
+def _merge(level, edges, counts):
+    """Regrouper les tranches [edges[k], edges[k+1]) (counts: échantillons par tranche)"""
+    out = np.empty((len(edges), len(FIELDS)), dtype=np.float32)
+    for column in (0, 2, 4):
+        out[:, column] = np.minimum.reduceat(level[:, column], edges)
+    for column in (1, 3, 5):
+        out[:, column] = np.maximum.reduceat(level[:, column], edges)
+    weighted = np.add.reduceat(level[:, 6] * counts, edges)
+    out[:, 6] = weighted / np.add.reduceat(counts, edges)
+    return out
+
+
+class iq_pyramid:
+    """
+    Pyramide d'un iq_recording
+
+    Attributs: recording, bin_sizes (échantillons par tranche de chaque
+    niveau), levels (tableaux (tranches, FIELDS), éventuellement projetés).
+    """
+
+    def __init__(self, recording, cache=True, base_bin=BASE_BIN, factor=FACTOR):
+        self.recording = recording
+        self.base_bin = base_bin
+        self.factor = factor
+        self.levels = None
+        if cache:
+            self._load()
+        if self.levels is None:
+            self._build()
+            if cache:
+                self._save()
+        self.bin_sizes = [base_bin * factor ** k for k in range(len(self.levels))]
+
+    # -- cache -----------------------------------------------------------
+
+    def _cache_paths(self):
+        return self.recording.path + '.pyramid.npy', self.recording.path + '.pyramid.json'
+
+    def _signature(self):
+        stat = os.stat(self.recording.path)
+        return {
+            'version': PYRAMID_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'dtype': str(self.recording.dtype),
+            'num_samples': self.recording.num_samples,
+            'base_bin': self.base_bin,
+            'factor': self.factor,
+        }
+
+    def _load(self):
+        data_path, meta_path = self._cache_paths()
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get('signature') != self._signature():
+                return  # Fichier modifié ou paramètres différents: reconstruire
+            data = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return
+        offsets = meta['offsets']
+        self.levels = [data[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+    def _save(self):
+        data_path, meta_path = self._cache_paths()
+        offsets = np.cumsum([0] + [len(level) for level in self.levels]).tolist()
+        try:
+            np.save(data_path, np.concatenate(self.levels))
+            # Métadonnées en dernier: leur présence désigne un cache complet
+            with open(meta_path, 'w') as f:
+                json.dump({'signature': self._signature(), 'fields': FIELDS,
+                           'offsets': offsets}, f)
+        except OSError:
+            pass  # Répertoire en lecture seule: pyramide gardée en mémoire
+
+    def _build(self):
+        recording = self.recording
+        block = self.base_bin * BUILD_BINS
+        parts = [_summarize(x, np.arange(0, len(x), self.base_bin))
+                 for _, x in recording.blocks(block)]
+        level = (np.concatenate(parts) if parts
+                 else np.zeros((0, len(FIELDS)), dtype=np.float32))
+        levels = [level]
+        bin_size = self.base_bin
+        while len(level) > 1:
+            counts = self._counts(len(level), bin_size)
+            edges = np.arange(0, len(level), self.factor)
+            level = _merge(level, edges, counts)
+            levels.append(level)
+            bin_size *= self.factor
+        self.levels = levels
+
+    def _counts(self, nbins, bin_size):
+        """Echantillons par tranche d'un niveau (la dernière peut être partielle)"""
+        counts = np.full(nbins, bin_size, dtype=np.float64)
+        if nbins:
+            counts[-1] = self.recording.num_samples - (nbins - 1) * bin_size
+        return counts
+
+    def _range_summary(self, lo, hi):
+        """
+        Résumé exact des échantillons [lo, hi)
+
+        Tranches entières les plus grossières possibles, échantillons bruts
+        seulement pour les restes non alignés sur BASE_BIN (< 2 * base_bin).
+        """
+        total = self.recording.num_samples
+        rows, counts = [], []
+        pos = lo
+        while pos < hi:
+            for k in reversed(range(len(self.levels))):
+                bin_size = self.bin_sizes[k]
+                count = min(bin_size, total - pos)
+                if pos % bin_size == 0 and pos + count <= hi:
+                    rows.append(self.levels[k][pos // bin_size])
+                    counts.append(count)
+                    pos += count
+                    break
+            else:
+                end = min(hi, (pos // self.base_bin + 1) * self.base_bin)
+                x = self.recording.samples(pos, end)
+                rows.append(_summarize(x, np.zeros(1, dtype=np.int64))[0])
+                counts.append(end - pos)
+                pos = end
+        return _merge(np.array(rows, dtype=np.float32), np.zeros(1, dtype=np.int64),
+                      np.asarray(counts, dtype=np.float64))[0]
+
+    # -- rendu -----------------------------------------------------------
+
+    def view(self, start=0, stop=None, width=1000):
+        """
+        Résumé de [start, stop) sur width pixels
+
+        Returns:
+            dict: 'edges' (width+1 indices d'échantillons: limites des
+            pixels, calées sur les tranches du niveau utilisé, sauf start et
+            stop), une colonne par champ de FIELDS (width valeurs),
+            'bin_size' (1 = échantillons bruts)
+        """
+        total = self.recording.num_samples
+        stop = total if stop is None else min(stop, total)
+        start = max(0, min(start, stop))
+        if stop == start:
+            raise ValueError("intervalle vide")
+        width = max(1, min(width, stop - start))
+        edges = start + np.round(np.linspace(0, stop - start, width + 1)).astype(np.int64)
+        per_pixel = (stop - start) / width
+
+        level_index = None
+        for k, bin_size in enumerate(self.bin_sizes):
+            if bin_size <= per_pixel:
+                level_index = k
+
+        if level_index is None:
+            x = self.recording.samples(start, stop)
+            summary = _summarize(x, edges[:-1] - start)
+            bin_size = 1
+        else:
+            bin_size = self.bin_sizes[level_index]
+            level = self.levels[level_index]
+            b0 = start // bin_size
+            b1 = min(len(level), -(-stop // bin_size))
+            bins = np.asarray(level[b0:b1])
+            counts = self._counts(len(level), bin_size)[b0:b1]
+            pixel_bins = np.minimum(edges[:-1] // bin_size - b0, len(bins) - 1)
+            summary = _merge(bins, pixel_bins, counts)
+            # Limites réelles des pixels: bords des tranches regroupées
+            edges = np.append((pixel_bins + b0) * bin_size, stop)
+            edges[0] = start
+            # Premier et dernier pixels: les tranches du bord débordent de
+            # [start, stop), résumé recalculé sur l'intervalle exact
+            summary[0] = self._range_summary(edges[0], edges[1])
+            summary[-1] = self._range_summary(edges[-2], edges[-1])
+
+        result = {name: summary[:, k] for k, name in enumerate(FIELDS)}
+        result['edges'] = edges
+        result['bin_size'] = bin_size
+        return result
+
+
+def open_pyramid(path, sample_rate=None, fmt=None, cache=True):
+    """Ouvrir un enregistrement (open_iq) et sa pyramide (construite si besoin)"""
+    return iq_pyramid(open_iq(path, sample_rate, fmt), cache)
+
+
+def _read_events(events_path):
+    """Evénements de cospas-replay (JSON lines), JSON (liste) ou CSV de cospas-batch-decode"""
+    if events_path.endswith('.csv'):
+        with open(events_path, newline='') as f:
+            return list(csv.DictReader(f))
+    with open(events_path) as f:
+        if events_path.endswith('.json'):
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _is_valid(event):
+    for key in ('valid', 'crc_ok', 'bch_ok'):
+        value = event.get(key)
+        if value not in (None, ''):
+            return value in (True, 1, '1', 'True', 'true')
+    return None
+
+
+def burst_marks(recording, events_path=None):
+    """
+    Limites des bursts d'un enregistrement
+
+    Sources: annotations SigMF (burst_recorder), puis événements d'un
+    fichier de trames (seulement ceux dont 'source' désigne ce fichier).
+
+    Returns:
+        liste de dict: start, stop (échantillons), label, valid (bool ou None)
+    """
+    marks = []
+    for annotation in recording.metadata.get('annotations', []):
+        start = int(annotation.get('core:sample_start', 0))
+        count = int(annotation.get('core:sample_count', 0))
+        status = annotation.get('cospas:decode_status')
+        marks.append({
+            'start': start,
+            'stop': start + count,
+            'label': annotation.get('core:label', 'burst'),
+            'valid': None if status in (None, 'no_frame') else status == 'decoded',
+        })
+
+    if events_path:
+        name = os.path.basename(recording.path)
+        rate = recording.sample_rate or 40000.0
+        for event in _read_events(events_path):
+            source = event.get('source')
+            if source and source != name:
+                continue
+            if event.get('sample') in (None, ''):
+                continue
+            generation = int(event.get('generation') or 1)
+            start = int(event['sample'])
+            marks.append({
+                'start': start,
+                'stop': start + int(BURST_S.get(generation, 1.0) * rate),
+                'label': f"{generation}G {event.get('hex') or ''}".strip(),
+                'valid': _is_valid(event),
+            })
+    return sorted(marks, key=lambda mark: mark['start'])
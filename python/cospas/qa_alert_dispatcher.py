@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+alert_dispatcher: anti-doublon par balise, limite de débit, nouveaux essais
+avec délai croissant sans retarder les autres alertes, abandon et oubli
+de la balise
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from gnuradio import gr_unittest
+from gnuradio.cospas.alert_dispatcher import alert_dispatcher, alert_key, file_sink
+
+# Standard Location ELT: la position (bits 65-85) ne change pas le hex ID
+HEX_1G = 'FFFED08E3301E2402B002BBA863609670908'
+HEX_1G_MOVED = 'FFFED08E3301E2402F002BBA863609670908'  # Bit 70 inversé
+
+
+class recording_sink:
+    """Sortie de test: échoue sur les failures[clé] premiers essais d'une clé"""
+
+    def __init__(self, name='test', failures=None):
+        self.name = name
+        self.failures = dict(failures or {})
+        self.sent = []       # (instant, clé)
+        self.attempts = {}   # Clé -> nombre d'essais
+        self._lock = threading.Lock()
+
+    def send(self, alert):
+        key = alert_key(alert)
+        with self._lock:
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            if self.attempts[key] <= self.failures.get(key, 0):
+                raise OSError('serveur injoignable')
+            self.sent.append((time.monotonic(), key))
+
+
+class qa_alert_dispatcher(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp, 'alerts.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def dispatcher(self, sinks, **kwargs):
+        return alert_dispatcher(sinks, log_file=self.log_file, **kwargs)
+
+    def test_001_dedup(self):
+        sink = recording_sink()
+        path = os.path.join(self.tmp, 'alerts.jsonl')
+        dispatcher = self.dispatcher([sink, file_sink(path)], dedup_s=0.3)
+
+        self.assertEqual(dispatcher.submit({'generation': 1, 'hex': HEX_1G}),
+                         {'test': 'queued', 'file': 'queued'})
+        # Même balise, position différente: même hex ID
+        self.assertEqual(dispatcher.submit({'generation': 1, 'hex': HEX_1G_MOVED}),
+                         {'test': 'duplicate', 'file': 'duplicate'})
+        self.assertEqual(dispatcher.submit({'generation': 2, 'hex_id': 'ABC'})['test'], 'queued')
+        self.assertEqual(dispatcher.submit({'generation': 2, 'hex_id': 'ABC'})['test'], 'duplicate')
+
+        # Fenêtre écoulée: nouvelle alerte
+        time.sleep(0.35)
+        self.assertEqual(dispatcher.submit({'generation': 1, 'hex': HEX_1G})['test'], 'queued')
+        dispatcher.close(timeout=2.0)
+
+        stats = dispatcher.get_statistics()
+        self.assertEqual(stats['test']['sent'], 3)
+        self.assertEqual(stats['test']['duplicates'], 2)
+        self.assertEqual(stats['file']['sent'], 3)
+        with open(path) as f:
+            keys = [json.loads(line)['key'] for line in f]
+        self.assertEqual(keys, ['1C6603C480FFBFF', 'ABC', '1C6603C480FFBFF'])
+
+    def test_002_retry_with_backoff(self):
+        # Deux échecs puis succès; l'alerte suivante n'attend pas les essais
+        sink = recording_sink(failures={'A': 2})
+        dispatcher = self.dispatcher([sink], backoff_s=0.2, max_attempts=4)
+        start = time.monotonic()
+        dispatcher.submit({'hex_id': 'A'})
+        time.sleep(0.05)
+        dispatcher.submit({'hex_id': 'B'})
+        dispatcher.close(timeout=3.0)
+
+        self.assertEqual([key for _, key in sink.sent], ['B', 'A'])
+        self.assertEqual(sink.attempts, {'A': 3, 'B': 1})
+        self.assertLess(sink.sent[0][0] - start, 0.15)
+        self.assertGreaterEqual(sink.sent[1][0] - start, 0.2 + 0.4)  # Délais 0.2 puis 0.4 s
+
+        stats = dispatcher.get_statistics()['test']
+        self.assertEqual((stats['sent'], stats['retried'], stats['failed']), (2, 2, 0))
+
+    def test_003_give_up_forgets_beacon(self):
+        sink = recording_sink(failures={'A': 100})
+        dispatcher = self.dispatcher([sink], backoff_s=0.01, max_attempts=3)
+        dispatcher.submit({'hex_id': 'A'})
+        deadline = time.monotonic() + 2.0
+        while dispatcher.get_statistics()['test']['failed'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        stats = dispatcher.get_statistics()['test']
+        self.assertEqual((stats['retried'], stats['failed']), (2, 1))
+        self.assertEqual(sink.attempts['A'], 3)
+        # Abandon: la trame suivante de la balise redéclenche l'alerte
+        self.assertEqual(dispatcher.submit({'hex_id': 'A'})['test'], 'queued')
+        dispatcher.close(timeout=0.0)
+
+    def test_004_rate_limit(self):
+        sink = recording_sink()
+        dispatcher = self.dispatcher([sink], rate_limit=3, rate_period_s=0.3)
+        status = [dispatcher.submit({'hex_id': key})['test'] for key in 'ABCD']
+        self.assertEqual(status, ['queued', 'queued', 'queued', 'rate_limited'])
+        # Refusée, la balise D n'est pas marquée comme signalée
+        time.sleep(0.35)
+        self.assertEqual(dispatcher.submit({'hex_id': 'D'})['test'], 'queued')
+        dispatcher.close(timeout=2.0)
+
+        stats = dispatcher.get_statistics()['test']
+        self.assertEqual((stats['sent'], stats['rate_limited']), (4, 1))
+
+    def test_005_close_abandons_pending_retries(self):
+        sink = recording_sink(failures={'A': 100})
+        dispatcher = self.dispatcher([sink], backoff_s=10.0)
+        dispatcher.submit({'hex_id': 'A'})
+        start = time.monotonic()
+        dispatcher.close(timeout=0.2)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(dispatcher.get_statistics()['test']['failed'], 1)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_alert_dispatcher)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+channel_model: calibration Eb/N0 du bruit, précision de l'interpolateur
+d'erreur d'horloge, reproductibilité des essais (trial_rng) et pas de
+quantification RTL-SDR
+"""
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.cospas.channel_model import (
+    BIT_RATE_1G, BIT_RATE_2G, ChannelModel, add_awgn, apply_clock_error,
+    quantize_rtlsdr, to_rtlsdr_bytes, trial_rng,
+)
+
+SAMPLE_RATE = 40000.0
+
+
+def measured_ebn0_db(clean, noisy, sample_rate, bit_rate, power=None):
+    """Eb/N0 mesuré à partir du bruit ajouté (noisy - clean)"""
+    if power is None:
+        power = np.mean(np.abs(clean) ** 2)
+    n0 = np.mean(np.abs(noisy - clean) ** 2) / sample_rate
+    return 10 * np.log10(power / bit_rate / n0)
+
+
+def tones(t, freqs):
+    """Somme d'exponentielles complexes aux fréquences réduites freqs, à l'instant t"""
+    return sum(np.exp(2j * np.pi * f * t + 1j * k) for k, f in enumerate(freqs)) / len(freqs)
+
+
+class qa_channel_model(gr_unittest.TestCase):
+
+    def test_001_ebn0_calibration(self):
+        rng = trial_rng(406, 0)
+        n = 2000000
+        phase = rng.uniform(0, 2 * np.pi, n)
+        clean = (0.5 * np.exp(1j * phase)).astype(np.complex64)
+        for ebn0_db, bit_rate in ((10.0, BIT_RATE_1G), (3.0, BIT_RATE_2G), (-5.0, BIT_RATE_1G)):
+            noisy = add_awgn(clean, ebn0_db, SAMPLE_RATE, bit_rate, rng)
+            self.assertEqual(noisy.dtype, np.complex64)
+            self.assertAlmostEqual(measured_ebn0_db(clean, noisy, SAMPLE_RATE, bit_rate),
+                                   ebn0_db, delta=0.02)
+
+        # Burst dans du silence: la puissance utile est passée explicitement
+        burst = np.zeros(n, dtype=np.complex64)
+        burst[:n // 4] = clean[:n // 4]
+        noisy = add_awgn(burst, 8.0, SAMPLE_RATE, BIT_RATE_2G, rng, power=0.25)
+        self.assertAlmostEqual(measured_ebn0_db(burst, noisy, SAMPLE_RATE, BIT_RATE_2G, 0.25),
+                               8.0, delta=0.02)
+
+    def test_002_clock_error_interpolation(self):
+        # Bande utile d'un burst 1G/2G à 40 kHz: quelques kHz au plus
+        freqs = (0.01, -0.035, 0.1)
+        x = tones(np.arange(100000), freqs).astype(np.complex64)
+        for ppm, offset in ((50.0, 0.0), (-120.0, 0.37), (0.0, 2.25), (1000.0, 5.5)):
+            y = apply_clock_error(x, ppm, offset)
+            ratio = 1.0 + ppm * 1e-6
+            self.assertEqual(len(y), int(np.floor((len(x) - 1 - offset) / ratio)) + 1)
+
+            # Bords exclus (demi-longueur du filtre)
+            t = np.arange(len(y)) * ratio + offset
+            error = np.abs(y - tones(t, freqs))[16:-16]
+            self.assertLess(np.sqrt(np.mean(error ** 2)), 2e-4)
+            self.assertLess(error.max(), 4e-4)
+
+        np.testing.assert_array_equal(apply_clock_error(x, 0.0), x)
+        with self.assertRaises(ValueError):
+            apply_clock_error(x, 10.0, -1.0)
+
+    def test_003_trial_rng_reproducible(self):
+        a = trial_rng(7, 3).standard_normal(1000)
+        np.testing.assert_array_equal(a, trial_rng(7, 3).standard_normal(1000))
+        self.assertFalse(np.array_equal(a, trial_rng(7, 4).standard_normal(1000)))
+        self.assertFalse(np.array_equal(a, trial_rng(8, 3).standard_normal(1000)))
+
+        # Chaîne complète: même signal quel que soit l'ordre des essais
+        model = ChannelModel(SAMPLE_RATE, ebn0_db=6.0, offset_hz=1200.0, drift_hz_s=-2.0,
+                             linewidth_hz=5.0, clock_ppm=20.0, quantize=True)
+        clean = np.ones(20000, dtype=np.complex64) * np.complex64(0.5)
+        forward = [model.apply(clean, trial_rng(1, k)) for k in range(4)]
+        backward = [model.apply(clean, trial_rng(1, k)) for k in reversed(range(4))]
+        for k in range(4):
+            np.testing.assert_array_equal(forward[k], backward[3 - k])
+        self.assertFalse(np.array_equal(forward[0], forward[1]))
+
+    def test_004_quantize_rtlsdr_step(self):
+        rng = trial_rng(406, 1)
+        x = (rng.uniform(-1.2, 1.2, 100000) + 1j * rng.uniform(-1.2, 1.2, 100000))
+        for full_scale in (1.0, 0.25):
+            x_fs = (x * full_scale).astype(np.complex64)
+            q = quantize_rtlsdr(x_fs, full_scale)
+            self.assertEqual(q.dtype, np.complex64)
+
+            # 256 niveaux espacés de full_scale / 127.5, extrêmes à ±full_scale
+            levels = np.unique(q.view(np.float32))
+            self.assertEqual(len(levels), 256)
+            step = full_scale / 127.5
+            np.testing.assert_allclose(np.diff(levels), step, rtol=1e-4)
+            np.testing.assert_allclose(levels[[0, -1]], [-full_scale, full_scale], rtol=1e-6)
+
+            # Erreur ≤ demi-pas hors écrêtage
+            iq = x_fs.view(np.float32)
+            inside = np.abs(iq) <= full_scale
+            err = np.abs(q.view(np.float32) - iq)[inside]
+            self.assertLessEqual(err.max(), step / 2 * (1 + 1e-4))
+
+        # Octets entrelacés I, Q
+        u8 = to_rtlsdr_bytes(np.array([1 - 1j, 0.5j, -2 + 0j], dtype=np.complex64))
+        self.assertEqual(u8.dtype, np.uint8)
+        np.testing.assert_array_equal(u8, [255, 0, 128, 191, 0, 128])
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_channel_model)
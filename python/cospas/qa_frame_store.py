@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+frame_store: aller-retour des trames par la base SQLite (colonnes, bits,
+champs JSON, filtres de query), dédoublonnage (source, sample, hex) et
+Hex ID 15 des trames 1G
+"""
+
+import os
+import shutil
+import tempfile
+
+from gnuradio import gr_unittest
+from gnuradio.cospas.frame_store import frame_store, decode_1g_hex
+
+# Standard Location ELT (adresse 24 bits), pays 227
+HEX_1G = '8E3301E2402B002BBA863609670908'
+HEX_ID_1G = '1C6603C480FFBFF'
+HEX_2G = '0C0E7456390956CCD02799A2468ACF135787FFF00C02832000037707609BC0F'
+T0 = 1763200000.0  # 2025-11-15T09:46:40Z
+
+
+def flip_bit(hex_str, bit):
+    """Inverse le bit C/S bit (25 = premier bit du message) d'une trame 1G"""
+    value = int(hex_str, 16) ^ (1 << (4 * len(hex_str) - 1 - (bit - 25)))
+    return f"{value:0{len(hex_str)}X}"
+
+
+def event_1g(sample, hex_str=HEX_1G, **extra):
+    event = {'generation': 1, 'hex': hex_str, 'crc_ok': True, 'freq_offset': 312.5,
+             'source': 'capture.iq', 'sample': sample, 'bits': [1, 0, 1, 1, 0, 0, 1],
+             'snr_db': 14.5}
+    event.update(extra)
+    return event
+
+
+def event_2g(sample, **extra):
+    event = {'generation': 2, 'hex': HEX_2G, 'hex_id': '9C7FEC2AACD3590A0010000',
+             'bch_ok': True, 'bch_errors': 2, 'beacon_type': 1, 'country_code': 228,
+             'lat': 42.85001, 'lon': 4.95001, 'source': 'capture.iq', 'sample': sample}
+    event.update(extra)
+    return event
+
+
+class qa_frame_store(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'frames.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_001_round_trip(self):
+        with frame_store(self.path, flush_interval=0.05) as store:
+            self.assertTrue(store.add(event_1g(1000), utc=T0, freq_hz=406.028e6))
+            self.assertTrue(store.add(event_2g(50000, utc='2025-11-15T09:47:00Z'),
+                                      freq_hz=406.040e6))
+            store.flush()
+            self.assertEqual(store.frames_written, 2)
+
+            frames = store.query()
+            self.assertEqual([f['generation'] for f in frames], [1, 2])
+
+            f1 = store.query(hex_id=HEX_ID_1G)[0]
+            self.assertEqual(f1['hex'], HEX_1G)
+            self.assertEqual(f1['utc'], T0)
+            self.assertEqual(f1['utc_iso'], '2025-11-15T09:46:40.000+00:00')
+            self.assertEqual(f1['valid'], 1)
+            self.assertEqual(f1['country_code'], 227)
+            self.assertEqual(f1['protocol'], 'Standard Location ELT (24-bit address)')
+            self.assertEqual(f1['freq_hz'], 406.028e6)
+            self.assertEqual(f1['freq_offset'], 312.5)
+            self.assertEqual(f1['bits'], [1, 0, 1, 1, 0, 0, 1])
+            self.assertEqual(f1['snr_db'], 14.5)  # Champ hors colonnes (JSON)
+
+            f2 = store.query(generation=2)[0]
+            self.assertEqual(f2['utc'], T0 + 20.0)
+            self.assertEqual(f2['protocol'], 'SGB EPIRB')
+            self.assertEqual(f2['bch_errors'], 2)
+            self.assertAlmostEqual(f2['lat'], 42.85001)
+            self.assertIsNone(f2['bits'])
+
+            # Filtres
+            self.assertEqual(len(store.query(hex_id='1C6603*')), 1)
+            self.assertEqual(len(store.query(hex_id='1c6603c480ffbff')), 1)
+            self.assertEqual(len(store.query(since=T0 + 1.0)), 1)
+            self.assertEqual(len(store.query(until=T0 + 1.0)), 1)
+            self.assertEqual(len(store.query(freq_range=(406.035e6, 406.045e6))), 1)
+            self.assertEqual(len(store.query(protocol='ELT')), 1)
+            self.assertEqual(len(store.query(bbox=(42.0, 43.0, 4.0, 6.0))), 1)
+            self.assertEqual(len(store.query(valid=False)), 0)
+            self.assertEqual(len(store.query(limit=1)), 1)
+
+            beacons = store.beacons()
+            self.assertEqual([b['hex_id'] for b in beacons],
+                             ['9C7FEC2AACD3590A0010000', HEX_ID_1G])
+            self.assertEqual(beacons[1]['frames'], 1)
+
+    def test_002_dedup(self):
+        # Même burst rejoué: une seule ligne; autre burst de la même balise: ajouté
+        with frame_store(self.path, flush_interval=0.05) as store:
+            store.add(event_1g(1000), utc=T0)
+            store.add(event_1g(1000), utc=T0 + 5.0)
+            store.add(event_1g(21000), utc=T0 + 50.0)
+            store.flush()
+            self.assertEqual(store.frames_written, 2)
+
+        # Réouverture: rejouer le même fichier n'ajoute rien
+        with frame_store(self.path, flush_interval=0.05) as store:
+            store.add(event_1g(1000), utc=T0)
+            store.add(event_1g(21000), utc=T0 + 50.0)
+            store.add(event_2g(50000), utc=T0 + 60.0)
+            store.flush()
+            self.assertEqual(store.frames_written, 1)
+            self.assertEqual([f['sample'] for f in store.query()], [1000, 21000, 50000])
+            self.assertEqual(store.beacons()[1]['frames'], 2)
+
+    def test_003_hex_id_1g(self):
+        decoded = decode_1g_hex(HEX_1G)
+        self.assertEqual(decoded, {'hex_id': HEX_ID_1G, 'country_code': 227,
+                                   'protocol': 'Standard Location ELT (24-bit address)'})
+        self.assertEqual(decode_1g_hex('FFFED0' + HEX_1G), decoded)
+
+        # Position (bits 65-85) remplacée par sa valeur par défaut: Hex ID stable
+        self.assertEqual(decode_1g_hex(flip_bit(HEX_1G, 70))['hex_id'], HEX_ID_1G)
+        self.assertNotEqual(decode_1g_hex(flip_bit(HEX_1G, 50))['hex_id'], HEX_ID_1G)
+
+        self.assertEqual(decode_1g_hex(''), {})
+        self.assertEqual(decode_1g_hex('8E33'), {})
+        self.assertEqual(decode_1g_hex('not hex'), {})
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_frame_store)
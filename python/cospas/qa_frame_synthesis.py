@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+frame_synthesis: la synthèse vectorisée redonne exactement la construction
+bit par bit de l'ancien cospas_generator, et le lot (synthesize_frames)
+les mêmes trames que des appels unitaires
+"""
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.cospas.frame_synthesis import (
+    CARRIER_SAMPLES, FRAME_SYNC_NORMAL, FRAME_SYNC_TEST, MOD_PHASE, PREAMBLE_BITS,
+    SAMPLES_PER_BIT, synthesize_frame, synthesize_frames,
+)
+
+HEX_LONG = '8E3301E2402B002BBA863609670908'  # 120 bits de données (trame longue)
+HEX_SHORT = '8E3301E2402B002BBA8636'          # 88 bits (trame courte)
+
+
+def reference_frame(data_bytes, test_mode=False, mod_phase=MOD_PHASE,
+                    samples_per_bit=SAMPLES_PER_BIT, carrier_samples=CARRIER_SAMPLES):
+    """Construction bit par bit (ancien cospas_generator.generate_frame)"""
+    half_bit = samples_per_bit // 2
+
+    def bit_samples(bit):
+        first = mod_phase if bit == '1' else -mod_phase
+        return [np.exp(1j * first)] * half_bit + [np.exp(-1j * first)] * half_bit
+
+    samples = [1.0 + 0.0j] * carrier_samples
+    for bit in '1' * PREAMBLE_BITS + (FRAME_SYNC_TEST if test_mode else FRAME_SYNC_NORMAL):
+        samples += bit_samples(bit)
+    for byte in data_bytes:
+        for bit_pos in range(7, -1, -1):  # MSB first
+            samples += bit_samples('1' if (byte >> bit_pos) & 1 else '0')
+    return np.array(samples, dtype=np.complex64)
+
+
+class qa_frame_synthesis(gr_unittest.TestCase):
+
+    def test_001_single_frame_matches_per_bit(self):
+        for hex_str in (HEX_LONG, HEX_SHORT):
+            data = bytes.fromhex(hex_str)
+            for test_mode in (False, True):
+                frame = synthesize_frame(data, test_mode)
+                self.assertEqual(frame.dtype, np.complex64)
+                np.testing.assert_array_equal(frame, reference_frame(data, test_mode))
+
+        # Paramètres non nominaux
+        data = bytes.fromhex(HEX_LONG)
+        kwargs = {'mod_phase': 0.9, 'samples_per_bit': 100, 'carrier_samples': 6400}
+        np.testing.assert_array_equal(synthesize_frame(data, **kwargs),
+                                      reference_frame(data, **kwargs))
+
+    def test_002_batch_matches_single_frames(self):
+        rng = np.random.default_rng(406)
+        data = rng.integers(0, 256, size=(50, 15), dtype=np.uint8)
+        expected = np.stack([synthesize_frame(bytes(row), True) for row in data])
+
+        # Tableau, bytes ou hex: mêmes trames
+        for frames in (data, [bytes(row) for row in data], [bytes(row).hex() for row in data]):
+            batch = synthesize_frames(frames, test_mode=True)
+            self.assertEqual(batch.shape, expected.shape)
+            np.testing.assert_array_equal(batch, expected)
+        np.testing.assert_array_equal(synthesize_frames([bytes(data[0])], True)[0],
+                                      reference_frame(bytes(data[0]), True))
+
+    def test_003_rejected_batches(self):
+        with self.assertRaises(ValueError):
+            synthesize_frames([HEX_LONG, HEX_SHORT])  # Longueurs différentes
+        with self.assertRaises(ValueError):
+            synthesize_frames(np.zeros(15, dtype=np.uint8))  # Tableau 1D
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_frame_synthesis)
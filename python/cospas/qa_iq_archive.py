@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+iq_archive: aller-retour écriture/lecture dans chaque format (cs16, cs8,
+cf32, zstd si disponible), fenêtre à cheval sur deux morceaux et quota
+disque (le morceau le plus récent est toujours conservé)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.cospas import iq_archive as archive_module
+from gnuradio.cospas.iq_archive import archive_writer, iq_archive
+
+SAMPLE_RATE = 8000.0
+T0 = 1763200000.25  # 2025-11-15T09:46:40.250Z: premier morceau partiel
+
+
+class qa_iq_archive(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.rng = np.random.default_rng(406)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def noise(self, n, amplitude=0.5):
+        x = self.rng.uniform(-amplitude, amplitude, (n, 2)).astype(np.float32)
+        return x.view(np.complex64).ravel()
+
+    def write(self, root, x, block=1000, start_time=T0, **kwargs):
+        """Archive x par blocs, renvoie le writer fermé"""
+        writer = archive_writer(root, SAMPLE_RATE, center_freq=406.028e6, chunk_s=1.0,
+                                **kwargs)
+        writer.start_time = start_time
+        for first in range(0, len(x), block):
+            self.assertTrue(writer.push(first, x[first:first + block].copy()))
+        writer.close()
+        return writer
+
+    def check_round_trip(self, fmt, compression, step):
+        x = self.noise(int(2.5 * SAMPLE_RATE))
+        root = os.path.join(self.tmp, f'{fmt}_{compression}')
+        writer = self.write(root, x, fmt=fmt, compression=compression, block_s=0.3)
+        self.assertEqual(writer.samples_written, len(x))
+        self.assertEqual(writer.samples_dropped, 0)
+
+        archive = iq_archive(root)
+        # Morceaux calés sur les secondes UTC: 0.75 s, 1 s, 0.75 s
+        chunks = archive.chunks()
+        self.assertEqual([c['num_samples'] for c in chunks], [6000, 8000, 6000])
+        self.assertEqual([c['stream_sample'] for c in chunks], [0, 6000, 14000])
+        self.assertAlmostEqual(chunks[1]['start_utc'], T0 + 0.75)
+        self.assertTrue(all(c['format'] == fmt for c in chunks))
+        self.assertTrue(chunks[0]['path'].endswith(
+            f'iq_20251115T094640_250Z_8000.{fmt}' + ('.zst' if compression else '')))
+
+        window = archive.window()
+        self.assertEqual(len(window), len(x))
+        self.assertEqual(window.center_freq, 406.028e6)
+        # Erreur de quantification: demi-pas au plus (arrondi float32 près)
+        error = np.abs(window.samples().view(np.float32) - x.view(np.float32)).max()
+        self.assertLessEqual(error, 0.51 * step)
+        archive.close()
+
+    def test_001_round_trip(self):
+        self.check_round_trip('cf32', None, 0.0)
+        self.check_round_trip('cs16', None, 1.0 / 32767)
+        self.check_round_trip('cs8', None, 1.0 / 127)
+
+    @unittest.skipIf(archive_module.zstandard is None, "module zstandard absent")
+    def test_002_round_trip_zstd(self):
+        self.check_round_trip('cs16', 'zstd', 1.0 / 32767)
+        self.check_round_trip('cf32', 'zstd', 0.0)
+
+    def test_003_window_across_chunks(self):
+        x = self.noise(int(2.5 * SAMPLE_RATE))
+        root = os.path.join(self.tmp, 'archive')
+        self.write(root, x, block=777, fmt='cf32')
+        archive = iq_archive(root)
+
+        # [T0 + 0.6, T0 + 1.4): fin du premier morceau, début du second
+        window = archive.window(T0 + 0.6, T0 + 1.4)
+        self.assertEqual(len(window.metadata['chunks']), 2)
+        self.assertEqual(len(window), 6400)
+        np.testing.assert_array_equal(window.samples(), x[4800:11200])
+        np.testing.assert_array_equal(window.samples(1000, 1300), x[5800:6100])
+        self.assertAlmostEqual(window.time_of(1200).timestamp(), T0 + 0.75, places=6)
+
+        # Lecture par blocs dans un tampon fourni
+        out = np.empty(500, dtype=np.complex64)
+        np.testing.assert_array_equal(window.samples(1100, 1600, out), x[5900:6400])
+        np.testing.assert_array_equal(archive.read(T0 + 0.7, T0 + 0.8), x[5600:6400])
+
+        with self.assertRaises(ValueError):
+            archive.window(T0 + 10.0, T0 + 11.0)
+        archive.close()
+
+    def test_004_quota_eviction(self):
+        # Morceaux cf32 d'une seconde: 64000 octets; quota de deux morceaux
+        x = self.noise(int(4 * SAMPLE_RATE))
+        root = os.path.join(self.tmp, 'quota')
+        writer = self.write(root, x, fmt='cf32', start_time=1763200000.0,
+                            quota_gb=130000 / 1e9)
+        self.assertEqual(writer.chunks_written, 4)
+        self.assertEqual(writer.chunks_evicted, 2)
+
+        archive = iq_archive(root)
+        chunks = archive.chunks()
+        self.assertEqual([c['stream_sample'] for c in chunks], [16000, 24000])
+        self.assertEqual(sorted(os.listdir(os.path.join(root, '20251115'))),
+                         sorted(os.path.basename(c['path']) for c in chunks))
+        np.testing.assert_array_equal(archive.window().samples(), x[16000:])
+        archive.close()
+
+    def test_005_quota_below_one_chunk(self):
+        # Quota inférieur à un morceau: le dernier morceau fermé reste lisible
+        x = self.noise(int(3 * SAMPLE_RATE))
+        root = os.path.join(self.tmp, 'small')
+        writer = self.write(root, x, fmt='cf32', start_time=1763200000.0,
+                            quota_gb=1000 / 1e9)
+        self.assertEqual(writer.chunks_evicted, 2)
+
+        archive = iq_archive(root)
+        self.assertEqual([c['stream_sample'] for c in archive.chunks()], [16000])
+        np.testing.assert_array_equal(archive.window().samples(), x[16000:])
+        archive.close()
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_iq_archive)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+iq_pyramid: view() redonne min/max/puissance calculés directement sur les
+échantillons de chaque pixel, à tous les niveaux de zoom et pour des
+bornes non alignées sur les tranches; cache relu depuis le disque
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.cospas.iq_file import open_iq
+from gnuradio.cospas.iq_pyramid import BASE_BIN, FACTOR, FIELDS, iq_pyramid
+
+NUM_SAMPLES = 1000003  # Dernière tranche de chaque niveau partielle
+
+
+class no_build_pyramid(iq_pyramid):
+    """Pyramide qui doit être relue depuis le cache"""
+
+    def _build(self):
+        raise AssertionError("pyramide reconstruite au lieu d'être relue")
+
+
+class qa_iq_pyramid(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'capture.cf32')
+        rng = np.random.default_rng(406)
+        # Amplitude variable: les extrêmes diffèrent d'une tranche à l'autre
+        envelope = 1.0 + np.sin(np.arange(NUM_SAMPLES) / 5000.0)
+        iq = rng.standard_normal((NUM_SAMPLES, 2)) * envelope[:, None]
+        self.x = iq.astype(np.float32).view(np.complex64).ravel()
+        self.x.tofile(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def check_view(self, pyramid, start, stop, width):
+        """Compare view() au calcul direct sur les échantillons de chaque pixel"""
+        view = pyramid.view(start, stop, width)
+        edges = view['edges']
+        self.assertEqual(len(edges), width + 1)
+        self.assertEqual((edges[0], edges[-1]), (start, stop))
+        self.assertTrue(np.all(np.diff(edges) > 0))
+        # Limites intérieures calées sur les tranches du niveau utilisé
+        self.assertTrue(np.all(edges[1:-1] % view['bin_size'] == 0))
+
+        expected = {name: np.empty(width, dtype=np.float32) for name in FIELDS}
+        for k in range(width):
+            x = self.x[edges[k]:edges[k + 1]]
+            mag = np.abs(x)
+            for name, values in (('i', x.real), ('q', x.imag), ('mag', mag)):
+                expected[name + '_min'][k] = values.min()
+                expected[name + '_max'][k] = values.max()
+            expected['power'][k] = np.mean(mag.astype(np.float64) ** 2)
+
+        for name in FIELDS[:-1]:
+            np.testing.assert_array_equal(view[name], expected[name], err_msg=name)
+        np.testing.assert_allclose(view['power'], expected['power'], rtol=1e-4)
+        return view
+
+    def test_001_zoom_levels(self):
+        pyramid = iq_pyramid(open_iq(self.path, 40000), cache=False)
+        self.assertEqual(pyramid.bin_sizes[:3], [BASE_BIN, BASE_BIN * FACTOR,
+                                                 BASE_BIN * FACTOR ** 2])
+        bin_sizes = set()
+        for width in (1, 4, 40, 300, 2000):
+            bin_sizes.add(self.check_view(pyramid, 0, NUM_SAMPLES, width)['bin_size'])
+        # Echantillons bruts (< BASE_BIN par pixel)
+        bin_sizes.add(self.check_view(pyramid, 5000, 105000, 1000)['bin_size'])
+        self.assertEqual(bin_sizes, {1} | {BASE_BIN * FACTOR ** k for k in range(4)})
+
+    def test_002_unaligned_bounds(self):
+        pyramid = iq_pyramid(open_iq(self.path, 40000), cache=False)
+        for start, stop, width in ((12345, 987651, 400), (12345, 987651, 37),
+                                   (100, 300000, 1), (2049, 2049 + 3 * 16384 + 5, 3),
+                                   (777, NUM_SAMPLES, 11)):
+            self.check_view(pyramid, start, stop, width)
+
+        with self.assertRaises(ValueError):
+            pyramid.view(5000, 5000)
+
+    def test_003_cache(self):
+        pyramid = iq_pyramid(open_iq(self.path, 40000))
+        self.assertTrue(os.path.exists(self.path + '.pyramid.npy'))
+        self.assertTrue(os.path.exists(self.path + '.pyramid.json'))
+        reference = pyramid.view(12345, 987651, 300)
+
+        # Relue en mémoire projetée, sans reconstruction
+        cached = no_build_pyramid(open_iq(self.path, 40000))
+        self.assertIsInstance(cached.levels[0], np.memmap)
+        self.assertEqual(cached.bin_sizes, pyramid.bin_sizes)
+        for level, expected in zip(cached.levels, pyramid.levels):
+            np.testing.assert_array_equal(level, expected)
+        view = self.check_view(cached, 12345, 987651, 300)
+        for name in FIELDS + ('edges',):
+            np.testing.assert_array_equal(view[name], reference[name])
+
+        # Fichier modifié: le cache est ignoré et la pyramide reconstruite
+        self.x = self.x[:NUM_SAMPLES // 2] * np.float32(2.0)
+        self.x.tofile(self.path)
+        with self.assertRaises(AssertionError):
+            no_build_pyramid(open_iq(self.path, 40000))
+        rebuilt = iq_pyramid(open_iq(self.path, 40000))
+        self.check_view(rebuilt, 0, len(self.x), 50)
+
+        # Sans cache: aucun fichier écrit
+        os.remove(self.path + '.pyramid.npy')
+        os.remove(self.path + '.pyramid.json')
+        iq_pyramid(open_iq(self.path, 40000), cache=False)
+        self.assertFalse(os.path.exists(self.path + '.pyramid.json'))
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_iq_pyramid)
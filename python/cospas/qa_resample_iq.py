@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2025 COSPAS-SARSAT.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+scripts/resample_iq.py: le traitement par blocs avec marges doit redonner
+exactement resample_poly sur le fichier entier, quels que soient le ratio,
+la taille des blocs et le nombre de threads
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+from math import gcd
+
+import numpy as np
+from scipy import signal
+from gnuradio import gr_unittest
+
+# Script hors paquet: chargé depuis l'arbre source
+_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       '..', '..', 'scripts', 'resample_iq.py')
+_spec = importlib.util.spec_from_file_location('resample_iq', _SCRIPT)
+resample_iq = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(resample_iq)
+
+
+class qa_resample_iq(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.rng = np.random.default_rng(406)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def resample(self, x, input_rate, output_rate, chunk_samples, workers):
+        """Rééchantillonne x par fichier, renvoie (sortie, échantillons écrits)"""
+        src = os.path.join(self.tmp, 'in.iq')
+        dst = os.path.join(self.tmp, 'out.iq')
+        x.tofile(src)
+        with contextlib.redirect_stdout(io.StringIO()):
+            written = resample_iq.resample_iq_file(src, dst, input_rate, output_rate,
+                                                   chunk_samples=chunk_samples,
+                                                   workers=workers)
+        return np.fromfile(dst, dtype=np.complex64), written
+
+    def noise(self, n):
+        return (self.rng.standard_normal(n) + 1j * self.rng.standard_normal(n)).astype(np.complex64)
+
+    def test_001_matches_resample_poly(self):
+        # Blocs petits devant le fichier: nombreuses frontières, longueurs
+        # non multiples de down
+        cases = [
+            (48000, 40000, 100003, 4096, 3),
+            (40000, 48000, 50001, 1000, 2),
+            (2400000, 40000, 600001, 30000, 4),
+            (40000, 40000, 1234, 100, 1),
+        ]
+        for input_rate, output_rate, n, chunk, workers in cases:
+            x = self.noise(n)
+            y, written = self.resample(x, input_rate, output_rate, chunk, workers)
+
+            g = gcd(input_rate, output_rate)
+            expected = signal.resample_poly(x, output_rate // g, input_rate // g)
+            self.assertEqual(written, len(expected))
+            np.testing.assert_array_equal(y, expected.astype(np.complex64))
+
+    def test_002_workers_do_not_change_output(self):
+        x = self.noise(200000)
+        y1, _ = self.resample(x, 48000, 40000, 8192, 1)
+        y4, _ = self.resample(x, 48000, 40000, 8192, 4)
+        np.testing.assert_array_equal(y1, y4)
+
+    def test_003_short_and_empty_files(self):
+        x = self.noise(7)
+        y, _ = self.resample(x, 250000, 40000, 100, 1)
+        np.testing.assert_array_equal(y, signal.resample_poly(x, 4, 25).astype(np.complex64))
+
+        y, written = self.resample(np.zeros(0, dtype=np.complex64), 48000, 40000, 100, 1)
+        self.assertEqual(written, 0)
+        self.assertEqual(len(y), 0)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_resample_iq)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejeu d'enregistrements I/Q dans la chaîne de réception de production
+Détecteur → Router → Démodulateurs 1G/2G, alimentés depuis un fichier
+projeté en mémoire (iq_file: .iq/.cf32/.cu8/WAV/SigMF...), aussi vite que
+le CPU le permet ou à un multiple du temps réel.
+
+Chaque trame produit un événement structuré (dict) construit à partir des
+ports "frames" des démodulateurs, comme en exploitation: génération, hex,
+CRC/BCH, offset de fréquence, champs 2G décodés, position du burst dans
+l'enregistrement (échantillon, secondes, date UTC si connue).
+
+Point d'entrée: cospas-replay (apps/), événements en JSON lines. Avec
+--archive, rejoue un intervalle UTC d'une archive continue (iq_archive)
+sans parcourir ses fichiers.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pmt
+from gnuradio import gr, blocks
+
+from .iq_file import open_iq, find_recordings
+from .iq_archive import iq_archive, parse_utc
+from .frame_store import frame_store
+
+# Taille des blocs lus dans la projection mémoire par appel à work()
+SOURCE_BLOCK = 65536
+
+# Champs volumineux retirés des événements (sauf include_soft)
+ARRAY_FIELDS = ('bits', 'soft')
+
+
+class iq_file_source(gr.sync_block):
+    """Source GNU Radio lisant un iq_recording par blocs, sans copie du fichier"""
+
+    def __init__(self, recording, start=0, stop=None):
+        gr.sync_block.__init__(self, name="iq_file_source", in_sig=None, out_sig=[np.complex64])
+        self.recording = recording
+        self.position = start
+        self.stop = recording.num_samples if stop is None else min(stop, recording.num_samples)
+
+    def work(self, input_items, output_items):
+        out = output_items[0]
+        n = min(len(out), SOURCE_BLOCK, self.stop - self.position)
+        if n <= 0:
+            return -1  # WORK_DONE
+        self.recording.samples(self.position, self.position + n, out=out)
+        self.position += n
+        return n
+
+
+class frame_event_sink(gr.basic_block):
+    """
+    Convertit les dicts des ports "frames" en événements Python
+
+    Un port d'entrée par génération ("frames_1g", "frames_2g"); chaque
+    événement est passé au callback dans l'ordre de réception.
+    """
+
+    def __init__(self, callback, sample_rate, recording=None, include_soft=False,
+                 sample_offset=0):
+        gr.basic_block.__init__(self, name="frame_event_sink", in_sig=None, out_sig=None)
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.recording = recording
+        self.include_soft = include_soft
+        self.sample_offset = sample_offset
+        self.count = 0
+        for generation in (1, 2):
+            port = pmt.intern(f"frames_{generation}g")
+            self.message_port_register_in(port)
+            self.set_msg_handler(port, lambda msg, g=generation: self.handle_frame(msg, g))
+
+    def handle_frame(self, msg, generation):
+        self.callback(frame_event(msg, generation, self.sample_rate, self.recording,
+                                  self.include_soft, self.sample_offset))
+        self.count += 1
+
+
+def frame_event(msg, generation, sample_rate, recording=None, include_soft=False,
+                sample_offset=0):
+    """
+    Evénement (dict JSON-sérialisable) d'un message du port "frames"
+
+    sample_offset: indice, dans l'enregistrement, du premier échantillon
+    injecté dans la chaîne (découpage d'un long fichier).
+    """
+    fields = pmt.to_python(msg) if pmt.is_dict(msg) else {}
+    event = {'generation': generation}
+    for key, value in fields.items():
+        if key in ARRAY_FIELDS:
+            if include_soft:
+                event[key] = np.asarray(value).tolist()
+            continue
+        if isinstance(value, np.generic):
+            value = value.item()
+        event[key] = value
+
+    if 'burst_start' in event:
+        sample = int(event.pop('burst_start')) + sample_offset
+        event['sample'] = sample
+        event['time_s'] = sample / sample_rate
+        if recording is not None:
+            utc = recording.time_of(sample)
+            if utc is not None:
+                event['utc'] = utc.isoformat(timespec='milliseconds')
+    if recording is not None:
+        event['source'] = os.path.basename(recording.path)
+    return event
+
+
+class replay_chain(gr.top_block):
+    """
+    Chaîne de production alimentée par un enregistrement
+
+    speed: 0 = aussi vite que possible, sinon multiple du temps réel (throttle).
+    demod_threads: workers du démodulateur 1G (0 = synchrone, un seul thread
+    d'hypothèses); None garde la configuration par défaut du bloc.
+    record_dir: enregistrer chaque burst en SigMF (burst_recorder) dans ce
+    répertoire; record_failed: seulement les bursts non décodés.
+    """
+
+    def __init__(self, recording, callback, sample_rate=None, speed=0.0, threshold=0.1,
+                 gain=1.0, start=0, stop=None, include_soft=False, debug_mode=False,
+                 demod_threads=None, record_dir=None, record_failed=False):
+        gr.top_block.__init__(self, "COSPAS-SARSAT Replay")
+        from gnuradio import cospas
+
+        sample_rate = float(sample_rate or recording.sample_rate or 40000.0)
+        self.sample_rate = sample_rate
+
+        self.source = iq_file_source(recording, start, stop)
+        chain = [self.source]
+        if speed and speed > 0:
+            self.throttle = blocks.throttle(gr.sizeof_gr_complex, sample_rate * speed)
+            chain.append(self.throttle)
+        if gain != 1.0:
+            self.gain = blocks.multiply_const_cc(gain)
+            chain.append(self.gain)
+
+        self.burst_detector = cospas.cospas_burst_detector(
+            sample_rate=sample_rate,
+            buffer_duration_ms=2000,
+            threshold=threshold,
+            min_burst_duration_ms=200,
+            debug_mode=debug_mode
+        )
+        self.burst_router = cospas.burst_router(sample_rate=sample_rate, debug_mode=debug_mode)
+        self.demod_1g = cospas.cospas_sarsat_demodulator(sample_rate=sample_rate,
+                                                         debug_mode=debug_mode)
+        if demod_threads is not None:
+            self.demod_1g.set_num_workers(demod_threads)
+            self.demod_1g.set_hypothesis_threads(max(1, demod_threads))
+        self.demod_2g = cospas.sgb_demodulator(sample_rate=sample_rate, debug_mode=debug_mode)
+        self.events = frame_event_sink(callback, sample_rate, recording, include_soft, start)
+
+        self.null_sink_1g = blocks.null_sink(gr.sizeof_gr_complex)
+        self.null_sink_2g = blocks.null_sink(gr.sizeof_gr_complex)
+
+        self.recorder = None
+        if record_dir:
+            # Même flux que le détecteur: indices "start" communs
+            self.recorder = cospas.burst_recorder(
+                sample_rate=sample_rate,
+                output_dir=record_dir,
+                center_freq=recording.center_freq or 0.0,
+                failed_only=record_failed,
+                debug_mode=debug_mode
+            )
+            if recording.start_time is not None:
+                self.recorder.set_start_time(recording.start_time.timestamp()
+                                             + start / sample_rate)
+            self.connect(chain[-1], self.recorder)
+            self.msg_connect((self.burst_detector, "bursts"), (self.recorder, "bursts"))
+            self.msg_connect((self.demod_1g, "frames"), (self.recorder, "frames"))
+            self.msg_connect((self.demod_2g, "frames"), (self.recorder, "frames"))
+
+        chain += [self.burst_detector, self.burst_router]
+        self.connect(*chain)
+        self.connect((self.burst_router, 0), self.null_sink_1g)
+        self.connect((self.burst_router, 1), self.null_sink_2g)
+
+        self.msg_connect((self.burst_detector, "bursts"), (self.burst_router, "bursts"))
+        self.msg_connect((self.burst_router, "bursts_1g"), (self.demod_1g, "bursts"))
+        # 2G: fragments pendant la réception, démodulation commencée avant la fin du burst
+        self.msg_connect((self.burst_router, "fragments_2g"), (self.demod_2g, "fragments"))
+        self.msg_connect((self.demod_1g, "frames"), (self.events, "frames_1g"))
+        self.msg_connect((self.demod_2g, "frames"), (self.events, "frames_2g"))
+
+    def get_statistics(self):
+        stats = {
+            'samples': self.source.position,
+            'bursts_detected': self.burst_detector.get_bursts_detected(),
+            'bursts_1g': self.burst_router.get_bursts_1g(),
+            'bursts_2g': self.burst_router.get_bursts_2g(),
+            'frames_1g': self.demod_1g.get_frames_decoded(),
+            'frames_2g': self.demod_2g.get_frames_decoded(),
+        }
+        if self.recorder is not None:
+            stats['bursts_recorded'] = self.recorder.get_bursts_recorded()
+            stats['bursts_dropped'] = self.recorder.get_bursts_dropped()
+        return stats
+
+
+def replay_file(path, callback, sample_rate=None, fmt=None, speed=0.0, threshold=0.1,
+                gain=1.0, start=0, stop=None, include_soft=False, debug_mode=False,
+                demod_threads=None, record_dir=None, record_failed=False):
+    """
+    Rejouer un enregistrement, callback(event) appelé pour chaque trame
+
+    path: chemin d'un fichier I/Q, ou enregistrement déjà ouvert
+    (iq_recording, iq_archive.archive_window).
+    start/stop: échantillons [start, stop) de l'enregistrement à rejouer.
+    record_dir/record_failed: voir replay_chain.
+
+    Returns:
+        dict de statistiques (échantillons, bursts, trames, durée, facteur temps réel)
+    """
+    recording = path if hasattr(path, 'samples') else open_iq(path, sample_rate, fmt)
+    tb = replay_chain(recording, callback, sample_rate, speed, threshold, gain, start, stop,
+                      include_soft, debug_mode, demod_threads, record_dir, record_failed)
+    t0 = time.perf_counter()
+    tb.run()
+    elapsed = time.perf_counter() - t0
+
+    stats = tb.get_statistics()
+    duration = (stats['samples'] - start) / tb.sample_rate
+    stats.update({
+        'file': recording.path,
+        'sample_rate': tb.sample_rate,
+        'signal_duration_s': duration,
+        'wall_time_s': elapsed,
+        'x_real_time': duration / elapsed if elapsed > 0 else None,
+    })
+    return stats
+
+
+class _silenced_stdout:
+    """Détourne le stdout du décodeur C++ (fd 1) vers /dev/null"""
+
+    def __enter__(self):
+        sys.stdout.flush()
+        self.saved = os.dup(1)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.close(devnull)
+        return self
+
+    def __exit__(self, *exc):
+        sys.stdout.flush()
+        os.dup2(self.saved, 1)
+        os.close(self.saved)
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='cospas-replay',
+        description="Rejoue des enregistrements I/Q dans la chaîne de réception COSPAS-SARSAT "
+                    "et écrit un événement JSON par trame décodée")
+    parser.add_argument('files', nargs='*',
+                        help='Fichiers ou répertoires (.iq/.raw/.cf32/.cs16/.cu8/.wav/SigMF)')
+    parser.add_argument('--archive', metavar='DIR',
+                        help='Rejouer une archive continue (iq_archive) au lieu de fichiers')
+    parser.add_argument('--start', metavar='UTC',
+                        help='Avec --archive: début ISO 8601, UTC (défaut: début de l\'archive)')
+    parser.add_argument('--duration', type=float,
+                        help='Avec --archive: durée en secondes (défaut: jusqu\'à la fin)')
+    parser.add_argument('-s', '--sample-rate', type=float,
+                        help='Sample rate en Hz (défaut: en-tête WAV/SigMF, nom gqrx, sinon 40000)')
+    parser.add_argument('-f', '--format', help='Format forcé (cf32, cs16, cu8, wav...)')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='Multiple du temps réel (défaut: 0 = aussi vite que possible)')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Seuil du détecteur de bursts (défaut: 0.1)')
+    parser.add_argument('--gain', type=float, default=1.0, help='Gain appliqué au signal')
+    parser.add_argument('-o', '--output', help='Fichier JSON lines (défaut: stdout)')
+    parser.add_argument('--soft', action='store_true',
+                        help='Inclure les bits et décisions souples dans les événements')
+    parser.add_argument('--decode-text', action='store_true',
+                        help='Laisser passer l\'affichage texte du décodeur (stdout)')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Enregistrer chaque burst détecté en SigMF dans DIR')
+    parser.add_argument('--record-failed', action='store_true',
+                        help='Avec --record: seulement les bursts non décodés')
+    parser.add_argument('--store', metavar='DB',
+                        help='Ajouter aussi les trames à une base frame_store (cospas-frames)')
+    parser.add_argument('--debug', action='store_true', help='Mode debug des blocs')
+    args = parser.parse_args(argv)
+
+    if args.archive:
+        try:
+            archive = iq_archive(args.archive)
+            extent = archive.extent() or (0.0, 0.0)
+            t0 = parse_utc(args.start) if args.start else extent[0]
+            t1 = t0 + args.duration if args.duration else None
+            paths = [archive.window(t0, t1)]
+        except ValueError as e:
+            parser.error(f"--archive {args.archive}: {e}")
+    else:
+        paths = find_recordings(args.files)
+    if not paths:
+        parser.error("aucun enregistrement I/Q trouvé")
+
+    # Les événements gardent le vrai stdout même quand le décodeur C++ est détourné
+    if args.output:
+        out = open(args.output, 'w')
+    else:
+        out = os.fdopen(os.dup(1), 'w', buffering=1)
+
+    store = frame_store(args.store) if args.store else None
+
+    def emit(event):
+        if store is not None:
+            store.add(event)
+        out.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    total_frames = 0
+    failures = 0
+    try:
+        for path in paths:
+            try:
+                if args.decode_text:
+                    stats = replay_file(path, emit, args.sample_rate, args.format, args.speed,
+                                        args.threshold, args.gain, include_soft=args.soft,
+                                        debug_mode=args.debug, record_dir=args.record,
+                                        record_failed=args.record_failed)
+                else:
+                    with _silenced_stdout():
+                        stats = replay_file(path, emit, args.sample_rate, args.format,
+                                            args.speed, args.threshold, args.gain,
+                                            include_soft=args.soft, debug_mode=args.debug,
+                                            record_dir=args.record,
+                                            record_failed=args.record_failed)
+            except (OSError, ValueError) as e:
+                print(f"[REPLAY] {getattr(path, 'path', path)}: {e}", file=sys.stderr)
+                failures += 1
+                continue
+            out.flush()
+            frames = stats['frames_1g'] + stats['frames_2g']
+            total_frames += frames
+            print(f"[REPLAY] {os.path.basename(stats['file'])}: "
+                  f"{stats['signal_duration_s']:.1f} s en {stats['wall_time_s']:.2f} s (x{stats['x_real_time']:.1f}), "
+                  f"bursts {stats['bursts_detected']} (1G {stats['bursts_1g']}, "
+                  f"2G {stats['bursts_2g']}), trames 1G {stats['frames_1g']}, "
+                  f"2G {stats['frames_2g']}", file=sys.stderr)
+            if 'bursts_recorded' in stats:
+                print(f"[REPLAY] {stats['bursts_recorded']} burst(s) enregistré(s) dans "
+                      f"{args.record}, {stats['bursts_dropped']} abandonné(s)", file=sys.stderr)
+    finally:
+        out.close()
+        if store is not None:
+            store.close()
+
+    print(f"[REPLAY] {len(paths)} fichier(s), {total_frames} trame(s)", file=sys.stderr)
+    if store is not None:
+        print(f"[REPLAY] {store.frames_written} trame(s) ajoutée(s) à {args.store}",
+              file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_chain.py - Banc de performance de la chaîne de réception
+Détecteur → Router → Démodulateurs 1G/2G → dec406, à vitesse maximale
+(file_source sans throttle), sur fichiers IQ enregistrés et/ou corpus
+synthétique (générateurs 1G/2G + channel_model).
+
+Mesures par entrée:
+- facteur temps réel (durée du signal / durée de traitement)
+- échantillons/s de chaque bloc stream (compteurs de performance GNU Radio)
+- latence par burst des démodulateurs (moyenne, p50, p95, p99, max)
+- bursts détectés/routés, trames décodées, RSS maximale du processus
+
+Résultats écrits en JSON (commit git inclus) pour comparer deux commits:
+    python3 scripts/benchmark_chain.py --synthetic-1g 20 --synthetic-2g 20 -o avant.json
+    python3 scripts/benchmark_chain.py --synthetic-1g 20 --synthetic-2g 20 -o apres.json --compare avant.json
+
+Usage: python3 benchmark_chain.py [fichier.iq ...] [options]
+Les fichiers sont des complex64 (gqrx .raw/.iq, .cf32) au sample rate donné.
+"""
+
+import os
+
+# Compteurs de performance: à activer avant l'import de gnuradio
+os.environ.setdefault('GR_CONF_PERFCOUNTERS_ON', 'True')
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from gnuradio import gr, blocks
+from gnuradio import cospas
+from gnuradio.cospas import channel_model
+
+# Générateur 2G (tools/2g)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools', '2g'))
+
+# Trames de référence (examples/1g/test_all_files.sh, tools/2g/test_frame_2g.txt)
+FRAMES_1G = ['8E3301E2402B002BBA863609670908', '8E3301E240298056CF99F61503780B']
+FRAME_2G = '0C0E7456390956CCD02799A2468ACF135787FFF00C02832000037707609BC0F'
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+class benchmark_chain(gr.top_block):
+    """Chaîne de réception complète alimentée par un fichier, sans throttle"""
+
+    def __init__(self, filename, sample_rate=40000, threshold=0.1):
+        gr.top_block.__init__(self, "COSPAS-SARSAT Benchmark")
+
+        self.file_source = blocks.file_source(gr.sizeof_gr_complex, filename, False, 0, 0)
+
+        self.burst_detector = cospas.cospas_burst_detector(
+            sample_rate=sample_rate,
+            buffer_duration_ms=2000,
+            threshold=threshold,
+            min_burst_duration_ms=200,
+            debug_mode=False
+        )
+        self.burst_router = cospas.burst_router(sample_rate=sample_rate, debug_mode=False)
+        self.demod_1g = cospas.cospas_sarsat_demodulator(sample_rate=sample_rate, debug_mode=False)
+        self.demod_2g = cospas.sgb_demodulator(sample_rate=sample_rate, debug_mode=False)
+
+        self.null_sink_1g = blocks.null_sink(gr.sizeof_gr_complex)
+        self.null_sink_2g = blocks.null_sink(gr.sizeof_gr_complex)
+
+        self.connect(self.file_source, self.burst_detector, self.burst_router)
+        self.connect((self.burst_router, 0), self.null_sink_1g)
+        self.connect((self.burst_router, 1), self.null_sink_2g)
+
+        self.msg_connect((self.burst_detector, "bursts"), (self.burst_router, "bursts"))
+        self.msg_connect((self.burst_router, "bursts_1g"), (self.demod_1g, "bursts"))
+        # 2G: fragments pendant la réception, démodulation commencée avant la fin du burst
+        self.msg_connect((self.burst_router, "fragments_2g"), (self.demod_2g, "fragments"))
+
+    def stream_blocks(self):
+        return {
+            'file_source': self.file_source,
+            'burst_detector': self.burst_detector,
+            'burst_router': self.burst_router,
+        }
+
+
+def timer_ticks_per_second():
+    """Résolution des compteurs pc_work_time (ticks de gr::high_res_timer)"""
+    tps = getattr(gr, 'high_res_timer_tps', None)
+    return float(tps()) if tps else 1e9
+
+
+def block_performance(block, input_items):
+    """Echantillons/s d'un bloc d'après son temps de work() cumulé"""
+    work_s = block.pc_work_time_total() / timer_ticks_per_second()
+    return {
+        'items': int(input_items),
+        'work_time_s': work_s,
+        'samples_per_s': (input_items / work_s) if work_s > 0 else None,
+    }
+
+
+def latency_summary(demod):
+    summary = {
+        'mean_ms': demod.get_mean_latency_ms(),
+        'max_ms': demod.get_max_latency_ms(),
+    }
+    for p in LATENCY_PERCENTILES:
+        summary[f'p{p}_ms'] = demod.get_latency_percentile_ms(p)
+    return summary
+
+
+def run_benchmark(filename, sample_rate, threshold):
+    """Un passage complet de la chaîne sur un fichier complex64"""
+    num_samples = os.path.getsize(filename) // np.dtype(np.complex64).itemsize
+    tb = benchmark_chain(filename, sample_rate, threshold)
+
+    # Le décodage dec406 écrit sur stdout: le détourner pendant la mesure
+    sys.stdout.flush()
+    saved_stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        start = time.perf_counter()
+        tb.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(saved_stdout)
+        os.close(devnull)
+
+    duration = num_samples / sample_rate
+    performance = {
+        name: block_performance(block, block.nitems_read(0) if name != 'file_source'
+                                else block.nitems_written(0))
+        for name, block in tb.stream_blocks().items()
+    }
+
+    return {
+        'samples': num_samples,
+        'signal_duration_s': duration,
+        'wall_time_s': elapsed,
+        'x_real_time': duration / elapsed if elapsed > 0 else None,
+        'blocks': performance,
+        'bursts_detected': tb.burst_detector.get_bursts_detected(),
+        'bursts_1g': tb.burst_router.get_bursts_1g(),
+        'bursts_2g': tb.burst_router.get_bursts_2g(),
+        'router_max_queue_depth': tb.burst_router.get_max_queue_depth(),
+        'frames_1g': tb.demod_1g.get_frames_decoded(),
+        'frames_2g': tb.demod_2g.get_frames_decoded(),
+        'latency_1g': latency_summary(tb.demod_1g),
+        'latency_2g': latency_summary(tb.demod_2g),
+    }
+
+
+def synthesize_corpus(path, n_1g, n_2g, sample_rate, spacing_s, ebn0_db, amplitude, seed):
+    """
+    Ecrit un enregistrement synthétique: bursts 1G et 2G alternés, espacés de
+    spacing_s, offsets de porteuse aléatoires, bruit à Eb/N0 donné
+    """
+    import generate_oqpsk_iq as gen2g
+
+    rng = channel_model.trial_rng(seed, 0)
+    spb = int(round(sample_rate / channel_model.BIT_RATE_1G))
+    bursts_1g = cospas.synthesize_frames(
+        [FRAMES_1G[i % len(FRAMES_1G)] for i in range(n_1g)],
+        samples_per_bit=spb, carrier_samples=int(0.160 * sample_rate))
+    burst_2g = gen2g.generate_2g_iq_signal(FRAME_2G, int(sample_rate), verbose=False)
+    burst_2g = burst_2g / np.sqrt(channel_model.signal_power(burst_2g))
+
+    bursts = []
+    for i in range(max(n_1g, n_2g)):
+        if i < n_1g:
+            bursts.append((bursts_1g[i], channel_model.BIT_RATE_1G))
+        if i < n_2g:
+            bursts.append((burst_2g, channel_model.BIT_RATE_2G))
+
+    slot = int(spacing_s * sample_rate)
+    with open(path, 'wb') as f:
+        for burst, bit_rate in bursts:
+            segment = np.zeros(slot, dtype=np.complex64)
+            start = slot // 4
+            segment[start:start + len(burst)] = burst[:slot - start]
+            segment = channel_model.apply_frequency_offset(
+                segment, sample_rate, rng.uniform(-2000, 2000), phase=rng.uniform(0, 2 * np.pi))
+            if ebn0_db is not None:
+                segment = channel_model.add_awgn(segment, ebn0_db, sample_rate, bit_rate, rng,
+                                                 power=1.0)
+            (amplitude * segment).astype(np.complex64).tofile(f)
+    return len(bursts)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, timeout=5,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, previous_path):
+    """Affiche l'évolution du facteur temps réel par entrée"""
+    with open(previous_path) as f:
+        previous = {r['input']: r for r in json.load(f)['results']}
+
+    print(f"\nComparaison avec {previous_path}:")
+    for result in results:
+        old = previous.get(result['input'])
+        if not old or not old.get('x_real_time') or not result.get('x_real_time'):
+            continue
+        ratio = result['x_real_time'] / old['x_real_time']
+        flag = "  ⚠ RÉGRESSION" if ratio < 0.9 else ""
+        print(f"  {result['input']}: x{old['x_real_time']:.1f} → x{result['x_real_time']:.1f} "
+              f"({(ratio - 1) * 100:+.1f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Banc de performance détecteur → router → démodulateurs → dec406")
+    parser.add_argument('files', nargs='*', help='Fichiers IQ complex64 enregistrés')
+    parser.add_argument('-s', '--sample-rate', type=float, default=40000.0,
+                        help='Sample rate des fichiers (défaut: 40000)')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Seuil du détecteur de bursts (défaut: 0.1)')
+    parser.add_argument('--synthetic-1g', type=int, default=0, help='Bursts 1G synthétiques')
+    parser.add_argument('--synthetic-2g', type=int, default=0, help='Bursts 2G synthétiques')
+    parser.add_argument('--ebn0', type=float, default=15.0,
+                        help='Eb/N0 du corpus synthétique en dB (défaut: 15)')
+    parser.add_argument('--spacing', type=float, default=2.5,
+                        help='Espacement des bursts synthétiques en s (défaut: 2.5)')
+    parser.add_argument('--amplitude', type=float, default=0.15,
+                        help='Amplitude du corpus synthétique (défaut: 0.15)')
+    parser.add_argument('--seed', type=int, default=406, help='Graine du corpus synthétique')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Passages par entrée, médiane retenue (défaut: 3)')
+    parser.add_argument('-o', '--output', default='bench_results.json',
+                        help='Fichier JSON de résultats (défaut: bench_results.json)')
+    parser.add_argument('--compare', help='JSON d\'un run précédent à comparer')
+    args = parser.parse_args()
+
+    inputs = [(os.path.basename(f), f) for f in args.files]
+    tmp_dir = tempfile.TemporaryDirectory(prefix='cospas_bench_')
+    if args.synthetic_1g or args.synthetic_2g:
+        path = os.path.join(tmp_dir.name, 'synthetic.cf32')
+        n = synthesize_corpus(path, args.synthetic_1g, args.synthetic_2g, args.sample_rate,
+                              args.spacing, args.ebn0, args.amplitude, args.seed)
+        name = f"synthetic_1g{args.synthetic_1g}_2g{args.synthetic_2g}_ebn0{args.ebn0:g}"
+        inputs.append((name, path))
+        print(f"[BENCH] Corpus synthétique: {n} bursts, Eb/N0 {args.ebn0:g} dB")
+
+    if not inputs:
+        parser.error("aucune entrée: donner des fichiers ou --synthetic-1g/--synthetic-2g")
+
+    results = []
+    for name, path in inputs:
+        runs = [run_benchmark(path, args.sample_rate, args.threshold) for _ in range(args.runs)]
+        median = sorted(runs, key=lambda r: r['wall_time_s'])[len(runs) // 2]
+        result = dict(median, input=name, runs_x_real_time=[r['x_real_time'] for r in runs])
+        results.append(result)
+
+        print(f"[BENCH] {name}: x{result['x_real_time']:.1f} temps réel "
+              f"({result['signal_duration_s']:.1f} s en {result['wall_time_s']:.2f} s), "
+              f"bursts {result['bursts_detected']} (1G {result['bursts_1g']}, "
+              f"2G {result['bursts_2g']}), trames 1G {result['frames_1g']}, "
+              f"2G {result['frames_2g']}")
+        for block, perf in result['blocks'].items():
+            if perf['samples_per_s']:
+                print(f"         {block}: {perf['samples_per_s'] / 1e6:.2f} Méch/s")
+        for gen in ('1g', '2g'):
+            lat = result[f'latency_{gen}']
+            print(f"         latence {gen.upper()}: p50 {lat['p50_ms']:.1f} ms, "
+                  f"p95 {lat['p95_ms']:.1f} ms, p99 {lat['p99_ms']:.1f} ms, "
+                  f"max {lat['max_ms']:.1f} ms")
+
+    report = {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'gnuradio': gr.version(),
+        'sample_rate': args.sample_rate,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] RSS max: {report['peak_rss_mb']:.0f} Mo, résultats: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
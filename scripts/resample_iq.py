@@ -2,14 +2,54 @@
 """
 Script de rééchantillonnage de fichiers IQ
 Convertit un fichier IQ d'un taux d'échantillonnage à un autre
+
+Le fichier source est projeté en mémoire et traité par blocs: chaque bloc
+est lu avec une marge de part et d'autre (plus longue que la demi-réponse
+du filtre polyphase) puis tronqué, ce qui donne exactement le résultat de
+resample_poly sur le fichier entier avec une mémoire constante. Les blocs
+sont indépendants: ils sont traités en parallèle (le filtrage de scipy
+libère le GIL) et écrits dans l'ordre au fil de l'eau.
 """
 
-import numpy as np
-from scipy import signal
+import argparse
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from math import gcd
 
-def resample_iq_file(input_file, output_file, input_rate, output_rate):
+import numpy as np
+from scipy import signal
+
+# Echantillons d'entrée par bloc (8 Mo en complex64)
+CHUNK_SAMPLES = 1 << 20
+
+# Demi-longueur du filtre de resample_poly, en échantillons suréchantillonnés
+HALF_LEN_FACTOR = 10
+
+
+def _round_up(n, multiple):
+    return -(-n // multiple) * multiple
+
+
+def _resample_chunk(iq_data, n0, n1, up, down, margin):
+    """
+    Sortie de resample_poly correspondant aux entrées [n0, n1)
+
+    n0 est un multiple de down: la sortie commence à l'échantillon n0*up/down.
+    """
+    total = len(iq_data)
+    s0 = max(0, n0 - margin)
+    s1 = min(total, n1 + margin)
+    resampled = signal.resample_poly(iq_data[s0:s1], up, down)
+
+    first = (n0 - s0) * up // down
+    count = -(-n1 * up // down) - n0 * up // down
+    return resampled[first:first + count].astype(np.complex64, copy=False)
+
+
+def resample_iq_file(input_file, output_file, input_rate, output_rate,
+                     chunk_samples=CHUNK_SAMPLES, workers=None):
     """
     Rééchantillonne un fichier IQ complex64
 
@@ -18,6 +58,8 @@ def resample_iq_file(input_file, output_file, input_rate, output_rate):
         output_file: Chemin du fichier IQ de sortie
         input_rate: Taux d'échantillonnage source (Hz)
         output_rate: Taux d'échantillonnage cible (Hz)
+        chunk_samples: Echantillons d'entrée par bloc
+        workers: Threads de calcul (défaut: nombre de coeurs)
     """
     # Calcul du ratio de rééchantillonnage
     g = gcd(int(input_rate), int(output_rate))
@@ -25,39 +67,67 @@ def resample_iq_file(input_file, output_file, input_rate, output_rate):
     down = int(input_rate / g)
 
     print(f"[RESAMPLE] Lecture de {input_file}...")
-    iq_data = np.fromfile(input_file, dtype=np.complex64)
-    print(f"[RESAMPLE] {len(iq_data)} échantillons lus à {input_rate} Hz")
+    if os.path.getsize(input_file) >= np.dtype(np.complex64).itemsize:
+        iq_data = np.memmap(input_file, dtype=np.complex64, mode='r')
+    else:
+        iq_data = np.zeros(0, dtype=np.complex64)  # mmap refuse les fichiers vides
+    total = len(iq_data)
+    print(f"[RESAMPLE] {total} échantillons à {input_rate} Hz "
+          f"({total * 8 / 1e6:.1f} Mo, projeté en mémoire)")
 
-    # Séparation I et Q
-    i_data = iq_data.real
-    q_data = iq_data.imag
+    # Marge: demi-réponse du filtre en échantillons d'entrée, multiple de down
+    # pour que chaque bloc commence sur un échantillon de sortie entier
+    margin = _round_up(HALF_LEN_FACTOR * max(up, down) // up + 1, down)
+    chunk = _round_up(max(chunk_samples, margin), down)
+    workers = workers or os.cpu_count() or 1
+    bounds = [(n0, min(total, n0 + chunk)) for n0 in range(0, total, chunk)]
 
-    print(f"[RESAMPLE] Rééchantillonnage {input_rate} Hz -> {output_rate} Hz (up={up}, down={down})...")
-    # Rééchantillonnage avec filtre polyphase
-    i_resampled = signal.resample_poly(i_data, up, down)
-    q_resampled = signal.resample_poly(q_data, up, down)
+    print(f"[RESAMPLE] Rééchantillonnage {input_rate} Hz -> {output_rate} Hz (up={up}, down={down}), "
+          f"{len(bounds)} bloc(s) de {chunk} échantillons, {workers} thread(s)...")
+    t0 = time.perf_counter()
+    written = 0
+    with open(output_file, 'wb') as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        # Au plus 2 blocs en vol par thread: mémoire constante
+        pending = []
+        for n0, n1 in bounds:
+            pending.append(pool.submit(_resample_chunk, iq_data, n0, n1, up, down, margin))
+            if len(pending) >= 2 * workers:
+                resampled = pending.pop(0).result()
+                out.write(resampled.tobytes())
+                written += len(resampled)
+        for future in pending:
+            resampled = future.result()
+            out.write(resampled.tobytes())
+            written += len(resampled)
+    elapsed = time.perf_counter() - t0
 
-    # Reconstruction complexe
-    iq_resampled = i_resampled + 1j * q_resampled
+    print(f"[RESAMPLE] {written} échantillons après rééchantillonnage")
+    print(f"[RESAMPLE] ✓ Terminé: {output_file} en {elapsed:.2f} s "
+          f"(x{total / input_rate / max(elapsed, 1e-9):.0f} temps réel)")
+    print(f"  Entrée:  {total} échantillons @ {input_rate} Hz")
+    print(f"  Sortie:  {written} échantillons @ {output_rate} Hz")
+    if total:
+        print(f"  Ratio:   {written/total:.6f}")
+    return written
 
-    print(f"[RESAMPLE] {len(iq_resampled)} échantillons après rééchantillonnage")
-    print(f"[RESAMPLE] Écriture de {output_file}...")
-    iq_resampled.astype(np.complex64).tofile(output_file)
 
-    print(f"[RESAMPLE] ✓ Terminé")
-    print(f"  Entrée:  {len(iq_data)} échantillons @ {input_rate} Hz")
-    print(f"  Sortie:  {len(iq_resampled)} échantillons @ {output_rate} Hz")
-    print(f"  Ratio:   {len(iq_resampled)/len(iq_data):.6f}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rééchantillonne un fichier IQ complex64 (par blocs, mémoire constante)",
+        epilog="Exemple: resample_iq.py input_1800000.iq output_40000.iq 1800000 40000")
+    parser.add_argument('input_file', help='Fichier IQ source (complex64)')
+    parser.add_argument('output_file', help='Fichier IQ de sortie (complex64)')
+    parser.add_argument('input_rate', type=int, help='Taux d\'échantillonnage source (Hz)')
+    parser.add_argument('output_rate', type=int, help='Taux d\'échantillonnage cible (Hz)')
+    parser.add_argument('-j', '--jobs', type=int, help='Threads de calcul (défaut: nombre de coeurs)')
+    parser.add_argument('--chunk', type=int, default=CHUNK_SAMPLES,
+                        help=f'Echantillons d\'entrée par bloc (défaut: {CHUNK_SAMPLES})')
+    args = parser.parse_args(argv)
 
-if __name__ == "__main__":
-    if len(sys.argv) != 5:
-        print("Usage: resample_iq.py <input.iq> <output.iq> <input_rate> <output_rate>")
-        print("Exemple: resample_iq.py input_1800000.iq output_40000.iq 1800000 40000")
-        sys.exit(1)
+    resample_iq_file(args.input_file, args.output_file, args.input_rate, args.output_rate,
+                     args.chunk, args.jobs)
+    return 0
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
-    input_rate = int(sys.argv[3])
-    output_rate = int(sys.argv[4])
 
-    resample_iq_file(input_file, output_file, input_rate, output_rate)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,9 +9,17 @@ Intègre les optimisations validées:
 - Lowpass 20kHz, normalisation 0.15, seuil 0.05
 - Validation bit sync stricte (>=13/15 bits)
 
-Usage: python3 scan406_iq.py <f1_MHz> <f2_MHz> [ppm] [snr_threshold]
+Usage: python3 scan406_iq.py <f1_MHz> <f2_MHz> [ppm] [snr_threshold] [record_dir] [archive_dir]
 Exemple: python3 scan406_iq.py 403.000 403.100 0 7
          python3 scan406_iq.py 406.000 406.100 55 7
+         python3 scan406_iq.py 406.000 406.100 55 7 ../data/bursts
+         python3 scan406_iq.py 406.000 406.100 55 7 - ../data/archive
+record_dir: chaque burst détecté y est enregistré en SigMF (burst_recorder),
+            '-' pour aucun
+archive_dir: enregistrement I/Q continu compressé (iq_archive, quota
+             ARCHIVE_QUOTA_GB), rejouable avec cospas-replay --archive
+Les trames décodées sont ajoutées à ../data/frames.db (frame_store),
+interrogeable avec cospas-frames.
 """
 
 import sys
@@ -20,15 +28,23 @@ import time
 import subprocess
 import tempfile
 import csv
+import re
 from datetime import datetime, timezone
 from gnuradio import gr, blocks, filter
 from gnuradio import cospas
+from gnuradio.cospas import iq_archive
+from gnuradio.cospas.replay import frame_event_sink
+from gnuradio.cospas.frame_store import frame_store
+from gnuradio.cospas.alert_dispatcher import alert_dispatcher, smtp_sink, webhook_sink, file_sink
 
+# Archive continue: cs16 (zstd si disponible), morceaux d'une minute
+ARCHIVE_QUOTA_GB = 50
 
 class cospas_receiver(gr.top_block):
     """Récepteur COSPAS-SARSAT I/Q temps réel"""
 
-    def __init__(self, freq_hz, sample_rate=40000, ppm=0):
+    def __init__(self, freq_hz, sample_rate=40000, ppm=0, record_dir=None, archive_dir=None,
+                 store=None):
         gr.top_block.__init__(self, "COSPAS-SARSAT I/Q Receiver")
 
         self.sample_rate = sample_rate
@@ -101,6 +117,48 @@ class cospas_receiver(gr.top_block):
             debug_mode=False
         )
 
+        # Démodulateur 2G (OQPSK DSSS)
+        self.demod_2g = cospas.sgb_demodulator(
+            sample_rate=sample_rate,
+            debug_mode=False
+        )
+
+        # Enregistreur SigMF des bursts (pré/post-roll 200 ms, état du décodage)
+        self.burst_recorder = None
+        if record_dir:
+            self.burst_recorder = cospas.burst_recorder(
+                sample_rate=sample_rate,
+                output_dir=record_dir,
+                pre_roll_ms=200,
+                post_roll_ms=200,
+                center_freq=freq_hz,
+                debug_mode=False
+            )
+
+        # Archive I/Q continue (signal normalisé ~0.15, pleine échelle 1.0)
+        self.archive_sink = None
+        if archive_dir:
+            self.archive_sink = iq_archive.iq_archive_sink(
+                archive_dir, sample_rate,
+                center_freq=freq_hz,
+                fmt='cs16',
+                compression='zstd' if iq_archive.zstandard is not None else None,
+                chunk_s=60.0,
+                quota_gb=ARCHIVE_QUOTA_GB
+            )
+
+        # Trames structurées (ports "frames"): base de trames, hex ID des alertes
+        self.frames_by_hex = {}
+        source = 'live_' + datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+        def add_frame(event):
+            event['source'] = source
+            self.frames_by_hex[event.get('hex')] = event
+            if store is not None:
+                store.add(event, time.time(), freq_hz)
+
+        self.frame_events = frame_event_sink(add_frame, sample_rate, include_soft=True)
+
         # Monitor pour détecter la fin du décodage
         self.decode_monitor = cospas.decode_monitor()
 
@@ -126,12 +184,40 @@ class cospas_receiver(gr.top_block):
         self.msg_connect((self.burst_detector, "bursts"), (self.burst_router, "bursts"))
         self.msg_connect((self.burst_router, "bursts_1g"), (self.demod_1g, "bursts"))
         self.msg_connect((self.demod_1g, "decode_complete"), (self.decode_monitor, "decode_complete"))
+        # 2G: fragments pendant la réception, démodulation commencée avant la fin du burst
+        self.msg_connect((self.burst_router, "fragments_2g"), (self.demod_2g, "fragments"))
+
+        # Enregistreur: même flux que le détecteur, trames des deux démodulateurs
+        if self.burst_recorder is not None:
+            self.connect(self.normalizer, self.burst_recorder)
+            self.msg_connect((self.burst_detector, "bursts"), (self.burst_recorder, "bursts"))
+            self.msg_connect((self.demod_1g, "frames"), (self.burst_recorder, "frames"))
+            self.msg_connect((self.demod_2g, "frames"), (self.burst_recorder, "frames"))
+
+        if self.archive_sink is not None:
+            self.connect(self.normalizer, self.archive_sink)
+
+        self.msg_connect((self.demod_1g, "frames"), (self.frame_events, "frames_1g"))
+        self.msg_connect((self.demod_2g, "frames"), (self.frame_events, "frames_2g"))
 
         # Sorties stream du router vers null sinks
         self.connect((self.burst_router, 0), self.null_sink_1g)
         self.connect((self.burst_router, 1), self.null_sink_2g)
 
-        print(f"[FLOWGRAPH] RTL-SDR → Decimator → Lowpass 20kHz → Normalizer → Detector → Router → Demod 1G")
+        print(f"[FLOWGRAPH] RTL-SDR → Decimator → Lowpass 20kHz → Normalizer → Detector → Router → Demod 1G / Demod 2G")
+
+    def frame_alert(self, text):
+        """Alerte de la dernière trame affichée par le décodeur (texte de trame.asc)"""
+        found = re.findall(r'\[COSPAS(?: 2G)?\] HEX: ([0-9A-F]+)', text)
+        hex_str = found[-1] if found else None
+        event = self.frames_by_hex.get(hex_str, {})
+        return {
+            'freq_mhz': self.freq_hz / 1e6,
+            'generation': event.get('generation', 2 if '[COSPAS 2G]' in text else 1),
+            'hex': hex_str,
+            'hex_id': event.get('hex_id'),
+            'text': text,
+        }
 
     def get_bits_file(self):
         return self.bits_file.name if self.bits_file else None
@@ -141,7 +227,12 @@ class cospas_receiver(gr.top_block):
             'bursts_detected': self.burst_detector.get_bursts_detected(),
             'bursts_1g': self.burst_router.get_bursts_1g(),
             'bursts_2g': self.burst_router.get_bursts_2g(),
-            'frames_decoded': self.demod_1g.get_frames_decoded()
+            'frames_decoded': self.demod_1g.get_frames_decoded(),
+            'frames_2g_decoded': self.demod_2g.get_frames_decoded(),
+            'bursts_recorded': (self.burst_recorder.get_bursts_recorded()
+                                if self.burst_recorder is not None else 0),
+            'archive': (self.archive_sink.get_statistics()
+                        if self.archive_sink is not None else None)
         }
 
     def is_decode_complete(self):
@@ -351,40 +442,24 @@ def parse_trames_from_file(trame_file):
     return list(trames_dict.values())
 
 
-def send_email_simple(trame_file, utc_time, freq_mhz, config):
-    """Envoie UN email avec le fichier trame.asc (comme scan406.pl)"""
-    if not config:
-        print("[EMAIL] Configuration email non disponible")
-        return False
-
-    try:
-        subject = "Alerte_Balise_406"
-        message = f"Date et Heure (UTC) du decodage: {utc_time}"
-
-        # Log file comme scan406.pl
-        log_file = config.get('log_file', '../data/mail.log')
-
-        cmd = [
-            "sendemail",
-            "-l", log_file,
-            "-f", config['utilisateur'],
-            "-u", subject,
-            "-t", config['destinataires'],
-            "-s", config['smtp_serveur'],
-            "-o", "tls=yes",
-            "-xu", config['utilisateur'],
-            "-xp", config['password'],
-            "-m", message,
-            "-a", trame_file
-        ]
-
-        subprocess.run(cmd, capture_output=True, timeout=30)
-        print(f"[EMAIL] Alerte envoyée à {config['destinataires']}")
-        return True
-
-    except Exception as e:
-        print(f"[EMAIL] Erreur: {e}")
-        return False
+def build_alert_dispatcher(config, data_dir):
+    """
+    Sorties d'alerte: email (config_mail.txt), webhook (clé webhook=URL),
+    et toujours le fichier data_dir/alerts.jsonl
+    """
+    sinks = []
+    if config.get('smtp_serveur') and config.get('destinataires'):
+        sinks.append(smtp_sink.from_address(
+            config['smtp_serveur'],
+            sender=config.get('utilisateur'),
+            recipients=config['destinataires'],
+            username=config.get('utilisateur'),
+            password=config.get('password')
+        ))
+    if config.get('webhook'):
+        sinks.append(webhook_sink(config['webhook']))
+    sinks.append(file_sink(os.path.join(data_dir, 'alerts.jsonl')))
+    return alert_dispatcher(sinks, log_file=config.get('log_file', os.path.join(data_dir, 'mail.log')))
 
 
 def reset_rtlsdr_usb():
@@ -443,7 +518,7 @@ def load_mail_config(config_file):
 def main():
     # Arguments obligatoires
     if len(sys.argv) < 3:
-        print("Usage: python3 scan406_iq.py <f1_MHz> <f2_MHz> [ppm] [snr_threshold]")
+        print("Usage: python3 scan406_iq.py <f1_MHz> <f2_MHz> [ppm] [snr_threshold] [record_dir] [archive_dir]")
         print("Exemple: python3 scan406_iq.py 403.000 403.100 0 7")
         print("         python3 scan406_iq.py 406.000 406.100 55 7")
         sys.exit(1)
@@ -452,6 +527,8 @@ def main():
     f2_mhz = float(sys.argv[2])
     ppm = int(sys.argv[3]) if len(sys.argv) > 3 else 0
     snr_threshold = float(sys.argv[4]) if len(sys.argv) > 4 else 7.0  # Seuil abaissé pour signaux faibles
+    record_dir = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != '-' else None
+    archive_dir = sys.argv[6] if len(sys.argv) > 6 else None
 
     timeout_s = 56  # Comme scan406.pl - correspond aux 50s entre bursts des vraies balises
 
@@ -462,6 +539,10 @@ def main():
     print(f"Correction PPM: {ppm}")
     print(f"SNR threshold: {snr_threshold} dB")
     print(f"Timeout capture: {timeout_s}s")
+    if record_dir:
+        print(f"Enregistrement des bursts: {record_dir}")
+    if archive_dir:
+        print(f"Archive I/Q continue: {archive_dir} (quota {ARCHIVE_QUOTA_GB} Go)")
     print("=" * 60)
 
     # Charger config email
@@ -476,6 +557,14 @@ def main():
     trame_dir = '../data'
     os.makedirs(trame_dir, exist_ok=True)
 
+    # Base de trames (cospas-frames pour l'interroger)
+    store = frame_store(os.path.join(trame_dir, 'frames.db'))
+    print(f"[CONFIG] Base de trames: {store.path}")
+
+    # Alertes envoyées en arrière-plan, une par balise toutes les 15 min au plus
+    alerts = build_alert_dispatcher(mail_config, trame_dir)
+    print(f"[CONFIG] Alertes: {', '.join(alerts.get_statistics())}")
+
     # Boucle principale (comme scan406.pl)
     while True:
         # Reset USB au début de chaque cycle (comme scan406.pl ligne 80)
@@ -529,7 +618,7 @@ def main():
 
             # Créer le récepteur UNE FOIS pour tout le cycle de 56s
             try:
-                tb = cospas_receiver(freq_trouvee, 40000, ppm)
+                tb = cospas_receiver(freq_trouvee, 40000, ppm, record_dir, archive_dir, store)
             except Exception as e:
                 print(f"[ERREUR] Impossible de créer le récepteur: {e}")
                 time.sleep(10)
@@ -592,18 +681,21 @@ def main():
                         freq_mhz_actuelle = freq_trouvee / 1e6
 
                         # Afficher le décodage dans un bloc séparé
+                        trame_text = ''
                         if os.path.exists(trame_file) and os.path.getsize(trame_file) > 0:
-                            print("\n" + "="*80)
                             with open(trame_file, 'r') as f:
-                                print(f.read())
+                                trame_text = f.read()
+                            print("\n" + "="*80)
+                            print(trame_text)
                             print("="*80 + "\n")
 
                         if freq_balise_autorisee(freq_mhz_actuelle):
-                            # Envoyer email immédiatement (comme scan406.pl)
-                            if mail_config:
-                                send_email_simple(trame_file, utc_time, freq_mhz_actuelle, mail_config)
-                            else:
-                                print("[EMAIL] Configuration manquante, email non envoyé")
+                            # Alerte mise en file: l'envoi ne retarde pas le décodage
+                            alert = tb.frame_alert(trame_text)
+                            alert['utc'] = utc_time
+                            status = alerts.submit(alert)
+                            print(f"[ALERTE] {alert['hex_id'] or alert['hex']}: "
+                                  + ", ".join(f"{name} {state}" for name, state in status.items()))
 
                         # Réinitialiser le flag pour écouter la prochaine trame
                         tb.decode_monitor.reset()
@@ -641,7 +733,20 @@ def main():
                 print(f"[STATS] Bursts détectés: {stats['bursts_detected']}")
                 print(f"[STATS] Bursts 1G routés: {stats['bursts_1g']}")
                 print(f"[STATS] Trames démodulées: {stats['frames_decoded']}")
-                print(f"[STATS] Trames envoyées par email (cette capture): {trames_trouvees}")
+                print(f"[STATS] Bursts 2G routés: {stats['bursts_2g']}, "
+                      f"trames 2G démodulées: {stats['frames_2g_decoded']}")
+                if record_dir:
+                    print(f"[STATS] Bursts enregistrés: {stats['bursts_recorded']}")
+                if stats['archive']:
+                    print(f"[STATS] Archive: {stats['archive']['chunks_written']} morceau(x), "
+                          f"{stats['archive']['bytes_written'] / 1e6:.1f} Mo, "
+                          f"{stats['archive']['samples_dropped']} échantillon(s) perdu(s)")
+                print(f"[STATS] Base de trames: {store.frames_written} trame(s) enregistrée(s), "
+                      f"{store.frames_dropped} perdue(s)")
+                print(f"[STATS] Trames décodées (cette capture): {trames_trouvees}")
+                for name, sink_stats in alerts.get_statistics().items():
+                    print(f"[STATS] Alertes {name}: {sink_stats['sent']} envoyée(s), "
+                          f"{sink_stats['duplicates']} doublon(s), {sink_stats['failed']} échec(s)")
 
                 # Décider si on continue sur cette fréquence ou on rescanne (comme scan406.pl)
                 if trames_trouvees == 0:
@@ -664,6 +769,8 @@ def main():
                 print("\n[STOP] Interruption utilisateur")
                 tb.stop()
                 tb.wait()
+                store.close()  # Ecrire les trames encore en file
+                alerts.close()
                 raise
 
             except Exception as e:
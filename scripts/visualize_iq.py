@@ -1,95 +1,205 @@
 #!/usr/bin/env python3
 """
 Script de visualisation de fichiers IQ
-Affiche amplitude, phase, spectrogramme
+Affiche vue d'ensemble, zoom (amplitude, puissance), constellation et
+spectrogramme, avec les limites des bursts détectés
+
+Les longs enregistrements ne sont jamais chargés en entier: le fichier est
+projeté en mémoire (formats de cospas.open_iq) et résumé par une pyramide
+min/max/puissance mise en cache à côté du fichier (cospas.iq_pyramid).
+Chaque tracé, vue d'ensemble comprise, lit au plus quelques milliers de
+tranches; le zoom interactif recalcule la vue à chaque changement d'échelle.
 """
 
+import argparse
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import signal
-import sys
 
-def visualize_iq(filename, sample_rate, start_sample=0, num_samples=None):
+from gnuradio.cospas.iq_pyramid import open_pyramid, burst_marks
+
+# Pixels des tracés d'enveloppe
+WIDTH = 2000
+
+# Au-delà, constellation et spectrogramme portent sur le centre du zoom
+MAX_DETAIL_SAMPLES = 1 << 20
+MAX_CONSTELLATION_POINTS = 20000
+
+
+def _draw_envelope(ax, pyramid, start, stop, sample_rate, width=WIDTH):
+    """Enveloppe d'amplitude min/max de [start, stop), temps en secondes"""
+    view = pyramid.view(start, stop, width)
+    t = view['edges'][:-1] / sample_rate
+    artists = [ax.fill_between(t, view['mag_min'], view['mag_max'], step='post',
+                               linewidth=0, alpha=0.6, color='tab:blue')]
+    if stop - start <= width:
+        # Un échantillon par pixel: composantes I et Q
+        artists += ax.plot(t, view['i_max'], linewidth=0.4, color='tab:orange', label='I')
+        artists += ax.plot(t, view['q_max'], linewidth=0.4, color='tab:green', label='Q')
+    return view, artists
+
+
+def _draw_bursts(ax, marks, sample_rate):
+    for mark in marks:
+        color = {True: 'tab:green', False: 'tab:red'}.get(mark['valid'], 'tab:gray')
+        ax.axvspan(mark['start'] / sample_rate, mark['stop'] / sample_rate,
+                   color=color, alpha=0.2, linewidth=0)
+
+
+def visualize_iq(filename, sample_rate, start_sample=0, num_samples=None, events=None,
+                 output_file=None, show=True):
     """
     Visualise un fichier IQ
 
     Args:
-        filename: Chemin du fichier IQ
-        sample_rate: Taux d'échantillonnage (Hz)
-        start_sample: Échantillon de départ
-        num_samples: Nombre d'échantillons à visualiser (None = tout)
+        filename: Chemin du fichier IQ (.iq/.cf32/.cs16/.cu8/WAV/SigMF)
+        sample_rate: Taux d'échantillonnage (Hz, None: en-tête WAV/SigMF ou nom gqrx)
+        start_sample: Échantillon de départ du zoom
+        num_samples: Nombre d'échantillons du zoom (None = tout)
+        events: Fichier de trames (cospas-replay JSON lines, cospas-batch-decode CSV)
+            dont les bursts sont superposés, en plus des annotations SigMF
+        output_file: Image PNG (défaut: <fichier>_plot.png)
+        show: Ouvrir la fenêtre interactive
     """
     print(f"[VIZ] Lecture de {filename}...")
-    iq_data = np.fromfile(filename, dtype=np.complex64)
-
-    if num_samples is None:
-        num_samples = len(iq_data) - start_sample
+    pyramid = open_pyramid(filename, sample_rate)
+    recording = pyramid.recording
+    sample_rate = recording.sample_rate or sample_rate or 40000
+    total = recording.num_samples
+    if total == 0:
+        print("[VIZ] Fichier vide")
+        return
+
+    start = max(0, min(start_sample, total - 1))
+    stop = total if num_samples is None else min(total, start + num_samples)
+
+    overall = pyramid.levels[-1]
+    print(f"[VIZ] {total} échantillons @ {sample_rate} Hz ({total / sample_rate:.1f} s), "
+          f"pyramide {len(pyramid.levels)} niveaux")
+    print(f"[VIZ] Amplitude max: {float(np.max(overall[:, 5])):.6f}")
+    print(f"[VIZ] Puissance moyenne: {float(overall[0, 6]):.6g}")
+
+    marks = burst_marks(recording, events)
+    if marks:
+        print(f"[VIZ] {len(marks)} burst(s) superposé(s)")
+
+    fig = plt.figure(figsize=(14, 10))
+    grid = fig.add_gridspec(3, 2, width_ratios=(3, 1))
+    fig.suptitle(f'Visualisation IQ: {filename}', fontsize=14)
 
-    iq_data = iq_data[start_sample:start_sample+num_samples]
+    # 1. Vue d'ensemble, zone zoomée en surbrillance
+    ax_all = fig.add_subplot(grid[0, :])
+    _draw_envelope(ax_all, pyramid, 0, total, sample_rate)
+    _draw_bursts(ax_all, marks, sample_rate)
+    if (start, stop) != (0, total):
+        ax_all.axvspan(start / sample_rate, stop / sample_rate, color='k', alpha=0.1)
+    ax_all.set_xlim(0, total / sample_rate)
+    ax_all.set_ylabel('Amplitude')
+    ax_all.set_title("Vue d'ensemble (enveloppe min/max)")
+    ax_all.grid(True, alpha=0.3)
+
+    # 2. Zoom: enveloppe recalculée à chaque changement d'échelle
+    ax_zoom = fig.add_subplot(grid[1, 0])
+    ax_power = fig.add_subplot(grid[2, 0], sharex=ax_zoom)
+    _draw_bursts(ax_zoom, marks, sample_rate)
+    _draw_bursts(ax_power, marks, sample_rate)
+    state = {'artists': []}
+
+    def redraw(lo, hi):
+        for artist in state['artists']:
+            artist.remove()
+        a = max(0, int(lo * sample_rate))
+        b = min(total, int(np.ceil(hi * sample_rate)))
+        if b <= a:
+            state['artists'] = []
+            return
+        view, artists = _draw_envelope(ax_zoom, pyramid, a, b, sample_rate)
+        t = view['edges'][:-1] / sample_rate
+        power_db = 10 * np.log10(view['power'] + 1e-20)
+        artists += ax_power.plot(t, power_db, linewidth=0.6, color='tab:purple',
+                                 drawstyle='steps-post')
+        state['artists'] = artists
+
+    def on_xlim(ax):
+        if state.get('busy'):
+            return
+        state['busy'] = True
+        redraw(*ax.get_xlim())
+        ax.figure.canvas.draw_idle()
+        state['busy'] = False
+
+    redraw(start / sample_rate, stop / sample_rate)
+    ax_zoom.set_xlim(start / sample_rate, stop / sample_rate)
+    ax_zoom.callbacks.connect('xlim_changed', on_xlim)
+    ax_zoom.set_ylabel('Amplitude')
+    ax_zoom.set_title('Zoom')
+    ax_zoom.grid(True, alpha=0.3)
+    ax_power.set_ylabel('Puissance (dB)')
+    ax_power.set_xlabel('Temps (s)')
+    ax_power.grid(True, alpha=0.3)
+
+    # 3. Constellation et spectrogramme: au plus MAX_DETAIL_SAMPLES au centre du zoom
+    center = (start + stop) // 2
+    d0 = max(start, center - MAX_DETAIL_SAMPLES // 2)
+    d1 = min(stop, d0 + MAX_DETAIL_SAMPLES)
+    detail = np.asarray(recording.samples(d0, d1))
+
+    ax_const = fig.add_subplot(grid[1, 1])
+    step = max(1, len(detail) // MAX_CONSTELLATION_POINTS)
+    ax_const.plot(detail.real[::step], detail.imag[::step], '.', markersize=1, alpha=0.3)
+    ax_const.set_xlabel('I (Real)')
+    ax_const.set_ylabel('Q (Imag)')
+    ax_const.grid(True, alpha=0.3)
+    ax_const.set_title('Constellation I/Q')
+    ax_const.axis('equal')
+
+    ax_spec = fig.add_subplot(grid[2, 1])
+    if len(detail) >= 1024:
+        f, t_spec, Sxx = signal.spectrogram(detail, fs=sample_rate, nperseg=1024,
+                                            return_onesided=False)
+        f = np.fft.fftshift(f)
+        Sxx = np.fft.fftshift(Sxx, axes=0)
+        ax_spec.pcolormesh(d0 / sample_rate + t_spec, f / 1000, 10 * np.log10(Sxx + 1e-10),
+                           shading='auto', cmap='viridis')
+    ax_spec.set_ylabel('Fréquence (kHz)')
+    ax_spec.set_xlabel('Temps (s)')
+    ax_spec.set_title('Spectrogramme')
+
+    fig.tight_layout()
 
-    print(f"[VIZ] {len(iq_data)} échantillons @ {sample_rate} Hz")
-    print(f"[VIZ] Amplitude max: {np.max(np.abs(iq_data)):.6f}")
-    print(f"[VIZ] Amplitude moyenne: {np.mean(np.abs(iq_data)):.6f}")
+    # Sauvegarder
+    if output_file is None:
+        output_file = os.path.splitext(filename)[0] + '_plot.png'
+    fig.savefig(output_file, dpi=150)
+    print(f"[VIZ] Graphique sauvegardé: {output_file}")
 
-    # Axe temporel
-    t = np.arange(len(iq_data)) / sample_rate
+    if show:
+        plt.show()
 
-    # Créer la figure avec 4 sous-graphiques
-    fig, axes = plt.subplots(4, 1, figsize=(12, 10))
-    fig.suptitle(f'Visualisation IQ: {filename}', fontsize=14)
 
-    # 1. Amplitude
-    amplitude = np.abs(iq_data)
-    axes[0].plot(t * 1000, amplitude, linewidth=0.5)
-    axes[0].set_ylabel('Amplitude')
-    axes[0].set_xlabel('Temps (ms)')
-    axes[0].grid(True, alpha=0.3)
-    axes[0].set_title('Amplitude du signal')
-
-    # 2. Phase
-    phase = np.angle(iq_data)
-    axes[1].plot(t * 1000, phase, linewidth=0.5)
-    axes[1].set_ylabel('Phase (rad)')
-    axes[1].set_xlabel('Temps (ms)')
-    axes[1].grid(True, alpha=0.3)
-    axes[1].set_title('Phase du signal')
-    axes[1].set_ylim([-np.pi, np.pi])
-
-    # 3. Constellation I/Q
-    axes[2].plot(iq_data.real, iq_data.imag, '.', markersize=1, alpha=0.3)
-    axes[2].set_xlabel('I (Real)')
-    axes[2].set_ylabel('Q (Imag)')
-    axes[2].grid(True, alpha=0.3)
-    axes[2].set_title('Constellation I/Q')
-    axes[2].axis('equal')
-
-    # 4. Spectrogramme
-    f, t_spec, Sxx = signal.spectrogram(iq_data, fs=sample_rate, nperseg=1024)
-    axes[3].pcolormesh(t_spec * 1000, f / 1000, 10 * np.log10(Sxx + 1e-10),
-                       shading='gouraud', cmap='viridis')
-    axes[3].set_ylabel('Fréquence (kHz)')
-    axes[3].set_xlabel('Temps (ms)')
-    axes[3].set_title('Spectrogramme')
-
-    plt.tight_layout()
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Visualise un fichier IQ, même de plusieurs Go (pyramide min/max en cache)",
+        epilog="Exemple: visualize_iq.py capture.iq 40000 10000 50000 --events frames.jsonl")
+    parser.add_argument('filename', help='Fichier IQ (.iq/.raw/.cf32/.cs16/.cu8/.wav/SigMF)')
+    parser.add_argument('sample_rate', type=int, help="Taux d'échantillonnage (Hz)")
+    parser.add_argument('start_sample', type=int, nargs='?', default=0,
+                        help='Échantillon de départ du zoom')
+    parser.add_argument('num_samples', type=int, nargs='?',
+                        help="Nombre d'échantillons du zoom (défaut: tout)")
+    parser.add_argument('--events',
+                        help='Trames à superposer (cospas-replay JSON lines, cospas-batch-decode CSV)')
+    parser.add_argument('-o', '--output', help='Image PNG (défaut: <fichier>_plot.png)')
+    parser.add_argument('--no-show', action='store_true', help='Sans fenêtre interactive')
+    args = parser.parse_args(argv)
 
-    # Sauvegarder
-    output_file = filename.replace('.iq', '_plot.png').replace('.raw', '_plot.png')
-    plt.savefig(output_file, dpi=150)
-    print(f"[VIZ] Graphique sauvegardé: {output_file}")
+    visualize_iq(args.filename, args.sample_rate, args.start_sample, args.num_samples,
+                 args.events, args.output, not args.no_show)
+    return 0
 
-    plt.show()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: visualize_iq.py <fichier.iq> <sample_rate> [start_sample] [num_samples]")
-        print("Exemple: visualize_iq.py capture.iq 40000")
-        print("Exemple: visualize_iq.py capture.iq 40000 10000 50000")
-        sys.exit(1)
-
-    filename = sys.argv[1]
-    sample_rate = int(sys.argv[2])
-    start_sample = int(sys.argv[3]) if len(sys.argv) > 3 else 0
-    num_samples = int(sys.argv[4]) if len(sys.argv) > 4 else None
-
-    visualize_iq(filename, sample_rate, start_sample, num_samples)
+    sys.exit(main())
@@ -31,7 +31,9 @@ Références:
 
 import numpy as np
 import argparse
+import os
 import sys
+from fractions import Fraction
 
 # ============================================================================
 # PARAMÈTRES SYSTÈME T.018 (Validés dsPIC33CK)
@@ -47,6 +49,18 @@ PREAMBLE_BITS = 50       # bits de préambule (166.7 ms)
 INFO_BITS = 202          # bits d'information
 BCH_BITS = 48           # bits BCH(250,202)
 TOTAL_MESSAGE_BITS = INFO_BITS + BCH_BITS  # 250 bits
+HEX_PAD_BITS = 2         # bits à zéro en tête du HEX 63 chars
+FRAME_BITS = PREAMBLE_BITS + TOTAL_MESSAGE_BITS  # 300 bits
+CHANNEL_BITS = FRAME_BITS // 2  # 150 bits par canal I/Q
+
+# Cache disque des tables PRN (.npy), surchargeable par variable d'environnement
+PRN_CACHE_DIR = os.environ.get(
+    'COSPAS_PRN_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'cospas'))
+
+# Mise en forme RRC (T.018 Section 2.3.4)
+RRC_ALPHA = 0.8          # roll-off
+RRC_SPAN = 31            # ±31 chips (63 coefficients par phase)
 
 # Échantillonnage
 # Sample rate choisi pour PlutoSDR (65.1 kSPS - 61.44 MSPS)
@@ -58,6 +72,7 @@ SAMPLES_PER_CHIP = SAMPLE_RATE / CHIP_RATE  # 10.0 exactement
 PREAMBLE_DURATION = PREAMBLE_BITS / DATA_RATE  # 166.7 ms
 MESSAGE_DURATION = TOTAL_MESSAGE_BITS / DATA_RATE  # 833.3 ms
 TOTAL_DURATION = 1.0     # 1 seconde
+DEFAULT_PERIOD = 5.0     # s, période de répétition pour --repeat
 
 # ============================================================================
 # GÉNÉRATEUR PRN (LFSR T.018 - x²³ + x¹⁸ + 1)
@@ -119,7 +134,7 @@ class LFSR_T018:
 
     def generate_sequence(self, length):
         """
-        Génère une séquence de chips.
+        Génère une séquence de chips (identique à `length` appels de next_chip()).
 
         Args:
             length: Nombre de chips à générer
@@ -127,7 +142,43 @@ class LFSR_T018:
         Returns:
             np.array: Séquence de chips (int8: +1/-1)
         """
-        return np.array([self.next_chip() for _ in range(length)], dtype=np.int8)
+        bits = self.sequence_bits(self.state, length + 23)
+        # Nouvel état: X0..X22 = les 23 sorties suivantes
+        self.state = int(np.dot(bits[length:].astype(np.int64), 1 << np.arange(23)))
+        return self.bits_to_chips(bits[:length])
+
+    @staticmethod
+    def sequence_bits(init_state, length):
+        """
+        Sorties logiques X0 du LFSR, calculées par blocs (bit-parallèle).
+
+        La sortie vérifie s[n+23] = s[n] ⊕ s[n+18]; en élevant le polynôme au
+        carré k fois, s[n+23K] = s[n] ⊕ s[n+18K] avec K = 2^k. Chaque itération
+        produit donc 5K bits d'un seul XOR NumPy: ~25 itérations pour 38400 chips.
+
+        Args:
+            init_state: État initial LFSR (23 bits)
+            length: Nombre de bits à générer
+
+        Returns:
+            np.array: Bits de sortie (uint8: 0 ou 1)
+        """
+        bits = np.empty(max(length, 23), dtype=np.uint8)
+        bits[:23] = (init_state >> np.arange(23)) & 1
+        n = 23
+        while n < length:
+            k = 1
+            while 46 * k <= n:
+                k *= 2
+            block = min(5 * k, length - n)
+            bits[n:n + block] = bits[n - 23 * k:n - 23 * k + block] ^ bits[n - 5 * k:n - 5 * k + block]
+            n += block
+        return bits[:length]
+
+    @staticmethod
+    def bits_to_chips(bits):
+        """Table 2.3: Logic 1 → -1, Logic 0 → +1 (int8)."""
+        return (1 - 2 * bits.astype(np.int8)).astype(np.int8)
 
     def reset(self):
         """Réinitialise le LFSR à son état initial."""
@@ -163,6 +214,12 @@ class LFSR_T018:
         # Valeurs attendues T.018 Table 2.2
         expected = ["8000", "0108", "4212", "84A1"]
 
+        # La version vectorisée doit reproduire le pas à pas
+        vectorized = cls.sequence_bits(cls.INIT_NORMAL_I, 64).tolist()
+        if vectorized != chips:
+            print("✗ PRN LFSR vectorisé différent de next_chip()")
+            return False
+
         if hex_values == expected:
             print(f"✓ PRN LFSR conforme T.018 Table 2.2: {' '.join(hex_values)}")
             return True
@@ -218,7 +275,64 @@ def build_frame_with_preamble(message_bits):
     preamble = np.zeros(PREAMBLE_BITS, dtype=np.uint8)
     return np.concatenate([preamble, message_bits])
 
-def dsss_spread_oqpsk(frame_bits):
+# Tables PRN déjà chargées: {(self_test, n_bits): array (2, n_bits, 256)}
+_PRN_TABLES = {}
+
+def prn_tables(self_test=False, n_bits=CHANNEL_BITS):
+    """
+    Tables PRN I/Q précalculées, une ligne de 256 chips par bit de canal.
+
+    Le LFSR tourne en continu sur toute la trame: la ligne k contient les
+    chips 256k..256k+255 de la séquence. Les tables (2, n_bits, 256) int8 sont
+    calculées une fois puis mises en cache mémoire et disque (.npy dans
+    PRN_CACHE_DIR); un cache illisible ou de mauvaise forme est régénéré.
+
+    Args:
+        self_test: Etats initiaux self-test au lieu du mode normal
+        n_bits: Nombre de bits par canal (150 pour une trame de 300 bits)
+
+    Returns:
+        tuple: (prn_i, prn_q) - np.array int8 de forme (n_bits, 256)
+    """
+    key = (self_test, n_bits)
+    tables = _PRN_TABLES.get(key)
+    if tables is None:
+        mode = 'test' if self_test else 'normal'
+        path = os.path.join(PRN_CACHE_DIR, f't018_prn_{mode}_{n_bits}.npy')
+        shape = (2, n_bits, CHIPS_PER_BIT)
+        try:
+            tables = np.load(path)
+            if tables.shape != shape or tables.dtype != np.int8:
+                tables = None
+        except (OSError, ValueError):
+            tables = None
+
+        if tables is None:
+            if self_test:
+                inits = (LFSR_T018.INIT_TEST_I, LFSR_T018.INIT_TEST_Q)
+            else:
+                inits = (LFSR_T018.INIT_NORMAL_I, LFSR_T018.INIT_NORMAL_Q)
+            tables = np.stack([
+                LFSR_T018.bits_to_chips(
+                    LFSR_T018.sequence_bits(init, n_bits * CHIPS_PER_BIT)
+                ).reshape(n_bits, CHIPS_PER_BIT)
+                for init in inits
+            ])
+            try:
+                os.makedirs(PRN_CACHE_DIR, exist_ok=True)
+                # Ecriture atomique: pas de cache tronqué si deux process génèrent
+                tmp_path = f'{path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, tables)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # Cache disque optionnel (répertoire en lecture seule...)
+
+        tables.setflags(write=False)
+        _PRN_TABLES[key] = tables
+    return tables[0], tables[1]
+
+def dsss_spread_oqpsk(frame_bits, self_test=False):
     """
     Applique l'étalement DSSS selon T.018 Section 2.2.3(b).
 
@@ -227,43 +341,65 @@ def dsss_spread_oqpsk(frame_bits):
     - Bits pairs (2, 4, 6...) → canal Q → 256 chips (LFSR Q)
     - Bit 0: non inversé, Bit 1: inversé (XOR avec PRN)
 
+    L'étalement est un seul produit NumPy (bits, 256) avec les tables PRN
+    précalculées (voir prn_tables).
+
     Args:
         frame_bits: Trame complète (300 bits)
+        self_test: PRN du mode self-test (T.018 Table 2.2)
 
     Returns:
         tuple: (i_chips, q_chips) - np.array int8
     """
-    # Initialiser LFSR I et Q
-    lfsr_i = LFSR_T018(LFSR_T018.INIT_NORMAL_I)
-    lfsr_q = LFSR_T018(LFSR_T018.INIT_NORMAL_Q)
+    frame_bits = np.asarray(frame_bits, dtype=np.uint8)
 
     # Séparer bits pairs/impairs (selon T.018: bit 1 = premier bit)
     # Python indexing: bit[0] = bit 1 T.018
     odd_bits = frame_bits[0::2]   # Bits 1, 3, 5... → canal I
     even_bits = frame_bits[1::2]  # Bits 2, 4, 6... → canal Q
 
-    i_chips_list = []
-    q_chips_list = []
+    prn_i, prn_q = prn_tables(self_test, max(CHANNEL_BITS, len(odd_bits)))
 
-    # Générer chips pour canal I (bits impairs)
-    for bit in odd_bits:
-        prn_seq = lfsr_i.generate_sequence(CHIPS_PER_BIT)
-        # T.018 Table 2.4: Bit 0 → PRN normal, Bit 1 → PRN inversé
-        if bit == 1:
-            prn_seq = -prn_seq
-        i_chips_list.append(prn_seq)
+    # T.018 Table 2.4: Bit 0 → PRN normal, Bit 1 → PRN inversé
+    i_signs = (1 - 2 * odd_bits.astype(np.int8))[:, None]
+    q_signs = (1 - 2 * even_bits.astype(np.int8))[:, None]
+    i_chips = (prn_i[:len(odd_bits)] * i_signs).ravel()
+    q_chips = (prn_q[:len(even_bits)] * q_signs).ravel()
 
-    # Générer chips pour canal Q (bits pairs)
-    for bit in even_bits:
-        prn_seq = lfsr_q.generate_sequence(CHIPS_PER_BIT)
-        if bit == 1:
-            prn_seq = -prn_seq
-        q_chips_list.append(prn_seq)
+    return i_chips, q_chips
 
-    i_chips = np.concatenate(i_chips_list)
-    q_chips = np.concatenate(q_chips_list)
+def rrc_pulse(t, alpha=RRC_ALPHA):
+    """
+    Impulsion Root-Raised Cosine continue (t en périodes chip, non normalisée).
 
-    return i_chips, q_chips
+    Args:
+        t: Instants (scalaire ou np.array) en chips
+        alpha: Roll-off factor (0.8 pour T.018)
+
+    Returns:
+        np.array: Valeurs de l'impulsion (float64)
+    """
+    t = np.asarray(t, dtype=np.float64)
+    h = np.empty(t.shape)
+
+    # Singularités: t = 0 et |t| = 1/(4α)
+    at_zero = t == 0
+    at_edge = np.isclose(np.abs(t), 1 / (4 * alpha))
+    regular = ~(at_zero | at_edge)
+
+    tr = t[regular]
+    numerator = (
+        np.sin(np.pi * tr * (1 - alpha)) +
+        4 * alpha * tr * np.cos(np.pi * tr * (1 + alpha))
+    )
+    denominator = np.pi * tr * (1 - (4 * alpha * tr) ** 2)
+    h[regular] = numerator / denominator
+    h[at_zero] = 1 - alpha + 4 * alpha / np.pi
+    h[at_edge] = (alpha / np.sqrt(2)) * (
+        ((1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha))) +
+        ((1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha)))
+    )
+    return h
 
 def rrc_filter_taps(alpha, span, sps):
     """
@@ -282,32 +418,172 @@ def rrc_filter_taps(alpha, span, sps):
     Returns:
         np.array: Coefficients du filtre RRC normalisés
     """
-    n_taps = 2 * span * sps + 1
     t = np.arange(-span * sps, span * sps + 1) / float(sps)
-
-    h = np.zeros(len(t))
-
-    for i, time in enumerate(t):
-        if time == 0:
-            h[i] = (1 - alpha + 4 * alpha / np.pi)
-        elif abs(time) == 1 / (4 * alpha):
-            h[i] = (alpha / np.sqrt(2)) * (
-                ((1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha))) +
-                ((1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha)))
-            )
-        else:
-            numerator = (
-                np.sin(np.pi * time * (1 - alpha)) +
-                4 * alpha * time * np.cos(np.pi * time * (1 + alpha))
-            )
-            denominator = np.pi * time * (1 - (4 * alpha * time) ** 2)
-            h[i] = numerator / denominator
+    h = rrc_pulse(t, alpha)
 
     # Normaliser pour gain unitaire
     h = h / np.sqrt(np.sum(h ** 2))
 
     return h
 
+class PolyphaseOQPSKModulator:
+    """
+    Mise en forme RRC polyphase (type upfirdn) des chips I/Q, en flux.
+
+    Le rapport sample_rate / CHIP_RATE = L/M est réduit en fraction: les
+    instants d'échantillonnage reviennent sur les mêmes L phases tous les
+    M chips. Pour chaque phase, les 2·span+1 coefficients RRC sont
+    précalculés (I à t, Q à t - Tc/2 exactement), et chaque échantillon de
+    sortie ne coûte que 2·span+1 multiplications par voie, sur les chips
+    eux-mêmes (pas de suréchantillonnage par zéros).
+
+    Un chip à 0 est un silence: les blocs successifs peuvent enchaîner
+    bursts et pauses sans discontinuité du filtre. La mémoire utilisée est
+    bornée par la taille des blocs fournis à process().
+
+    Amplitude: |I|, |Q| ≤ 1/√2 (borne de la somme des |coefficients|),
+    donc |iq| ≤ 1 sans normalisation globale.
+    """
+
+    # Dénominateur max du rapport de débits (taille de la table polyphase)
+    MAX_PHASES = 4096
+
+    def __init__(self, sample_rate=SAMPLE_RATE, alpha=RRC_ALPHA, span=RRC_SPAN):
+        """
+        Args:
+            sample_rate: Fréquence d'échantillonnage (Hz)
+            alpha: Roll-off factor RRC
+            span: Demi-longueur du filtre en chips
+        """
+        # Avance en chips par échantillon = M/L
+        step = Fraction(CHIP_RATE) / Fraction(sample_rate).limit_denominator(1000)
+        step = step.limit_denominator(self.MAX_PHASES)
+        self.sample_rate = sample_rate
+        self.span = span
+        self.L = step.denominator   # échantillons par période
+        self.M = step.numerator     # chips par période
+
+        # Phase r: t = r·M/L chips. Chip central floor(t - delay), coefficients
+        # h(frac + span - m) appliqués aux chips central - span + m.
+        r = np.arange(self.L)
+        m = np.arange(2 * span + 1)
+        bases = []
+        taps = []
+        for delay2 in (0, 1):  # I: 0, Q: Tc/2 (en demi-chips)
+            num = 2 * r * self.M - delay2 * self.L   # 2L·(t - delay)
+            base = num // (2 * self.L)
+            frac = (num - base * 2 * self.L) / (2.0 * self.L)
+            bases.append(base)
+            taps.append(rrc_pulse(frac[:, None] + span - m[None, :], alpha))
+
+        # Normalisation commune I/Q: borne crête 1/√2 par voie
+        bound = max(np.abs(t).sum(axis=1).max() for t in taps)
+
+        # Toutes les phases d'une période lisent une même fenêtre de chips
+        # (début qM + min_base - span): une matrice (fenêtre, L) par voie, et
+        # une période entière = un produit matriciel
+        self._min_base = int(min(b.min() for b in bases))
+        self._max_base = int(max(b.max() for b in bases))
+        self._window = 2 * span + 1 + self._max_base - self._min_base
+        self._taps = np.zeros((2, self._window, self.L), dtype=np.float32)
+        for ch in (0, 1):
+            for k in range(self.L):
+                offset = bases[ch][k] - self._min_base
+                self._taps[ch, offset:offset + 2 * span + 1, k] = taps[ch][k] / (bound * np.sqrt(2))
+
+        self.reset()
+
+    def reset(self):
+        """Réinitialise l'état (début de flux)."""
+        # Chips passés à zéro: le filtre démarre sur du silence
+        lead = self.span + 1
+        self._buf = np.zeros((2, lead), dtype=np.float32)
+        self._buf_start = -lead        # indice global du chip _buf[:, 0]
+        self._next_period = 0          # prochaine période de L échantillons
+        self._total_chips = 0
+        self._samples_out = 0
+
+    def _run(self, last_chip):
+        """Produit toutes les périodes dont les chips sont disponibles."""
+        q_end = (last_chip - self._max_base - self.span) // self.M + 1
+        count = q_end - self._next_period
+        if count <= 0:
+            return np.zeros(0, dtype=np.complex64)
+
+        first = self._next_period * self.M + self._min_base - self.span - self._buf_start
+        iq = np.empty((count, self.L), dtype=np.complex64)
+        for ch, part in ((0, iq.real), (1, iq.imag)):
+            windows = np.lib.stride_tricks.sliding_window_view(self._buf[ch], self._window)
+            rows = np.ascontiguousarray(windows[first:first + count * self.M:self.M])
+            part[:] = rows @ self._taps[ch]
+
+        self._next_period = q_end
+        # Garder les chips encore nécessaires aux périodes suivantes
+        keep_from = first + count * self.M
+        self._buf = self._buf[:, keep_from:]
+        self._buf_start += keep_from
+        return iq.ravel()
+
+    def process(self, i_chips, q_chips):
+        """
+        Ajoute un bloc de chips et retourne les échantillons disponibles.
+
+        Args:
+            i_chips: Chips canal I (±1, 0 = silence)
+            q_chips: Chips canal Q (même longueur)
+
+        Returns:
+            np.array: Echantillons IQ (complex64), éventuellement vide
+        """
+        if len(i_chips) != len(q_chips):
+            raise ValueError("i_chips et q_chips doivent avoir la même longueur")
+        self._buf = np.concatenate(
+            [self._buf, np.asarray([i_chips, q_chips], dtype=np.float32)], axis=1)
+        self._total_chips += len(i_chips)
+        return self._emit(self._run(self._buf_start + self._buf.shape[1] - 1))
+
+    def flush(self):
+        """
+        Termine le flux: queue du filtre jusqu'au dernier chip.
+
+        La sortie totale fait exactement ceil(chips · sample_rate / CHIP_RATE)
+        échantillons.
+        """
+        total = -(-self._total_chips * self.L // self.M)
+        tail = np.zeros((2, 2 * self.span + 2 * self.M + 2), dtype=np.float32)
+        self._buf = np.concatenate([self._buf, tail], axis=1)
+        iq = self._run(self._buf_start + self._buf.shape[1] - 1)
+        iq = iq[:max(0, total - self._samples_out)]
+        self._samples_out += len(iq)
+        return iq
+
+    def _emit(self, iq):
+        self._samples_out += len(iq)
+        return iq
+
+def oqpsk_modulate_stream(chip_blocks, sample_rate=SAMPLE_RATE):
+    """
+    Générateur OQPSK en flux: un bloc d'échantillons par bloc de chips.
+
+    Permet de produire des signaux de plusieurs minutes (bursts répétés
+    séparés de silences) sans jamais les tenir entiers en mémoire.
+
+    Args:
+        chip_blocks: Itérable de (i_chips, q_chips), chips à 0 = silence
+        sample_rate: Fréquence d'échantillonnage (Hz)
+
+    Yields:
+        np.array: Echantillons IQ (complex64), |iq| ≤ 1
+    """
+    modulator = PolyphaseOQPSKModulator(sample_rate)
+    for i_chips, q_chips in chip_blocks:
+        iq = modulator.process(i_chips, q_chips)
+        if len(iq):
+            yield iq
+    iq = modulator.flush()
+    if len(iq):
+        yield iq
+
 def oqpsk_modulate(i_chips, q_chips, sample_rate, use_rrc=True):
     """
     Modulation OQPSK avec offset Q = Tc/2 et filtre RRC.
@@ -318,6 +594,9 @@ def oqpsk_modulate(i_chips, q_chips, sample_rate, use_rrc=True):
 
     T.018 Section 2.3.4: Pulse shaping avec RRC α=0.8
 
+    Le filtrage RRC passe par PolyphaseOQPSKModulator: offset Tc/2 exact
+    quel que soit le sample rate (y compris non multiple du débit chip).
+
     Args:
         i_chips: Chips canal I (int8: ±1)
         q_chips: Chips canal Q (int8: ±1)
@@ -327,50 +606,21 @@ def oqpsk_modulate(i_chips, q_chips, sample_rate, use_rrc=True):
     Returns:
         np.array: Signal IQ complexe (complex64)
     """
-    samples_per_chip = int(sample_rate / CHIP_RATE)
-
     if use_rrc:
-        # Filtre RRC T.018: α=0.8, span=±31 chips (63 taps)
-        rrc_taps = rrc_filter_taps(alpha=0.8, span=31, sps=samples_per_chip)
-
-        # Suréchantillonner par insertion de zéros
-        i_upsampled = np.zeros(len(i_chips) * samples_per_chip, dtype=np.float32)
-        q_upsampled = np.zeros(len(q_chips) * samples_per_chip, dtype=np.float32)
-
-        i_upsampled[::samples_per_chip] = i_chips
-        q_upsampled[::samples_per_chip] = q_chips
-
-        # Appliquer filtre RRC
-        i_signal = np.convolve(i_upsampled, rrc_taps, mode='same')
-        q_signal = np.convolve(q_upsampled, rrc_taps, mode='same')
-
+        modulator = PolyphaseOQPSKModulator(sample_rate)
+        iq_signal = np.concatenate([modulator.process(i_chips, q_chips),
+                                    modulator.flush()])
     else:
-        # Mode legacy sans RRC (répétition simple)
+        # Mode legacy sans RRC (répétition simple, offset Q arrondi)
+        samples_per_chip = int(sample_rate / CHIP_RATE)
         i_signal = np.repeat(i_chips, samples_per_chip).astype(np.float32)
         q_signal = np.repeat(q_chips, samples_per_chip).astype(np.float32)
-
-    # Offset Q de Tc/2 (I leading Q)
-    # T.018: offset = Tc/2 ± 1%
-    # samples_per_chip = 400000/38400 = 10.416667
-    # Tc/2 = 5.208333 samples
-    # Utiliser interpolation fractionnaire pour respecter ±1%
-    offset_samples_exact = samples_per_chip / 2.0
-    offset_samples_int = int(np.round(offset_samples_exact))
-
-    # Pour interpolation fractionnaire: décaler de offset_samples_int
-    # et ajuster en phase si nécessaire
-    q_signal_delayed = np.concatenate([
-        np.full(offset_samples_int, 0.0 if use_rrc else q_chips[0], dtype=np.float32),
-        q_signal
-    ])
-
-    # Égaliser longueurs
-    min_len = min(len(i_signal), len(q_signal_delayed))
-    i_signal = i_signal[:min_len]
-    q_signal_delayed = q_signal_delayed[:min_len]
-
-    # Signal complexe I + jQ
-    iq_signal = i_signal + 1j * q_signal_delayed
+        offset_samples_int = int(np.round(samples_per_chip / 2.0))
+        q_signal = np.concatenate([
+            np.full(offset_samples_int, q_chips[0], dtype=np.float32),
+            q_signal
+        ])[:len(i_signal)]
+        iq_signal = i_signal + 1j * q_signal
 
     # Normalisation pour magnitude = 1
     max_mag = np.max(np.abs(iq_signal))
@@ -411,7 +661,7 @@ def save_iq_file(iq_signal, filename, sample_rate):
 # FONCTION PRINCIPALE
 # ============================================================================
 
-def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True):
+def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True, self_test=False):
     """
     Génère le signal OQPSK complet T.018 compliant.
 
@@ -419,6 +669,7 @@ def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True):
         hex_frame: Trame 250 bits (hex)
         sample_rate: Fréquence échantillonnage (Hz)
         verbose: Mode verbeux
+        self_test: PRN du mode self-test (T.018 Table 2.2)
 
     Returns:
         np.array: Signal IQ complexe
@@ -437,7 +688,9 @@ def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True):
         print()
 
     # Étape 1: Hex → Bits (250 bits)
-    message_bits = hex_to_bits(hex_frame)[:TOTAL_MESSAGE_BITS]
+    # 63 chars = 252 bits: les 2 premiers bits sont du remplissage à zéro,
+    # le message occupe les 250 derniers (convention du HEX 2G)
+    message_bits = hex_to_bits(hex_frame)[HEX_PAD_BITS:HEX_PAD_BITS + TOTAL_MESSAGE_BITS]
     if verbose:
         print(f"✓ Message: {len(message_bits)} bits extraits")
         print(f"  Structure: {INFO_BITS} info + {BCH_BITS} BCH")
@@ -449,7 +702,7 @@ def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True):
         print(f"✓ Trame complète: {total_bits} bits ({PREAMBLE_BITS} preamble + {TOTAL_MESSAGE_BITS} message)")
 
     # Étape 3: Étalement DSSS (bits → chips)
-    i_chips, q_chips = dsss_spread_oqpsk(frame_bits)
+    i_chips, q_chips = dsss_spread_oqpsk(frame_bits, self_test)
     if verbose:
         print(f"✓ DSSS spreading:")
         print(f"  I-channel: {len(i_chips)} chips ({len(i_chips)//CHIPS_PER_BIT} bits × {CHIPS_PER_BIT})")
@@ -468,6 +721,44 @@ def generate_2g_iq_signal(hex_frame, sample_rate=SAMPLE_RATE, verbose=True):
 
     return iq_signal
 
+def generate_2g_iq_stream(hex_frame, sample_rate=SAMPLE_RATE, repeat=1,
+                          period=DEFAULT_PERIOD, self_test=False):
+    """
+    Génère en flux une suite de bursts identiques espacés de `period` secondes.
+
+    Mémoire bornée (une trame de chips + un bloc d'échantillons) quelle que
+    soit la durée totale: adapté aux signaux de test de plusieurs minutes.
+
+    Args:
+        hex_frame: Trame 250 bits (hex)
+        sample_rate: Fréquence échantillonnage (Hz)
+        repeat: Nombre de bursts
+        period: Période de répétition (s, ≥ durée d'un burst)
+        self_test: PRN du mode self-test (T.018 Table 2.2)
+
+    Yields:
+        np.array: Blocs IQ complex64, |iq| ≤ 1
+    """
+    message_bits = hex_to_bits(hex_frame)[HEX_PAD_BITS:HEX_PAD_BITS + TOTAL_MESSAGE_BITS]
+    i_chips, q_chips = dsss_spread_oqpsk(build_frame_with_preamble(message_bits), self_test)
+
+    gap_chips = int(round(period * CHIP_RATE)) - len(i_chips)
+    if gap_chips < 0:
+        raise ValueError(f"Période {period} s plus courte qu'un burst ({TOTAL_DURATION} s)")
+    silence = np.zeros(CHIP_RATE, dtype=np.int8)  # blocs de 1 s de silence
+
+    def chip_blocks():
+        for n in range(repeat):
+            yield i_chips, q_chips
+            if n < repeat - 1:
+                remaining = gap_chips
+                while remaining > 0:
+                    block = silence[:min(remaining, len(silence))]
+                    remaining -= len(block)
+                    yield block, block
+
+    yield from oqpsk_modulate_stream(chip_blocks(), sample_rate)
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -501,6 +792,17 @@ Références:
                        type=int,
                        default=SAMPLE_RATE,
                        help=f'Sample rate Hz (défaut: {SAMPLE_RATE})')
+    parser.add_argument('--self-test',
+                       action='store_true',
+                       help='PRN du mode self-test (T.018 Table 2.2)')
+    parser.add_argument('-r', '--repeat',
+                       type=int,
+                       default=1,
+                       help='Nombre de bursts (> 1: génération en flux, mémoire bornée)')
+    parser.add_argument('-p', '--period',
+                       type=float,
+                       default=DEFAULT_PERIOD,
+                       help=f'Période de répétition en s avec --repeat (défaut: {DEFAULT_PERIOD})')
     parser.add_argument('-q', '--quiet',
                        action='store_true',
                        help='Mode silencieux')
@@ -527,9 +829,24 @@ Références:
               file=sys.stderr)
         sys.exit(1)
 
-    # Générer signal
     verbose = not args.quiet
-    iq_signal = generate_2g_iq_signal(hex_frame, args.sample_rate, verbose)
+
+    if args.repeat > 1:
+        # Signal long: écriture bloc par bloc, jamais entier en mémoire
+        num_samples = 0
+        with open(args.output, 'wb') as f:
+            for block in generate_2g_iq_stream(hex_frame, args.sample_rate, args.repeat,
+                                               args.period, args.self_test):
+                block.tofile(f)
+                num_samples += len(block)
+        if verbose:
+            print(f"✓ Fichier IQ généré: {args.output}")
+            print(f"  {args.repeat} bursts, période {args.period} s")
+            print(f"  Échantillons: {num_samples:,} ({num_samples / args.sample_rate:.1f} s)")
+        return
+
+    # Générer signal
+    iq_signal = generate_2g_iq_signal(hex_frame, args.sample_rate, verbose, args.self_test)
 
     # Sauvegarder
     save_iq_file(iq_signal, args.output, args.sample_rate)